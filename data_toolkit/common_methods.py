@@ -14,7 +14,21 @@
 
 """ """
 
+import json
+import numpy as np
 import os.path
+import pandas as pd
+import shutil
+
+# Raw data tables with hourly values by unit that can be materialized into
+# the raw data array store
+RAW_UNIT_DAY_HOUR_TABLES = [
+    "raw_data_system_load",
+    "raw_data_var_profiles",
+    "raw_data_availability_profiles",
+]
+RAW_DATA_STORE_SUFFIX = "_raw_data_store"
+RAW_DATA_STORE_UNITS_PER_QUERY = 100
 
 
 def create_csv_generic(
@@ -34,3 +48,293 @@ def create_csv_generic(
             f"The file {filename} already exists and overwrite has not been "
             "indicated."
         )
+
+
+def get_raw_unit_day_hour_data(conn, raw_data_table, units):
+    """
+    :param conn: the database connection
+    :param raw_data_table: str; the raw data table with hourly values by unit
+        (e.g. raw_data_var_profiles)
+    :param units: list of the units for which to get the raw data
+    :return: MultiIndex of the (year, month, day_of_month) days in the raw
+        data, array of the hours of day, (day, hour, unit) array of the unit
+        values (NaN if NULL), and (day, hour, unit) boolean array of whether
+        the raw data have a row for the day, hour, and unit
+
+    Slice the units' data from the raw data array store if the table has been
+    materialized there (see materialize_raw_data_store); otherwise, read the
+    raw data for the units with a single query. The data are arranged by
+    day, hour, and unit (in the order of the units list).
+    """
+    table_directory = get_raw_data_store_table_directory(
+        conn=conn, raw_data_table=raw_data_table
+    )
+    if table_directory is not None and os.path.exists(
+        os.path.join(table_directory, "units.json")
+    ):
+        return read_raw_data_store(table_directory=table_directory, units=units)
+
+    return read_raw_unit_day_hour_data_from_db(
+        conn=conn, raw_data_table=raw_data_table, units=units
+    )
+
+
+def read_raw_unit_day_hour_data_from_db(conn, raw_data_table, units):
+    """
+    :param conn: the database connection
+    :param raw_data_table: str; the raw data table with hourly values by unit
+    :param units: list of the units for which to get the raw data
+    :return: same as get_raw_unit_day_hour_data
+
+    Read the raw data for the units with a single query and arrange them by
+    day, hour, and unit.
+    """
+    df = pd.read_sql(
+        f"""
+        SELECT year, month, day_of_month, hour_of_day, unit, value
+        FROM {raw_data_table}
+        WHERE unit IN ({", ".join(["?"] * len(units))})
+        ;
+        """,
+        conn,
+        params=list(units),
+    )
+
+    row_days = pd.MultiIndex.from_frame(df[["year", "month", "day_of_month"]])
+    days = row_days.unique().sort_values()
+    day_codes = days.get_indexer(row_days)
+    hour_codes, hours = pd.factorize(df["hour_of_day"], sort=True)
+    unit_codes = pd.Index(units).get_indexer(df["unit"])
+
+    shape = (len(days), len(hours), len(units))
+    values = np.full(shape, np.nan)
+    values[day_codes, hour_codes, unit_codes] = df["value"].to_numpy(
+        dtype=float, na_value=np.nan
+    )
+    present = np.zeros(shape, dtype=bool)
+    present[day_codes, hour_codes, unit_codes] = True
+
+    return days, np.asarray(hours), values, present
+
+
+def get_raw_data_store_table_directory(conn, raw_data_table):
+    """
+    :param conn: the database connection
+    :param raw_data_table: str; the raw data table with hourly values by unit
+    :return: the directory of the table's raw data array store or None if the
+        database is not a file (e.g. an in-memory database)
+
+    The raw data array store is a directory next to the database file.
+    """
+    db_file = [
+        file
+        for (seq, name, file) in conn.execute("PRAGMA database_list;")
+        if name == "main"
+    ][0]
+    if not db_file:
+        return None
+
+    return os.path.join(db_file + RAW_DATA_STORE_SUFFIX, raw_data_table)
+
+
+def materialize_raw_data_store(conn, raw_data_table):
+    """
+    :param conn: the database connection
+    :param raw_data_table: str; the raw data table with hourly values by unit
+    :return:
+
+    Write all of the table's data to the raw data array store as (unit, day,
+    hour) arrays of the values (values.npy) and of whether the table has a
+    row for the unit, day, and hour (present.npy), along with the calendar
+    index of (year, month, day_of_month) days (days.npy), the hours of day
+    (hours.npy), and the unit names (units.json). Each unit's data is
+    contiguous, so the arrays can be memory-mapped and sliced by unit without
+    reading the rest of the table.
+    """
+    table_directory = get_raw_data_store_table_directory(
+        conn=conn, raw_data_table=raw_data_table
+    )
+    units = [
+        unit
+        for (unit,) in conn.execute(
+            f"SELECT DISTINCT unit FROM {raw_data_table} ORDER BY unit;"
+        )
+    ]
+    days = pd.MultiIndex.from_frame(
+        pd.read_sql(
+            f"""
+            SELECT DISTINCT year, month, day_of_month
+            FROM {raw_data_table}
+            ORDER BY year, month, day_of_month
+            ;
+            """,
+            conn,
+        )
+    )
+    hours = pd.Index(
+        [
+            hour
+            for (hour,) in conn.execute(
+                f"SELECT DISTINCT hour_of_day FROM {raw_data_table} "
+                f"ORDER BY hour_of_day;"
+            )
+        ],
+        dtype=np.int64,
+    )
+
+    # Write to a temporary directory first, so that the store is never left
+    # half-written
+    temp_directory = table_directory + ".tmp"
+    if os.path.exists(temp_directory):
+        shutil.rmtree(temp_directory)
+    os.makedirs(temp_directory)
+
+    # Fill the arrays on disk a chunk of units at a time, so that the table
+    # doesn't need to fit in memory
+    shape = (len(units), len(days), len(hours))
+    values = np.lib.format.open_memmap(
+        os.path.join(temp_directory, "values.npy"),
+        mode="w+",
+        dtype=float,
+        shape=shape,
+    )
+    values[:] = np.nan
+    present = np.lib.format.open_memmap(
+        os.path.join(temp_directory, "present.npy"),
+        mode="w+",
+        dtype=bool,
+        shape=shape,
+    )
+    for start in range(0, len(units), RAW_DATA_STORE_UNITS_PER_QUERY):
+        chunk_units = units[start : start + RAW_DATA_STORE_UNITS_PER_QUERY]
+        df = pd.read_sql(
+            f"""
+            SELECT year, month, day_of_month, hour_of_day, unit, value
+            FROM {raw_data_table}
+            WHERE unit IN ({", ".join(["?"] * len(chunk_units))})
+            ;
+            """,
+            conn,
+            params=chunk_units,
+        )
+        unit_codes = start + pd.Index(chunk_units).get_indexer(df["unit"])
+        day_codes = days.get_indexer(
+            pd.MultiIndex.from_frame(df[["year", "month", "day_of_month"]])
+        )
+        hour_codes = hours.get_indexer(df["hour_of_day"])
+        values[unit_codes, day_codes, hour_codes] = df["value"].to_numpy(
+            dtype=float, na_value=np.nan
+        )
+        present[unit_codes, day_codes, hour_codes] = True
+    values.flush()
+    present.flush()
+    del values, present
+
+    np.save(
+        os.path.join(temp_directory, "days.npy"),
+        np.array(list(days), dtype=np.int64).reshape(len(days), 3),
+    )
+    np.save(os.path.join(temp_directory, "hours.npy"), hours.to_numpy())
+    with open(os.path.join(temp_directory, "units.json"), "w") as f:
+        json.dump(units, f)
+
+    remove_raw_data_store(conn=conn, raw_data_table=raw_data_table)
+    os.replace(temp_directory, table_directory)
+
+
+def remove_raw_data_store(conn, raw_data_table):
+    """
+    :param conn: the database connection
+    :param raw_data_table: str; the raw data table with hourly values by unit
+    :return:
+
+    Remove the table's raw data array store if it exists, e.g. when the
+    table's data change, so that the toolkit reads the table instead.
+    """
+    table_directory = get_raw_data_store_table_directory(
+        conn=conn, raw_data_table=raw_data_table
+    )
+    if table_directory is not None and os.path.exists(table_directory):
+        shutil.rmtree(table_directory)
+
+
+def read_raw_data_store(table_directory, units):
+    """
+    :param table_directory: the directory of the table's raw data array store
+    :param units: list of the units for which to get the raw data
+    :return: same as get_raw_unit_day_hour_data
+
+    Memory-map the table's arrays and slice the units' data. Units not in the
+    store have no data. Only the days and hours with data for at least one of
+    the units are returned, like when reading the units' data from the
+    database.
+    """
+    with open(os.path.join(table_directory, "units.json"), "r") as f:
+        store_units = pd.Index(json.load(f))
+    store_values = np.load(os.path.join(table_directory, "values.npy"), mmap_mode="r")
+    store_present = np.load(os.path.join(table_directory, "present.npy"), mmap_mode="r")
+    store_days = np.load(os.path.join(table_directory, "days.npy"))
+    store_hours = np.load(os.path.join(table_directory, "hours.npy"))
+
+    unit_positions = store_units.get_indexer(pd.Index(units))
+    in_store = unit_positions >= 0
+    shape = (len(units),) + store_values.shape[1:]
+    values = np.full(shape, np.nan)
+    values[in_store] = store_values[unit_positions[in_store]]
+    present = np.zeros(shape, dtype=bool)
+    present[in_store] = store_present[unit_positions[in_store]]
+
+    has_day = present.any(axis=(0, 2))
+    has_hour = present.any(axis=(0, 1))
+    days = pd.MultiIndex.from_arrays(
+        [store_days[has_day, i] for i in range(3)],
+        names=["year", "month", "day_of_month"],
+    )
+    values = np.moveaxis(values[:, has_day][:, :, has_hour], 0, 2)
+    present = np.moveaxis(present[:, has_day][:, :, has_hour], 0, 2)
+
+    return days, store_hours[has_hour], values, present
+
+
+def get_weighted_day_hour_profile(values, present, unit_weights):
+    """
+    :param values: (day, hour, unit) array of the raw unit values
+    :param present: (day, hour, unit) boolean array of whether the raw data
+        have a row for the day, hour, and unit
+    :param unit_weights: list of (unit position, weight) tuples
+    :return: (day, hour) array of the weighted sum of the unit values (NaN if
+        none of the units has a non-NULL value) and (day, hour) boolean array
+        of whether any of the units has data
+
+    The weighted unit values are accumulated one unit at a time in the order
+    of unit_weights (i.e. the weights are applied as a sparse unit-by-profile
+    matrix), which is the order in which SQLite sums them when grouping the
+    weighted unit rows by hour.
+    """
+    profile = np.zeros(values.shape[:2])
+    n_values = np.zeros(values.shape[:2], dtype=int)
+    for unit_position, weight in unit_weights:
+        weighted_values = values[:, :, unit_position] * weight
+        has_value = ~np.isnan(weighted_values)
+        profile += np.where(has_value, weighted_values, 0)
+        n_values += has_value
+    profile[n_values == 0] = np.nan
+
+    has_data = present[:, :, [u for (u, w) in unit_weights]].any(axis=2)
+
+    return profile, has_data
+
+
+def get_draw_rows(has_data, draw_days):
+    """
+    :param has_data: (day, hour) boolean array of whether there are data
+    :param draw_days: array of the day position of each draw (-1 if the
+        drawn day is not in the raw data)
+    :return: arrays of the draw and hour positions of the rows with data,
+        ordered by draw and then by hour
+    """
+    draw_has_data = np.zeros((len(draw_days), has_data.shape[1]), dtype=bool)
+    in_data = draw_days >= 0
+    draw_has_data[in_data] = has_data[draw_days[in_data]]
+
+    return np.nonzero(draw_has_data)
@@ -39,6 +39,18 @@ This generic loader is used throughout the Data Toolkit workflow to populate
 ``raw_data`` tables (e.g., VER profiles and their unit mapping, hydro operating
 characteristics) that later Data Toolkit steps depend on.
 
+With ``--raw_data_store``, the loader also materializes the tables with hourly
+values by unit (``raw_data_system_load``, ``raw_data_var_profiles``, and
+``raw_data_availability_profiles``) into a raw data array store: a directory
+named after the database with the ``_raw_data_store`` suffix and one
+subdirectory per table with memory-mappable NumPy arrays of the values by
+unit, day, and hour and the calendar index of the days. Later Data Toolkit
+steps then slice the units' data from the arrays instead of querying the
+database. Without the flag, the store of any hourly table the loader appends
+to is removed, so that the toolkit falls back to reading the database. If you
+modify these tables by other means, re-run the loader with
+``--raw_data_store`` (and no files to import) or delete the store.
+
 =====
 Usage
 =====
@@ -50,6 +62,7 @@ Settings
 =========
     * database
     * csv_location
+    * raw_data_store
 
 The ``--csv_location`` directory must contain a ``files_to_import.csv``
 manifest with columns for the import flag, the CSV filename, and the
@@ -64,6 +77,11 @@ from sqlite3 import Connection
 
 import pandas as pd
 
+from data_toolkit.common_methods import (
+    RAW_UNIT_DAY_HOUR_TABLES,
+    materialize_raw_data_store,
+    remove_raw_data_store,
+)
 from db.common_functions import spin_on_database_lock_generic, connect_to_database
 
 
@@ -79,6 +97,13 @@ def parse_arguments(args):
 
     parser.add_argument("-db", "--database")
     parser.add_argument("-csv", "--csv_location")
+    parser.add_argument(
+        "--raw_data_store",
+        default=False,
+        action="store_true",
+        help="Also materialize the raw data tables with hourly values by "
+        "unit into memory-mapped arrays next to the database.",
+    )
     parser.add_argument("-q", "--quiet", default=False, action="store_true")
 
     parsed_arguments = parser.parse_known_args(args=args)[0]
@@ -109,8 +134,18 @@ def main(args=None):
             f_path = str(os.path.join(parsed_args.csv_location, f))
 
             read_and_import_csv(conn, f_path, table)
+            if table in RAW_UNIT_DAY_HOUR_TABLES and not parsed_args.raw_data_store:
+                remove_raw_data_store(conn=conn, raw_data_table=table)
 
     conn.commit()
+
+    if parsed_args.raw_data_store:
+        for table in RAW_UNIT_DAY_HOUR_TABLES:
+            if conn.execute(f"SELECT 1 FROM {table} LIMIT 1;").fetchone():
+                if not parsed_args.quiet:
+                    print(f"... materializing {table}...")
+                materialize_raw_data_store(conn=conn, raw_data_table=table)
+
     conn.close()
 
 
@@ -215,6 +215,7 @@ def main(args=None):
         print_default_values=parsed_args.print_ones,
         default_value=1,
         no_hydro_iteration=True,
+        quiet=parsed_args.quiet,
     )
 
 
@@ -15,7 +15,13 @@
 from multiprocessing import current_process, get_context
 import os.path
 import pandas as pd
+import time
 
+from data_toolkit.common_methods import (
+    get_raw_unit_day_hour_data,
+    get_weighted_day_hour_profile,
+    get_draw_rows,
+)
 from data_toolkit.project.common_methods import (
     create_iterations_csv,
 )
@@ -29,6 +35,15 @@ VAR_NAME_DEFAULT = "ra_toolkit"
 STAGE_ID_DEFAULT = 1
 
 
+def split_projects(projects, n_groups):
+    """
+    :param projects: list of projects
+    :param n_groups: the number of groups to split the projects into
+    :return: list of up to n_groups non-empty lists of projects
+    """
+    return [projects[i::n_groups] for i in range(min(n_groups, len(projects)))]
+
+
 def get_monte_carlo_timeseries_project_pool_and_make_profile_csvs(
     db_path,
     weather_bins_id,
@@ -46,6 +61,7 @@ def get_monte_carlo_timeseries_project_pool_and_make_profile_csvs(
     print_default_values,
     default_value,
     no_hydro_iteration=False,
+    quiet=True,
 ):
     conn = connect_to_database(db_path=db_path)
 
@@ -90,7 +106,9 @@ def get_monte_carlo_timeseries_project_pool_and_make_profile_csvs(
                     os.remove(filename)
 
     # Get the respective draws for the timeseries_name and then find the data
-    # from the raw_data tables
+    # from the raw_data tables; the projects of each timeseries are split
+    # into n_parallel_projects groups, each of which reads the raw data of
+    # its projects' units once
     pool_data = tuple(
         [
             [
@@ -99,7 +117,7 @@ def get_monte_carlo_timeseries_project_pool_and_make_profile_csvs(
                 weather_draws_id,
                 timeseries_project_unit_dict,
                 timeseries_name,
-                project,
+                projects,
                 profile_scenario_id,
                 profile_scenario_name,
                 stage_id,
@@ -110,9 +128,13 @@ def get_monte_carlo_timeseries_project_pool_and_make_profile_csvs(
                 print_default_values,
                 default_value,
                 no_hydro_iteration,
+                quiet,
             ]
             for timeseries_name in timeseries_project_unit_dict.keys()
-            for project in timeseries_project_unit_dict[timeseries_name].keys()
+            for projects in split_projects(
+                projects=list(timeseries_project_unit_dict[timeseries_name].keys()),
+                n_groups=int(n_parallel_projects),
+            )
         ]
     )
 
@@ -128,18 +150,18 @@ def get_monte_carlo_timeseries_project_pool_and_make_profile_csvs(
 
     pool = get_context("spawn").Pool(int(n_parallel_projects))
 
-    pool.map(create_project_profile_csv_pool, pool_data)
+    pool.map(create_project_profile_csvs_pool, pool_data)
     pool.close()
     pool.join()
 
 
-def create_project_profile_csv(
+def create_project_profile_csvs(
     db_path,
     weather_bins_id,
     weather_draws_id,
     timeseries_project_unit_dict,
     timeseries_name,
-    project,
+    projects,
     profile_scenario_id,
     profile_scenario_name,
     stage_id,
@@ -150,68 +172,89 @@ def create_project_profile_csv(
     print_default_values,
     default_value,
     no_hydro_iteration=False,
+    quiet=True,
 ):
+    """
+    Create the profile CSVs of a set of projects with the same timeseries.
+    The raw data of all of the projects' units are read from the database
+    once, the weighted project profile is calculated for each historical
+    day, and the drawn days are then gathered for all weather iterations and
+    written to the project CSV in one pass.
+    """
+    start_time = time.perf_counter()
+
     # Connect to database
     conn = connect_to_database(db_path=db_path)
-    c = conn.cursor()
 
     # Get all the draws
-    draws = c.execute(f"""
+    draws = pd.read_sql(
+        f"""
                 SELECT weather_iteration, draw_number,
-                {timeseries_name}_year, {timeseries_name}_month,
-                {timeseries_name}_day_of_month
+                {timeseries_name}_year AS year, {timeseries_name}_month AS month,
+                {timeseries_name}_day_of_month AS day_of_month
                 FROM aux_weather_iterations
                 WHERE weather_bins_id = {weather_bins_id}
                 AND weather_draws_id = {weather_draws_id}
                 ORDER BY weather_iteration, draw_number
                 ;
-                """).fetchall()
-
-    for weather_iteration, draw_number, year, month, day_of_month in draws:
-        # For each project, get the weighted cap factor for each of its
-        # constituent units, get the UNION of these tables, and then find
-        # the project cap factor with SUM and GROUP BY
-        unit_queries = [
-            f"""
-            SELECT year, month, day_of_month, hour_of_day, unit, 
-            value * {weight} as weighted_{param_name}
-            FROM {raw_data_table}
-            WHERE year = {year}
-            AND month = {month}
-            AND day_of_month = {day_of_month}
-            AND unit = '{unit}'
-            """
+                """,
+        con=conn,
+    )
+
+    if draws.empty:
+        conn.close()
+        return
+
+    # Get the raw data of the projects' units by day, hour, and unit
+    units = sorted(
+        set(
+            unit
+            for project in projects
             for (unit, weight) in timeseries_project_unit_dict[timeseries_name][project]
-        ]
+        )
+    )
+    days, hours, values, present = get_raw_unit_day_hour_data(
+        conn=conn, raw_data_table=raw_data_table, units=units
+    )
 
-        union_query = " UNION ".join(unit_queries)
+    conn.close()
 
-        # Get the project cap factor
-        # TODO: start draw numbers at 0 and remove -1 here
-        # We're assuming draws are days, so multiplying the draw
-        # number by 24 here, then adding hour of day to get the
-        # timepoint ID
-        hydro_iter_sql = "" if no_hydro_iteration else "0 AS hydro_iteration,"
-        project_query = (
-            f"""
-                SELECT {weather_iteration} AS weather_iteration,  
-                {hydro_iter_sql}
-                {stage_id} AS stage_id,
-                {study_year}*10000+({draw_number}-1)*24+hour_of_day AS 
-                timepoint, 
-                sum(weighted_{param_name}) as {param_name}
-                FROM (
-            """
-            + union_query
-            + f""")
-            GROUP BY year, month, day_of_month, hour_of_day
-            ORDER BY year, month, day_of_month, hour_of_day
-            ;
-            """
+    unit_positions = {unit: position for (position, unit) in enumerate(units)}
+    draw_days = days.get_indexer(
+        pd.MultiIndex.from_frame(draws[["year", "month", "day_of_month"]])
+    )
+
+    for project in projects:
+        project_start_time = time.perf_counter()
+        # Sum each project's units' weighted values in order of the unit
+        # names as the SQL queries did
+        profile, has_data = get_weighted_day_hour_profile(
+            values=values,
+            present=present,
+            unit_weights=[
+                (unit_positions[unit], weight)
+                for (unit, weight) in sorted(
+                    timeseries_project_unit_dict[timeseries_name][project]
+                )
+            ],
         )
+        draw_rows, hour_rows = get_draw_rows(has_data=has_data, draw_days=draw_days)
 
-        # Put into a dataframe and add to file
-        df = pd.read_sql(project_query, con=conn)
+        # We're assuming draws are days, so multiplying the draw number by 24
+        # here, then adding hour of day to get the timepoint ID
+        # TODO: start draw numbers at 0 and remove -1 here
+        df = pd.DataFrame(
+            {"weather_iteration": draws["weather_iteration"].to_numpy()[draw_rows]}
+        )
+        if not no_hydro_iteration:
+            df["hydro_iteration"] = 0
+        df["stage_id"] = int(stage_id)
+        df["timepoint"] = (
+            int(study_year) * 10000
+            + (draws["draw_number"].to_numpy()[draw_rows] - 1) * 24
+            + hours[hour_rows]
+        )
+        df[param_name] = profile[draw_days[draw_rows], hour_rows]
 
         # Filter out rows where the value is the default, unless
         # print_default_values is True
@@ -250,18 +293,28 @@ def create_project_profile_csv(
             overwrite=True,
         )
 
-    conn.commit()
-    conn.close()
+        if not quiet:
+            seconds = time.perf_counter() - project_start_time
+            print(
+                f"...wrote {len(df)} rows for project {project} in "
+                f"{seconds:.2f} seconds ({len(df) / seconds:.0f} rows/second)"
+            )
+
+    if not quiet:
+        print(
+            f"...created profiles for {len(projects)} project(s) with timeseries "
+            f"{timeseries_name} in {time.perf_counter() - start_time:.2f} seconds"
+        )
 
 
-def create_project_profile_csv_pool(pool_datum):
+def create_project_profile_csvs_pool(pool_datum):
     [
         db_path,
         weather_bins_id,
         weather_draws_id,
         timeseries_project_unit_dict,
         timeseries_name,
-        project,
+        projects,
         variable_generator_profile_scenario_id,
         variable_generator_profile_scenario_name,
         stage_id,
@@ -272,15 +325,16 @@ def create_project_profile_csv_pool(pool_datum):
         print_default_values,
         default_value,
         no_hydro_iteration,
+        quiet,
     ] = pool_datum
 
-    create_project_profile_csv(
+    create_project_profile_csvs(
         db_path=db_path,
         weather_bins_id=weather_bins_id,
         weather_draws_id=weather_draws_id,
         timeseries_project_unit_dict=timeseries_project_unit_dict,
         timeseries_name=timeseries_name,
-        project=project,
+        projects=projects,
         profile_scenario_id=variable_generator_profile_scenario_id,
         profile_scenario_name=variable_generator_profile_scenario_name,
         stage_id=stage_id,
@@ -291,4 +345,5 @@ def create_project_profile_csv_pool(pool_datum):
         print_default_values=print_default_values,
         default_value=default_value,
         no_hydro_iteration=no_hydro_iteration,
+        quiet=quiet,
     )
@@ -49,8 +49,11 @@ to compute the ``timepoint`` ID. One output CSV is written per project, named
 ``{project}-{scenario_id}-{scenario_name}.csv``, with an accompanying iterations
 CSV written to an ``iterations`` subdirectory of ``--output_directory``.
 
-``--n_parallel_projects N`` processes up to ``N`` projects concurrently (via a
-multiprocessing pool over the project pool) to speed things up. ``--overwrite``
+The raw data of the projects' units are read from the database once and the
+project profiles are calculated for each historical day, so the profile for all
+weather iterations is gathered from the drawn days and written in one pass.
+``--n_parallel_projects N`` splits the projects into up to ``N`` groups that are
+processed concurrently (via a multiprocessing pool) to speed things up. ``--overwrite``
 deletes any existing CSVs with the matching project/scenario filename before
 writing; without it, output is appended to existing files.
 
@@ -206,6 +209,7 @@ def main(args=None):
         study_year=parsed_args.study_year,
         print_default_values=True,
         default_value=None,
+        quiet=parsed_args.quiet,
     )
 
 
@@ -55,7 +55,7 @@ corresponding ``--skip_*`` flag:
       holds the actual hourly ``load_mw`` per ``load_zone``, ``weather_iteration``,
       ``stage_id``, and ``timepoint``.
 
-The load levels are built one synthetic weather iteration at a time. For every
+The load levels are built for all synthetic weather iterations at once. For every
 drawn day in ``aux_weather_iterations`` (matched on ``weather_bins_id`` and
 ``weather_draws_id``), the module identifies the corresponding historical
 calendar day and, for each ``load_zone``, sums the hourly load from
@@ -63,8 +63,10 @@ calendar day and, for each ``load_zone``, sums the hourly load from
 scaled by its ``unit_weight`` from ``user_defined_load_zone_units``. Timepoint
 IDs are derived from the draw number and ``hour_of_day`` and are offset by
 ``--study_year`` (so they start at 1 by default, or at ``YYYY0001`` when a
-study year is provided). Rows for successive draws are appended to the single
-load-levels CSV for the scenario.
+study year is provided). The raw load of all units is read from the database
+once and the weighted load of each zone is calculated for each historical day,
+so the drawn days are simply gathered from it, and the rows for all draws are
+written to the single load-levels CSV for the scenario in one pass.
 
 These CSVs are the files the GridPath model consumes for load; they are not
 loaded back into the database by this step.
@@ -81,9 +83,8 @@ regenerated in place when they already exist:
     * ``--load_components_overwrite`` for the load components CSV, and
     * ``--load_levels_overwrite`` for the load levels CSV.
 
-For the load levels CSV, overwrite resets the file (writes a fresh header) only
-on the first draw of the run and then appends the remaining draws, so the file
-is rebuilt for the full ensemble rather than truncated mid-write.
+For the load levels CSV, overwrite rewrites the file for the full ensemble;
+without it, the rows are appended to an existing file.
 
 =====
 Usage
@@ -133,7 +134,13 @@ import sys
 from argparse import ArgumentParser
 import os.path
 import pandas as pd
+import time
 
+from data_toolkit.common_methods import (
+    get_raw_unit_day_hour_data,
+    get_weighted_day_hour_profile,
+    get_draw_rows,
+)
 from data_toolkit.system.common_methods import (
     create_load_scenario_csv,
     create_load_components_scenario_csv,
@@ -301,97 +308,120 @@ def create_load_levels_csv(
     study_year,
     load_component_name,
     overwrite_load_levels_csv,
+    quiet=True,
 ):
     """
     This module will create load profiles for each synthetic weather
     iteration created with the ``create_monte_carlo_draws`` GridPath Data
     Toolkit module (based on the weather_bins_id and weather_draws_id).
+
+    The raw load of all load zone units is read once, the weighted load of
+    each load zone is calculated for each historical day, and the drawn days
+    are then gathered for all weather iterations and written in one pass.
     """
-    c = conn.cursor()
+    start_time = time.perf_counter()
 
     # Get load zone units
     df = pd.read_sql("""SELECT * FROM user_defined_load_zone_units;""", conn)
 
-    # Create a dictionary of the form {timeseries: project: [units]}
+    # Create a dictionary of the form {load_zone: [(unit, weight)]}
     load_zone_unit_dict = {}
-
     for index, row in df.iterrows():
-        if row["load_zone"] not in load_zone_unit_dict.keys():
-            load_zone_unit_dict[row["load_zone"]] = [(row["unit"], row["unit_weight"])]
-        else:
-            load_zone_unit_dict[row["project"]].append(
-                (row["unit"], row["unit_weight"])
-            )
+        load_zone_unit_dict.setdefault(row["load_zone"], []).append(
+            (row["unit"], row["unit_weight"])
+        )
 
-    draws = c.execute(f"""
+    draws = pd.read_sql(
+        f"""
                 SELECT weather_iteration, draw_number,
-                load_year, load_month,
-                load_day_of_month
+                load_year AS year, load_month AS month,
+                load_day_of_month AS day_of_month
                 FROM aux_weather_iterations
                 WHERE weather_bins_id = {weather_bins_id}
                 AND weather_draws_id = {weather_draws_id}
                 ;
-                """).fetchall()
-
-    draw_n = 0
-    for d in draws:
-        weather_iteration, draw_number, year, month, day_of_month = d
-        for load_zone in load_zone_unit_dict.keys():
-            unit_queries = [f"""
-                SELECT year, month, day_of_month, hour_of_day, unit, 
-                value * {weight} as weighted_load
-                FROM raw_data_system_load
-                WHERE year = {year}
-                AND month = {month}
-                AND day_of_month = {day_of_month}
-                AND unit = '{unit}'
-                """ for (unit, weight) in load_zone_unit_dict[load_zone]]
-
-            union_query = " UNION ".join(unit_queries)
-
-            load_zone_query = (
-                f"""
-                        SELECT 
-                        '{load_zone}' AS load_zone,
-                        {weather_iteration} AS weather_iteration, 
-                        {stage_id} AS stage_id,
-                        {study_year}*10000+({draw_number}-1)*24+hour_of_day AS 
-                        timepoint, 
-                        '{load_component_name}' AS load_component,
-                        sum(weighted_load) AS load_mw
-                        FROM (
-                    """
-                + union_query
-                + f""")
-                    GROUP BY year, month, day_of_month, hour_of_day
-                    ;
-                    """
-            )
+                """,
+        con=conn,
+    )
 
-            # Put into a dataframe and add to file
-            df = pd.read_sql(load_zone_query, con=conn)
+    if draws.empty or not load_zone_unit_dict:
+        return
 
-            filename = os.path.join(
-                output_directory,
-                "load_levels",
-                f"{load_levels_scenario_id}_{load_levels_scenario_name}.csv",
-            )
-            if not os.path.exists(filename) or (
-                overwrite_load_levels_csv and draw_n == 0
-            ):
-                mode = "w"
-                write_header = True
-            else:
-                mode = "a"
-                write_header = False
-            df.to_csv(
-                filename,
-                mode=mode,
-                header=write_header,
-                index=False,
+    # Get the raw load of the load zones' units by day, hour, and unit
+    units = sorted(df["unit"].unique())
+    unit_positions = {unit: position for (position, unit) in enumerate(units)}
+    days, hours, values, present = get_raw_unit_day_hour_data(
+        conn=conn, raw_data_table="raw_data_system_load", units=units
+    )
+    draw_days = days.get_indexer(
+        pd.MultiIndex.from_frame(draws[["year", "month", "day_of_month"]])
+    )
+
+    load_zone_dfs = []
+    for load_zone_position, load_zone in enumerate(load_zone_unit_dict.keys()):
+        # Sum the weighted load of the units in order of the unit names as
+        # the SQL queries did
+        load, has_data = get_weighted_day_hour_profile(
+            values=values,
+            present=present,
+            unit_weights=[
+                (unit_positions[unit], weight)
+                for (unit, weight) in sorted(load_zone_unit_dict[load_zone])
+            ],
+        )
+        draw_rows, hour_rows = get_draw_rows(has_data=has_data, draw_days=draw_days)
+
+        load_zone_dfs.append(
+            pd.DataFrame(
+                {
+                    "draw_position": draw_rows,
+                    "load_zone_position": load_zone_position,
+                    "load_zone": load_zone,
+                    "weather_iteration": draws["weather_iteration"].to_numpy()[
+                        draw_rows
+                    ],
+                    "stage_id": int(stage_id),
+                    "timepoint": study_year * 10000
+                    + (draws["draw_number"].to_numpy()[draw_rows] - 1) * 24
+                    + hours[hour_rows],
+                    "load_component": load_component_name,
+                    "load_mw": load[draw_days[draw_rows], hour_rows],
+                }
             )
+        )
+
+    # Write the load zones' rows for each draw in turn
+    load_levels_df = (
+        pd.concat(load_zone_dfs)
+        .sort_values(["draw_position", "load_zone_position"], kind="stable")
+        .drop(columns=["draw_position", "load_zone_position"])
+    )
 
-            draw_n += 1
+    filename = os.path.join(
+        output_directory,
+        "load_levels",
+        f"{load_levels_scenario_id}_{load_levels_scenario_name}.csv",
+    )
+    if not os.path.exists(filename) or overwrite_load_levels_csv:
+        mode = "w"
+        write_header = True
+    else:
+        mode = "a"
+        write_header = False
+    load_levels_df.to_csv(
+        filename,
+        mode=mode,
+        header=write_header,
+        index=False,
+    )
+
+    if not quiet:
+        seconds = time.perf_counter() - start_time
+        print(
+            f"...wrote {len(load_levels_df)} load rows for {len(draws)} draws "
+            f"and {len(load_zone_unit_dict)} load zone(s) in {seconds:.2f} "
+            f"seconds ({len(load_levels_df) / seconds:.0f} rows/second)"
+        )
 
 
 def main(args=None):
@@ -444,6 +474,7 @@ def main(args=None):
             study_year=int(parsed_args.study_year),
             load_component_name=parsed_args.load_component,
             overwrite_load_levels_csv=parsed_args.load_levels_overwrite,
+            quiet=parsed_args.quiet,
         )
 
     conn.close()
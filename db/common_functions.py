@@ -19,14 +19,22 @@ import sys
 import time
 import traceback
 
+# Scenario results databases are in a directory with the name of the
+# database and this suffix
+SCENARIO_RESULTS_DIRECTORY_SUFFIX = "_scenario_results"
 
-def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
+
+def connect_to_database(
+    db_path="../db/io.db", timeout=5, detect_types=0, cached_statements=128
+):
     """
     :param db_path: str, the path to the database, relative to the
         current working directory, defaults to "../db/io.db"
     :param timeout: int, number of seconds the connection should wait for the
         database lock to go away before raising an exception, defaults to 5
     :param detect_types: int, type detection parameter, defaults to 0
+    :param cached_statements: int, number of prepared statements to cache,
+        defaults to 128 (the sqlite3 default)
     :return: the sqlite3 database connection object
 
     Connect to a database and return the connection object.
@@ -37,7 +45,12 @@ def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
             "specify a different database file?".format(os.path.abspath(db_path))
         )
 
-    conn = sqlite3.connect(db_path, timeout=timeout, detect_types=detect_types)
+    conn = sqlite3.connect(
+        db_path,
+        timeout=timeout,
+        detect_types=detect_types,
+        cached_statements=cached_statements,
+    )
     # print("Connected to {}".format(db_path))
 
     # Enforce foreign keys (default = not enforced)
@@ -169,3 +182,231 @@ def spin_on_database_lock_generic(
         else:
             # print("...done.")
             break
+
+
+def get_database_file(conn):
+    """
+    :param conn: the database connection
+    :return: the path to the file of the connection's main database (an
+        empty string for an in-memory database)
+    """
+    return [
+        file
+        for (seq, name, file) in conn.execute("PRAGMA database_list;")
+        if name == "main"
+    ][0]
+
+
+def get_scenario_results_db_path(db_path, scenario_id):
+    """
+    :param db_path: str, the path to the database
+    :param scenario_id: int, the scenario ID
+    :return: the path to the scenario's results database
+
+    Scenario results databases are in a directory next to the database.
+    """
+    return os.path.join(
+        db_path + SCENARIO_RESULTS_DIRECTORY_SUFFIX,
+        "scenario_{}.db".format(scenario_id),
+    )
+
+
+def create_scenario_results_database(conn, scenario_results_db_path):
+    """
+    :param conn: the database connection
+    :param scenario_results_db_path: str, the path to the scenario results
+        database to create (it is replaced if it exists)
+    :return:
+
+    Create an empty scenario results database with the results tables, their
+    indices, and the results views of the connection's database.
+    """
+    if os.path.exists(scenario_results_db_path):
+        os.remove(scenario_results_db_path)
+    os.makedirs(os.path.dirname(scenario_results_db_path), exist_ok=True)
+
+    results_conn = sqlite3.connect(scenario_results_db_path)
+    for (sql,) in conn.execute("""SELECT sql
+        FROM main.sqlite_master
+        WHERE tbl_name LIKE 'results%'
+        AND sql IS NOT NULL
+        ORDER BY rowid;"""):
+        results_conn.execute(sql)
+    results_conn.commit()
+    results_conn.close()
+
+
+def connect_to_scenario_results_database(db_path, scenario_results_db_path, timeout=5):
+    """
+    :param db_path: str, the path to the database
+    :param scenario_results_db_path: str, the path to the scenario results
+        database
+    :param timeout: int, number of seconds the connection should wait for the
+        database lock to go away before raising an exception, defaults to 5
+    :return: the sqlite3 database connection object
+
+    Connect to the scenario results database and attach the database as
+    'io.' Unqualified table names are looked up in the scenario results
+    database first, so the results tables are read from and written to the
+    scenario results database while all other tables are read from the
+    database. Foreign keys are not enforced, as SQLite can't enforce
+    them across database files (e.g., the results_scenario scenario_id).
+    """
+    conn = connect_to_database(db_path=scenario_results_db_path, timeout=timeout)
+    conn.execute("PRAGMA foreign_keys=OFF;")
+    conn.execute("ATTACH DATABASE ? AS io;", (db_path,))
+
+    return conn
+
+
+def remove_scenario_results_database(conn, scenario_id):
+    """
+    :param conn: the database connection
+    :param scenario_id: int, the scenario ID
+    :return:
+
+    Remove the scenario's results database if it exists.
+    """
+    db_path = get_database_file(conn)
+    if db_path:
+        scenario_results_db_path = get_scenario_results_db_path(
+            db_path=db_path, scenario_id=scenario_id
+        )
+        if os.path.exists(scenario_results_db_path):
+            os.remove(scenario_results_db_path)
+
+
+def attach_scenario_results(conn, scenario_ids=None):
+    """
+    :param conn: the database connection
+    :param scenario_ids: list of the scenario IDs whose results databases to
+        attach; defaults to all scenarios with a results database
+    :return:
+
+    Attach the scenarios' results databases to the connection and create
+    temporary views with the names of the results tables that combine the
+    results in the database and in the scenario results databases. The
+    temporary views take precedence over the database's tables and views
+    with the same name, so queries of the results tables (e.g. the viz
+    queries and those in results_queries.sql) see the results of all
+    attached scenarios. If there are more scenario results databases than
+    SQLite can attach at once, they are attached in batches instead and
+    their results are copied into temporary tables with the names of the
+    results tables. The connection should only be used to read results
+    after this.
+    """
+    db_path = get_database_file(conn)
+    if not db_path:
+        return
+
+    if scenario_ids is None:
+        scenario_results_directory = db_path + SCENARIO_RESULTS_DIRECTORY_SUFFIX
+        scenario_ids = (
+            sorted(
+                int(f[len("scenario_") : -len(".db")])
+                for f in os.listdir(scenario_results_directory)
+                if f.startswith("scenario_") and f.endswith(".db")
+            )
+            if os.path.isdir(scenario_results_directory)
+            else []
+        )
+
+    schemas = []
+    for scenario_id in scenario_ids:
+        scenario_results_db_path = get_scenario_results_db_path(
+            db_path=db_path, scenario_id=scenario_id
+        )
+        if os.path.exists(scenario_results_db_path):
+            schemas.append("scenario_results_{}".format(scenario_id))
+
+    if not schemas:
+        return
+
+    results_objects = conn.execute("""SELECT type, name, sql
+        FROM main.sqlite_master
+        WHERE type IN ('table', 'view')
+        AND name LIKE 'results%'
+        ORDER BY rowid;""").fetchall()
+    results_table_columns = {
+        name: ", ".join(
+            row[1] for row in conn.execute("PRAGMA main.table_info({});".format(name))
+        )
+        for object_type, name, sql in results_objects
+        if object_type == "table"
+    }
+
+    max_attached = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    if len(schemas) <= max_attached:
+        attach_schemas(conn=conn, db_path=db_path, schemas=schemas)
+        for name, columns in results_table_columns.items():
+            selects = ["SELECT {} FROM main.{}".format(columns, name)] + [
+                "SELECT {} FROM {}.{}".format(columns, schema, name)
+                for schema in schemas
+                if has_table(conn=conn, schema=schema, name=name)
+            ]
+            conn.execute(
+                "CREATE TEMP VIEW {} AS {};".format(name, " UNION ALL ".join(selects))
+            )
+    else:
+        for name, columns in results_table_columns.items():
+            conn.execute(
+                "CREATE TEMP TABLE {} AS SELECT {} FROM main.{};".format(
+                    name, columns, name
+                )
+            )
+        for batch_start in range(0, len(schemas), max_attached):
+            batch = schemas[batch_start : batch_start + max_attached]
+            attach_schemas(conn=conn, db_path=db_path, schemas=batch)
+            for name, columns in results_table_columns.items():
+                for schema in batch:
+                    if has_table(conn=conn, schema=schema, name=name):
+                        conn.execute(
+                            "INSERT INTO temp.{} SELECT {} FROM {}.{};".format(
+                                name, columns, schema, name
+                            )
+                        )
+            # Databases can't be detached during a transaction
+            conn.commit()
+            for schema in batch:
+                conn.execute("DETACH DATABASE {};".format(schema))
+
+    for object_type, name, sql in results_objects:
+        if object_type == "view":
+            # Recreate the results views as temporary views, so that they
+            # query the combined results
+            conn.execute(sql.replace("CREATE VIEW", "CREATE TEMP VIEW", 1))
+
+
+def attach_schemas(conn, db_path, schemas):
+    """
+    :param conn: the database connection
+    :param db_path: str, the path to the database
+    :param schemas: list of the schema names of the scenario results
+        databases to attach, e.g. scenario_results_1
+    :return:
+    """
+    for schema in schemas:
+        conn.execute(
+            "ATTACH DATABASE ? AS {};".format(schema),
+            (
+                get_scenario_results_db_path(
+                    db_path=db_path,
+                    scenario_id=schema.replace("scenario_results_", ""),
+                ),
+            ),
+        )
+
+
+def has_table(conn, schema, name):
+    """
+    :param conn: the database connection
+    :param schema: the schema name of the attached database
+    :param name: the table name
+    :return: whether the attached database has the table
+    """
+    return (
+        conn.execute(
+            "SELECT 1 FROM {}.sqlite_master WHERE name = ?;".format(schema), (name,)
+        ).fetchone()
+        is not None
+    )
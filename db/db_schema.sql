@@ -191,6 +191,23 @@ CREATE TABLE status_validation
     FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
 );
 
+-- Validation results cache: the validation outcome of a module for a
+-- fingerprint of the module source and of the content of the tables the
+-- module read (filtered by subscenario IDs); coordinates are the
+-- iteration/subproblem/stage values the module's inputs vary by (JSON)
+DROP TABLE IF EXISTS status_validation_cache;
+CREATE TABLE status_validation_cache
+(
+    gridpath_module   VARCHAR(128),
+    coordinates       VARCHAR(256),
+    db_tables         TEXT, -- JSON: columns read by table
+    subscenario_ids   TEXT, -- JSON: subscenario IDs filtered on by table
+    fingerprint       VARCHAR(64),
+    validation_errors TEXT, -- JSON: status_validation rows
+    time_stamp        TEXT, -- ISO8601 String
+    PRIMARY KEY (gridpath_module, coordinates, fingerprint)
+);
+
 -- Scenario results: objective function, solver status
 DROP TABLE IF EXISTS results_scenario;
 CREATE TABLE results_scenario
@@ -1,3 +1,8 @@
+-- If scenario results were imported into scenario results databases (with
+-- --scenario_results_database), run these queries on a connection on which
+-- db.common_functions.attach_scenario_results has been called, so that the
+-- results tables include the attached scenarios' results.
+
 -- Cumulative generator newly build capacity by scenario, project, an period
 SELECT scenario_id, scenario_name, project, period, technology, load_zone,
 energy_target_zone, instantaneous_penetration_zone, carbon_cap_zone, new_build_mw
@@ -25,6 +25,10 @@ import warnings
 from db.common_functions import spin_on_database_lock
 import db.utilities.custom_functions as custom
 
+# Number of CSV files parsed at a time by the worker processes when loading
+# data in parallel
+PARSE_BATCH_SIZE = 16
+
 # ### Functions for converting CSVs to lists of tuples for DB insertion ### #
 
 
@@ -140,8 +144,10 @@ def get_subscenario_data(csv_file, cols_to_exclude_str, **kwargs):
     # Make the dataframe with the correct columns
     df = df[csv_columns]
 
-    # Convert to tuples
-    tuples_for_import = [kwd_tuple + tuple(x) for x in df.to_records(index=False)]
+    # Convert to tuples of Python (not numpy) scalars, which are much
+    # faster to convert, to pickle when parsing in worker processes, and to
+    # bind to the insert statement
+    tuples_for_import = [kwd_tuple + x for x in df.itertuples(index=False, name=None)]
 
     return csv_columns, tuples_for_import
 
@@ -229,6 +235,46 @@ def get_subscenario_description(input_dir, csv_filename):
     return subscenario_description
 
 
+def _csv_to_subscenario_for_insertion(parse_args):
+    return csv_to_subscenario_for_insertion(*parse_args)
+
+
+def parse_subscenario_csvs(parse_args, pool=None):
+    """
+    :param parse_args: list of the (dir_subsc, inputs_dir, csv_file,
+        sub_input_flag, cols_to_exclude_str) arguments of
+        csv_to_subscenario_for_insertion for each CSV file to parse
+    :param pool: optional multiprocessing pool in which to parse the CSVs
+    :return: generator of the parsed subscenarios, in the order of parse_args
+
+    If a pool is given, the CSVs are parsed by its worker processes in
+    batches of PARSE_BATCH_SIZE files, so that the workers parse the
+    following files while the caller inserts the data of the previous ones
+    into the database without holding more than two batches in memory.
+    """
+    if pool is None:
+        for args in parse_args:
+            yield csv_to_subscenario_for_insertion(*args)
+    else:
+        next_batch = None
+        for start in range(0, len(parse_args), PARSE_BATCH_SIZE):
+            batch = next_batch or pool.map_async(
+                _csv_to_subscenario_for_insertion,
+                parse_args[start : start + PARSE_BATCH_SIZE],
+            )
+            next_start = start + PARSE_BATCH_SIZE
+            next_batch = (
+                pool.map_async(
+                    _csv_to_subscenario_for_insertion,
+                    parse_args[next_start : next_start + PARSE_BATCH_SIZE],
+                )
+                if next_start < len(parse_args)
+                else None
+            )
+            for parsed_subscenario in batch.get():
+                yield parsed_subscenario
+
+
 def get_subscenario_data_and_insert_into_db(
     conn,
     quiet,
@@ -264,14 +310,56 @@ def get_subscenario_data_and_insert_into_db(
     if not quiet:
         print("   ...importing data from {}".format(csv_file))
 
-    subscenario_tuples, csv_headers, inputs_tuples, default_subscenario_id = (
-        csv_to_subscenario_for_insertion(
+    insert_subscenario_into_db(
+        conn=conn,
+        quiet=quiet,
+        subscenario=subscenario,
+        table=table,
+        parsed_subscenario=csv_to_subscenario_for_insertion(
             dir_subsc=dir_subsc,
             inputs_dir=inputs_dir,
             csv_file=csv_file,
             sub_input_flag=use_project_method,
             cols_to_exclude_str=cols_to_exclude_str,
-        )
+        ),
+        use_project_method=use_project_method,
+        sub_input_column=sub_input_column,
+        skip_subscenario_info=skip_subscenario_info,
+        skip_subscenario_data=skip_subscenario_data,
+        custom_method=custom_method,
+    )
+
+
+def insert_subscenario_into_db(
+    conn,
+    quiet,
+    subscenario,
+    table,
+    parsed_subscenario,
+    use_project_method,
+    sub_input_column,
+    skip_subscenario_info,
+    skip_subscenario_data,
+    custom_method,
+):
+    """
+    :param conn: database connection object
+    :param quiet: boolean
+    :param subscenario: string
+    :param table: string
+    :param parsed_subscenario: tuple; the subscenario info tuples, CSV
+        headers, data tuples, and default subscenario ID as returned by
+        csv_to_subscenario_for_insertion
+    :param use_project_method: boolean
+    :param sub_input_column: string
+    :param skip_subscenario_info: boolean
+    :param skip_subscenario_data: boolean
+    :param custom_method: string
+
+    Insert the parsed data for a subscenario into the database.
+    """
+    subscenario_tuples, csv_headers, inputs_tuples, default_subscenario_id = (
+        parsed_subscenario
     )
 
     generic_insert_subscenario(
@@ -320,6 +408,7 @@ def read_all_csv_subscenarios_from_dir_and_insert_into_db(
     sub_input_column,
     cols_to_exclude_str,
     custom_method,
+    pool=None,
 ):
     """
     :param conn: database connection object
@@ -331,6 +420,7 @@ def read_all_csv_subscenarios_from_dir_and_insert_into_db(
     :param sub_input_column: string
     :param cols_to_exclude_str: string
     :param custom_method: string
+    :param pool: optional multiprocessing pool in which to parse the CSVs
 
     Read data from all subscenario CSVs in a directory and insert them into
     the database.
@@ -357,22 +447,26 @@ def read_all_csv_subscenarios_from_dir_and_insert_into_db(
 
     # If the subscenario is included, make a list of tuples for the subscenario
     # and inputs, and insert into the database via the relevant method
-    for csv_file in csv_files:
+    parsed_subscenarios = parse_subscenario_csvs(
+        parse_args=[
+            (False, inputs_dir, csv_file, use_project_method, cols_to_exclude_str)
+            for csv_file in csv_files
+        ],
+        pool=pool,
+    )
+    for csv_file, parsed_subscenario in zip(csv_files, parsed_subscenarios):
         if not quiet:
             print("...importing CSV {}".format(csv_file))
-        get_subscenario_data_and_insert_into_db(
+        insert_subscenario_into_db(
             conn=conn,
             quiet=quiet,
             subscenario=subscenario,
             table=table,
-            dir_subsc=False,
-            inputs_dir=inputs_dir,
-            csv_file=csv_file,
+            parsed_subscenario=parsed_subscenario,
             use_project_method=use_project_method,
             sub_input_column=sub_input_column,
             skip_subscenario_info=skip_subscenario_info,
             skip_subscenario_data=skip_subscenario_data,
-            cols_to_exclude_str=cols_to_exclude_str,
             custom_method=custom_method,
         )
 
@@ -420,6 +514,7 @@ def read_all_dir_subscenarios_from_dir_and_insert_into_db(
     skip_subscenario_data,
     cols_to_exclude_str,
     custom_method,
+    pool=None,
 ):
     """
     :param conn: database connection object
@@ -432,6 +527,7 @@ def read_all_dir_subscenarios_from_dir_and_insert_into_db(
     :param skip_subscenario_data: boolean
     :param cols_to_exclude_str: string
     :param custom_method: function
+    :param pool: optional multiprocessing pool in which to parse the CSVs
 
     Read data from all subscenario directories in a directory and insert them
     into the database.
@@ -440,22 +536,28 @@ def read_all_dir_subscenarios_from_dir_and_insert_into_db(
         main_directory=inputs_dir, quiet=quiet
     )
 
-    for subscenario_directory in subscenario_directories:
+    parsed_subscenarios = parse_subscenario_csvs(
+        parse_args=[
+            (True, subscenario_directory, filename, False, cols_to_exclude_str)
+            for subscenario_directory in subscenario_directories
+        ],
+        pool=pool,
+    )
+    for subscenario_directory, parsed_subscenario in zip(
+        subscenario_directories, parsed_subscenarios
+    ):
         if not quiet:
             print("...importing data from directory {}".format(subscenario_directory))
-        get_subscenario_data_and_insert_into_db(
+        insert_subscenario_into_db(
             conn=conn,
             quiet=quiet,
             subscenario=subscenario,
             table=table,
-            dir_subsc=True,
-            inputs_dir=subscenario_directory,
-            csv_file=filename,
+            parsed_subscenario=parsed_subscenario,
             use_project_method=False,
             sub_input_column=False,
             skip_subscenario_info=skip_subscenario_info,
             skip_subscenario_data=skip_subscenario_data,
-            cols_to_exclude_str=cols_to_exclude_str,
             custom_method=custom_method,
         )
 
@@ -1035,6 +1137,7 @@ def load_all_subscenario_ids_from_dir_to_subscenario_table(
     inputs_dir,
     filename,
     quiet,
+    pool=None,
 ):
     """
     :param conn: the database connection
@@ -1048,6 +1151,7 @@ def load_all_subscenario_ids_from_dir_to_subscenario_table(
     :param inputs_dir: str
     :param filename: str
     :param quiet: boolean
+    :param pool: optional multiprocessing pool in which to parse the CSVs
     :return:
 
     Load all data for a subscenario (i.e. all subscenario IDs) from a
@@ -1072,6 +1176,7 @@ def load_all_subscenario_ids_from_dir_to_subscenario_table(
             sub_input_column=sub_input_column,
             cols_to_exclude_str=cols_to_exclude_str,
             custom_method=custom_method,
+            pool=pool,
         )
     elif subscenario_type in ["dir_subsc_only", "dir_main", "dir_aux"]:
         read_all_dir_subscenarios_from_dir_and_insert_into_db(
@@ -1085,6 +1190,7 @@ def load_all_subscenario_ids_from_dir_to_subscenario_table(
             skip_subscenario_data=skip_subscenario_data,
             cols_to_exclude_str=cols_to_exclude_str,
             custom_method=custom_method,
+            pool=pool,
         )
 
 
@@ -72,6 +72,17 @@ example, a *temporal_scenario_id* directory must contain files named
 *period_params.csv*, *horizon_params.csv*, *structure.csv*, and
 *horizon_timepoints.csv*.
 
+When loading all data, the CSV files can be parsed in parallel worker
+processes with the *--n_parallel_read* flag, e.g. *--n_parallel_read 4*. The
+parsed data are still inserted into the database in the order of the
+*csv_structure.csv* file by a single database connection. The data for each
+table are committed in a single transaction, after which the table is
+recorded in a load log (a *_load_log.csv* file next to the database) along
+with the number of rows written and the time it took; the throughput for
+each table is also printed unless *--quiet* is specified. If the load is
+interrupted, rerun the same command with the *--resume* flag to skip the
+tables already loaded. The load log is removed once all data are loaded.
+
 The *scenarios.csv* under the scenario folder contains the subscenario ID
 specifications for each scenario to be loaded. The user-defined name of the
 scenario should be entered as the name of the scenario column.
@@ -79,11 +90,14 @@ scenario should be entered as the name of the scenario column.
 """
 
 from argparse import ArgumentParser
+import csv
+from multiprocessing import get_context
 import numpy as np
 import os
 import pandas as pd
 import sqlite3
 import sys
+import time
 
 # Data-import modules
 from db.common_functions import connect_to_database
@@ -165,6 +179,21 @@ def parse_arguments(args):
         help="Turn off foreign key enforcement. Can be helpful when trying to "
         "delete and reload data, but please proceed with caution.",
     )
+    parser.add_argument(
+        "--n_parallel_read",
+        default=1,
+        type=int,
+        help="Number of worker processes in which to parse the CSV files "
+        "when loading all data. The data are still inserted into the database "
+        "in order by a single connection. Defaults to 1 (no worker processes).",
+    )
+    parser.add_argument(
+        "--resume",
+        default=False,
+        action="store_true",
+        help="Resume an interrupted load of all data, skipping the tables "
+        "recorded as loaded in the load log.",
+    )
     parser.add_argument(
         "--quiet",
         default=False,
@@ -177,16 +206,52 @@ def parse_arguments(args):
     return parsed_arguments
 
 
-def load_all_from_csv_structure(conn, csv_path, csv_structure, quiet):
+def get_load_log_path(db_path):
+    """
+    :param db_path: str, the path to the database
+    :return: str, the path to the log of the tables loaded into the database
+    """
+    return "{}_load_log.csv".format(os.path.splitext(db_path)[0])
+
+
+def read_load_log(load_log):
+    """
+    :param load_log: str, the path to the load log
+    :return: set of the CSV structure rows (index and table) already loaded
+    """
+    if not os.path.isfile(load_log):
+        return set()
+    log_df = pd.read_csv(load_log)
+    return set(zip(log_df["row"], log_df["table"]))
+
+
+def load_all_from_csv_structure(
+    conn, csv_path, csv_structure, quiet, pool=None, load_log=None, resume=False
+):
     """
     :param conn: the database connection
     :param csv_path: str, the directory where the CSV files are located
     :param csv_structure: Pandas dataframe of the CSV structure file
     :param quiet: boolean for whether to print output
+    :param pool: optional multiprocessing pool in which to parse the CSVs
+    :param load_log: str, optional path to the file where to record each
+        table (CSV structure row) once its data are committed
+    :param resume: boolean; if True, skip the tables already recorded in
+        the load log
     :return:
 
     Read and load all data specified in the CSV structure file.
+
+    The data for each row of the CSV structure file are inserted in a single
+    transaction, which is committed before the row is recorded in the load
+    log along with the number of rows written and the time it took, so an
+    interrupted load can be resumed after the last table recorded.
     """
+    loaded_rows = read_load_log(load_log) if resume and load_log is not None else set()
+    if load_log is not None and not loaded_rows:
+        with open(load_log, "w", newline="") as f:
+            csv.writer(f).writerow(["row", "table", "rows_written", "seconds"])
+
     # LOAD ALL SUBSCENARIOS WITH NON-CUSTOM INPUTS #
     for index, row in csv_structure.iterrows():
         # Load data if a directory is specified for this table
@@ -202,11 +267,20 @@ def load_all_from_csv_structure(conn, csv_path, csv_structure, quiet):
                 subscenario_type,
                 filename,
             ) = parse_row(row=row, csv_path=csv_path)
+            if (index, table) in loaded_rows:
+                if not quiet:
+                    print(
+                        "Skipping subscenario {}, table {}: already "
+                        "loaded".format(subscenario, table)
+                    )
+                continue
             if not quiet:
                 print(
                     "Importing data for subscenario {}, table {} from {}"
                     "...".format(subscenario, table, inputs_dir)
                 )
+            start_changes = conn.total_changes
+            start_time = time.perf_counter()
             load_all_subscenario_ids_from_dir_to_subscenario_table(
                 conn,
                 subscenario,
@@ -219,7 +293,25 @@ def load_all_from_csv_structure(conn, csv_path, csv_structure, quiet):
                 inputs_dir,
                 filename,
                 quiet,
+                pool,
             )
+            conn.commit()
+            rows_written = conn.total_changes - start_changes
+            seconds = time.perf_counter() - start_time
+
+            if load_log is not None:
+                with open(load_log, "a", newline="") as f:
+                    csv.writer(f).writerow([index, table, rows_written, seconds])
+            if not quiet:
+                print(
+                    "...wrote {} rows for table {} in {:.2f} seconds ({:.0f} "
+                    "rows/second)".format(
+                        rows_written,
+                        table,
+                        seconds,
+                        rows_written / seconds if seconds > 0 else 0,
+                    )
+                )
 
         conn.commit()
 
@@ -456,12 +548,35 @@ def main(args=None):
         and parsed_args.subscenario_id is None
         and parsed_args.project is None
     ):
-        load_all_from_csv_structure(
-            conn=conn,
-            csv_path=csv_path,
-            csv_structure=csv_structure,
-            quiet=parsed_args.quiet,
+        # Each table is committed once loaded, so we don't need to sync the
+        # database file to disk as often during the bulk load; we don't turn
+        # syncing off, as the tables recorded in the load log as committed
+        # must survive a crash to be skipped with --resume
+        synchronous = conn.execute("PRAGMA synchronous;").fetchone()[0]
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        load_log = get_load_log_path(db_path=db_path)
+        pool = (
+            get_context("spawn").Pool(parsed_args.n_parallel_read)
+            if parsed_args.n_parallel_read > 1
+            else None
         )
+        try:
+            load_all_from_csv_structure(
+                conn=conn,
+                csv_path=csv_path,
+                csv_structure=csv_structure,
+                quiet=parsed_args.quiet,
+                pool=pool,
+                load_log=load_log,
+                resume=parsed_args.resume,
+            )
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            conn.execute("PRAGMA synchronous={};".format(synchronous))
+        # The load completed, so there's nothing left to resume
+        os.remove(load_log)
     elif parsed_args.subscenario is not None and parsed_args.subscenario_id is None:
         # Load all IDs for a subscenario-table
         load_all_subscenario_ids_from_directory(
@@ -32,7 +32,11 @@ import pandas as pd
 import sys
 import warnings
 
-from db.common_functions import connect_to_database, spin_on_database_lock
+from db.common_functions import (
+    connect_to_database,
+    remove_scenario_results_database,
+    spin_on_database_lock,
+)
 from db.utilities.common_functions import confirm
 
 
@@ -214,8 +218,11 @@ def delete_scenario_results_and_status(conn, scenario_id):
     :param scenario_id:
     :return:
 
-    Delete scenario results and statuses from relevant tables.
+    Delete scenario results and statuses from relevant tables and remove the
+    scenario's results database if it exists.
     """
+    remove_scenario_results_database(conn=conn, scenario_id=scenario_id)
+
     c = conn.cursor()
     all_tables = c.execute(
         "SELECT name FROM sqlite_master WHERE type='table';"
@@ -253,8 +260,11 @@ def delete_scenario_results(conn, scenario_id):
     :param scenario_id:
     :return:
 
-    Delete prior results for this scenario from all results tables.
+    Delete prior results for this scenario from all results tables and
+    remove the scenario's results database if it exists.
     """
+    remove_scenario_results_database(conn=conn, scenario_id=scenario_id)
+
     c = conn.cursor()
     all_tables = c.execute(
         "SELECT name FROM sqlite_master WHERE type='table';"
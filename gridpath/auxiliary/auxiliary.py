@@ -19,6 +19,9 @@ Various auxiliary functions used in other modules
 from importlib import import_module
 import os.path
 import pandas as pd
+from pyomo.core.expr import LinearExpression, MonomialTermExpression
+from pyomo.core.expr.numvalue import native_numeric_types
+from pyomo.environ import value
 import traceback
 
 
@@ -136,6 +139,63 @@ def subset_init_by_set_membership(mod, superset, index, membership_set):
     )
 
 
+def linear_combination(coefficients_and_terms, constant=0):
+    """
+    Build the sum of coefficient * term over an iterable of
+    (coefficient, term) tuples.
+
+    Coefficients (e.g., products of timepoint weights and discount factors)
+    are evaluated to numbers once here, so each term gets a single
+    precomputed coefficient instead of a chain of product nodes. If all
+    terms are variables, the sum is returned directly as a flat Pyomo
+    LinearExpression; otherwise, the weighted terms are summed as usual.
+    Terms with a zero coefficient are dropped and numeric terms are added to
+    the constant.
+
+    :param coefficients_and_terms: iterable of (coefficient, term) tuples;
+        coefficients must be numbers or fixed (non-variable) expressions
+    :param constant: a number to add to the sum
+    :return: the expression (or the constant if there are no terms)
+    """
+    coefficients = []
+    terms = []
+    all_variables = True
+    for coefficient, term in coefficients_and_terms:
+        if coefficient.__class__ not in native_numeric_types:
+            if coefficient.is_potentially_variable():
+                raise ValueError(
+                    "Coefficient {} of term {} is not fixed.".format(coefficient, term)
+                )
+            coefficient = value(coefficient)
+        if not coefficient:
+            continue
+        if term.__class__ in native_numeric_types:
+            constant += coefficient * term
+            continue
+        coefficients.append(coefficient)
+        terms.append(term)
+        if all_variables and not term.is_variable_type():
+            all_variables = False
+
+    if not terms:
+        return constant
+    if all_variables:
+        args = [
+            term if coefficient == 1 else MonomialTermExpression((coefficient, term))
+            for coefficient, term in zip(coefficients, terms)
+        ]
+        if constant:
+            args.append(constant)
+        return LinearExpression(args)
+    return sum(
+        (
+            term if coefficient == 1 else coefficient * term
+            for coefficient, term in zip(coefficients, terms)
+        ),
+        constant,
+    )
+
+
 def check_list_has_single_item(l, error_msg):
     if len(l) > 1:
         raise ValueError(error_msg)
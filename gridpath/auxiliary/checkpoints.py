@@ -0,0 +1,615 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Subproblem checkpoints for resuming scenario runs.
+
+After all stages of a subproblem are solved and their results exported,
+we write a small JSON manifest for the subproblem to the *checkpoints*
+directory of the scenario. The manifest records the termination condition
+and the solve/export timings of each stage, the size and modification
+time of each of the input files used, and the same for the state handed
+off from the subproblem, i.e. its pass-through inputs and, if subproblems
+are linked, the linked inputs written to the next subproblem, along with
+the modification time of each of these directories. Writing a checkpoint
+therefore doesn't read any files. With *--hash_checkpoint_inputs*, the
+content hash of each file is recorded too, so that files that were
+rewritten with the same content (e.g. when inputs are written again from
+the database) are not considered changed when resuming. Manifests are written to a temporary file first and then moved
+into place, so a run that dies mid-write never leaves a partial manifest.
+
+When resuming a run (with *--incomplete_only*), the manifests are read with
+a single scan of the checkpoints directory, checkpointed subproblems are
+skipped, and the run restarts at the first incomplete subproblem (of
+each iteration if subproblems are linked). If the inputs of a checkpointed
+subproblem (or the linked state the restart depends on) changed since the
+checkpoint was written, we refuse to resume; if its pass-through inputs
+changed, the subproblem is solved again. Files are only hashed if their
+size or modification time differ from the manifest and their hash was
+recorded, and directories are only listed again if their modification
+time differs, i.e. if files may have been added or removed.
+"""
+
+import datetime
+import hashlib
+import json
+import os.path
+import shutil
+import tempfile
+
+from gridpath.auxiliary.auxiliary import check_for_integer_subdirectories
+from gridpath.common_functions import ensure_empty_string
+
+CHECKPOINTS_DIRECTORY = "checkpoints"
+
+
+def get_checkpoint_filename(
+    weather_iteration, hydro_iteration, availability_iteration, subproblem
+):
+    """
+    :return: the name of the manifest file of the subproblem, e.g.
+        weather_iteration_1__2.json for subproblem 2 of weather iteration 1
+    """
+    directories = [
+        d
+        for d in (
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+        )
+        if d != ""
+    ]
+    return "{}.json".format("__".join(directories) if directories else "scenario")
+
+
+def hash_file(filepath):
+    """
+    :param filepath:
+    :return: the SHA-256 hex digest of the file's content
+    """
+    file_hash = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1048576), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_file_signatures(
+    directory, filename_filter=None, previous_signatures=None, hash_content=True
+):
+    """
+    :param directory: the directory whose files to sign
+    :param filename_filter: function returning whether to include a file
+    :param previous_signatures: dictionary of previously determined signatures
+    :param hash_content: whether to hash the content of the files (the
+        content hash is None otherwise)
+    :return: dictionary with a [size, modification time, content hash] list
+        for each file in the directory
+
+    The content hash of a file is only recalculated if its size or
+    modification time differ from those in previous_signatures.
+    """
+    previous_signatures = {} if previous_signatures is None else previous_signatures
+    signatures = {}
+    if not os.path.isdir(directory):
+        return signatures
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or (
+                filename_filter is not None and not filename_filter(entry.name)
+            ):
+                continue
+            stat = entry.stat()
+            previous = previous_signatures.get(entry.name)
+            if not hash_content:
+                content_hash = None
+            elif previous is not None and previous[:2] == [
+                stat.st_size,
+                stat.st_mtime_ns,
+            ]:
+                content_hash = previous[2]
+            else:
+                content_hash = hash_file(entry.path)
+            signatures[entry.name] = [stat.st_size, stat.st_mtime_ns, content_hash]
+
+    return signatures
+
+
+def get_directory_mtimes(base_directory, directories):
+    """
+    :param base_directory: the directory the directories are relative to
+    :param directories: the directories whose modification times to get
+    :return: dictionary with the modification time of each directory (None
+        if the directory doesn't exist)
+    """
+    directory_mtimes = {}
+    for directory in directories:
+        try:
+            directory_mtimes[directory] = os.stat(
+                os.path.join(base_directory, directory)
+            ).st_mtime_ns
+        except FileNotFoundError:
+            directory_mtimes[directory] = None
+
+    return directory_mtimes
+
+
+def get_content_hash(signatures_by_directory):
+    """
+    :param signatures_by_directory: dictionary of file signatures by directory
+    :return: hash of the content hashes of all files
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                directory: {f: signatures[f][2] for f in signatures}
+                for directory, signatures in signatures_by_directory.items()
+            },
+            sort_keys=True,
+        ).encode()
+    ).hexdigest()
+
+
+def get_subproblem_stages(subproblem_directory, multi_stage):
+    if multi_stage:
+        return check_for_integer_subdirectories(subproblem_directory)
+    else:
+        return [""]
+
+
+def get_subproblem_inputs_fingerprint(
+    scenario_directory,
+    weather_iteration,
+    hydro_iteration,
+    availability_iteration,
+    subproblem,
+    multi_stage,
+):
+    """
+    :param scenario_directory:
+    :param weather_iteration:
+    :param hydro_iteration:
+    :param availability_iteration:
+    :param subproblem:
+    :param multi_stage:
+    :return: hash of the content of the scenario-level files (e.g. the
+        features, units, and solver options) and of the input files of all
+        stages of the subproblem
+
+    The scenario description is not read by the model, so it is excluded:
+    the same subproblem of two scenarios with the same fingerprint (and
+    solved with the same options) has the same results.
+    """
+    subproblem_directory = os.path.join(
+        scenario_directory,
+        weather_iteration,
+        hydro_iteration,
+        availability_iteration,
+        subproblem,
+    )
+    signatures_by_directory = {
+        "": get_file_signatures(
+            scenario_directory,
+            filename_filter=lambda f: f != "scenario_description.csv",
+        )
+    }
+    for stage in get_subproblem_stages(subproblem_directory, multi_stage):
+        signatures_by_directory[os.path.join(stage, "inputs")] = get_file_signatures(
+            os.path.join(subproblem_directory, stage, "inputs")
+        )
+
+    return get_content_hash(signatures_by_directory)
+
+
+def is_linked_file(filename):
+    return "_linked_" in filename
+
+
+def get_linked_state_directories(
+    scenario_directory,
+    weather_iteration,
+    hydro_iteration,
+    availability_iteration,
+    subproblem,
+    stages,
+):
+    """
+    :return: list of the directories (relative to the scenario directory)
+        to which the subproblem writes linked inputs for the next subproblem
+        of the same iteration (see the linked subproblem exports of the
+        operational type modules)
+    """
+    if subproblem == "" or not os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    ):
+        return []
+    return [
+        os.path.join(
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            str(int(subproblem) + 1),
+            stage,
+            "inputs",
+        )
+        for stage in stages
+    ]
+
+
+def write_checkpoint(
+    scenario_directory,
+    weather_iteration,
+    hydro_iteration,
+    availability_iteration,
+    subproblem,
+    multi_stage,
+    stage_timings,
+    hash_inputs=False,
+):
+    """
+    :param scenario_directory:
+    :param weather_iteration:
+    :param hydro_iteration:
+    :param availability_iteration:
+    :param subproblem:
+    :param multi_stage:
+    :param stage_timings: dictionary of the solve/export timings by stage
+        (only for stages solved in this run)
+    :param hash_inputs: whether to record the content hash of the files
+        (otherwise only their size and modification time are recorded)
+    :return: the manifest (None if any stage of the subproblem is incomplete)
+
+    Write the checkpoint manifest for a subproblem all of whose stages are
+    complete.
+    """
+    subproblem_directory = os.path.join(
+        scenario_directory,
+        weather_iteration,
+        hydro_iteration,
+        availability_iteration,
+        subproblem,
+    )
+    stages = get_subproblem_stages(subproblem_directory, multi_stage)
+
+    stage_results = {}
+    inputs = {}
+    for stage in stages:
+        termination_condition_file = os.path.join(
+            subproblem_directory, stage, "results", "termination_condition.txt"
+        )
+        if not os.path.isfile(termination_condition_file):
+            return None
+        with open(termination_condition_file, "r") as f:
+            stage_results[stage] = {"termination_condition": f.read()}
+        stage_results[stage].update(stage_timings.get(stage, {}))
+
+        inputs[os.path.join(stage, "inputs")] = get_file_signatures(
+            os.path.join(subproblem_directory, stage, "inputs"),
+            hash_content=hash_inputs,
+        )
+
+    pass_through_directory = os.path.join(
+        weather_iteration,
+        hydro_iteration,
+        availability_iteration,
+        subproblem,
+        "pass_through_inputs",
+    )
+    pass_through_state = {
+        pass_through_directory: get_file_signatures(
+            os.path.join(scenario_directory, pass_through_directory),
+            hash_content=hash_inputs,
+        )
+    }
+    linked_state = {
+        linked_directory: get_file_signatures(
+            os.path.join(scenario_directory, linked_directory),
+            filename_filter=is_linked_file,
+            hash_content=hash_inputs,
+        )
+        for linked_directory in get_linked_state_directories(
+            scenario_directory,
+            weather_iteration,
+            hydro_iteration,
+            availability_iteration,
+            subproblem,
+            stages,
+        )
+    }
+
+    manifest = {
+        "weather_iteration": weather_iteration,
+        "hydro_iteration": hydro_iteration,
+        "availability_iteration": availability_iteration,
+        "subproblem": subproblem,
+        "status": "complete",
+        "timestamp": datetime.datetime.now().isoformat(),
+        "stages": stage_results,
+        "inputs_hash": get_content_hash(inputs) if hash_inputs else None,
+        "inputs": inputs,
+        "inputs_directory_mtimes": get_directory_mtimes(
+            subproblem_directory, inputs.keys()
+        ),
+        "pass_through_state": pass_through_state,
+        "linked_state": linked_state,
+        "linked_state_directory_mtimes": get_directory_mtimes(
+            scenario_directory, linked_state.keys()
+        ),
+    }
+
+    checkpoints_directory = os.path.join(scenario_directory, CHECKPOINTS_DIRECTORY)
+    os.makedirs(checkpoints_directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=checkpoints_directory, suffix=".tmp", delete=False
+    ) as f:
+        json.dump(manifest, f)
+    os.replace(
+        f.name,
+        os.path.join(
+            checkpoints_directory,
+            get_checkpoint_filename(
+                weather_iteration, hydro_iteration, availability_iteration, subproblem
+            ),
+        ),
+    )
+
+    return manifest
+
+
+def read_checkpoints(scenario_directory):
+    """
+    :param scenario_directory:
+    :return: dictionary of the checkpoint manifests by (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem)
+    """
+    checkpoints_directory = os.path.join(scenario_directory, CHECKPOINTS_DIRECTORY)
+    manifests = {}
+    if not os.path.isdir(checkpoints_directory):
+        return manifests
+    with os.scandir(checkpoints_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                with open(entry.path, "r") as f:
+                    manifest = json.load(f)
+                if manifest["status"] == "complete":
+                    manifests[
+                        (
+                            manifest["weather_iteration"],
+                            manifest["hydro_iteration"],
+                            manifest["availability_iteration"],
+                            manifest["subproblem"],
+                        )
+                    ] = manifest
+
+    return manifests
+
+
+def clear_checkpoints(scenario_directory):
+    """
+    Remove the checkpoints of prior runs (e.g. when starting a new run of
+    all subproblems).
+    """
+    shutil.rmtree(
+        os.path.join(scenario_directory, CHECKPOINTS_DIRECTORY), ignore_errors=True
+    )
+
+
+def get_changed_files(
+    base_directory,
+    recorded_signatures,
+    recorded_directory_mtimes=None,
+    filename_filter=None,
+):
+    """
+    :param base_directory: the directory the recorded directories are
+        relative to
+    :param recorded_signatures: dictionary of the recorded file signatures
+        by directory
+    :param recorded_directory_mtimes: dictionary of the recorded modification
+        times of the directories (if any)
+    :param filename_filter: function returning whether to include a file
+    :return: sorted list of files (relative to the base directory) that
+        were added, removed, or whose content changed since the signatures
+        were recorded
+
+    If a directory's modification time is the same as recorded, no files
+    were added to or removed from it, so we only check the size and
+    modification time of the recorded files instead of listing the
+    directory. Files are only hashed if their size or modification time
+    changed and their content hash was recorded.
+    """
+    recorded_directory_mtimes = (
+        {} if recorded_directory_mtimes is None else recorded_directory_mtimes
+    )
+    changed_files = []
+    for directory, recorded in recorded_signatures.items():
+        directory_path = os.path.join(base_directory, directory)
+        recorded_mtime = recorded_directory_mtimes.get(directory)
+        if (
+            recorded_mtime is not None
+            and get_directory_mtimes(base_directory, [directory])[directory]
+            == recorded_mtime
+        ):
+            changed_files += [
+                os.path.join(directory, f)
+                for f, signature in recorded.items()
+                if is_file_changed(os.path.join(directory_path, f), signature)
+            ]
+            continue
+
+        current = get_file_signatures(
+            directory_path, filename_filter=filename_filter, hash_content=False
+        )
+        for f in set(recorded) | set(current):
+            if (
+                f not in recorded
+                or f not in current
+                or is_file_changed(os.path.join(directory_path, f), recorded[f])
+            ):
+                changed_files.append(os.path.join(directory, f))
+
+    return sorted(changed_files)
+
+
+def is_file_changed(filepath, signature):
+    """
+    :param filepath: the file to check
+    :param signature: the recorded [size, modification time, content hash]
+        of the file
+    :return: whether the file's content differs from the recorded signature
+
+    If no content hash was recorded, a file whose size or modification time
+    differ is considered changed.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return True
+    if [stat.st_size, stat.st_mtime_ns] == signature[:2]:
+        return False
+    return (
+        stat.st_size != signature[0]
+        or signature[2] is None
+        or hash_file(filepath) != signature[2]
+    )
+
+
+def get_completed_subproblems(scenario_directory, scenario_directory_structure, quiet):
+    """
+    :param scenario_directory:
+    :param scenario_directory_structure:
+    :param quiet:
+    :return: set of the (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem) directories of the subproblems
+        that are checkpointed and don't need to be solved again
+
+    If the subproblems are linked, only the subproblems before the first
+    incomplete subproblem of each iteration are complete, as the following
+    subproblems of the iteration will be solved with new linked inputs.
+    Raise an exception if the inputs of a completed subproblem or the linked
+    state written for the first incomplete subproblem changed since they
+    were checkpointed. A checkpointed subproblem whose pass-through inputs
+    (written by its stages) changed is incomplete, as they are no longer
+    the ones its results were solved with.
+    """
+    manifests = read_checkpoints(scenario_directory)
+    linked = os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    )
+
+    completed_subproblems = set()
+    for weather_iteration in scenario_directory_structure.keys():
+        for hydro_iteration in scenario_directory_structure[weather_iteration].keys():
+            for availability_iteration in scenario_directory_structure[
+                weather_iteration
+            ][hydro_iteration].keys():
+                # Linked subproblems are linked within each iteration
+                previous_manifest = None
+                for subproblem in scenario_directory_structure[weather_iteration][
+                    hydro_iteration
+                ][availability_iteration].keys():
+                    key = (
+                        ensure_empty_string(weather_iteration),
+                        ensure_empty_string(hydro_iteration),
+                        ensure_empty_string(availability_iteration),
+                        subproblem,
+                    )
+                    if key in manifests and not check_inputs(
+                        scenario_directory, manifests[key], key, quiet
+                    ):
+                        del manifests[key]
+                    if key not in manifests:
+                        if linked:
+                            check_linked_state(
+                                scenario_directory, previous_manifest, key
+                            )
+                            break
+                        continue
+
+                    manifest = manifests[key]
+                    completed_subproblems.add(key)
+                    previous_manifest = manifest
+                    if not quiet:
+                        print(
+                            "Subproblem {} checkpointed on {}. Skipping "
+                            "solve.".format(
+                                "/".join([d for d in key if d != ""]),
+                                manifest["timestamp"],
+                            )
+                        )
+
+    return completed_subproblems
+
+
+def check_inputs(scenario_directory, manifest, key, quiet):
+    """
+    :return: whether the pass-through inputs of the checkpointed subproblem
+        are unchanged
+
+    Raise an exception if the inputs of the checkpointed subproblem changed.
+    """
+    changed_inputs = get_changed_files(
+        os.path.join(scenario_directory, *key),
+        manifest["inputs"],
+        recorded_directory_mtimes=manifest.get("inputs_directory_mtimes"),
+    )
+    if changed_inputs:
+        raise Exception(
+            "Inputs of checkpointed subproblem {} changed since "
+            "it was solved ({}). Cannot resume; re-run all "
+            "subproblems without --incomplete_only.".format(
+                "/".join([d for d in key if d != ""]),
+                ", ".join(changed_inputs),
+            )
+        )
+
+    changed_pass_through_inputs = get_changed_files(
+        scenario_directory, manifest["pass_through_state"]
+    )
+    if changed_pass_through_inputs and not quiet:
+        print(
+            "Pass-through inputs of checkpointed subproblem {} changed since "
+            "it was solved ({}). Solving again.".format(
+                "/".join([d for d in key if d != ""]),
+                ", ".join(changed_pass_through_inputs),
+            )
+        )
+
+    return not changed_pass_through_inputs
+
+
+def check_linked_state(scenario_directory, previous_manifest, key):
+    """
+    Raise an exception if the linked inputs that the previous (checkpointed)
+    subproblem wrote for the subproblem we are restarting at changed.
+    """
+    if previous_manifest is None:
+        return
+    changed_files = get_changed_files(
+        scenario_directory,
+        previous_manifest["linked_state"],
+        recorded_directory_mtimes=previous_manifest.get(
+            "linked_state_directory_mtimes"
+        ),
+        filename_filter=is_linked_file,
+    )
+    if changed_files:
+        raise Exception(
+            "Linked inputs for subproblem {} changed since the previous "
+            "subproblem was solved ({}). Cannot resume; re-run all "
+            "subproblems without --incomplete_only.".format(
+                "/".join([d for d in key if d != ""]), ", ".join(changed_files)
+            )
+        )
@@ -16,6 +16,19 @@ import os.path
 import pandas as pd
 
 from db.common_functions import spin_on_database_lock, spin_on_database_lock_generic
+from gridpath.common_functions import get_results_filepath
+
+# The number of rows of Parquet results files to import at a time
+RESULTS_BATCH_SIZE = 100000
+
+# The columns identifying the results imported for a single problem
+RESULTS_SUBSET_COLUMNS = [
+    "weather_iteration",
+    "hydro_iteration",
+    "availability_iteration",
+    "subproblem_id",
+    "stage_id",
+]
 
 
 def get_required_capacity_types_from_database(conn, scenario_id):
@@ -132,12 +145,15 @@ def import_csv(
     if not quiet:
         print(which_results)
 
-    results_filepath = os.path.join(results_directory, f"{which_results}.csv")
+    results_filepath = get_results_filepath(
+        results_directory=results_directory, which_results=which_results
+    )
     if not os.path.exists(results_filepath):
         if not quiet:
             print("...not found, skipping...")
-    else:
-        df = pd.read_csv(results_filepath)
+        return
+
+    for df in iterate_results_dfs(results_filepath=results_filepath):
         df["scenario_id"] = scenario_id
 
         # TODO: DB defaults need to be specified somewhere
@@ -169,8 +185,75 @@ def import_csv(
         )
 
 
+def iterate_results_dfs(results_filepath, batch_size=RESULTS_BATCH_SIZE):
+    """
+    :param results_filepath: the path to a Parquet or CSV results file
+    :param batch_size: the maximum number of rows of Parquet files to read at
+        a time
+    :return: generator of results dataframes
+
+    Parquet results files are read in batches of rows, so that large
+    results are imported without holding them in memory all at once. CSV
+    results files are read in full.
+    """
+    if results_filepath.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(results_filepath).iter_batches(
+            batch_size=batch_size
+        ):
+            yield batch.to_pandas()
+    else:
+        yield pd.read_csv(results_filepath)
+
+
+def get_results_subset_filter(
+    results_subset, columns=RESULTS_SUBSET_COLUMNS, table=None
+):
+    """
+    :param results_subset: list of (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem_id, stage_id) tuples or None
+    :param columns: the subset of RESULTS_SUBSET_COLUMNS to filter on
+    :param table: table name to qualify the columns with (optional)
+    :return: the SQL condition to append to a WHERE clause with the
+        scenario_id condition and its parameters
+
+    Results processing aggregations can be limited to the results imported
+    for some (iteration, subproblem, stage) combinations; aggregations that
+    sum over some of these dimensions (e.g. across iterations) filter only
+    on the remaining columns, so that the affected aggregates are fully
+    recomputed. If results_subset is None, there's no filter.
+    """
+    if results_subset is None:
+        return "", ()
+
+    column_indices = [RESULTS_SUBSET_COLUMNS.index(col) for col in columns]
+    values = sorted(
+        set(tuple(row[i] for i in column_indices) for row in results_subset)
+    )
+    if not values:
+        return "AND 0", ()
+
+    qualified_columns = ", ".join(
+        col if table is None else "{}.{}".format(table, col) for col in columns
+    )
+    row_placeholder = "({})".format(", ".join(["?"] * len(columns)))
+    condition = "AND ({}) IN (VALUES {})".format(
+        qualified_columns, ", ".join([row_placeholder] * len(values))
+    )
+
+    return condition, tuple(value for row in values for value in row)
+
+
 def update_prj_zone_column(
-    conn, scenario_id, subscenarios, subscenario, subsc_tbl, prj_tbl, col
+    conn,
+    scenario_id,
+    subscenarios,
+    subscenario,
+    subsc_tbl,
+    prj_tbl,
+    col,
+    results_subset=None,
 ):
     """
     :param conn:
@@ -179,6 +262,9 @@ def update_prj_zone_column(
     :param subscenario:
     :param prj_tbl:
     :param col:
+    :param results_subset: list of (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem_id, stage_id) tuples to update or
+        None to update all of the scenario's results
 
     Update a column of a project table based on the scenario's relevant
     subscenario ID.
@@ -194,16 +280,19 @@ def update_prj_zone_column(
         )
     ).fetchall()
 
+    subset_filter, subset_data = get_results_subset_filter(results_subset)
+
     updates = []
     for prj, zone in project_zones:
-        updates.append((zone, scenario_id, prj))
+        updates.append((zone, scenario_id, prj) + subset_data)
 
     sql = """
         UPDATE {}
         SET {} = ?
         WHERE scenario_id = ?
-        AND project = ?;
-        """.format(prj_tbl, col)
+        AND project = ?
+        {};
+        """.format(prj_tbl, col, subset_filter)
     spin_on_database_lock(conn=conn, cursor=c, sql=sql, data=updates)
 
 
@@ -224,8 +313,9 @@ def determine_table_subset_by_start_and_column(conn, tbl_start, cols):
     for tbl_tuple in all_tables:
         table = tbl_tuple[0]
         if table.startswith(tbl_start):
-            table_data_query = c.execute("""SELECT * FROM {};""".format(table))
-            column_names = [s[0] for s in table_data_query.description]
+            column_names = [
+                row[1] for row in c.execute("""PRAGMA table_info({});""".format(table))
+            ]
             if all(col in column_names for col in cols):
                 table_subset.append(table)
 
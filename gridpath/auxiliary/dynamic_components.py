@@ -68,6 +68,8 @@ fuel_burn_balance_components = "fuel_burn_balance_components"
 cost_components = "cost_components"
 revenue_components = "revenue_components"
 
+results_format = "results_format"
+
 
 class DynamicComponents(object):
     """
@@ -119,6 +121,12 @@ class DynamicComponents(object):
         setattr(self, reserve_variable_derate_params, dict())
         setattr(self, reserve_to_energy_adjustment_params, dict())
 
+        # ### Results ### #
+        # The format in which to write the consolidated results files ('csv'
+        # or 'parquet'); set from the --results_format argument when
+        # exporting results
+        setattr(self, results_format, "csv")
+
         # ### Transmission sets and variables ### #
         setattr(self, tx_capacity_type_operational_period_sets, list())
         setattr(self, tx_capacity_type_financial_period_sets, list())
@@ -15,6 +15,8 @@
 import os.path
 from pyomo.environ import value
 
+from gridpath.common_functions import get_results_filepath
+
 # Import-export rules
 
 
@@ -40,10 +42,14 @@ def export_rule_use(instance, quiet):
 
 def sys_lz_tmp_csv_based_rule(results_directory, quiet):
     """
-    Returns True if the results directory contains a system_load_zone_timepoint.csv file.
+    Returns True if the results directory contains a system_load_zone_timepoint
+    results file.
     """
     if os.path.exists(
-        os.path.join(results_directory, "system_load_zone_timepoint.csv")
+        get_results_filepath(
+            results_directory=results_directory,
+            which_results="system_load_zone_timepoint",
+        )
     ):
         import_results = True
         if not quiet:
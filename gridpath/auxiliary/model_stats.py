@@ -0,0 +1,227 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Model size and build-time statistics by component and GridPath module.
+
+If requested with *--model_stats*, we record which GridPath module declared
+each model component (see *create_abstract_model* in *run_scenario*) and
+how long Pyomo took to construct each component when creating the problem
+instance (from Pyomo's construction timing logger). We then write two CSV
+files to the results directory:
+
+* *model_stats.csv*: for every Set, Param, Var, Expression, and Constraint,
+  the GridPath module that declared it, its index set, the number of
+  indices (or of members for sets), the number of variables appearing in
+  it (nonzeros) for expressions and constraints, and its construction time
+* *model_stats_index_sets.csv*: the index sets of the model's components
+  ordered by size, along with the number of components indexed by each and
+  their total number of indices
+"""
+
+import csv
+import logging
+import os.path
+
+from pyomo.common.timing import ConstructionTimer
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.environ import Set, Param, Var, Expression, Constraint
+
+STATS_COMPONENT_TYPES = [Set, Param, Var, Expression, Constraint]
+
+CONSTRUCTION_LOGGER = logging.getLogger("pyomo.common.timing.construction")
+TIMING_LOGGER = logging.getLogger("pyomo.common.timing")
+
+
+class ConstructionTimeRecorder(logging.Handler):
+    """
+    Logging handler recording the construction time of each component from
+    the messages of Pyomo's construction timing logger. The times are only
+    recorded between start() and stop().
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.seconds = {}
+        self._previous_level = None
+        self._previous_propagate = None
+
+    def start(self):
+        self._previous_level = CONSTRUCTION_LOGGER.level
+        self._previous_propagate = CONSTRUCTION_LOGGER.propagate
+        # Don't print the timing messages unless the user requested so
+        # (via --report_timing)
+        if not TIMING_LOGGER.isEnabledFor(logging.INFO):
+            CONSTRUCTION_LOGGER.propagate = False
+        CONSTRUCTION_LOGGER.setLevel(logging.INFO)
+        CONSTRUCTION_LOGGER.addHandler(self)
+
+    def stop(self):
+        CONSTRUCTION_LOGGER.removeHandler(self)
+        CONSTRUCTION_LOGGER.setLevel(self._previous_level)
+        CONSTRUCTION_LOGGER.propagate = self._previous_propagate
+
+    def emit(self, record):
+        if isinstance(record.msg, ConstructionTimer):
+            name = record.msg.name
+            self.seconds[name] = self.seconds.get(name, 0) + record.msg.timer
+
+
+def count_nonzeros(expr):
+    """
+    :param expr: a Pyomo expression (or None)
+    :return: the number of distinct unfixed variables in the expression
+    """
+    if expr is None:
+        return 0
+    return sum(1 for _ in identify_variables(expr, include_fixed=False))
+
+
+def get_component_stats(instance, component_modules, construction_seconds):
+    """
+    :param instance: the problem instance
+    :param component_modules: dictionary of the GridPath module that
+        declared each component, by component name
+    :param construction_seconds: dictionary of construction times by
+        component name
+    :return: list of stats rows, one for each component
+    """
+    rows = []
+    for component in instance.component_objects(
+        ctype=STATS_COMPONENT_TYPES, descend_into=True
+    ):
+        component_type = component.ctype.__name__
+        if component.is_indexed():
+            # Anonymous index sets (e.g. set products) are labeled by their
+            # expression, e.g. PROJECTS*TMPS
+            index_set = str(component.index_set())
+        else:
+            index_set = None
+
+        if component.ctype is Set:
+            n_indices = (
+                sum(len(s) for s in component.values())
+                if component.is_indexed()
+                else len(component)
+            )
+        else:
+            n_indices = len(component)
+
+        if component.ctype is Constraint:
+            n_nonzeros = sum(count_nonzeros(c.body) for c in component.values())
+        elif component.ctype is Expression:
+            n_nonzeros = sum(count_nonzeros(e.expr) for e in component.values())
+        else:
+            n_nonzeros = None
+
+        rows.append(
+            [
+                component_modules.get(component.name),
+                component.name,
+                component_type,
+                index_set,
+                n_indices,
+                n_nonzeros,
+                construction_seconds.get(component.name),
+            ]
+        )
+
+    return rows
+
+
+def get_index_set_stats(instance, component_modules):
+    """
+    :param instance: the problem instance
+    :param component_modules: dictionary of the GridPath module that
+        declared each component, by component name
+    :return: list of stats rows, one for each index set, ordered by size
+        (largest first)
+    """
+    index_sets = {}
+    for component in instance.component_objects(
+        ctype=STATS_COMPONENT_TYPES, descend_into=True
+    ):
+        if not component.is_indexed():
+            continue
+        index_set = component.index_set()
+        label = str(index_set)
+        if label not in index_sets:
+            # Anonymous index sets are attributed to the module of the first
+            # component indexed by them
+            index_sets[label] = [
+                component_modules.get(label, component_modules.get(component.name)),
+                label,
+                index_set.dimen,
+                len(index_set) if index_set.isfinite() else None,
+                0,
+                0,
+            ]
+        index_sets[label][4] += 1
+        index_sets[label][5] += len(component)
+
+    return sorted(
+        index_sets.values(),
+        key=lambda row: (-1 if row[3] is None else row[3], row[5]),
+        reverse=True,
+    )
+
+
+def write_model_stats(
+    instance, component_modules, construction_seconds, results_directory
+):
+    """
+    :param instance: the problem instance
+    :param component_modules: dictionary of the GridPath module that
+        declared each component, by component name
+    :param construction_seconds: dictionary of construction times by
+        component name
+    :param results_directory: the directory to write the CSV files to
+
+    Write the component and index set statistics CSV files.
+    """
+    if not os.path.exists(results_directory):
+        os.makedirs(results_directory)
+
+    with open(os.path.join(results_directory, "model_stats.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "module",
+                "component",
+                "component_type",
+                "index_set",
+                "n_indices",
+                "n_nonzeros",
+                "construction_seconds",
+            ]
+        )
+        writer.writerows(
+            get_component_stats(instance, component_modules, construction_seconds)
+        )
+
+    with open(
+        os.path.join(results_directory, "model_stats_index_sets.csv"), "w", newline=""
+    ) as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "module",
+                "index_set",
+                "dimension",
+                "size",
+                "n_indexed_components",
+                "n_component_indices",
+            ]
+        )
+        writer.writerows(get_index_set_stats(instance, component_modules))
@@ -26,6 +26,7 @@ from importlib import import_module
 import os.path
 import pandas as pd
 import sys
+import time
 import traceback
 
 from gridpath.auxiliary.auxiliary import check_for_integer_subdirectories
@@ -628,9 +629,10 @@ def determine_modules(
         function will look for the 'features' input parameter
     :param multi_stage: Boolean. Optional input that determines whether the
         modules that fix variables are used (yes if True, no if False); if not
-        specified, this function will check the scenario_directory to
-        determine whether there are stage subdirectories (if there are not,
-        the 'fix variables' modules are removed).
+        specified, this function will check the multi_stage_flag.txt file in
+        the scenario_directory or, if the file doesn't exist, whether there
+        are stage subdirectories (if there are not, the 'fix variables'
+        modules are removed).
     :return: the list of modules -- a subset of all GridPath modules -- needed
         for a scenario. These are the module names, not the actual modules.
 
@@ -678,7 +680,15 @@ def determine_modules(
     # modules_to_use list if not
     # Also remove the "fix variables modules" if the multi_stage argument is False
     remove_fix_variable_modules = False
-    if multi_stage is None:
+    if multi_stage is None and os.path.exists(
+        os.path.join(scenario_directory, "multi_stage_flag.txt")
+    ):
+        # The multi-stage flag file is written when getting the scenario
+        # inputs, so we can use it instead of looking through the
+        # subproblem directories for stages
+        with open(os.path.join(scenario_directory, "multi_stage_flag.txt")) as f:
+            remove_fix_variable_modules = f.read().strip() != "True"
+    elif multi_stage is None:
         subproblems = check_for_integer_subdirectories(scenario_directory)
         # Check if we have subproblems
         if subproblems:
@@ -747,16 +757,22 @@ def determine_modules(
     return modules_to_use
 
 
-def load_modules(modules_to_use):
+def load_modules(modules_to_use, profile_startup=False):
     """
     :param modules_to_use: a list of the names of the modules to use
+    :param profile_startup: boolean; whether to print the time it took to
+        import each module
     :return: list of imported modules (Python <class 'module'> objects)
 
     Load the requested modules and return them as a list of Python module
-    objects.
+    objects. Only the modules in the list are imported. A module's import
+    time includes the time to import any dependencies not already imported
+    by the script or by a module earlier in the list.
     """
     loaded_modules = list()
+    import_times = list()
     for m in modules_to_use:
+        start_time = time.perf_counter()
         try:
             imported_module = import_module("." + m, package="gridpath")
             loaded_modules.append(imported_module)
@@ -764,5 +780,25 @@ def load_modules(modules_to_use):
             print("ERROR! Unable to import module " + str(m) + ".")
             traceback.print_exc()
             sys.exit(1)
+        import_times.append((m, time.perf_counter() - start_time))
+
+    if profile_startup:
+        print_import_times(import_times=import_times)
 
     return loaded_modules
+
+
+def print_import_times(import_times):
+    """
+    :param import_times: list of (module name, import time in seconds) tuples
+
+    Print the module import times, slowest first, and the total.
+    """
+    print("Module import times (seconds):")
+    for m, seconds in sorted(import_times, key=lambda x: x[1], reverse=True):
+        print("{:>8.3f}  {}".format(seconds, m))
+    print(
+        "{:>8.3f}  total ({} modules)".format(
+            sum(seconds for m, seconds in import_times), len(import_times)
+        )
+    )
@@ -17,7 +17,6 @@
 Scenario characteristics in database.
 """
 
-import copy
 import os.path
 import pandas as pd
 from pathlib import Path
@@ -466,62 +465,57 @@ def get_scenario_structure_from_disk(scenario_directory):
     # First, reverse engineer the directory structure that was sent to the
     # scenario
     # We need empty strings for layers that do not exist
-    # We'll start with what we got from disk
-    dir_structure_start = copy.deepcopy(dir_structure_from_disk)
+    # The nested dictionary from disk is not used anywhere else, so we add the
+    # missing levels around it (and modify it below) without copying it; the
+    # flags and the depth of the structure from disk are determined before
+    # we do so
+    weather_iteration_flag = check_dict_key_for_string_recursive(
+        dir_structure_from_disk, "weather_iteration_"
+    )
+    hydro_iteration_flag = check_dict_key_for_string_recursive(
+        dir_structure_from_disk, "hydro_iteration_"
+    )
+    availability_iteration_flag = check_dict_key_for_string_recursive(
+        dir_structure_from_disk, "availability_iteration_"
+    )
+    dir_structure_depth = get_dictionary_depth(dir_structure_from_disk) - 1
 
     # Check if we have a weather iteration level; if we don't, add the level
     # with a single key weather_iteration_0
-    if not check_dict_key_for_string_recursive(
-        dir_structure_from_disk, "weather_iteration_"
-    ):
-        weather_iteration_flag = False
-        dir_structure_w_weather = {
-            "weather_iteration_0": copy.deepcopy(dir_structure_start)
-        }
+    if not weather_iteration_flag:
+        dir_structure_w_weather = {"weather_iteration_0": dir_structure_from_disk}
     else:
-        weather_iteration_flag = True
-        dir_structure_w_weather = copy.deepcopy(dir_structure_start)
+        dir_structure_w_weather = dir_structure_from_disk
 
     # Check if we have a hydro iteration level; if we don't, add the level
     # with a single hydro_iteration_0 under each weather iteration key
-    if not check_dict_key_for_string_recursive(
-        dir_structure_from_disk, "hydro_iteration_"
-    ):
-        hydro_iteration_flag = False
+    if not hydro_iteration_flag:
         dir_structure_w_weather_hydro = {}
         for w in dir_structure_w_weather.keys():
-            dir_structure_w_weather_hydro[w] = {}
-            dir_structure_w_weather_hydro[w]["hydro_iteration_0"] = copy.deepcopy(
-                dir_structure_w_weather
-            )[w]
+            dir_structure_w_weather_hydro[w] = {
+                "hydro_iteration_0": dir_structure_w_weather[w]
+            }
     else:
-        hydro_iteration_flag = True
-        dir_structure_w_weather_hydro = copy.deepcopy(dir_structure_w_weather)
+        dir_structure_w_weather_hydro = dir_structure_w_weather
 
     # Check if we have an availability iteration level; if we don't, add the level
     # with a single availability_iteration_0 under each weather/hydro iteration
     # key
-    if not check_dict_key_for_string_recursive(
-        dir_structure_from_disk, "availability_iteration_"
-    ):
-        availability_iteration_flag = False
+    if not availability_iteration_flag:
         dir_structure_w_weather_hydro_av = {}
         for w in dir_structure_w_weather_hydro.keys():
             dir_structure_w_weather_hydro_av[w] = {}
             for h in dir_structure_w_weather_hydro[w].keys():
-                dir_structure_w_weather_hydro_av[w][h] = {}
-                dir_structure_w_weather_hydro_av[w][h]["availability_iteration_0"] = (
-                    copy.deepcopy(dir_structure_w_weather_hydro[w][h])
-                )
+                dir_structure_w_weather_hydro_av[w][h] = {
+                    "availability_iteration_0": dir_structure_w_weather_hydro[w][h]
+                }
     else:
-        availability_iteration_flag = True
-        dir_structure_w_weather_hydro_av = copy.deepcopy(dir_structure_w_weather_hydro)
+        dir_structure_w_weather_hydro_av = dir_structure_w_weather_hydro
 
     # Iteration layers
     iteration_layers_n = sum(
         [weather_iteration_flag, hydro_iteration_flag, availability_iteration_flag]
     )
-    dir_structure_depth = get_dictionary_depth(dir_structure_from_disk) - 1
     non_iteration_layers_n = dir_structure_depth - iteration_layers_n
 
     # Finally, figure out the subproblem/stage structure from the non-iteration
@@ -739,20 +733,33 @@ def dir_to_nested_dict(
     result = {}
 
     # Iterate through items in the directory
-    for item in sorted(path.iterdir()):
+    # We use os.scandir, as the directory entries it returns cache whether
+    # they are directories, so we don't need to stat every item (this makes
+    # a big difference for large scenario directories, especially on
+    # network storage)
+    with os.scandir(path) as items:
         # Only process directories, skip files
         # Only add directories that are integers or start with one of
         # weather_iteration_, hydro_iteration_, or availability_iteration_
-        if item.is_dir() and (
-            str(item.name).isdigit()
-            or str(item.name).startswith("weather_iteration_")
-            or str(item.name).startswith("hydro_iteration_")
-            or str(item.name).startswith("availability_iteration_")
-        ):
-            # Recursively process subdirectories
-            subdirs = dir_to_nested_dict(item, current_level + 1, max_level)
-            # If subdirectory has no subdirs, use empty dict
-            result[item.name] = subdirs if subdirs else {}
+        subdirectories = sorted(
+            item.name
+            for item in items
+            if (
+                item.name.isdigit()
+                or item.name.startswith("weather_iteration_")
+                or item.name.startswith("hydro_iteration_")
+                or item.name.startswith("availability_iteration_")
+            )
+            and item.is_dir()
+        )
+
+    for name in subdirectories:
+        # Recursively process subdirectories
+        subdirs = dir_to_nested_dict(
+            os.path.join(path, name), current_level + 1, max_level
+        )
+        # If subdirectory has no subdirs, use empty dict
+        result[name] = subdirs if subdirs else {}
 
     return result
 
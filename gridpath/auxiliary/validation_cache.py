@@ -0,0 +1,502 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fingerprint-based caching of input validation results.
+
+While a module's *validate_inputs()* method runs, we record which database
+tables and columns it reads (via a SQLite authorizer callback). The
+validation outcome is then stored in the *status_validation_cache* table
+along with a fingerprint of the content of those tables (filtered by the
+subscenario IDs of the scenario being validated) and of the module source.
+If a later validation (of the same or of a different scenario) finds the
+same fingerprint, the stored outcome is replayed instead of re-running the
+module's validation.
+
+The table reads also tell us which of the iteration/subproblem/stage
+coordinates a module's validation depends on: a module that never reads
+e.g. the *weather_iteration* column can't produce different results for
+different weather iterations, so it only needs to be run once for all of
+them.
+"""
+
+import datetime
+import hashlib
+import importlib
+import inspect
+import json
+import sqlite3
+
+from db.common_functions import spin_on_database_lock
+
+# The columns through which a module's inputs can vary by the coordinate
+# passed to validate_inputs(); the order is that of the coordinate tuples
+# (weather_iteration, hydro_iteration, availability_iteration, subproblem,
+# stage)
+COORDINATE_COLUMNS = [
+    "weather_iteration",
+    "hydro_iteration",
+    "availability_iteration",
+    "subproblem_id",
+    "stage_id",
+]
+
+# Tables whose reads are not inputs to the validation
+IGNORED_TABLES = ["status_validation", "status_validation_cache"]
+
+# Shared helper modules whose source is part of every module's fingerprint
+# (in addition to the GridPath modules the validated module imports from)
+VALIDATION_HELPER_MODULES = [
+    "db.common_functions",
+    "gridpath.auxiliary.auxiliary",
+    "gridpath.auxiliary.db_interface",
+    "gridpath.auxiliary.validations",
+    "gridpath.common_functions",
+]
+SOURCE_PACKAGES = ["db", "gridpath"]
+
+
+class TableReadRecorder(object):
+    """
+    SQLite authorizer callback that records the columns read in each table.
+    Connections using this should be created with cached_statements=0, as
+    the authorizer is only invoked when a statement is prepared. Reads are
+    only recorded between start() and stop().
+    """
+
+    def __init__(self):
+        self.columns_by_table = {}
+        self.active = False
+
+    def start(self):
+        self.columns_by_table = {}
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def __call__(self, action, arg1, arg2, db_name, trigger_or_view):
+        if (
+            self.active
+            and action == sqlite3.SQLITE_READ
+            and arg1 not in IGNORED_TABLES
+            and not arg1.startswith("sqlite_")
+        ):
+            if arg1 not in self.columns_by_table.keys():
+                self.columns_by_table[arg1] = set()
+            if arg2:
+                self.columns_by_table[arg1].add(arg2)
+
+        return sqlite3.SQLITE_OK
+
+    def coordinate_dimensions(self):
+        """
+        :return: sorted list of the indices of the coordinate columns read
+        """
+        columns_read = set().union(*self.columns_by_table.values())
+        return [i for i, col in enumerate(COORDINATE_COLUMNS) if col in columns_read]
+
+    def tables(self):
+        """
+        :return: dictionary of sorted lists of the columns read by table
+        """
+        return {
+            table: sorted(columns)
+            for table, columns in sorted(self.columns_by_table.items())
+        }
+
+
+def get_subscenario_filters(table_columns, scenario_id, subscenarios):
+    """
+    :param table_columns: list of the table's columns
+    :param scenario_id: int, the scenario ID
+    :param subscenarios: SubScenarios object
+    :return: dictionary of {column: value} to filter the table by
+
+    Determine how to filter a table down to the data relevant for the
+    scenario: by the scenario_id if the table has that column and by any
+    other subscenario ID column that is specified for the scenario.
+    """
+    filters = {}
+    for column in table_columns:
+        if column == "scenario_id":
+            filters[column] = scenario_id
+        elif column.endswith("_scenario_id"):
+            value = getattr(subscenarios, column.upper(), None)
+            if value not in [None, "NULL"]:
+                filters[column] = value
+
+    return filters
+
+
+def get_table_fingerprint(conn, table, columns, filters):
+    """
+    :param conn: database connection
+    :param table: str, the table name
+    :param columns: list of columns to include in the fingerprint
+    :param filters: dictionary of {column: value or list of values} to
+        filter the table by
+    :return: str, the fingerprint
+
+    Hash the content of the requested columns of the filtered table. The
+    scenario_id column is only used for filtering, so that scenarios with
+    identical inputs have the same fingerprint.
+    """
+    columns = [c for c in columns if c != "scenario_id"]
+    select = ", ".join(columns) if columns else "1"
+    conditions = []
+    values = []
+    for col, value in filters.items():
+        if isinstance(value, list):
+            conditions.append("{} IN ({})".format(col, ", ".join("?" for v in value)))
+            values += value
+        else:
+            conditions.append(f"{col} = ?")
+            values.append(value)
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+    n_rows = 0
+    table_hash = hashlib.sha1()
+    cursor = conn.execute(f"SELECT {select} FROM {table} {where};", tuple(values))
+    while True:
+        rows = cursor.fetchmany(10000)
+        if not rows:
+            break
+        n_rows += len(rows)
+        table_hash.update(repr(rows).encode())
+
+    return "{}:{}".format(n_rows, table_hash.hexdigest())
+
+
+class FingerprintCalculator(object):
+    """
+    Calculate and memoize table fingerprints for a scenario, so that each
+    (table, columns, filters) combination is only hashed once per
+    validation run.
+    """
+
+    def __init__(self, conn, scenario_id, subscenarios):
+        self.conn = conn
+        self.scenario_id = scenario_id
+        self.subscenarios = subscenarios
+        self._table_columns = {}
+        self._scenario_filters = {}
+        self._derived_filters = {}
+        self._table_fingerprints = {}
+        self._source_fingerprints = {}
+        self._file_hashes = {}
+
+    def table_columns(self, table):
+        if table not in self._table_columns.keys():
+            self._table_columns[table] = [
+                r[1] for r in self.conn.execute(f"PRAGMA table_info({table});")
+            ]
+            if not self._table_columns[table]:
+                raise sqlite3.OperationalError(f"no such table: {table}")
+
+        return self._table_columns[table]
+
+    def scenario_filters(self, table):
+        if table not in self._scenario_filters.keys():
+            self._scenario_filters[table] = get_subscenario_filters(
+                table_columns=self.table_columns(table),
+                scenario_id=self.scenario_id,
+                subscenarios=self.subscenarios,
+            )
+
+        return self._scenario_filters[table]
+
+    def filters(self, table, tables):
+        """
+        :param table: str, the table name
+        :param tables: the other tables read
+        :return: dictionary of {column: value or list of values}
+
+        In addition to the scenario-level subscenario IDs, filter by
+        subscenario IDs that are not specified for the scenario but are
+        looked up in another table that was read (e.g. the variable
+        generator profile scenario IDs in the project operational
+        characteristics table).
+        """
+        filters = dict(self.scenario_filters(table))
+        for column in self.table_columns(table):
+            if column.endswith("_scenario_id") and column not in filters.keys():
+                for other_table in tables:
+                    if (
+                        other_table != table
+                        and self.scenario_filters(other_table)
+                        and column in self.table_columns(other_table)
+                    ):
+                        filters[column] = self.derived_filter(other_table, column)
+                        break
+
+        return filters
+
+    def derived_filter(self, table, column):
+        key = (table, column)
+        if key not in self._derived_filters.keys():
+            filters = self.scenario_filters(table)
+            where = " AND ".join(f"{col} = ?" for col in filters.keys())
+            self._derived_filters[key] = sorted(
+                [
+                    r[0]
+                    for r in self.conn.execute(
+                        f"""SELECT DISTINCT {column} FROM {table} 
+                        WHERE {where} AND {column} IS NOT NULL;""",
+                        tuple(filters.values()),
+                    )
+                ],
+                key=str,
+            )
+
+        return self._derived_filters[key]
+
+    def table_fingerprint(self, table, columns, filters):
+        key = (table, tuple(columns), json.dumps(filters, sort_keys=True, default=str))
+        if key not in self._table_fingerprints.keys():
+            self._table_fingerprints[key] = get_table_fingerprint(
+                conn=self.conn, table=table, columns=columns, filters=filters
+            )
+
+        return self._table_fingerprints[key]
+
+    def file_hash(self, filename):
+        if filename not in self._file_hashes.keys():
+            with open(filename, "rb") as f:
+                self._file_hashes[filename] = hashlib.sha1(f.read()).hexdigest()
+
+        return self._file_hashes[filename]
+
+    def source_fingerprint(self, loaded_module):
+        """
+        :param loaded_module: the imported module
+        :return: hash of the source of the module, of the GridPath modules
+            it imports from, and of the shared validation helpers
+        """
+        name = loaded_module.__name__
+        if name not in self._source_fingerprints.keys():
+            source_files = {
+                importlib.import_module(helper).__file__
+                for helper in VALIDATION_HELPER_MODULES
+            }
+            source_files.add(loaded_module.__file__)
+            for obj in vars(loaded_module).values():
+                source_module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+                if (
+                    source_module is not None
+                    and source_module.__name__.split(".")[0] in SOURCE_PACKAGES
+                    and getattr(source_module, "__file__", None) is not None
+                ):
+                    source_files.add(source_module.__file__)
+
+            self._source_fingerprints[name] = hashlib.sha1(
+                json.dumps(
+                    [self.file_hash(filename) for filename in sorted(source_files)]
+                ).encode()
+            ).hexdigest()
+
+        return self._source_fingerprints[name]
+
+    def fingerprint(self, loaded_module, tables):
+        """
+        :param loaded_module: the imported module
+        :param tables: dictionary of the columns read by table
+        :return: tuple of the subscenario IDs the tables were filtered by
+            (dictionary by table) and the overall fingerprint
+        """
+        subscenario_ids = {}
+        table_fingerprints = {}
+        for table, columns in tables.items():
+            try:
+                filters = self.filters(table=table, tables=tables.keys())
+                table_fingerprints[table] = self.table_fingerprint(
+                    table=table, columns=columns, filters=filters
+                )
+            except sqlite3.OperationalError:
+                # Table or column no longer exists, so can't match
+                return None, None
+            subscenario_ids[table] = filters
+
+        fingerprint = hashlib.sha1(
+            json.dumps(
+                [self.source_fingerprint(loaded_module), table_fingerprints],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+        return subscenario_ids, fingerprint
+
+
+def project_coordinate(coordinate, dimensions):
+    """
+    :param coordinate: tuple (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem, stage)
+    :param dimensions: list of indices of the coordinate elements to keep
+    :return: JSON string of {coordinate column: value} for the kept elements
+    """
+    return json.dumps(
+        {COORDINATE_COLUMNS[i]: str(coordinate[i]) for i in dimensions},
+        sort_keys=True,
+    )
+
+
+def coordinate_dimensions_from_projection(projection):
+    """
+    :param projection: JSON string returned by project_coordinate
+    :return: sorted list of indices of the coordinate elements in it
+    """
+    return sorted(COORDINATE_COLUMNS.index(col) for col in json.loads(projection))
+
+
+def generalize_validation_rows(rows, coordinate):
+    """
+    :param rows: list of (subproblem_id, stage_id, gridpath_module, db_table,
+        severity, description) tuples written by a module's validation
+    :param coordinate: the coordinate the validation was run for
+    :return: list of lists in which the subproblem and stage IDs are None if
+        they are the ones of the coordinate
+
+    Make validation rows reusable for other coordinates.
+    """
+    generalized_rows = []
+    for row in rows:
+        subproblem_id, stage_id = row[0], row[1]
+        generalized_rows.append(
+            [
+                None if str(subproblem_id) == str(coordinate[3]) else subproblem_id,
+                None if str(stage_id) == str(coordinate[4]) else stage_id,
+            ]
+            + list(row[2:])
+        )
+
+    return generalized_rows
+
+
+def specialize_validation_rows(generalized_rows, scenario_id, coordinate):
+    """
+    :param generalized_rows: rows returned by generalize_validation_rows
+    :param scenario_id: int, the scenario ID to write the rows for
+    :param coordinate: the coordinate to write the rows for
+    :return: list of status_validation rows (without the timestamp)
+    """
+    return [
+        (
+            scenario_id,
+            coordinate[3] if row[0] is None else row[0],
+            coordinate[4] if row[1] is None else row[1],
+        )
+        + tuple(row[2:])
+        for row in generalized_rows
+    ]
+
+
+def validation_cache_exists(conn):
+    """
+    :param conn: database connection
+    :return: boolean, whether the database has a status_validation_cache
+        table (databases created with older GridPath versions don't)
+    """
+    return bool(conn.execute("""SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name = 'status_validation_cache';""").fetchall())
+
+
+def get_cached_validations(conn, gridpath_module):
+    """
+    :param conn: database connection
+    :param gridpath_module: str, the module name
+    :return: list of (coordinates, db_tables, fingerprint, validation_rows)
+        tuples with the JSON columns decoded
+    """
+    cached = conn.execute(
+        """SELECT coordinates, db_tables, fingerprint, validation_errors
+        FROM status_validation_cache
+        WHERE gridpath_module = ?;""",
+        (gridpath_module,),
+    ).fetchall()
+
+    return [
+        (coordinates, json.loads(db_tables), fingerprint, json.loads(errors))
+        for coordinates, db_tables, fingerprint, errors in cached
+    ]
+
+
+def write_validations_to_cache(conn, cache_rows):
+    """
+    :param conn: database connection
+    :param cache_rows: list of (gridpath_module, coordinates, db_tables,
+        subscenario_ids, fingerprint, validation_rows) tuples
+    :return:
+    """
+    if not cache_rows:
+        return
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    data = [
+        (
+            gridpath_module,
+            coordinates,
+            json.dumps(db_tables, sort_keys=True),
+            json.dumps(subscenario_ids, sort_keys=True, default=str),
+            fingerprint,
+            json.dumps(validation_rows, default=str),
+            timestamp,
+        )
+        for (
+            gridpath_module,
+            coordinates,
+            db_tables,
+            subscenario_ids,
+            fingerprint,
+            validation_rows,
+        ) in cache_rows
+    ]
+    sql = """
+        INSERT OR REPLACE INTO status_validation_cache
+        (gridpath_module, coordinates, db_tables, subscenario_ids, fingerprint,
+        validation_errors, time_stamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+        """
+    spin_on_database_lock(
+        conn=conn, cursor=conn.cursor(), sql=sql, data=data, commit_immediately=True
+    )
+
+
+def write_validation_rows_to_database(conn, rows):
+    """
+    :param conn: database connection
+    :param rows: list of (scenario_id, subproblem_id, stage_id,
+        gridpath_module, db_table, severity, description) tuples
+    :return:
+
+    Write validation rows (e.g. replayed from the cache) to the
+    status_validation table.
+    """
+    if not rows:
+        return
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    sql = """
+        INSERT INTO status_validation
+        (scenario_id, subproblem_id, stage_id, 
+        gridpath_module, db_table, severity, description, time_stamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+        """
+    spin_on_database_lock(
+        conn=conn,
+        cursor=conn.cursor(),
+        sql=sql,
+        data=[tuple(row) + (timestamp,) for row in rows],
+        commit_immediately=True,
+    )
@@ -13,7 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+from contextlib import contextmanager
+import logging
+import logging.handlers
 import os.path
+import queue
 import sys
 import warnings
 
@@ -86,6 +91,13 @@ def get_required_e2e_arguments_parser():
         action="store_true",
         help="Print extra output, e.g. current module info.",
     )
+    parser.add_argument(
+        "--profile_startup",
+        default=False,
+        action="store_true",
+        help="Print the time it takes to import each GridPath module the "
+        "scenario uses.",
+    )
 
     return parser
 
@@ -178,6 +190,15 @@ def get_get_inputs_parser():
         default=1,
         help="Get inputs for n subproblems in parallel.",
     )
+    parser.add_argument(
+        "--bulk_write_inputs",
+        default=False,
+        action="store_true",
+        help="Get the inputs of the modules that support it (e.g. "
+        "variable generator profiles) for all iterations, subproblems, and "
+        "stages with a single database query instead of one query per "
+        "iteration/subproblem/stage.",
+    )
 
     return parser
 
@@ -254,6 +275,23 @@ def get_run_scenario_parser():
         action="store_true",
         help="Don't print solver output.",
     )
+    parser.add_argument(
+        "--duals",
+        default="all",
+        choices=["all", "declared", "none"],
+        help="Which constraint duals to get from the solver: 'all' (the "
+        "default), 'declared' to only load the duals of the constraints "
+        "whose duals modules save when loading a solution file (solver "
+        "plugins return all duals), or 'none' to not ask the solver for "
+        "duals (the dual results will be empty).",
+    )
+    parser.add_argument(
+        "--log_solver_output_to_file_only",
+        default=False,
+        action="store_true",
+        help="When logging, write the solver output only to the log file "
+        "and not to the terminal.",
+    )
     parser.add_argument(
         "--write_solver_files_to_logs_dir",
         default=False,
@@ -277,6 +315,15 @@ def get_run_scenario_parser():
         default=False,
         action="store_true",
     )
+    parser.add_argument(
+        "--model_stats",
+        default=False,
+        action="store_true",
+        help="Write the size (number of indices and nonzeros) and "
+        "construction time of each model component, along with the module "
+        "that added it, and the sizes of the model's index sets to CSV files "
+        "in the results directory.",
+    )
     # Flag for test runs (various changes in behavior)
     parser.add_argument(
         "--testing",
@@ -291,6 +338,24 @@ def get_run_scenario_parser():
         default=1,
         help="Solve n subproblems in parallel.",
     )
+    parser.add_argument(
+        "--results_format",
+        default="csv",
+        choices=["csv", "parquet"],
+        help="The format of the consolidated project, transmission, and load "
+        "zone results files: 'csv' (the default) or 'parquet' (compressed, "
+        "with typed columns; requires the pyarrow package).",
+    )
+    parser.add_argument(
+        "--pipeline_depth",
+        default=0,
+        type=int,
+        help="When solving subproblems sequentially, save the results of up "
+        "to this many solved subproblems on a background thread while the "
+        "next subproblem is created and solved. Not used for linked "
+        "subproblems or with --log. Defaults to 0 (results are saved before "
+        "the next subproblem is created).",
+    )
 
     # Solve only incomplete subproblems
     parser.add_argument(
@@ -298,8 +363,18 @@ def get_run_scenario_parser():
         default=False,
         action="store_true",
         help="Solve only incomplete subproblems, i.e. do no re-solve if "
-        "results are found. The subproblem is assumed complete if the"
-        "termination_condition.txt file is found.",
+        "results are found. A subproblem is complete if it has a "
+        "checkpoint (written after all of its stages are solved); refuse "
+        "to resume if its inputs changed since.",
+    )
+    parser.add_argument(
+        "--hash_checkpoint_inputs",
+        default=False,
+        action="store_true",
+        help="Record the content hash of the input files in the subproblem "
+        "checkpoints, so that input files written again with the same "
+        "content don't prevent resuming with --incomplete_only. By default, "
+        "only the size and modification time of the files are recorded.",
     )
 
     # Results export rule name
@@ -338,6 +413,14 @@ def get_import_results_parser():
         "for subproblems before all other subproblems have been solved. "
         "Proceed with caution.",
     )
+    parser.add_argument(
+        "--scenario_results_database",
+        default=False,
+        action="store_true",
+        help="Import the scenario's results into a separate results database "
+        "next to the database instead of into the database's results tables. "
+        "Re-importing the scenario replaces its results database.",
+    )
 
     return parser
 
@@ -381,15 +464,23 @@ class Logging(object):
     """
     Log output to both standard output and a log file. This will be
     accomplished by assigning this class to sys.stdout.
+
+    Messages are put on a queue and written to the log file by a background
+    thread (via a logging QueueListener), so that writing output (e.g. the
+    solver output when the solver is run with tee=True) doesn't block on the
+    disk. Set the *echo* attribute to False (or use *echo_off*) to write
+    messages only to the log file and not to the terminal.
     """
 
-    def __init__(self, logs_dir, start_time, e2e, process_id):
+    def __init__(self, logs_dir, start_time, e2e, process_id, echo=True):
         """
         Assign sys.stdout and a log file as output destinations
 
         :param logs_dir:
+        :param echo: boolean; whether to also write messages to the terminal
         """
         self.terminal = sys.stdout
+        self.echo = echo
 
         # If logging only run_scenario, print to a file starting with opt_
         # and the datetime
@@ -407,7 +498,20 @@ class Logging(object):
                 ),
             )
 
-        self.log_file = open(self.log_file_path, "a", buffering=1)
+        # Messages are written as they are, i.e. without a formatter and
+        # terminator, as they already include any line breaks
+        self.log_file_handler = logging.FileHandler(self.log_file_path, mode="a")
+        self.log_file_handler.terminator = ""
+        self.log_queue = queue.SimpleQueue()
+        self.log_listener = logging.handlers.QueueListener(
+            self.log_queue, self.log_file_handler
+        )
+        self.log_listener.start()
+        self.log_file_closed = False
+
+        # The listener thread is a daemon thread, so make sure the queue is
+        # written to the log file if we exit before closing the logger
+        atexit.register(self.close)
 
     def __getattr__(self, attr):
         """
@@ -427,39 +531,44 @@ class Logging(object):
         :param message:
         :return:
         """
-        self.terminal.write(message)
-        self.log_file.write(message)
-
-        # Find a print statement
-        # import collections
-        # import inspect
-
-        # if message.strip():
-        #     Record = collections.namedtuple(
-        #         'Record',
-        #         'frame filename line_number function_name lines index')
-        #
-        #     record = Record(*inspect.getouterframes(inspect.currentframe())[1])
-        #     self.terminal.write(
-        #         '{f} {n}: '.format(f=record.filename, n=record.line_number))
-        # self.terminal.write(message)
+        if self.echo:
+            self.terminal.write(message)
+        self.log_queue.put(logging.makeLogRecord({"msg": message}))
 
     def flush(self):
         """
-        Flush both the terminal and the log file
+        Flush the terminal; messages are written to the log file by the
+        queue listener
 
         :return:
         """
         self.terminal.flush()
-        self.log_file.flush()
+
+    @contextmanager
+    def echo_off(self):
+        """
+        Write messages only to the log file within the context; the echo
+        setting is restored on exit, including if an exception is raised
+        (e.g. by the solver)
+        """
+        echo_original = self.echo
+        self.echo = False
+        try:
+            yield self
+        finally:
+            self.echo = echo_original
 
     def close(self):
         """
-        Close the log file to release the file descriptor.
+        Write any remaining messages and close the log file to release the
+        file descriptor.
         Critical for preventing "too many open files" errors.
         """
-        if hasattr(self, "log_file") and self.log_file and not self.log_file.closed:
-            self.log_file.close()
+        if not self.__dict__.get("log_file_closed", True):
+            self.log_listener.stop()
+            self.log_file_handler.close()
+            atexit.unregister(self.close)
+            self.log_file_closed = True
 
     def __del__(self):
         """
@@ -498,6 +607,80 @@ def create_results_df(index_columns, results_columns, data):
     return df
 
 
+def release_results_dfs(d, *df_names):
+    """
+    :param d: the dynamic components class
+    :param df_names: the names of the results dataframe attributes
+
+    Remove results dataframes from the dynamic components once their
+    consolidated results have been written, so that their memory can be
+    freed while the remaining results are exported.
+    """
+    for df_name in df_names:
+        if hasattr(d, df_name):
+            delattr(d, df_name)
+
+
+def write_results_df(df, results_directory, which_results, results_format="csv"):
+    """
+    :param df: the results dataframe; the index is written as columns
+    :param results_directory: the directory to write the results file to
+    :param which_results: the name of the results file without extension
+    :param results_format: 'csv' or 'parquet'
+
+    Write a results dataframe to a CSV file or, with the 'parquet' results
+    format, to a compressed Parquet file with typed columns (this requires
+    the pyarrow package). The results file in the other format written by a
+    prior run is removed, so that stale results are never read.
+    """
+    csv_filepath = os.path.join(results_directory, f"{which_results}.csv")
+    parquet_filepath = os.path.join(results_directory, f"{which_results}.parquet")
+    if results_format == "parquet":
+        df.reset_index().to_parquet(
+            parquet_filepath,
+            index=False,
+            compression="zstd",
+        )
+        stale_filepath = csv_filepath
+    else:
+        df.to_csv(
+            csv_filepath,
+            sep=",",
+            index=True,
+        )
+        stale_filepath = parquet_filepath
+    if os.path.exists(stale_filepath):
+        os.remove(stale_filepath)
+
+
+def get_results_filepath(results_directory, which_results):
+    """
+    :param results_directory: the results directory
+    :param which_results: the name of the results file without extension
+    :return: the path to the Parquet results file if it exists, otherwise
+        the path to the CSV results file (which may not exist either); only
+        one of them exists, as write_results_df() removes the other
+    """
+    parquet_filepath = os.path.join(results_directory, f"{which_results}.parquet")
+    if os.path.exists(parquet_filepath):
+        return parquet_filepath
+    return os.path.join(results_directory, f"{which_results}.csv")
+
+
+def read_results_df(results_directory, which_results):
+    """
+    :param results_directory: the results directory
+    :param which_results: the name of the results file without extension
+    :return: the results dataframe, read from the Parquet or CSV file
+    """
+    results_filepath = get_results_filepath(
+        results_directory=results_directory, which_results=which_results
+    )
+    if results_filepath.endswith(".parquet"):
+        return pd.read_parquet(results_filepath)
+    return pd.read_csv(results_filepath)
+
+
 def duals_wrapper(m, component, verbose=False):
     try:
         return m.dual[component]
@@ -27,6 +27,7 @@ from multiprocessing import get_context
 import os.path
 import pandas as pd
 import sys
+import time
 import warnings
 
 from db.common_functions import connect_to_database
@@ -59,6 +60,8 @@ def write_model_inputs(
     subscenarios,
     db_path,
     n_parallel_subproblems,
+    bulk_write_inputs=False,
+    quiet=False,
 ):
     """
     For each module, load the inputs from the database and write out the inputs
@@ -73,6 +76,12 @@ def write_model_inputs(
     :param subscenarios: SubScenarios object with all subscenario info
     :param db_path: database connection
     :param n_parallel_subproblems: int; get inputs for subproblems in parallel
+    :param bulk_write_inputs: boolean; if True, modules with a
+        *write_model_inputs_bulk()* method get their inputs for all
+        iterations, subproblems, and stages with a single database query
+        before the inputs of the other modules are written for each
+        iteration/subproblem/stage
+    :param quiet: boolean
 
 
     :return:
@@ -105,94 +114,169 @@ def write_model_inputs(
             )
         n_parallel_subproblems = 1
 
-    # If no parallelization requested, loop through the iterations
-    # and subproblems
-    if n_parallel_subproblems == 1:
-        for weather_iteration_str in scenario_directory_structure.keys():
-            for hydro_iteration_str in scenario_directory_structure[
+    # Get the iteration/subproblem/stage directories to write inputs to
+    iterations_subproblems_stages = []
+    for weather_iteration_str in scenario_directory_structure.keys():
+        for hydro_iteration_str in scenario_directory_structure[
+            weather_iteration_str
+        ].keys():
+            for availability_iteration_str in scenario_directory_structure[
                 weather_iteration_str
-            ].keys():
-                for availability_iteration_str in scenario_directory_structure[
+            ][hydro_iteration_str].keys():
+                # We may have passed "empty_string" to avoid actual empty
+                # strings as dictionary keys; convert to actual empty
+                # strings here to pass to the directory creation methods
+                weather_iteration_str = ensure_empty_string(weather_iteration_str)
+                hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
+                availability_iteration_str = ensure_empty_string(
+                    availability_iteration_str
+                )
+
+                for subproblem_str in scenario_directory_structure[
                     weather_iteration_str
-                ][hydro_iteration_str].keys():
-                    # We may have passed "empty_string" to avoid actual empty
-                    # strings as dictionary keys; convert to actual empty
-                    # strings here to pass to the directory creation methods
-                    weather_iteration_str = ensure_empty_string(weather_iteration_str)
-                    hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                    availability_iteration_str = ensure_empty_string(
-                        availability_iteration_str
-                    )
-
-                    for subproblem_str in scenario_directory_structure[
+                ][hydro_iteration_str][availability_iteration_str].keys():
+                    for stage_str in scenario_directory_structure[
                         weather_iteration_str
-                    ][hydro_iteration_str][availability_iteration_str].keys():
-                        for stage_str in scenario_directory_structure[
-                            weather_iteration_str
-                        ][hydro_iteration_str][availability_iteration_str][
-                            subproblem_str
-                        ]:
-                            write_inputs(
-                                scenario_directory=scenario_directory,
-                                weather_iteration_str=weather_iteration_str,
-                                hydro_iteration_str=hydro_iteration_str,
-                                availability_iteration_str=availability_iteration_str,
-                                subproblem_str=subproblem_str,
-                                stage_str=stage_str,
-                                modules_to_use=modules_to_use,
-                                scenario_id=scenario_id,
-                                subscenarios=subscenarios,
-                                db_path=db_path,
+                    ][hydro_iteration_str][availability_iteration_str][subproblem_str]:
+                        iterations_subproblems_stages.append(
+                            (
+                                weather_iteration_str,
+                                hydro_iteration_str,
+                                availability_iteration_str,
+                                subproblem_str,
+                                stage_str,
                             )
-    else:
-        pool_data = []
-        for weather_iteration_str in scenario_directory_structure.keys():
-            for hydro_iteration_str in scenario_directory_structure[
-                weather_iteration_str
-            ].keys():
-                for availability_iteration_str in scenario_directory_structure[
-                    weather_iteration_str
-                ][hydro_iteration_str].keys():
-                    # We may have passed "empty_string" to avoid actual empty
-                    # strings as dictionary keys; convert to actual empty
-                    # strings here to pass to the directory creation methods
-                    weather_iteration_str = ensure_empty_string(weather_iteration_str)
-                    hydro_iteration_str = ensure_empty_string(hydro_iteration_str)
-                    availability_iteration_str = ensure_empty_string(
-                        availability_iteration_str
-                    )
+                        )
 
-                    for subproblem_str in scenario_directory_structure[
-                        weather_iteration_str
-                    ][hydro_iteration_str][availability_iteration_str].keys():
-                        for stage_str in scenario_directory_structure[
-                            weather_iteration_str
-                        ][hydro_iteration_str][availability_iteration_str][
-                            subproblem_str
-                        ]:
-                            pool_data.append(
-                                [
-                                    scenario_directory,
-                                    weather_iteration_str,
-                                    hydro_iteration_str,
-                                    availability_iteration_str,
-                                    subproblem_str,
-                                    stage_str,
-                                    modules_to_use,
-                                    scenario_id,
-                                    subscenarios,
-                                    db_path,
-                                ]
-                            )
+    # Create the inputs directories and delete input files that may have
+    # existed before to avoid phantom inputs
+    for iteration_subproblem_stage in iterations_subproblems_stages:
+        inputs_directory = os.path.join(
+            scenario_directory, *iteration_subproblem_stage, "inputs"
+        )
+        if not os.path.exists(inputs_directory):
+            os.makedirs(inputs_directory)
+        delete_prior_inputs(inputs_directory=inputs_directory)
+
+    # Write the inputs of the modules that support it for all directories at
+    # once
+    if bulk_write_inputs:
+        write_bulk_inputs(
+            scenario_directory=scenario_directory,
+            iterations_subproblems_stages=iterations_subproblems_stages,
+            modules_to_use=modules_to_use,
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            db_path=db_path,
+            quiet=quiet,
+        )
 
-        pool_data = tuple(pool_data)
+    # If no parallelization requested, loop through the iterations
+    # and subproblems
+    if n_parallel_subproblems == 1:
+        for (
+            weather_iteration_str,
+            hydro_iteration_str,
+            availability_iteration_str,
+            subproblem_str,
+            stage_str,
+        ) in iterations_subproblems_stages:
+            write_inputs(
+                scenario_directory=scenario_directory,
+                weather_iteration_str=weather_iteration_str,
+                hydro_iteration_str=hydro_iteration_str,
+                availability_iteration_str=availability_iteration_str,
+                subproblem_str=subproblem_str,
+                stage_str=stage_str,
+                modules_to_use=modules_to_use,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios,
+                db_path=db_path,
+                skip_bulk_modules=bulk_write_inputs,
+            )
+    else:
+        pool_data = tuple(
+            [
+                scenario_directory,
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+                stage_str,
+                modules_to_use,
+                scenario_id,
+                subscenarios,
+                db_path,
+                bulk_write_inputs,
+            ]
+            for (
+                weather_iteration_str,
+                hydro_iteration_str,
+                availability_iteration_str,
+                subproblem_str,
+                stage_str,
+            ) in iterations_subproblems_stages
+        )
 
         # Pool must use spawn to work properly on Linux
-        pool = get_context("spawn").Pool(n_parallel_subproblems)
+        # Workers import the modules when they start
+        pool = get_context("spawn").Pool(
+            n_parallel_subproblems,
+            initializer=load_modules,
+            initargs=(modules_to_use,),
+        )
         pool.map(get_inputs_for_subproblem_pool, pool_data)
         pool.close()
 
 
+def write_bulk_inputs(
+    scenario_directory,
+    iterations_subproblems_stages,
+    modules_to_use,
+    scenario_id,
+    subscenarios,
+    db_path,
+    quiet,
+):
+    """
+    Call the *write_model_inputs_bulk()* method of each of the loaded
+    modules that have one in order to write their inputs for all
+    iteration/subproblem/stage directories with a single database query
+    (e.g. the profiles of variable generators for all weather iterations)
+    rather than one query per directory.
+
+    :param iterations_subproblems_stages: list of (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem, stage) tuples of
+        directory strings
+    :return:
+    """
+    loaded_modules = load_modules(modules_to_use=modules_to_use)
+
+    conn = connect_to_database(db_path=db_path)
+    for m in loaded_modules:
+        if hasattr(m, "write_model_inputs_bulk"):
+            start_time = time.time()
+            n_rows = m.write_model_inputs_bulk(
+                scenario_directory=scenario_directory,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios,
+                iterations_subproblems_stages=iterations_subproblems_stages,
+                conn=conn,
+            )
+            if not quiet:
+                print(
+                    "... wrote {:,} rows of {} inputs to {} directories in "
+                    "{:.1f} seconds".format(
+                        n_rows,
+                        m.__name__.split(".")[-1],
+                        len(iterations_subproblems_stages),
+                        time.time() - start_time,
+                    )
+                )
+
+    conn.close()
+
+
 def write_inputs(
     scenario_directory,
     weather_iteration_str,
@@ -204,25 +288,18 @@ def write_inputs(
     scenario_id,
     subscenarios,
     db_path,
+    skip_bulk_modules=False,
 ):
-    loaded_modules = load_modules(modules_to_use=modules_to_use)
-
-    inputs_directory = os.path.join(
-        scenario_directory,
-        weather_iteration_str,
-        hydro_iteration_str,
-        availability_iteration_str,
-        subproblem_str,
-        stage_str,
-        "inputs",
-    )
-
-    if not os.path.exists(inputs_directory):
-        os.makedirs(inputs_directory)
+    """
+    Write the inputs for a single iteration/subproblem/stage directory. The
+    inputs directory must already exist.
 
-    # Delete input files that may have existed before to avoid
-    # phantom inputs
-    delete_prior_inputs(inputs_directory=inputs_directory)
+    :param skip_bulk_modules: boolean; if True, the inputs that the modules
+        with a *write_model_inputs_bulk()* method write in bulk have already
+        been written, so their *write_model_inputs()* method is called with
+        bulk_inputs_written=True to only write their remaining inputs
+    """
+    loaded_modules = load_modules(modules_to_use=modules_to_use)
 
     # Write model input .tab files for each of the loaded_modules if
     # appropriate. Note that all input files are saved in the
@@ -233,6 +310,11 @@ def write_inputs(
     conn = connect_to_database(db_path=db_path)
     for m in loaded_modules:
         if hasattr(m, "write_model_inputs"):
+            bulk_kwargs = (
+                {"bulk_inputs_written": True}
+                if skip_bulk_modules and hasattr(m, "write_model_inputs_bulk")
+                else {}
+            )
             m.write_model_inputs(
                 scenario_directory=scenario_directory,
                 scenario_id=scenario_id,
@@ -243,6 +325,7 @@ def write_inputs(
                 subproblem=subproblem_str,
                 stage=stage_str,
                 conn=conn,
+                **bulk_kwargs,
             )
 
     conn.commit()
@@ -265,6 +348,7 @@ def get_inputs_for_subproblem_pool(pool_datum):
         scenario_id,
         subscenarios,
         db_path,
+        skip_bulk_modules,
     ] = pool_datum
 
     write_inputs(
@@ -278,6 +362,7 @@ def get_inputs_for_subproblem_pool(pool_datum):
         scenario_id=scenario_id,
         subscenarios=subscenarios,
         db_path=db_path,
+        skip_bulk_modules=skip_bulk_modules,
     )
 
 
@@ -536,6 +621,8 @@ def main(args=None):
     modules_to_use = determine_modules(
         features=feature_list, multi_stage=scenario_structure.STAGE_FLAG
     )
+    if parsed_arguments.profile_startup:
+        load_modules(modules_to_use=modules_to_use, profile_startup=True)
 
     # Get appropriate inputs from database and write the .tab file model inputs
     write_model_inputs(
@@ -546,6 +633,8 @@ def main(args=None):
         subscenarios=subscenarios,
         db_path=db_path,
         n_parallel_subproblems=int(parsed_arguments.n_parallel_get_inputs),
+        bulk_write_inputs=parsed_arguments.bulk_write_inputs,
+        quiet=parsed_arguments.quiet,
     )
 
     # Save the list of optional features to a file (will be used to determine
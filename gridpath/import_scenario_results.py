@@ -27,7 +27,10 @@ import os.path
 import pandas as pd
 import sys
 
-from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from gridpath.auxiliary.db_interface import (
+    directories_to_db_values,
+    get_scenario_id_and_name,
+)
 from gridpath.auxiliary.import_export_rules import import_export_rules
 from gridpath.common_functions import (
     determine_scenario_directory,
@@ -37,7 +40,13 @@ from gridpath.common_functions import (
     get_import_results_parser,
     ensure_empty_string,
 )
-from db.common_functions import connect_to_database, spin_on_database_lock
+from db.common_functions import (
+    connect_to_database,
+    connect_to_scenario_results_database,
+    create_scenario_results_database,
+    get_scenario_results_db_path,
+    spin_on_database_lock,
+)
 from db.utilities.scenario import delete_scenario_results
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import (
@@ -68,6 +77,7 @@ def import_scenario_results_into_database(
     scenario_directory,
     ignore_incomplete,
     quiet,
+    subproblems=None,
 ):
     """
     :param import_rule:
@@ -78,9 +88,15 @@ def import_scenario_results_into_database(
     :param scenario_directory:
     :param ignore_incomplete: boolean
     :param quiet: boolean
+    :param subproblems: collection of the (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem) directory names
+        to import the results of; defaults to all subproblems
 
-    :return:
+    :return: list of the (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem_id, stage_id) combinations whose
+        results were imported; results processing can be limited to these
     """
+    imported_results_subset = []
 
     scenario_directory_structure = ScenarioDirectoryStructure(
         scenario_structure
@@ -125,6 +141,17 @@ def import_scenario_results_into_database(
                 for subproblem_str in scenario_directory_structure[
                     weather_iteration_str
                 ][hydro_iteration_str][availability_iteration_str].keys():
+                    if (
+                        subproblems is not None
+                        and (
+                            weather_iteration_str,
+                            hydro_iteration_str,
+                            availability_iteration_str,
+                            subproblem_str,
+                        )
+                        not in subproblems
+                    ):
+                        continue
                     subproblem = 0 if subproblem_str == "" else int(subproblem_str)
                     for stage_str in scenario_directory_structure[
                         weather_iteration_str
@@ -248,6 +275,18 @@ def import_scenario_results_into_database(
                                 loaded_modules=loaded_modules,
                                 quiet=quiet,
                             )
+                            imported_results_subset.append(
+                                tuple(
+                                    int(value)
+                                    for value in directories_to_db_values(
+                                        weather_iteration_dir=weather_iteration_str,
+                                        hydro_iteration_dir=hydro_iteration_str,
+                                        availability_iteration_dir=availability_iteration_str,
+                                        subproblem=subproblem_str,
+                                        stage=stage_str,
+                                    )
+                                )
+                            )
                         else:
                             if not quiet:
                                 print(f"""
@@ -258,6 +297,8 @@ def import_scenario_results_into_database(
                                 Termination condition was '{termination_condition}'.
                                 """)
 
+    return imported_results_subset
+
 
 def import_objective_function_value(
     db,
@@ -372,88 +413,146 @@ def parse_arguments(args):
     return parsed_arguments
 
 
-def main(args=None):
+class ScenarioResultsImport(object):
     """
-
-    :return:
+    Set up the import of a scenario's results: connect to the database,
+    delete the scenario's previous results, and load the scenario's modules.
+    The results of all or some of the subproblems can then be imported with
+    import_results(); close() commits them and closes the connection.
     """
-    if args is None:
-        args = sys.argv[1:]
 
-    parsed_arguments = parse_arguments(args=args)
+    def __init__(self, parsed_arguments):
+        self.db_path = parsed_arguments.database
+        self.scenario_results_database = parsed_arguments.scenario_results_database
+        self.quiet = parsed_arguments.quiet
+        self.import_rule = parsed_arguments.results_import_rule
+        self.ignore_incomplete = parsed_arguments.ignore_incomplete
 
-    db_path = parsed_arguments.database
-    scenario_id_arg = parsed_arguments.scenario_id
-    scenario_name_arg = parsed_arguments.scenario
-    scenario_location = parsed_arguments.scenario_location
-    quiet = parsed_arguments.quiet
-    import_rule = parsed_arguments.results_import_rule
-    ignore_incomplete = parsed_arguments.ignore_incomplete
-    temporal_structure_csv_overwrite = parsed_arguments.temporal_structure_csv_overwrite
-    temporal_structure_csv_path = parsed_arguments.temporal_structure_csv_path
-
-    conn = connect_to_database(db_path=db_path)
-    c = conn.cursor()
-
-    if not parsed_arguments.quiet:
-        print("Importing results... (connected to database {})".format(db_path))
-
-    scenario_id, scenario_name = get_scenario_id_and_name(
-        scenario_id_arg=scenario_id_arg,
-        scenario_name_arg=scenario_name_arg,
-        c=c,
-        script="import_scenario_results",
-    )
+        conn = connect_to_database(db_path=self.db_path)
+        c = conn.cursor()
+
+        if not parsed_arguments.quiet:
+            print(
+                "Importing results... (connected to database {})".format(self.db_path)
+            )
 
-    if temporal_structure_csv_overwrite:
-        scenario_structure = get_scenario_structure_from_csv(
-            temporal_structure_csv_path
+        self.scenario_id, scenario_name = get_scenario_id_and_name(
+            scenario_id_arg=parsed_arguments.scenario_id,
+            scenario_name_arg=parsed_arguments.scenario,
+            c=c,
+            script="import_scenario_results",
         )
-    else:
-        scenario_structure = get_scenario_structure_from_db(
-            conn=conn, scenario_id=scenario_id
+
+        if parsed_arguments.temporal_structure_csv_overwrite:
+            self.scenario_structure = get_scenario_structure_from_csv(
+                parsed_arguments.temporal_structure_csv_path
+            )
+        else:
+            self.scenario_structure = get_scenario_structure_from_db(
+                conn=conn, scenario_id=self.scenario_id
+            )
+
+        # Determine scenario directory
+        self.scenario_directory = determine_scenario_directory(
+            scenario_location=parsed_arguments.scenario_location,
+            scenario_name=scenario_name,
         )
 
-    # Determine scenario directory
-    scenario_directory = determine_scenario_directory(
-        scenario_location=scenario_location, scenario_name=scenario_name
-    )
+        # Check that the saved scenario_id matches
+        sc_df = pd.read_csv(
+            os.path.join(self.scenario_directory, "scenario_description.csv"),
+            header=None,
+            index_col=0,
+        )
+        scenario_id_saved = int(sc_df.loc["scenario_id", 1])
+        if scenario_id_saved != self.scenario_id:
+            raise AssertionError("ERROR: saved scenario_id does not match")
+
+        if self.scenario_results_database:
+            # Import into a new scenario results database, which replaces any
+            # previous one once the import is complete; only delete results
+            # previously imported into the database's results tables (all
+            # imports start with results_scenario)
+            if conn.execute(
+                "SELECT 1 FROM results_scenario WHERE scenario_id = ? LIMIT 1;",
+                (self.scenario_id,),
+            ).fetchone():
+                delete_scenario_results(conn=conn, scenario_id=self.scenario_id)
+            self.scenario_results_db_path = get_scenario_results_db_path(
+                db_path=self.db_path, scenario_id=self.scenario_id
+            )
+            self.import_db_path = self.scenario_results_db_path + ".tmp"
+            create_scenario_results_database(
+                conn=conn, scenario_results_db_path=self.import_db_path
+            )
+            conn.commit()
+            conn.close()
+            conn = connect_to_scenario_results_database(
+                db_path=self.db_path, scenario_results_db_path=self.import_db_path
+            )
+        else:
+            # Delete all previous results for this scenario_id
+            # Each module also makes sure results are deleted, but this step
+            # ensures that if a scenario_id was run with different modules
+            # before, we also delete previously imported "phantom" results
+            delete_scenario_results(conn=conn, scenario_id=self.scenario_id)
+        self.conn = conn
+
+        # Go through modules
+        modules_to_use = determine_modules(scenario_directory=self.scenario_directory)
+        self.loaded_modules = load_modules(
+            modules_to_use, profile_startup=parsed_arguments.profile_startup
+        )
 
-    # Check that the saved scenario_id matches
-    sc_df = pd.read_csv(
-        os.path.join(scenario_directory, "scenario_description.csv"),
-        header=None,
-        index_col=0,
-    )
-    scenario_id_saved = int(sc_df.loc["scenario_id", 1])
-    if scenario_id_saved != scenario_id:
-        raise AssertionError("ERROR: saved scenario_id does not match")
+    def import_results(self, subproblems=None):
+        """
+        :param subproblems: see import_scenario_results_into_database
+        :return: the (weather_iteration, hydro_iteration,
+            availability_iteration, subproblem_id, stage_id) combinations
+            whose results were imported
+        """
+        return import_scenario_results_into_database(
+            import_rule=self.import_rule,
+            loaded_modules=self.loaded_modules,
+            scenario_id=self.scenario_id,
+            scenario_structure=self.scenario_structure,
+            db=self.conn,
+            scenario_directory=self.scenario_directory,
+            ignore_incomplete=self.ignore_incomplete,
+            quiet=self.quiet,
+            subproblems=subproblems,
+        )
+
+    def close(self):
+        """
+        Commit the imported results and close the database connection.
+        """
+        self.conn.commit()
+        self.conn.close()
 
-    # Delete all previous results for this scenario_id
-    # Each module also makes sure results are deleted, but this step ensures
-    # that if a scenario_id was run with different modules before, we also
-    # delete previously imported "phantom" results
-    delete_scenario_results(conn=conn, scenario_id=scenario_id)
+        if self.scenario_results_database:
+            os.replace(self.import_db_path, self.scenario_results_db_path)
 
-    # Go through modules
-    modules_to_use = determine_modules(scenario_directory=scenario_directory)
-    loaded_modules = load_modules(modules_to_use)
+
+def main(args=None):
+    """
+
+    :return: the (weather_iteration, hydro_iteration, availability_iteration,
+        subproblem_id, stage_id) combinations whose results were imported
+    """
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_arguments = parse_arguments(args=args)
 
     # Import appropriate results into database
-    import_scenario_results_into_database(
-        import_rule=import_rule,
-        loaded_modules=loaded_modules,
-        scenario_id=scenario_id,
-        scenario_structure=scenario_structure,
-        db=conn,
-        scenario_directory=scenario_directory,
-        ignore_incomplete=ignore_incomplete,
-        quiet=quiet,
-    )
+    scenario_results_import = ScenarioResultsImport(parsed_arguments=parsed_arguments)
+    imported_results_subset = scenario_results_import.import_results()
 
     # Close the database connection
-    conn.commit()
-    conn.close()
+    scenario_results_import.close()
+
+    return imported_results_subset
 
 
 if __name__ == "__main__":
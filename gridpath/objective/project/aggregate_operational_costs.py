@@ -19,6 +19,7 @@ objective function.
 
 from pyomo.environ import Expression
 
+from gridpath.auxiliary.auxiliary import linear_combination
 from gridpath.auxiliary.dynamic_components import cost_components
 
 
@@ -62,12 +63,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.Variable_OM_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.Variable_OM_Cost[g, tmp],
+            )
             for (g, tmp) in mod.VAR_OM_COST_ALL_PRJS_OPR_TMPS
         )
 
@@ -80,12 +83,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.Fuel_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.Fuel_Cost[g, tmp],
+            )
             for (g, tmp) in mod.FUEL_PRJ_OPR_TMPS
         )
 
@@ -98,12 +103,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.Startup_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.Startup_Cost[g, tmp],
+            )
             for (g, tmp) in mod.STARTUP_COST_PRJ_OPR_TMPS
         )
 
@@ -115,12 +122,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.Shutdown_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.Shutdown_Cost[g, tmp],
+            )
             for (g, tmp) in mod.SHUTDOWN_COST_PRJ_OPR_TMPS
         )
 
@@ -131,12 +140,14 @@ def add_model_components(
         Sum operational constraint violation costs for the objective function
         term.
         """
-        return sum(
-            mod.Operational_Violation_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.Operational_Violation_Cost[g, tmp],
+            )
             for (g, tmp) in mod.VIOL_ALL_PRJ_OPR_TMPS
         )
 
@@ -150,12 +161,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.Curtailment_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.Curtailment_Cost[g, tmp],
+            )
             for (g, tmp) in mod.CURTAILMENT_COST_PRJ_OPR_TMPS
         )
 
@@ -167,12 +180,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.SOC_Penalty_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.SOC_Penalty_Cost[g, tmp],
+            )
             for (g, tmp) in mod.SOC_PENALTY_COST_PRJ_OPR_TMPS
         )
 
@@ -184,12 +199,14 @@ def add_model_components(
         :param mod:
         :return:
         """
-        return sum(
-            mod.SOC_Penalty_Last_Tmp_Cost[g, tmp]
-            * mod.hrs_in_tmp[tmp]
-            * mod.tmp_weight[tmp]
-            * mod.number_years_represented[mod.period[tmp]]
-            * mod.discount_factor[mod.period[tmp]]
+        return linear_combination(
+            (
+                mod.hrs_in_tmp[tmp]
+                * mod.tmp_weight[tmp]
+                * mod.number_years_represented[mod.period[tmp]]
+                * mod.discount_factor[mod.period[tmp]],
+                mod.SOC_Penalty_Last_Tmp_Cost[g, tmp],
+            )
             for (g, tmp) in mod.SOC_LAST_TMP_PENALTY_COST_PRJ_OPR_TMPS
         )
 
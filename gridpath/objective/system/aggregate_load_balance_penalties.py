@@ -26,6 +26,7 @@ load zone and is not weighted by any timepoint- or period-level parameters).
 
 from pyomo.environ import Var, NonNegativeReals, Constraint, Expression
 
+from gridpath.auxiliary.auxiliary import linear_combination
 from gridpath.auxiliary.dynamic_components import cost_components
 
 
@@ -85,19 +86,27 @@ def add_model_components(
 
     def total_penalty_costs_rule(mod):
         return (
-            sum(
+            linear_combination(
                 (
-                    mod.Unserved_Energy_MW_Expression[z, tmp]
-                    * mod.unserved_energy_penalty_per_mwh[z]
-                    + mod.Overgeneration_MW_Expression[z, tmp]
-                    * mod.overgeneration_penalty_per_mw[z]
+                    penalty
+                    * mod.hrs_in_tmp[tmp]
+                    * mod.tmp_weight[tmp]
+                    * mod.number_years_represented[mod.period[tmp]]
+                    * mod.discount_factor[mod.period[tmp]],
+                    expression,
                 )
-                * mod.hrs_in_tmp[tmp]
-                * mod.tmp_weight[tmp]
-                * mod.number_years_represented[mod.period[tmp]]
-                * mod.discount_factor[mod.period[tmp]]
                 for z in mod.LOAD_ZONES
                 for tmp in mod.TMPS
+                for (penalty, expression) in [
+                    (
+                        mod.unserved_energy_penalty_per_mwh[z],
+                        mod.Unserved_Energy_MW_Expression[z, tmp],
+                    ),
+                    (
+                        mod.overgeneration_penalty_per_mw[z],
+                        mod.Overgeneration_MW_Expression[z, tmp],
+                    ),
+                ]
             )
             + sum(
                 mod.Max_Unserved_Load_MW[z] * mod.max_unserved_load_penalty_per_mw[z]
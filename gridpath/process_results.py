@@ -22,9 +22,14 @@ The main() function of this script can also be called with the
 """
 
 from argparse import ArgumentParser
+import os.path
 import sys
 
-from db.common_functions import connect_to_database
+from db.common_functions import (
+    connect_to_database,
+    connect_to_scenario_results_database,
+    get_scenario_results_db_path,
+)
 from gridpath.common_functions import (
     determine_scenario_directory,
     get_db_parser,
@@ -35,7 +40,15 @@ from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import SubScenarios
 
 
-def process_results(loaded_modules, db, cursor, scenario_id, subscenarios, quiet):
+def process_results(
+    loaded_modules,
+    db,
+    cursor,
+    scenario_id,
+    subscenarios,
+    quiet,
+    results_subset=None,
+):
     """
 
     :param loaded_modules:
@@ -43,11 +56,26 @@ def process_results(loaded_modules, db, cursor, scenario_id, subscenarios, quiet
     :param cursor:
     :param subscenarios:
     :param quiet:
+    :param results_subset: list of (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem_id, stage_id) tuples whose
+        results were (re-)imported; if None, all of the scenario's results
+        are processed
     :return:
+
+    All processing queries are limited to the scenario's results. If a
+    results subset is given, the modules only recompute the aggregates that
+    depend on the results of these iterations, subproblems, and stages.
     """
     for m in loaded_modules:
         if hasattr(m, "process_results"):
-            m.process_results(db, cursor, scenario_id, subscenarios, quiet)
+            m.process_results(
+                db,
+                cursor,
+                scenario_id,
+                subscenarios,
+                quiet,
+                results_subset=results_subset,
+            )
 
 
 def parse_arguments(args):
@@ -66,9 +94,13 @@ def parse_arguments(args):
     return parsed_arguments
 
 
-def main(args=None):
+def main(args=None, results_subset=None):
     """
-
+    :param args:
+    :param results_subset: list of the (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem_id, stage_id) combinations to
+        process (e.g., the ones just imported) or None to process all of the
+        scenario's results
     :return:
     """
     if args is None:
@@ -94,6 +126,18 @@ def main(args=None):
         script="process_results",
     )
 
+    # Process the results in the scenario's results database if they were
+    # imported there
+    scenario_results_db_path = get_scenario_results_db_path(
+        db_path=db_path, scenario_id=scenario_id
+    )
+    if os.path.exists(scenario_results_db_path):
+        conn.close()
+        conn = connect_to_scenario_results_database(
+            db_path=db_path, scenario_results_db_path=scenario_results_db_path
+        )
+        c = conn.cursor()
+
     # Determine scenario directory
     scenario_directory = determine_scenario_directory(
         scenario_location=scenario_location, scenario_name=scenario_name
@@ -101,7 +145,9 @@ def main(args=None):
 
     # Go through modules
     modules_to_use = determine_modules(scenario_directory=scenario_directory)
-    loaded_modules = load_modules(modules_to_use)
+    loaded_modules = load_modules(
+        modules_to_use, profile_startup=parsed_arguments.profile_startup
+    )
 
     # Subscenarios
     subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
@@ -113,6 +159,7 @@ def main(args=None):
         scenario_id=scenario_id,
         subscenarios=subscenarios,
         quiet=parsed_arguments.quiet,
+        results_subset=results_subset,
     )
 
     # Close the database connection
@@ -16,6 +16,8 @@
 
 import os.path
 
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.common_functions import release_results_dfs, write_results_df
 from gridpath.project import PROJECT_PERIOD_DF
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
@@ -34,8 +36,9 @@ def export_results(
     Export all results from the PROJECT_CAPACITY_DF and PROJECT_OPERATIONS_DF
     that various modules have added to
     """
-    getattr(d, PROJECT_PERIOD_DF).to_csv(
-        os.path.join(
+    write_results_df(
+        df=getattr(d, PROJECT_PERIOD_DF),
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -43,14 +46,14 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "project_period.csv",
         ),
-        sep=",",
-        index=True,
+        which_results="project_period",
+        results_format=getattr(d, results_format),
     )
 
-    getattr(d, PROJECT_TIMEPOINT_DF).to_csv(
-        os.path.join(
+    write_results_df(
+        df=getattr(d, PROJECT_TIMEPOINT_DF),
+        results_directory=os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
@@ -58,8 +61,9 @@ def export_results(
             subproblem,
             stage,
             "results",
-            "project_timepoint.csv",
         ),
-        sep=",",
-        index=True,
+        which_results="project_timepoint",
+        results_format=getattr(d, results_format),
     )
+
+    release_results_dfs(d, PROJECT_PERIOD_DF, PROJECT_TIMEPOINT_DF)
@@ -270,13 +270,14 @@ def write_model_inputs(
             writer.writerow(list(row))
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
@@ -295,6 +296,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             subsc_tbl="inputs_project_carbon_cap_zones",
             prj_tbl=tbl,
             col="carbon_cap_zone",
+            results_subset=results_subset,
         )
 
 
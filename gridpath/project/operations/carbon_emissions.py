@@ -21,6 +21,7 @@ import os.path
 from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_results_subset_filter
 from gridpath.common_functions import create_results_df
 from gridpath.project import PROJECT_TIMEPOINT_DF
 
@@ -136,29 +137,37 @@ def export_results(
 ###############################################################################
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate emissions by technology, period, and spinup_or_lookahead
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate emissions by technology-period")
 
+    # The aggregates are summed across iterations, so we recompute them for
+    # all iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old emissions by technology
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_carbon_emissions_by_technology_period 
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate emissions by technology, period, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_carbon_emissions_by_technology_period
         (scenario_id, subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead, carbon_emissions_tons)
@@ -168,10 +177,11 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         * number_of_hours_in_timepoint ) AS carbon_emissions_tons 
         FROM results_project_timepoint
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead;"""
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,) + subset_data, many=False
     )
@@ -586,13 +586,14 @@ def write_model_inputs(
         ct_allowance_df.to_csv(fpath, index=False, sep="\t")
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
@@ -611,6 +612,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             subsc_tbl="inputs_project_carbon_tax_zones",
             prj_tbl=tbl,
             col="carbon_tax_zone",
+            results_subset=results_subset,
         )
 
 
@@ -29,6 +29,7 @@ from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
     subset_init_by_set_membership,
 )
+from gridpath.auxiliary.db_interface import get_results_subset_filter
 from gridpath.project.operations.common_functions import (
     load_operational_type_modules,
 )
@@ -715,7 +716,7 @@ def export_results(
 ###############################################################################
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate costs by zone and period
     TODO: by technology too?
@@ -723,22 +724,30 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate costs")
 
+    # The aggregates are summed across iterations, so we recompute them for
+    # all iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_costs_operations_agg
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate operational costs by period and load zone
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_costs_operations_agg
         (scenario_id, subproblem_id, stage_id, period, 
         load_zone, spinup_or_lookahead, 
@@ -753,9 +762,10 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(shutdown_cost * timepoint_weight) AS shutdown_cost
         FROM results_project_timepoint
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ;"""
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,) + subset_data, many=False
     )
@@ -505,13 +505,14 @@ def write_model_inputs(
         writer.writerows(new_rows)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
@@ -530,6 +531,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             subsc_tbl="inputs_project_energy_target_zones",
             prj_tbl=tbl,
             col="energy_target_zone",
+            results_subset=results_subset,
         )
 
 
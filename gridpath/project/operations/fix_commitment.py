@@ -32,6 +32,12 @@ from gridpath.auxiliary.auxiliary import (
 )
 from gridpath.project.operations.common_functions import load_operational_type_modules
 
+# Fixed commitments exported by the last solved stage of each subproblem,
+# by pass-through inputs directory; the next stage of the subproblem run in
+# the same process gets its fixed commitments from here instead of
+# re-reading the pass-through inputs file
+PASS_THROUGH_COMMITMENTS = dict()
+
 
 def add_model_components(
     m,
@@ -248,18 +254,13 @@ def load_model_data(
         )
     )
 
-    fixed_commitment_df = read_csv(
-        os.path.join(
-            scenario_directory,
-            weather_iteration,
-            hydro_iteration,
-            availability_iteration,
-            subproblem,
-            "pass_through_inputs",
-            "fixed_commitment.tab",
-        ),
-        sep="\t",
-        dtype={"stage": str},
+    pass_through_directory = os.path.join(
+        scenario_directory,
+        weather_iteration,
+        hydro_iteration,
+        availability_iteration,
+        subproblem,
+        "pass_through_inputs",
     )
 
     # FNL_COMMIT_PRJS
@@ -297,24 +298,45 @@ def load_model_data(
     data_portal.data()["FNL_COMMIT_PRJS"] = {None: get_fnl_commit_prjs()}
 
     # FXD_COMMIT_PRJS
-    fxd_commit_prjs = sorted(list(set(fixed_commitment_df["project"].tolist())))
-    # Load data only if we have projects that have already been committed
-    # Otherwise, leave uninitialized
-    if len(fxd_commit_prjs) > 0:
-        # For projects whose final commitment was in a prior stage, get the
-        # fixed commitment of the previous stage (by project and timepoint)
-        fixed_commitment_df["stage_index"] = fixed_commitment_df.apply(
-            lambda row: stages.index(row["stage"]), axis=1
+    # For projects whose final commitment was in a prior stage, get the
+    # fixed commitment of the previous stage (by project and timepoint)
+    stage_index = stages.index(stage)
+    pass_through_commitments = PASS_THROUGH_COMMITMENTS.get(
+        os.path.abspath(pass_through_directory)
+    )
+    if (
+        stage_index > 0
+        and pass_through_commitments is not None
+        and pass_through_commitments["stage"] == stages[stage_index - 1]
+    ):
+        fxd_commit_prjs = sorted(pass_through_commitments["fxd_commit_prjs"])
+        projects_timepoints = list(
+            zip(
+                pass_through_commitments["project"],
+                pass_through_commitments["timepoint"],
+            )
+        )
+        commitments = pass_through_commitments["commitment"]
+    else:
+        fixed_commitment_df = read_csv(
+            os.path.join(pass_through_directory, "fixed_commitment.tab"),
+            sep="\t",
+            dtype={"stage": str},
         )
+        fxd_commit_prjs = sorted(list(set(fixed_commitment_df["project"].tolist())))
         relevant_commitment_df = fixed_commitment_df[
-            fixed_commitment_df["stage_index"] == stages.index(stage) - 1
+            fixed_commitment_df["stage"].map({s: i for i, s in enumerate(stages)})
+            == stage_index - 1
         ]
         projects_timepoints = list(
             zip(relevant_commitment_df["project"], relevant_commitment_df["timepoint"])
         )
-        fixed_commitment_dict = dict(
-            zip(projects_timepoints, relevant_commitment_df["commitment"])
-        )
+        commitments = relevant_commitment_df["commitment"]
+
+    # Load data only if we have projects that have already been committed
+    # Otherwise, leave uninitialized
+    if len(fxd_commit_prjs) > 0:
+        fixed_commitment_dict = dict(zip(projects_timepoints, commitments))
 
         data_portal.data()["FXD_COMMIT_PRJS"] = {None: fxd_commit_prjs}
         data_portal.data()["FXD_COMMIT_PRJ_OPR_TMPS"] = {None: projects_timepoints}
@@ -358,44 +380,95 @@ def export_pass_through_inputs(
 
     final_commitment_stage_dict = dict(zip(df["project"], df["last_commitment_stage"]))
 
-    with open(
+    projects = list()
+    timepoints = list()
+    commitments = list()
+    for g, tmp in m.FNL_COMMIT_PRJ_OPR_TMPS:
+        commitment_value = m.Commitment[g, tmp].expr.value
+        if commitment_value < 0:
+            warnings.warn(
+                f"Commitment for ({g}, {tmp}) is "
+                f"{commitment_value}; changing to 0 in "
+                f"pass-through inputs to avoid data type error "
+                f"when loading into next stage. This is "
+                f"expected due to solver optimality tolerances."
+            )
+            commitment_value = 0
+        projects.append(g)
+        timepoints.append(tmp)
+        commitments.append(commitment_value)
+
+    pass_through_directory = os.path.join(
+        scenario_directory,
+        weather_iteration,
+        hydro_iteration,
+        availability_iteration,
+        subproblem,
+        "pass_through_inputs",
+    )
+
+    # Hand off the commitments to the next stage in memory along with all
+    # projects committed so far (from the file if nothing was handed off yet)
+    key = os.path.abspath(pass_through_directory)
+    if key in PASS_THROUGH_COMMITMENTS:
+        fxd_commit_prjs = PASS_THROUGH_COMMITMENTS[key]["fxd_commit_prjs"]
+    else:
+        fxd_commit_prjs = set(
+            read_csv(
+                os.path.join(pass_through_directory, "fixed_commitment.tab"),
+                sep="\t",
+                usecols=["project"],
+            )["project"]
+        )
+    fxd_commit_prjs = fxd_commit_prjs | set(projects)
+
+    # There is no next stage to hand off to after the subproblem's last
+    # stage, so release the commitments handed off to this stage
+    stages = check_for_integer_subdirectories(
         os.path.join(
             scenario_directory,
             weather_iteration,
             hydro_iteration,
             availability_iteration,
             subproblem,
-            "pass_through_inputs",
-            "fixed_commitment.tab",
-        ),
+        )
+    )
+    if stage == stages[-1]:
+        PASS_THROUGH_COMMITMENTS.pop(key, None)
+    else:
+        PASS_THROUGH_COMMITMENTS[key] = {
+            "stage": stage,
+            "fxd_commit_prjs": fxd_commit_prjs,
+            "project": projects,
+            "timepoint": timepoints,
+            "commitment": commitments,
+        }
+
+    # Also append them to the pass-through inputs file, which is used if the
+    # next stage is not run in the same process
+    with open(
+        os.path.join(pass_through_directory, "fixed_commitment.tab"),
         "a",
     ) as fixed_commitment_file:
         fixed_commitment_writer = writer(
             fixed_commitment_file, delimiter="\t", lineterminator="\n"
         )
-        for g, tmp in m.FNL_COMMIT_PRJ_OPR_TMPS:
-            commitment_value = m.Commitment[g, tmp].expr.value
-            if commitment_value < 0:
-                warnings.warn(
-                    f"Commitment for ({g}, {tmp}) is "
-                    f"{commitment_value}; changing to 0 in "
-                    f"pass-through inputs to avoid data type error "
-                    f"when loading into next stage. This is "
-                    f"expected due to solver optimality tolerances."
-                )
-                commitment_value = 0
-            fixed_commitment_writer.writerow(
-                [
-                    g,
-                    tmp,
-                    stage,
-                    final_commitment_stage_dict[g],
-                    commitment_value,
-                ]
+        fixed_commitment_writer.writerows(
+            zip(
+                projects,
+                timepoints,
+                [stage] * len(projects),
+                [final_commitment_stage_dict[g] for g in projects],
+                commitments,
             )
+        )
 
 
 def write_pass_through_file_headers(pass_through_directory):
+    # Writing the headers starts a new subproblem run, so discard any
+    # commitments handed off from a prior run
+    PASS_THROUGH_COMMITMENTS.pop(os.path.abspath(pass_through_directory), None)
+
     with open(
         os.path.join(pass_through_directory, "fixed_commitment.tab"),
         "w",
@@ -374,13 +374,14 @@ def write_model_inputs(
         writer.writerows(new_rows)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
@@ -399,6 +400,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             subsc_tbl="inputs_project_instantaneous_penetration_zones",
             prj_tbl=tbl,
             col="instantaneous_penetration_zone",
+            results_subset=results_subset,
         )
 
 
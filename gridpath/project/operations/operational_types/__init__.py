@@ -344,6 +344,7 @@ def write_model_inputs(
     subproblem,
     stage,
     conn,
+    bulk_inputs_written=False,
 ):
     """
     Get inputs from database and write out the model input .tab files
@@ -352,6 +353,9 @@ def write_model_inputs(
     :param subproblem:
     :param stage:
     :param conn: database connection
+    :param bulk_inputs_written: boolean; if True, skip the operational types
+        with a write_model_inputs_bulk function, as their inputs have already
+        been written by write_model_inputs_bulk
     :return:
     """
 
@@ -365,6 +369,10 @@ def write_model_inputs(
 
     # Write module-specific inputs
     for op_m in required_opchar_modules:
+        if bulk_inputs_written and hasattr(
+            imported_operational_modules[op_m], "write_model_inputs_bulk"
+        ):
+            continue
         if hasattr(imported_operational_modules[op_m], "write_model_inputs"):
             imported_operational_modules[op_m].write_model_inputs(
                 scenario_directory,
@@ -379,13 +387,59 @@ def write_model_inputs(
             )
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def write_model_inputs_bulk(
+    scenario_directory,
+    scenario_id,
+    subscenarios,
+    iterations_subproblems_stages,
+    conn,
+):
+    """
+    Write the model input .tab files for all iteration/subproblem/stage
+    directories of the operational types that can get their inputs for all
+    directories with a single query (i.e. that have a
+    write_model_inputs_bulk function). The inputs of the other operational
+    types are written by write_model_inputs for each directory.
+    :param scenario_directory: string, the scenario directory
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param iterations_subproblems_stages: list of (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem, stage) tuples of
+        directory strings
+    :param conn: database connection
+    :return: the number of rows written by the bulk writers
+    """
+
+    # Load in the required operational modules
+    c = conn.cursor()
+
+    required_opchar_modules = get_required_opchar_modules(scenario_id, c)
+    imported_operational_modules = load_operational_type_modules(
+        required_opchar_modules
+    )
+
+    # Write module-specific inputs
+    n_rows = 0
+    for op_m in required_opchar_modules:
+        if hasattr(imported_operational_modules[op_m], "write_model_inputs_bulk"):
+            n_rows += imported_operational_modules[op_m].write_model_inputs_bulk(
+                scenario_directory,
+                scenario_id,
+                subscenarios,
+                iterations_subproblems_stages,
+                conn,
+            )
+
+    return n_rows
+
+
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
 
@@ -400,7 +454,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     for op_m in required_opchar_modules:
         if hasattr(imported_operational_modules[op_m], "process_model_results"):
             imported_operational_modules[op_m].process_model_results(
-                db, c, scenario_id, subscenarios, quiet
+                db, c, scenario_id, subscenarios, quiet, results_subset=results_subset
             )
 
 
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
 import csv
 import os.path
 import pandas as pd
@@ -460,6 +461,96 @@ def write_tab_file_model_inputs(
                 writer.writerow(row)
 
 
+class PartitionedTabFileWriter(object):
+    """
+    Write rows to many tab-delimited input files (e.g. one per
+    iteration/subproblem/stage inputs directory) from a single stream of
+    rows. Rows are buffered in memory and written in batches, and at most
+    *max_open_files* files are kept open at a time (the least recently
+    used file is closed when that limit is reached).
+
+    As with write_tab_file_model_inputs, rows are appended if the file
+    already exists and a header is written first otherwise, so files are
+    only created if they have data.
+    """
+
+    def __init__(
+        self,
+        columns,
+        replace_nulls=False,
+        max_open_files=64,
+        buffer_rows=100000,
+    ):
+        """
+        :param columns: list of the column names to write as the header
+        :param replace_nulls: boolean, whether to replace Nulls with "."
+        :param max_open_files: int, maximum number of files to keep open
+        :param buffer_rows: int, number of rows to buffer before writing
+        """
+        self.columns = columns
+        self.replace_nulls = replace_nulls
+        self.max_open_files = max_open_files
+        self.buffer_rows = buffer_rows
+
+        self.buffers = {}
+        self.n_buffered = 0
+        self.open_files = OrderedDict()
+        self.files_written = set()
+        self.n_rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_row(self, out_file, row):
+        """
+        :param out_file: str, path to the file to write the row to
+        :param row: tuple, the row to write
+        :return:
+        """
+        if self.replace_nulls:
+            row = ["." if i is None else i for i in row]
+        if out_file not in self.buffers.keys():
+            self.buffers[out_file] = []
+        self.buffers[out_file].append(row)
+        self.n_buffered += 1
+        self.n_rows += 1
+
+        if self.n_buffered >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        for out_file, rows in self.buffers.items():
+            self._get_writer(out_file).writerows(rows)
+        self.buffers = {}
+        self.n_buffered = 0
+
+    def close(self):
+        self.flush()
+        for f, writer in self.open_files.values():
+            f.close()
+        self.open_files = OrderedDict()
+
+    def _get_writer(self, out_file):
+        if out_file in self.open_files.keys():
+            self.open_files.move_to_end(out_file)
+        else:
+            if len(self.open_files) >= self.max_open_files:
+                f, writer = self.open_files.popitem(last=False)[1]
+                f.close()
+            f_exists = os.path.isfile(out_file)
+            f = open(out_file, "a" if f_exists else "w", newline="")
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            if not f_exists:
+                writer.writerow(self.columns)
+            self.open_files[out_file] = (f, writer)
+            self.files_written.add(out_file)
+
+        return self.open_files[out_file][1]
+
+
 def load_var_profile_inputs(
     data_portal,
     scenario_directory,
@@ -716,6 +807,230 @@ def get_prj_temporal_index_opr_inputs_from_db(
     return prj_tmp_data
 
 
+def get_prj_temporal_index_opr_inputs_from_db_bulk(
+    subscenarios,
+    db_iterations_subproblems_stages,
+    conn,
+    op_type,
+    table,
+    subscenario_id_column,
+    data_column,
+    opr_index_dict=None,
+    exclude_stage=False,
+):
+    """
+    Get the same inputs as get_prj_temporal_index_opr_inputs_from_db, but
+    for all requested iteration/subproblem/stage combinations in a single
+    query ordered by subproblem, stage, and iteration.
+
+    :param db_iterations_subproblems_stages: list of (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem, stage) tuples of
+        database values
+    :return: cursor with rows of weather_iteration, hydro_iteration,
+        subproblem_id, stage_id followed by the columns of
+        get_prj_temporal_index_opr_inputs_from_db; the iterations are None
+        for projects whose inputs don't vary by that iteration type (i.e.
+        the row applies to all iterations of that type)
+    """
+    if opr_index_dict is None:
+        opr_index_dict = TIMEPOINT_INDEX_QUERY_PARAMS
+
+    select_columns = opr_index_dict["select_columns"]
+    index_columns = opr_index_dict["index_columns"]
+    index_join_table = opr_index_dict["index_join_table"]
+    index_columns_join_table = opr_index_dict["index_columns_join_table"]
+
+    weather_iterations = sorted(
+        set(int(i[0]) for i in db_iterations_subproblems_stages)
+    )
+    hydro_iterations = sorted(set(int(i[1]) for i in db_iterations_subproblems_stages))
+    subproblems_stages = sorted(
+        set((int(i[3]), int(i[4])) for i in db_iterations_subproblems_stages)
+    )
+
+    optype_filter = (
+        f"""AND operational_type = '{op_type}'""" if op_type != "all" else ""
+    )
+
+    cte_prj_sql = f"""
+        WITH portfolio_projects AS (
+            SELECT project FROM inputs_project_portfolios
+            WHERE project_portfolio_scenario_id = {subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID}
+        ),
+        optype_projects AS (
+            SELECT project, {subscenario_id_column}
+            FROM inputs_project_operational_chars
+            WHERE project_operational_chars_scenario_id = {subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID}
+            {optype_filter}
+        )"""
+
+    # Same checks on the iteration configuration as for a single
+    # iteration/subproblem/stage
+    c = conn.cursor()
+    iteration_configs = c.execute(f"""
+        {cte_prj_sql}
+        SELECT DISTINCT varies_by_weather_iteration, varies_by_hydro_iteration
+        FROM {table}_iterations
+        WHERE project IN portfolio_projects
+        AND (project, {subscenario_id_column}) IN optype_projects
+    """).fetchall()
+
+    if not iteration_configs:
+        return c.execute("SELECT NULL WHERE 1=0")
+
+    if 0 in weather_iterations:
+        invalid_configs = [config for config in iteration_configs if config[0] != 0]
+        if invalid_configs:
+            raise ValueError(
+                f"Table {table} has iteration configurations {invalid_configs} "
+                f"with varies_by_weather_iteration=1, but weather_iteration=0. "
+                f"Projects should not vary by weather iteration when weather_iteration is set to 0."
+            )
+    if 0 in hydro_iterations:
+        invalid_configs = [config for config in iteration_configs if config[1] != 0]
+        if invalid_configs:
+            raise ValueError(
+                f"Table {table} has iteration configurations {invalid_configs} "
+                f"with varies_by_hydro_iteration=1, but hydro_iteration=0. "
+                f"Projects should not vary by hydro iteration when hydro_iteration is set to 0."
+            )
+
+    subproblems_stages_values = ", ".join(
+        f"({subproblem}, {stage})" for (subproblem, stage) in subproblems_stages
+    )
+    # Inputs that don't vary by an iteration type are stored under iteration 0
+    weather_iterations_str = ", ".join(
+        str(i) for i in sorted(set(weather_iterations) | {0})
+    )
+    hydro_iterations_str = ", ".join(
+        str(i) for i in sorted(set(hydro_iterations) | {0})
+    )
+    stage_join = "" if exclude_stage else f"AND {table}.stage_id = rt.stage_id"
+    index_join = " AND ".join(
+        f"{table}.{idx.strip()} = rt.{join_idx.strip()}"
+        for idx, join_idx in zip(
+            index_columns.split(","), index_columns_join_table.split(",")
+        )
+    )
+    table_select_columns = ", ".join(
+        f"{table}.{col.strip()} AS {col.strip()}" for col in select_columns.split(",")
+    )
+
+    sql = f"""
+        {cte_prj_sql},
+        relevant_temporal AS (
+            SELECT DISTINCT subproblem_id, stage_id, {index_columns_join_table}
+            FROM {index_join_table}
+            WHERE temporal_scenario_id = {subscenarios.TEMPORAL_SCENARIO_ID}
+            AND (subproblem_id, stage_id) IN (VALUES {subproblems_stages_values})
+        )
+        SELECT
+            CASE WHEN ic.varies_by_weather_iteration = 1
+            THEN {table}.weather_iteration END AS weather_iteration,
+            CASE WHEN ic.varies_by_hydro_iteration = 1
+            THEN {table}.hydro_iteration END AS hydro_iteration,
+            rt.subproblem_id, rt.stage_id,
+            {table}.project AS project, {table_select_columns},
+            {table}.{data_column} AS {data_column}
+        FROM {table}
+        JOIN optype_projects AS op
+            ON {table}.project = op.project
+            AND {table}.{subscenario_id_column} = op.{subscenario_id_column}
+        JOIN {table}_iterations AS ic
+            ON {table}.project = ic.project
+            AND {table}.{subscenario_id_column} = ic.{subscenario_id_column}
+        JOIN relevant_temporal AS rt
+            ON {index_join}
+            {stage_join}
+        WHERE {table}.project IN (SELECT project FROM portfolio_projects)
+        AND {table}.weather_iteration IN ({weather_iterations_str})
+        AND {table}.hydro_iteration IN ({hydro_iterations_str})
+        AND CASE WHEN ic.varies_by_weather_iteration = 1
+            THEN {table}.weather_iteration != 0
+            ELSE {table}.weather_iteration = 0 END
+        AND CASE WHEN ic.varies_by_hydro_iteration = 1
+            THEN {table}.hydro_iteration != 0
+            ELSE {table}.hydro_iteration = 0 END
+        ORDER BY rt.subproblem_id, rt.stage_id
+        ;
+    """
+
+    return c.execute(sql)
+
+
+def write_prj_temporal_index_opr_inputs_bulk(
+    scenario_directory,
+    subscenarios,
+    iterations_subproblems_stages,
+    conn,
+    op_type,
+    table,
+    subscenario_id_column,
+    data_column,
+    fname,
+    opr_index_dict=None,
+    exclude_stage=False,
+):
+    """
+    Get the project temporal-index operational inputs for all
+    iteration/subproblem/stage directories with a single query and write
+    them to the *fname* file in each directory's inputs directory.
+
+    :param iterations_subproblems_stages: list of (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem, stage) tuples of
+        directory strings
+    :return: the number of rows written
+    """
+    # Map each (weather_iteration, hydro_iteration, subproblem, stage)
+    # combination of database values to the inputs directories it should be
+    # written to; a None iteration means all iterations of that type
+    out_files = {}
+    db_iterations_subproblems_stages = []
+    for directories in iterations_subproblems_stages:
+        db_values = directories_to_db_values(*directories)
+        db_iterations_subproblems_stages.append(db_values)
+        db_weather, db_hydro, db_availability, db_subproblem, db_stage = [
+            int(v) for v in db_values
+        ]
+        out_file = os.path.join(scenario_directory, *directories, "inputs", fname)
+        for key in [
+            (db_weather, db_hydro, db_subproblem, db_stage),
+            (None, db_hydro, db_subproblem, db_stage),
+            (db_weather, None, db_subproblem, db_stage),
+            (None, None, db_subproblem, db_stage),
+        ]:
+            if key not in out_files.keys():
+                out_files[key] = []
+            out_files[key].append(out_file)
+
+    data = get_prj_temporal_index_opr_inputs_from_db_bulk(
+        subscenarios=subscenarios,
+        db_iterations_subproblems_stages=db_iterations_subproblems_stages,
+        conn=conn,
+        op_type=op_type,
+        table=table,
+        subscenario_id_column=subscenario_id_column,
+        data_column=data_column,
+        opr_index_dict=opr_index_dict,
+        exclude_stage=exclude_stage,
+    )
+    if data.description is None or len(data.description) < 5:
+        return 0
+
+    with PartitionedTabFileWriter(
+        columns=[d[0] for d in data.description[4:]]
+    ) as writer:
+        while True:
+            rows = data.fetchmany(10000)
+            if not rows:
+                break
+            for row in rows:
+                for out_file in out_files.get(tuple(row[:4]), []):
+                    writer.write_row(out_file, row[4:])
+
+    return writer.n_rows
+
+
 def make_project_str(projects_list):
     project_str = "("
     list_len = len(projects_list)
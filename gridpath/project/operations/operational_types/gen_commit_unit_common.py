@@ -60,6 +60,7 @@ from pyomo.environ import (
 )
 
 from gridpath.auxiliary.auxiliary import (
+    linear_combination,
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
@@ -2174,12 +2175,11 @@ def add_model_components(
             getattr(mod, "gen_commit_{}_min_up_time_hours".format(bin_or_lin))[g],
         )
 
-        number_of_starts_min_up_time_or_less_hours_ago = sum(
-            getattr(mod, "GenCommit{}_Startup".format(Bin_or_Lin))[g, tp]
-            for tp in relevant_tmps
-        ) + sum(
-            getattr(mod, "gen_commit_{}_linked_startup".format(bin_or_lin))[g, ltp]
-            for ltp in relevant_linked_timepoints
+        startup = getattr(mod, "GenCommit{}_Startup".format(Bin_or_Lin))
+        linked_startup = getattr(mod, "gen_commit_{}_linked_startup".format(bin_or_lin))
+        number_of_starts_min_up_time_or_less_hours_ago = linear_combination(
+            [(1, startup[g, tp]) for tp in relevant_tmps]
+            + [(1, linked_startup[g, ltp]) for ltp in relevant_linked_timepoints]
         )
 
         # If we've reached the first timepoint in linear boundary mode and
@@ -2265,12 +2265,13 @@ def add_model_components(
             getattr(mod, "gen_commit_{}_min_down_time_hours".format(bin_or_lin))[g],
         )
 
-        number_of_stops_min_down_time_or_less_hours_ago = sum(
-            getattr(mod, "GenCommit{}_Shutdown".format(Bin_or_Lin))[g, tp]
-            for tp in relevant_tmps
-        ) + sum(
-            getattr(mod, "gen_commit_{}_linked_shutdown".format(bin_or_lin))[g, ltp]
-            for ltp in relevant_linked_timepoints
+        shutdown = getattr(mod, "GenCommit{}_Shutdown".format(Bin_or_Lin))
+        linked_shutdown = getattr(
+            mod, "gen_commit_{}_linked_shutdown".format(bin_or_lin)
+        )
+        number_of_stops_min_down_time_or_less_hours_ago = linear_combination(
+            [(1, shutdown[g, tp]) for tp in relevant_tmps]
+            + [(1, linked_shutdown[g, ltp]) for ltp in relevant_linked_timepoints]
         )
 
         # If we've reached the first timepoint in linear boundary mode and
@@ -2620,12 +2621,13 @@ def add_model_components(
 
         # Equal to 1 if unit has been down within interval [TSU,s; TSU,s+1)
         # before hour t. This "activates" this particular startup type
-        shutdown_within_interval = sum(
-            getattr(mod, "GenCommit{}_Shutdown".format(Bin_or_Lin))[g, tp]
-            for tp in relevant_tmps
-        ) + sum(
-            getattr(mod, "gen_commit_{}_linked_shutdown".format(bin_or_lin))[g, ltp]
-            for ltp in relevant_linked_tmps
+        shutdown = getattr(mod, "GenCommit{}_Shutdown".format(Bin_or_Lin))
+        linked_shutdown = getattr(
+            mod, "gen_commit_{}_linked_shutdown".format(bin_or_lin)
+        )
+        shutdown_within_interval = linear_combination(
+            [(1, shutdown[g, tp]) for tp in relevant_tmps]
+            + [(1, linked_shutdown[g, ltp]) for ltp in relevant_linked_tmps]
         )
 
         return (
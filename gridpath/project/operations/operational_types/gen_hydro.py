@@ -42,10 +42,14 @@ import warnings
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import (
+    linear_combination,
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import directories_to_db_values
+from gridpath.auxiliary.db_interface import (
+    directories_to_db_values,
+    get_results_subset_filter,
+)
 from gridpath.auxiliary.dynamic_components import headroom_variables, footroom_variables
 from gridpath.project.common_functions import (
     check_if_boundary_type_and_first_timepoint,
@@ -502,8 +506,8 @@ def energy_budget_rule(mod, g, bt, h):
     the budget would be half, i.e. 42,000 MWh, even though the average power
     fraction is the same!
     """
-    return sum(
-        mod.GenHydro_Gross_Power_MW[g, tmp] * mod.hrs_in_tmp[tmp]
+    return linear_combination(
+        (mod.hrs_in_tmp[tmp], mod.GenHydro_Gross_Power_MW[g, tmp])
         for tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, h]
     ) == sum(
         mod.gen_hydro_average_power_fraction[g, bt, h]
@@ -1012,29 +1016,37 @@ def write_model_inputs(
     )
 
 
-def process_model_results(db, c, scenario_id, subscenarios, quiet):
+def process_model_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate scheduled curtailment.
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate hydro curtailment")
 
+    # Curtailment is summed across iterations, so we recompute it for all
+    # iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old aggregated hydro curtailment results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_curtailment_hydro_periodagg 
         WHERE scenario_id = ?
+        {subset_filter};
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate hydro curtailment (just scheduled curtailment)
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_curtailment_hydro_periodagg
         (scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -1049,7 +1061,9 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
             load_zone, 
             sum(scheduled_curtailment_mw) AS scheduled_curtailment_mw
             FROM results_project_timepoint
-            WHERE operational_type = 'gen_hydro'
+            WHERE scenario_id = ?
+            AND operational_type = 'gen_hydro'
+            {subset_filter}
             GROUP BY scenario_id, subproblem_id, stage_id, timepoint, load_zone
         ) as agg_curtailment_tbl
         JOIN (
@@ -1066,7 +1080,11 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         ORDER BY subproblem_id, stage_id, load_zone, timepoint;
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id, scenario_id), many=False
+        conn=db,
+        cursor=c,
+        sql=agg_sql,
+        data=(scenario_id,) + subset_data + (scenario_id, scenario_id),
+        many=False,
     )
 
 
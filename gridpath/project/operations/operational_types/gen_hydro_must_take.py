@@ -36,6 +36,7 @@ from pyomo.environ import (
 import warnings
 
 from gridpath.auxiliary.auxiliary import (
+    linear_combination,
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
@@ -497,8 +498,8 @@ def energy_budget_rule(mod, g, bt, h):
     the budget would be half, i.e. 42,000 MWh, even though the average power
     fraction is the same!
     """
-    return sum(
-        mod.GenHydroMustTake_Gross_Power_MW[g, tmp] * mod.hrs_in_tmp[tmp]
+    return linear_combination(
+        (mod.hrs_in_tmp[tmp], mod.GenHydroMustTake_Gross_Power_MW[g, tmp])
         for tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, h]
     ) == sum(
         mod.gen_hydro_must_take_average_power_fraction[g, bt, h]
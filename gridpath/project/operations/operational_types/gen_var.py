@@ -41,7 +41,10 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import directories_to_db_values
+from gridpath.auxiliary.db_interface import (
+    directories_to_db_values,
+    get_results_subset_filter,
+)
 from gridpath.auxiliary.dynamic_components import (
     footroom_variables,
     headroom_variables,
@@ -59,6 +62,7 @@ from gridpath.project.operations.operational_types.common_functions import (
     load_var_profile_inputs,
     get_prj_temporal_index_opr_inputs_from_db,
     write_tab_file_model_inputs,
+    write_prj_temporal_index_opr_inputs_bulk,
     validate_opchars,
     validate_var_profiles,
     load_optype_model_data,
@@ -695,29 +699,37 @@ def write_model_inputs(
     )
 
 
-def process_model_results(db, c, scenario_id, subscenarios, quiet):
+def process_model_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate scheduled curtailment
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate variable curtailment")
 
+    # Curtailment is summed across iterations, so we recompute it for all
+    # iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old aggregated variable curtailment results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_curtailment_variable_periodagg 
-        WHERE scenario_id = ?;
+        WHERE scenario_id = ?
+        {subset_filter};
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate variable curtailment (just scheduled curtailment)
-    insert_sql = """
+    insert_sql = f"""
         INSERT INTO results_project_curtailment_variable_periodagg
         (scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -732,7 +744,9 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
             load_zone, 
             sum(scheduled_curtailment_mw) AS scheduled_curtailment_mw
             FROM results_project_timepoint
-            WHERE operational_type = 'gen_var'
+            WHERE scenario_id = ?
+            AND operational_type = 'gen_var'
+            {subset_filter}
             GROUP BY scenario_id, subproblem_id, stage_id, timepoint, load_zone
         ) as agg_curtailment_tbl
         JOIN (
@@ -749,7 +763,11 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         ORDER BY subproblem_id, stage_id, load_zone, timepoint;"""
 
     spin_on_database_lock(
-        conn=db, cursor=c, sql=insert_sql, data=(scenario_id, scenario_id), many=False
+        conn=db,
+        cursor=c,
+        sql=insert_sql,
+        data=(scenario_id,) + subset_data + (scenario_id, scenario_id),
+        many=False,
     )
 
 
@@ -801,3 +819,36 @@ def validate_inputs(
         conn,
         "gen_var",
     )
+
+
+def write_model_inputs_bulk(
+    scenario_directory,
+    scenario_id,
+    subscenarios,
+    iterations_subproblems_stages,
+    conn,
+):
+    """
+    Get inputs for all iteration/subproblem/stage directories from the
+    database with a single query and write out the model input
+    variable_generator_profiles.tab files.
+    :param scenario_directory: string, the scenario directory
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param iterations_subproblems_stages: list of (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem, stage) tuples of
+        directory strings
+    :param conn: database connection
+    :return: the number of rows written
+    """
+
+    return write_prj_temporal_index_opr_inputs_bulk(
+        scenario_directory=scenario_directory,
+        subscenarios=subscenarios,
+        iterations_subproblems_stages=iterations_subproblems_stages,
+        conn=conn,
+        op_type="gen_var",
+        table="inputs_project_variable_generator_profiles",
+        subscenario_id_column="variable_generator_profile_scenario_id",
+        data_column="cap_factor",
+        fname="variable_generator_profiles.tab",
+    )
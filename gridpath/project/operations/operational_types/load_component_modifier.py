@@ -41,6 +41,7 @@ from gridpath.project.operations.operational_types.common_functions import (
     load_var_profile_inputs,
     get_prj_temporal_index_opr_inputs_from_db,
     write_tab_file_model_inputs,
+    write_prj_temporal_index_opr_inputs_bulk,
     validate_opchars,
     validate_var_profiles,
     load_optype_model_data,
@@ -420,6 +421,39 @@ def write_model_inputs(
     )
 
 
+def write_model_inputs_bulk(
+    scenario_directory,
+    scenario_id,
+    subscenarios,
+    iterations_subproblems_stages,
+    conn,
+):
+    """
+    Get inputs for all iteration/subproblem/stage directories from the
+    database with a single query and write out the model input
+    load_component_modifier_fractions.tab files.
+    :param scenario_directory: string, the scenario directory
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param iterations_subproblems_stages: list of (weather_iteration,
+        hydro_iteration, availability_iteration, subproblem, stage) tuples of
+        directory strings
+    :param conn: database connection
+    :return: the number of rows written
+    """
+
+    return write_prj_temporal_index_opr_inputs_bulk(
+        scenario_directory=scenario_directory,
+        subscenarios=subscenarios,
+        iterations_subproblems_stages=iterations_subproblems_stages,
+        conn=conn,
+        op_type="load_component_modifier",
+        table="inputs_project_load_modifier_profiles",
+        subscenario_id_column="load_modifier_profile_scenario_id",
+        data_column="fraction",
+        fname="load_component_modifier_fractions.tab",
+    )
+
+
 # Validation
 ###############################################################################
 
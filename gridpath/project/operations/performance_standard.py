@@ -301,13 +301,14 @@ def write_model_inputs(
             writer.writerow(list(row))
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
@@ -326,6 +327,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             subsc_tbl="inputs_project_performance_standard_zones",
             prj_tbl=tbl,
             col="performance_standard_zone",
+            results_subset=results_subset,
         )
 
 
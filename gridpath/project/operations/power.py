@@ -24,6 +24,7 @@ from pyomo.environ import Expression, value, Constraint
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules
+from gridpath.auxiliary.db_interface import get_results_subset_filter
 from gridpath.common_functions import create_results_df
 from gridpath.project.operations.common_functions import load_operational_type_modules
 import gridpath.project.operations.operational_types as op_type_init
@@ -208,7 +209,7 @@ def export_results(
 ###############################################################################
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate dispatch by technology
     Aggregate dispatch by technology and period
@@ -216,22 +217,26 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate dispatch by technology")
 
+    subset_filter, subset_data = get_results_subset_filter(results_subset)
+
     # Delete old dispatch by technology
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_dispatch_by_technology 
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate dispatch by technology
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_dispatch_by_technology (
             scenario_id, 
             weather_iteration, 
@@ -265,6 +270,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             sum(power_mw) AS power_mw
         FROM results_project_timepoint
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY 
             weather_iteration, 
             hydro_iteration, 
@@ -284,23 +290,24 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             load_zone, 
             technology;"""
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     if not quiet:
         print("aggregate dispatch by technology-period")
 
     # Delete old dispatch by technology
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_project_dispatch_by_technology_period 
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate dispatch by technology, period, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_project_dispatch_by_technology_period (
             scenario_id, 
             weather_iteration, 
@@ -325,6 +332,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             SUM(power_mw * timepoint_weight * number_of_hours_in_timepoint ) AS energy_mwh 
         FROM results_project_dispatch_by_technology
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY 
             weather_iteration, 
             hydro_iteration, 
@@ -348,5 +356,5 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             ;
             """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,) + subset_data, many=False
     )
@@ -24,8 +24,8 @@ from pyomo.environ import Set, value
 from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.auxiliary.dynamic_components import headroom_variables
 from gridpath.common_functions import create_results_df
-from gridpath.project import PROJECT_TIMEPOINT_DF
 from gridpath.project.operations.reserves.reserve_provision import (
+    add_reserve_results_to_project_timepoint_df,
     generic_record_dynamic_components,
     generic_add_model_components,
     generic_load_model_data,
@@ -258,9 +258,7 @@ def export_results(
         data=data,
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    add_reserve_results_to_project_timepoint_df(d=d, results_df=results_df)
 
 
 def get_inputs_from_database(
@@ -32,7 +32,9 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_set_membership,
 )
 from gridpath.common_functions import create_results_df
-from gridpath.project import PROJECT_TIMEPOINT_DF
+from gridpath.project.operations.reserves.reserve_provision import (
+    add_reserve_results_to_project_timepoint_df,
+)
 
 
 def record_dynamic_components(
@@ -306,9 +308,7 @@ def export_results(
         data=data,
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    add_reserve_results_to_project_timepoint_df(d=d, results_df=results_df)
 
 
 def get_inputs_from_database(
@@ -449,9 +449,27 @@ def generic_export_results(
         data=data,
     )
 
-    for c in results_columns:
-        getattr(d, PROJECT_TIMEPOINT_DF)[c] = None
-    getattr(d, PROJECT_TIMEPOINT_DF).update(results_df)
+    add_reserve_results_to_project_timepoint_df(d=d, results_df=results_df)
+
+
+def add_reserve_results_to_project_timepoint_df(d, results_df):
+    """
+    Add the columns of a reserve results dataframe to the project-timepoint
+    results dataframe
+    :param d: the dynamic components class
+    :param results_df: reserve results dataframe indexed by project and
+        timepoint
+    :return:
+
+    The reserve results are reindexed to the project-timepoint index once
+    and their values are then assigned column by column; this is much faster
+    than DataFrame.update() for large frames and leaves the projects that
+    don't provide the reserve empty.
+    """
+    project_timepoint_df = getattr(d, PROJECT_TIMEPOINT_DF)
+    aligned_results_df = results_df.reindex(project_timepoint_df.index)
+    for c in aligned_results_df.columns:
+        project_timepoint_df[c] = aligned_results_df[c].to_numpy()
 
 
 def generic_get_inputs_from_database(
@@ -390,13 +390,14 @@ def import_results_into_database(
             )
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     # Required modules are the unique set of generator PRM types in
@@ -421,4 +422,5 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 scenario_id=scenario_id,
                 subscenarios=subscenarios,
                 quiet=quiet,
+                results_subset=results_subset,
             )
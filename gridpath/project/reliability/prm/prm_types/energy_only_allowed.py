@@ -34,7 +34,7 @@ from gridpath.auxiliary.auxiliary import (
     subset_init_by_param_value,
     subset_init_by_set_membership,
 )
-from gridpath.auxiliary.db_interface import import_csv
+from gridpath.auxiliary.db_interface import import_csv, get_results_subset_filter
 
 # TODO: rename deliverability_group_deliverability_cost_per_mw --> deliverability_group_deliverability_cost_per_mw_yr
 
@@ -210,28 +210,35 @@ def import_results_into_database(
     )
 
 
-def process_model_results(db, c, scenario_id, subscenarios, quiet):
+def process_model_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("update energy-only capacities")
 
+    subset_filter, subset_data = get_results_subset_filter(results_subset)
+
     # Figure out RPS zone for each project
-    project_period_eocap = c.execute("""SELECT project, period, energy_only_capacity_mw
+    project_period_eocap = c.execute(
+        """SELECT project, period, energy_only_capacity_mw
         FROM results_project_deliverability
-            WHERE scenario_id = {};""".format(scenario_id)).fetchall()
+            WHERE scenario_id = ?
+            {};""".format(subset_filter),
+        (scenario_id,) + subset_data,
+    ).fetchall()
 
     tables_to_update = ["results_project_elcc_simple", "results_project_elcc_surface"]
 
     results = []
     for row in project_period_eocap:
-        results.append((row[2], scenario_id, row[0], row[1]))
+        results.append((row[2], scenario_id, row[0], row[1]) + subset_data)
 
     for table in tables_to_update:
         sql = """
@@ -239,24 +246,36 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
             SET energy_only_capacity_mw = ?
             WHERE scenario_id = ?
             AND project = ?
-            AND period = ?;""".format(table)
+            AND period = ?
+            {};""".format(table, subset_filter)
 
         spin_on_database_lock(conn=db, cursor=c, sql=sql, data=results)
 
     # Aggregate costs by period and break out into spinup_or_lookahead.
 
+    # Deliverability costs are summed across iterations, so we recompute them
+    # for all iterations of the subproblems and stages in the results subset
+    agg_subset_filter, agg_subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old resulst
-    del_sql = """
+    del_sql = f"""
         DELETE FROM 
         results_project_deliverability_groups_agg 
         WHERE scenario_id = ?
+        {agg_subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db,
+        cursor=c,
+        sql=del_sql,
+        data=(scenario_id,) + agg_subset_data,
+        many=False,
     )
 
     # Insert new results
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO 
         results_project_deliverability_groups_agg
         (scenario_id, period, subproblem_id, stage_id,
@@ -277,11 +296,16 @@ def process_model_results(db, c, scenario_id, subscenarios, quiet):
         SUM(deliverability_annual_cost_in_period) AS deliverable_capacity_cost
         FROM results_project_deliverability_groups
         WHERE scenario_id = ?
+        {agg_subset_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period)
         ;"""
 
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db,
+        cursor=c,
+        sql=agg_sql,
+        data=(scenario_id,) + agg_subset_data,
+        many=False,
     )
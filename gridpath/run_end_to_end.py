@@ -24,6 +24,7 @@ The main() function of this script can also be called with the
 """
 
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import logging
 import os
@@ -41,6 +42,7 @@ from gridpath.common_functions import (
     create_logs_directory_if_not_exists,
     Logging,
     determine_scenario_directory,
+    ensure_empty_string,
     get_import_results_parser,
 )
 from gridpath import (
@@ -52,6 +54,7 @@ from gridpath import (
 from gridpath.run_scenario import _export_rule, _summarize_rule
 from gridpath.import_scenario_results import _import_rule
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from gridpath.auxiliary.scenario_chars import ScenarioDirectoryStructure, SubScenarios
 
 
 def parse_arguments(args):
@@ -108,11 +111,133 @@ def parse_arguments(args):
         help="Run only the specified E2E step. All others " "will be skipped.",
     )
 
+    parser.add_argument(
+        "--incremental_import",
+        default=False,
+        action="store_true",
+        help="Import (and process) the results of each subproblem as soon as "
+        "it is solved instead of after all subproblems are solved.",
+    )
+
     parsed_arguments = parser.parse_args(args=args)
 
     return parsed_arguments
 
 
+class IncrementalImport(object):
+    """
+    Import the results of each subproblem while the rest of the scenario is
+    still being solved and, if requested, process them, limiting the
+    processing to the imported subproblems (see process_results). Solved
+    subproblems are queued with submit() and imported one at a time on a
+    background thread, which is the only one writing to the database.
+    close() imports the subproblems that were not solved in this run (e.g.
+    with --incomplete_only) and raises again any exception raised on the
+    background thread.
+    """
+
+    def __init__(self, args, process):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.imported_subproblems = set()
+        # The database connection is created and used on the background
+        # thread only
+        self.futures = [self.executor.submit(self.set_up, args, process)]
+
+    def set_up(self, args, process):
+        self.scenario_results_import = import_scenario_results.ScenarioResultsImport(
+            parsed_arguments=import_scenario_results.parse_arguments(args=args)
+        )
+        self.process = process
+        if process:
+            self.subscenarios = SubScenarios(
+                conn=self.scenario_results_import.conn,
+                scenario_id=self.scenario_results_import.scenario_id,
+            )
+
+    def submit(
+        self, weather_iteration, hydro_iteration, availability_iteration, subproblem
+    ):
+        """
+        Queue the import of the results of a solved subproblem.
+        """
+        self.futures.append(
+            self.executor.submit(
+                self.import_subproblems,
+                [
+                    (
+                        weather_iteration,
+                        hydro_iteration,
+                        availability_iteration,
+                        subproblem,
+                    )
+                ],
+            )
+        )
+
+    def import_subproblems(self, subproblems):
+        results_subset = self.scenario_results_import.import_results(
+            subproblems=subproblems
+        )
+        self.imported_subproblems.update(subproblems)
+        if self.process and results_subset:
+            process_results.process_results(
+                loaded_modules=self.scenario_results_import.loaded_modules,
+                db=self.scenario_results_import.conn,
+                cursor=self.scenario_results_import.conn.cursor(),
+                scenario_id=self.scenario_results_import.scenario_id,
+                subscenarios=self.subscenarios,
+                quiet=self.scenario_results_import.quiet,
+                results_subset=results_subset,
+            )
+        self.scenario_results_import.conn.commit()
+
+    def finish(self):
+        scenario_directory_structure = ScenarioDirectoryStructure(
+            self.scenario_results_import.scenario_structure
+        ).SCENARIO_DIRECTORY_STRUCTURE
+        remaining_subproblems = []
+        for weather_iteration_str in scenario_directory_structure.keys():
+            for hydro_iteration_str in scenario_directory_structure[
+                weather_iteration_str
+            ].keys():
+                for availability_iteration_str in scenario_directory_structure[
+                    weather_iteration_str
+                ][hydro_iteration_str]:
+                    for subproblem_str in scenario_directory_structure[
+                        weather_iteration_str
+                    ][hydro_iteration_str][availability_iteration_str].keys():
+                        subproblem = (
+                            ensure_empty_string(weather_iteration_str),
+                            ensure_empty_string(hydro_iteration_str),
+                            ensure_empty_string(availability_iteration_str),
+                            subproblem_str,
+                        )
+                        if subproblem not in self.imported_subproblems:
+                            remaining_subproblems.append(subproblem)
+        if remaining_subproblems:
+            self.import_subproblems(remaining_subproblems)
+        self.scenario_results_import.close()
+
+    def close(self):
+        """
+        Import the remaining subproblems, wait for all imports, and close
+        the database connection.
+        """
+        self.futures.append(self.executor.submit(self.finish))
+        try:
+            for future in self.futures:
+                future.result()
+        finally:
+            self.executor.shutdown()
+
+    def cancel(self):
+        """
+        Stop importing (e.g., if the scenario run failed); results imported
+        since the last commit are not saved.
+        """
+        self.executor.shutdown(cancel_futures=True)
+
+
 # TODO: change all these to use scenario_id, not scenario_name
 def update_run_status(db_path, scenario, status_id):
     """
@@ -381,15 +506,35 @@ def main(args=None):
             )
             sys.exit(1)
 
+    # If requested, import (and process) the results of each subproblem as
+    # it is solved
+    incremental_import = None
+    if (
+        parsed_args.incremental_import
+        and not skip_run_scenario
+        and not parsed_args.skip_run_scenario
+        and not skip_import_results
+        and not parsed_args.skip_import_results
+    ):
+        incremental_import = IncrementalImport(
+            args=args,
+            process=not skip_process_results and not parsed_args.skip_process_results,
+        )
+
     if not skip_run_scenario and not parsed_args.skip_run_scenario:
         try:
             # make sure run_scenario.py gets the required --scenario argument
             run_scenario_args = args + ["--scenario", scenario]
             expected_objective_values = run_scenario.main(
                 args=run_scenario_args,
+                subproblem_complete_callback=(
+                    None if incremental_import is None else incremental_import.submit
+                ),
             )
         except Exception as e:
             logging.exception(e)
+            if incremental_import is not None:
+                incremental_import.cancel()
             end_time = update_db_for_run_end(
                 db_path=db_path,
                 scenario=scenario,
@@ -406,9 +551,14 @@ def main(args=None):
     else:
         expected_objective_values = None
 
+    # Only process the results we import (all results if not importing)
+    results_subset = None
     if not skip_import_results and not parsed_args.skip_import_results:
         try:
-            import_scenario_results.main(args=args)
+            if incremental_import is None:
+                results_subset = import_scenario_results.main(args=args)
+            else:
+                incremental_import.close()
         except Exception as e:
             logging.exception(e)
             end_time = update_db_for_run_end(
@@ -424,9 +574,14 @@ def main(args=None):
             )
             sys.exit(1)
 
-    if not skip_process_results and not parsed_args.skip_process_results:
+    # With incremental import, results were processed as they were imported
+    if (
+        not skip_process_results
+        and not parsed_args.skip_process_results
+        and incremental_import is None
+    ):
         try:
-            process_results.main(args=args)
+            process_results.main(args=args, results_subset=results_subset)
         except Exception as e:
             logging.exception(e)
             end_time = update_db_for_run_end(
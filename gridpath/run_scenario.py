@@ -22,13 +22,15 @@ The main() function of this script can also be called with the
 """
 
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from csv import reader, writer
 import datetime
-import dill
 import gc
 import json
 from multiprocessing import get_context, Manager
 import os.path
+from types import SimpleNamespace
 import xml.etree.ElementTree as ET
 
 from pyomo.environ import (
@@ -46,8 +48,15 @@ from pyomo.common.tempfiles import TempfileManager
 from pyomo.core import ComponentUID, SymbolMap
 from pyomo.opt import ReaderFactory, ResultsFormat, ProblemFormat
 import sys
+import time
 import warnings
 
+from gridpath.auxiliary.checkpoints import (
+    clear_checkpoints,
+    get_completed_subproblems,
+    write_checkpoint,
+)
+from gridpath.auxiliary.model_stats import ConstructionTimeRecorder, write_model_stats
 from gridpath.auxiliary.import_export_rules import import_export_rules
 from gridpath.auxiliary.scenario_chars import (
     get_scenario_structure_from_disk,
@@ -61,8 +70,12 @@ from gridpath.common_functions import (
     create_logs_directory_if_not_exists,
     Logging,
     ensure_empty_string,
+    release_results_dfs,
+)
+from gridpath.auxiliary.dynamic_components import (
+    DynamicComponents,
+    results_format as RESULTS_FORMAT,
 )
-from gridpath.auxiliary.dynamic_components import DynamicComponents
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 
 
@@ -120,6 +133,8 @@ def create_problem(
     # Create the abstract model; some components are initialized here
     if not parsed_arguments.quiet:
         print("Building model...")
+    # Record which module declares each component if model stats requested
+    component_modules = {} if parsed_arguments.model_stats else None
     create_abstract_model(
         model,
         dynamic_components,
@@ -130,14 +145,19 @@ def create_problem(
         availability_iteration,
         subproblem,
         stage,
+        component_modules=component_modules,
     )
 
     if parsed_arguments.report_timing:
         report_timing()
 
     # Create a dual suffix component
-    # TODO: maybe this shouldn't always be needed
-    model.dual = Suffix(direction=Suffix.IMPORT)
+    # Duals are only imported from the solver if requested; with a local
+    # suffix, the solver is not asked for duals and the exported duals will be
+    # empty
+    model.dual = Suffix(
+        direction=(Suffix.LOCAL if parsed_arguments.duals == "none" else Suffix.IMPORT)
+    )
 
     # Load the scenario data
     if not parsed_arguments.quiet:
@@ -156,7 +176,15 @@ def create_problem(
 
     if not parsed_arguments.quiet:
         print("Creating problem instance...")
-    instance = create_problem_instance(model, scenario_data)
+    if parsed_arguments.model_stats:
+        construction_time_recorder = ConstructionTimeRecorder()
+        construction_time_recorder.start()
+        try:
+            instance = create_problem_instance(model, scenario_data)
+        finally:
+            construction_time_recorder.stop()
+    else:
+        instance = create_problem_instance(model, scenario_data)
 
     # Fix variables if modules request so
     instance = fix_variables(
@@ -171,6 +199,24 @@ def create_problem(
         loaded_modules,
     )
 
+    if parsed_arguments.model_stats:
+        if not parsed_arguments.quiet:
+            print("Writing model stats...")
+        write_model_stats(
+            instance=instance,
+            component_modules=component_modules,
+            construction_seconds=construction_time_recorder.seconds,
+            results_directory=os.path.join(
+                scenario_directory,
+                weather_iteration,
+                hydro_iteration,
+                availability_iteration,
+                subproblem,
+                stage,
+                "results",
+            ),
+        )
+
     return dynamic_components, instance
 
 
@@ -179,6 +225,9 @@ def solve_problem(parsed_arguments, instance):
     if not parsed_arguments.quiet:
         print("Solving...")
     results = solve(instance, parsed_arguments)
+    # The solution is loaded into the model components, so release Pyomo's
+    # copy of it and the solver symbol maps before exporting results
+    instance.solutions.clear()
 
     return instance, results
 
@@ -192,12 +241,19 @@ def run_optimization_for_subproblem_stage(
     stage_directory,
     multi_stage,
     parsed_arguments,
+    stage_timings=None,
+    export_pipeline=None,
 ):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem_directory: if there are horizon subproblems, the horizon
     :param stage_directory: if there are stage subproblems, the stage
     :param parsed_arguments: the parsed script arguments
+    :param stage_timings: if a dictionary is passed, the solve and export
+        times (in seconds) are recorded in it
+    :param export_pipeline: if an ExportPipeline object is passed, the
+        results are saved on its background thread rather than before
+        returning
     :return: return the objective function value (Total_Cost); only used in
         testing
 
@@ -211,43 +267,7 @@ def run_optimization_for_subproblem_stage(
     Return the objective function (Total_Cost) value; only used in testing mode
 
     """
-    # Determine whether to skip this optimization before creating logger to
-    # avoid the logging overhead and opening too many files for large
-    # simulations
-    skip_solve = False
-    if parsed_arguments.incomplete_only:
-        termination_condition_file = os.path.join(
-            scenario_directory,
-            weather_iteration_directory,
-            hydro_iteration_directory,
-            availability_iteration_directory,
-            subproblem_directory,
-            stage_directory,
-            "results",
-            "termination_condition.txt",
-        )
-        if os.path.isfile(termination_condition_file):
-            with open(termination_condition_file, "r") as f:
-                termination_condition = f.read()
-            if not parsed_arguments.quiet:
-                print(
-                    f"Subproblem stage {subproblem_directory} "
-                    f"{stage_directory} "
-                    f"previously solved with termination condition "
-                    f"**{termination_condition}**. Skipping solve."
-                )
-            skip_solve = True
-            if not parsed_arguments.quiet:
-                print(
-                    f"Skipping {weather_iteration_directory}/{hydro_iteration_directory}/"
-                    f"{availability_iteration_directory}/{subproblem_directory}/{stage_directory} "
-                    f"(already solved)"
-                )
-            # Force garbage collection to release file descriptor immediately
-            gc.collect()
-            return None  # Exit early without creating logger
-
-    # If directed to do so, log optimization run (only if actually solving)
+    # If directed to do so, log optimization run
     if parsed_arguments.log:
         logs_directory = create_logs_directory_if_not_exists(
             scenario_directory,
@@ -275,155 +295,206 @@ def run_optimization_for_subproblem_stage(
         sys.stdout = logger
         sys.stderr = logger
 
-    if not skip_solve:
-        # If directed, set temporary file directory to be the logs directory
-        # In conjunction with --keepfiles, this will write the solver solution
-        # files into the log directory (rather than a hidden temp folder).
-        # Use the --symbolic argument as well for best debugging results
-        if parsed_arguments.write_solver_files_to_logs_dir:
-            logs_directory = create_logs_directory_if_not_exists(
-                scenario_directory,
-                weather_iteration_directory,
-                hydro_iteration_directory,
-                availability_iteration_directory,
-                subproblem_directory,
-                stage_directory,
-            )
-            TempfileManager.tempdir = logs_directory
+    # If directed, set temporary file directory to be the logs directory
+    # In conjunction with --keepfiles, this will write the solver solution
+    # files into the log directory (rather than a hidden temp folder).
+    # Use the --symbolic argument as well for best debugging results
+    if parsed_arguments.write_solver_files_to_logs_dir:
+        logs_directory = create_logs_directory_if_not_exists(
+            scenario_directory,
+            weather_iteration_directory,
+            hydro_iteration_directory,
+            availability_iteration_directory,
+            subproblem_directory,
+            stage_directory,
+        )
+        TempfileManager.tempdir = logs_directory
 
-        if not parsed_arguments.quiet:
-            print(
-                "\nRunning optimization for scenario {}".format(
-                    scenario_directory.split("/")[-1]
-                )
-            )
-            current_suproblem = os.path.join(
-                weather_iteration_directory,
-                hydro_iteration_directory,
-                availability_iteration_directory,
-                subproblem_directory,
-                stage_directory,
+    if not parsed_arguments.quiet:
+        print(
+            "\nRunning optimization for scenario {}".format(
+                scenario_directory.split("/")[-1]
             )
-            if current_suproblem.endswith("/"):
-                current_suproblem = current_suproblem[:-1]
+        )
+        current_suproblem = os.path.join(
+            weather_iteration_directory,
+            hydro_iteration_directory,
+            availability_iteration_directory,
+            subproblem_directory,
+            stage_directory,
+        )
+        if current_suproblem.endswith("/"):
+            current_suproblem = current_suproblem[:-1]
+
+        print(f"--- subproblem: {current_suproblem}")
 
-            print(f"--- subproblem: {current_suproblem}")
+    # We're expecting subproblem and stage to be strings downstream from here
+    subproblem_directory = str(subproblem_directory)
+    stage_directory = str(stage_directory)
 
-        # We're expecting subproblem and stage to be strings downstream from here
-        subproblem_directory = str(subproblem_directory)
-        stage_directory = str(stage_directory)
+    # Used only if we are writing problem files or loading solutions
+    prob_sol_files_directory = os.path.join(
+        scenario_directory, subproblem_directory, stage_directory, "prob_sol_files"
+    )
 
-        # Used only if we are writing problem files or loading solutions
-        prob_sol_files_directory = os.path.join(
-            scenario_directory, subproblem_directory, stage_directory, "prob_sol_files"
+    solve_start_time = datetime.datetime.now()
+
+    # Create problem instance and either save the problem file or solve the instance
+    # TODO: incompatible options
+    # If we are loading a solution, skip the compilation step; we'll use the saved
+    # instance and dynamic components
+    # Only the requested duals are loaded from the solution file
+    if (
+        parsed_arguments.load_cplex_solution
+        or parsed_arguments.load_gurobi_solution
+        or parsed_arguments.load_highs_solution
+    ):
+        dual_constraints = get_dual_constraints(
+            parsed_arguments=parsed_arguments,
+            scenario_directory=scenario_directory,
+            weather_iteration=weather_iteration_directory,
+            hydro_iteration=hydro_iteration_directory,
+            availability_iteration=availability_iteration_directory,
+            subproblem=subproblem_directory,
+            stage=stage_directory,
+            multi_stage=multi_stage,
+        )
+    if parsed_arguments.load_cplex_solution:
+        solved_instance, results, dynamic_components = load_cplex_xml_solution(
+            prob_sol_files_directory=prob_sol_files_directory,
+            solution_filename="cplex_solution.sol",
+            dual_constraints=dual_constraints,
+        )
+    elif parsed_arguments.load_gurobi_solution:
+        solved_instance, results, dynamic_components = load_gurobi_json_solution(
+            prob_sol_files_directory=prob_sol_files_directory,
+            solution_filename="gurobi_solution.json",
+            dual_constraints=dual_constraints,
+        )
+    elif parsed_arguments.load_highs_solution:
+        solved_instance, results, dynamic_components = load_highs_xml_solution(
+            prob_sol_files_directory=prob_sol_files_directory,
+            solution_filename="highs_solution.sol",
+            dual_constraints=dual_constraints,
+        )
+    else:
+        dynamic_components, instance = create_problem(
+            scenario_directory=scenario_directory,
+            weather_iteration=weather_iteration_directory,
+            hydro_iteration=hydro_iteration_directory,
+            availability_iteration=availability_iteration_directory,
+            subproblem=subproblem_directory,
+            stage=stage_directory,
+            multi_stage=multi_stage,
+            parsed_arguments=parsed_arguments,
+        )
+        report_peak_memory(
+            phase="creating the problem instance",
+            verbose=parsed_arguments.verbose,
         )
 
-        # Create problem instance and either save the problem file or solve the instance
-        # TODO: incompatible options
-        # If we are loading a solution, skip the compilation step; we'll use the saved
-        # instance and dynamic components
-        if parsed_arguments.load_cplex_solution:
-            solved_instance, results, dynamic_components = load_cplex_xml_solution(
-                prob_sol_files_directory=prob_sol_files_directory,
-                solution_filename="cplex_solution.sol",
-            )
-        elif parsed_arguments.load_gurobi_solution:
-            solved_instance, results, dynamic_components = load_gurobi_json_solution(
-                prob_sol_files_directory=prob_sol_files_directory,
-                solution_filename="gurobi_solution.json",
-            )
-        if parsed_arguments.load_highs_solution:
-            solved_instance, results, dynamic_components = load_highs_xml_solution(
-                prob_sol_files_directory=prob_sol_files_directory,
-                solution_filename="highs_solution.sol",
+        if parsed_arguments.create_lp_problem_file_only:
+            # dill is slow to import and only needed to save the problem
+            import dill
+
+            prob_sol_files_directory = os.path.join(
+                scenario_directory,
+                subproblem_directory,
+                stage_directory,
+                "prob_sol_files",
             )
-        else:
-            dynamic_components, instance = create_problem(
-                scenario_directory=scenario_directory,
-                weather_iteration=weather_iteration_directory,
-                hydro_iteration=hydro_iteration_directory,
-                availability_iteration=availability_iteration_directory,
-                subproblem=subproblem_directory,
-                stage=stage_directory,
-                multi_stage=multi_stage,
-                parsed_arguments=parsed_arguments,
+            if not os.path.exists(prob_sol_files_directory):
+                os.makedirs(prob_sol_files_directory)
+            with open(
+                os.path.join(prob_sol_files_directory, "instance.pickle"), "wb"
+            ) as f_out:
+                dill.dump(instance, f_out)
+            with open(
+                os.path.join(prob_sol_files_directory, "dynamic_components.pickle"),
+                "wb",
+            ) as f_out:
+                dill.dump(dynamic_components, f_out)
+
+            smap_id = write_problem_file(
+                instance=instance, prob_sol_files_directory=prob_sol_files_directory
             )
+            symbol_map = instance.solutions.symbol_map[smap_id]
 
-            if parsed_arguments.create_lp_problem_file_only:
-                prob_sol_files_directory = os.path.join(
-                    scenario_directory,
-                    subproblem_directory,
-                    stage_directory,
-                    "prob_sol_files",
-                )
-                if not os.path.exists(prob_sol_files_directory):
-                    os.makedirs(prob_sol_files_directory)
-                with open(
-                    os.path.join(prob_sol_files_directory, "instance.pickle"), "wb"
-                ) as f_out:
-                    dill.dump(instance, f_out)
-                with open(
-                    os.path.join(prob_sol_files_directory, "dynamic_components.pickle"),
-                    "wb",
-                ) as f_out:
-                    dill.dump(dynamic_components, f_out)
-
-                smap_id = write_problem_file(
-                    instance=instance, prob_sol_files_directory=prob_sol_files_directory
-                )
-                symbol_map = instance.solutions.symbol_map[smap_id]
-
-                symbol_cuid_pairs = tuple(
-                    (symbol, ComponentUID(var_weakref, cuid_buffer={}))
-                    for symbol, var_weakref in symbol_map.bySymbol.items()
-                )
+            symbol_cuid_pairs = tuple(
+                (symbol, ComponentUID(var_weakref, cuid_buffer={}))
+                for symbol, var_weakref in symbol_map.bySymbol.items()
+            )
 
-                with open(
-                    os.path.join(prob_sol_files_directory, "symbol_map.pickle"), "wb"
-                ) as f_out:
-                    dill.dump(symbol_cuid_pairs, f_out)
+            with open(
+                os.path.join(prob_sol_files_directory, "symbol_map.pickle"), "wb"
+            ) as f_out:
+                dill.dump(symbol_cuid_pairs, f_out)
 
-                print("Problem file written to {}".format(prob_sol_files_directory))
-                sys.exit()
+            print("Problem file written to {}".format(prob_sol_files_directory))
+            sys.exit()
+        else:
+            # If directed, write the solver output only to the log file
+            if parsed_arguments.log and (
+                parsed_arguments.log_solver_output_to_file_only
+            ):
+                with logger.echo_off():
+                    solved_instance, results = solve_problem(
+                        parsed_arguments=parsed_arguments,
+                        instance=instance,
+                    )
             else:
                 solved_instance, results = solve_problem(
                     parsed_arguments=parsed_arguments,
                     instance=instance,
                 )
+            report_peak_memory(phase="solving", verbose=parsed_arguments.verbose)
 
-        # Save the scenario results to disk
-        save_results(
-            scenario_directory,
-            weather_iteration_directory,
-            hydro_iteration_directory,
-            availability_iteration_directory,
-            subproblem_directory,
-            stage_directory,
-            multi_stage,
-            solved_instance,
-            results,
-            dynamic_components,
-            parsed_arguments,
-        )
+    if stage_timings is not None:
+        stage_timings["solve_seconds"] = (
+            datetime.datetime.now() - solve_start_time
+        ).total_seconds()
 
-        # If logging, we need to return sys.stdout to original (i.e. stop writing
-        # to log file) and close the log file to release file descriptor
-        if parsed_arguments.log:
-            logger.close()
-            sys.stdout = stdout_original
-            sys.stderr = stderr_original
-            # Explicitly delete logger reference and force garbage collection
-            del logger
-            gc.collect()
-
-        # Return the objective function value (in the testing suite, the value
-        # gets checked against the expected value, but this is the only place
-        # this is actually used)
-        if results.solver.termination_condition != "infeasible":
-            if parsed_arguments.testing:
-                return solved_instance.NPV()
-        else:
-            warnings.warn("WARNING: the problem was infeasible!")
+    # Save the scenario results to disk
+    save_results_kwargs = dict(
+        scenario_directory=scenario_directory,
+        weather_iteration=weather_iteration_directory,
+        hydro_iteration=hydro_iteration_directory,
+        availability_iteration=availability_iteration_directory,
+        subproblem=subproblem_directory,
+        stage=stage_directory,
+        multi_stage=multi_stage,
+        instance=solved_instance,
+        results=results,
+        dynamic_components=dynamic_components,
+        parsed_arguments=parsed_arguments,
+        stage_timings=stage_timings,
+    )
+    if export_pipeline is None:
+        save_results(**save_results_kwargs)
+    else:
+        export_pipeline.submit(save_results, **save_results_kwargs)
+
+    # If logging, we need to return sys.stdout to original (i.e. stop writing
+    # to log file) and close the log file to release file descriptor
+    if parsed_arguments.log:
+        logger.close()
+        sys.stdout = stdout_original
+        sys.stderr = stderr_original
+        # Explicitly delete logger reference and force garbage collection
+        del logger
+        gc.collect()
+
+    # Return the objective function value (in the testing suite, the value
+    # gets checked against the expected value, but this is the only place
+    # this is actually used)
+    objective_value = None
+    if results.solver.termination_condition != "infeasible":
+        if parsed_arguments.testing:
+            objective_value = solved_instance.NPV()
+    else:
+        warnings.warn("WARNING: the problem was infeasible!")
+
+    return objective_value
 
 
 def run_optimization_for_subproblem(
@@ -436,15 +507,26 @@ def run_optimization_for_subproblem(
     multi_stage,
     parsed_arguments,
     objective_values,
+    export_pipeline=None,
 ):
     """
     Check if there are stages in the subproblem; if not solve subproblem;
     if, yes, solve each stage sequentially
+
+    Once all stages are complete, write the subproblem's checkpoint.
+
+    If an ExportPipeline object is passed, the results of each stage and the
+    checkpoint are saved on its background thread. A stage's results must be
+    saved before the next stage is created, as the next stage uses its pass
+    through inputs, so only the last stage's results are saved while the
+    next subproblem is created and solved.
     """
     subproblem = 1 if subproblem_directory == "" else int(subproblem_directory)
 
-    for stage_directory in stage_directories:
+    stage_timings = {}
+    for stage_n, stage_directory in enumerate(stage_directories):
         stage = 1 if stage_directory == "" else int(stage_directory)
+        stage_timings[stage_directory] = {}
         objective_values[
             (
                 weather_iteration_directory,
@@ -461,47 +543,52 @@ def run_optimization_for_subproblem(
             stage_directory,
             multi_stage,
             parsed_arguments,
+            stage_timings[stage_directory],
+            export_pipeline,
         )
+        if export_pipeline is not None and stage_n < len(stage_directories) - 1:
+            export_pipeline.wait()
         # Force garbage collection after each stage to release file descriptors
         gc.collect()
 
+    write_checkpoint_kwargs = dict(
+        scenario_directory=scenario_directory,
+        weather_iteration=weather_iteration_directory,
+        hydro_iteration=hydro_iteration_directory,
+        availability_iteration=availability_iteration_directory,
+        subproblem=subproblem_directory,
+        multi_stage=multi_stage,
+        stage_timings=stage_timings,
+        hash_inputs=parsed_arguments.hash_checkpoint_inputs,
+    )
+    if export_pipeline is None:
+        write_checkpoint(**write_checkpoint_kwargs)
+    else:
+        export_pipeline.submit_after_last(write_checkpoint, **write_checkpoint_kwargs)
 
-def is_subproblem_stage_complete(
-    scenario_directory,
-    weather_iteration_directory,
-    hydro_iteration_directory,
-    availability_iteration_directory,
-    subproblem_directory,
-    stage_directory,
-):
+
+def initialize_worker(scenario_directory, multi_stage, modules_to_use):
     """
-    Check if a subproblem stage has been previously solved successfully.
+    :param scenario_directory:
+    :param multi_stage:
+    :param modules_to_use: the list of module names determined by the parent
+        process
 
-    :param scenario_directory: the main scenario directory
-    :param weather_iteration_directory: weather iteration directory
-    :param hydro_iteration_directory: hydro iteration directory
-    :param availability_iteration_directory: availability iteration directory
-    :param subproblem_directory: subproblem directory
-    :param stage_directory: stage directory
-    :return: True if the subproblem stage is complete, False otherwise
-    """
-    termination_condition_file = os.path.join(
-        scenario_directory,
-        weather_iteration_directory,
-        hydro_iteration_directory,
-        availability_iteration_directory,
-        subproblem_directory,
-        stage_directory,
-        "results",
-        "termination_condition.txt",
+    Pool initializer: import the scenario's modules once when the worker
+    process starts rather than with its first subproblem.
+    """
+    set_up_gridpath_modules(
+        scenario_directory=scenario_directory,
+        multi_stage=multi_stage,
+        modules_to_use=modules_to_use,
     )
-    return os.path.isfile(termination_condition_file)
 
 
 def run_optimization_for_subproblem_pool(pool_datum):
     """
     Helper function to easily pass to pool.map if solving subproblems in
-    parallel
+    parallel; returns the subproblem's (weather_iteration, hydro_iteration,
+    availability_iteration, subproblem) directories
     """
     [
         scenario_directory,
@@ -527,17 +614,148 @@ def run_optimization_for_subproblem_pool(pool_datum):
         objective_values=objective_values,
     )
 
+    return (
+        weather_iteration_directory,
+        hydro_iteration_directory,
+        availability_iteration_directory,
+        subproblem_directory,
+    )
+
+
+class ExportPipeline(object):
+    """
+    Save the results of solved subproblems on a background thread, so that
+    the results of one subproblem are exported while the next subproblem is
+    created and solved (the solver runs in a separate process).
+
+    At most *depth* solved subproblems wait for their results to be saved,
+    limiting how many solved instances are held in memory; submitting
+    another one first waits for the oldest to be saved. Exceptions raised
+    when saving results are raised again in the main thread.
+    """
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # Each item is the list of futures for one submitted subproblem stage
+        self.pending = deque()
+        self.start_time = time.perf_counter()
+        self.wait_seconds = 0
+        self.export_seconds = 0
+
+    def run(self, function, kwargs):
+        start_time = time.perf_counter()
+        function(**kwargs)
+        self.export_seconds += time.perf_counter() - start_time
+
+    def submit(self, function, **kwargs):
+        """
+        Queue function(**kwargs), first waiting if *depth* items are queued.
+        """
+        while len(self.pending) >= self.depth:
+            self.wait_for_oldest()
+        self.pending.append([self.executor.submit(self.run, function, kwargs)])
+
+    def submit_after_last(self, function, **kwargs):
+        """
+        Queue function(**kwargs) to run after the last queued item, as part
+        of that item (e.g., to write a checkpoint once results are saved).
+        """
+        future = self.executor.submit(self.run, function, kwargs)
+        if self.pending:
+            self.pending[-1].append(future)
+        else:
+            self.pending.append([future])
+
+    def wait_for_oldest(self):
+        start_time = time.perf_counter()
+        for future in self.pending.popleft():
+            future.result()
+        self.wait_seconds += time.perf_counter() - start_time
+
+    def wait(self):
+        """
+        Wait for all queued items.
+        """
+        while self.pending:
+            self.wait_for_oldest()
+
+    def close(self, quiet):
+        """
+        Wait for all queued items, stop the background thread, and print how
+        much of the time the main (create and solve) and export threads were
+        busy.
+        """
+        self.wait()
+        self.executor.shutdown()
+        wall_seconds = max(time.perf_counter() - self.start_time, 1e-6)
+        main_seconds = wall_seconds - self.wait_seconds
+        if not quiet:
+            print(
+                "Pipeline (depth {}): {:.1f} seconds; create/solve thread busy "
+                "{:.1f} seconds ({:.0%}); export thread busy {:.1f} seconds "
+                "({:.0%})".format(
+                    self.depth,
+                    wall_seconds,
+                    main_seconds,
+                    main_seconds / wall_seconds,
+                    self.export_seconds,
+                    self.export_seconds / wall_seconds,
+                )
+            )
+
+
+def get_export_pipeline(scenario_directory, parsed_arguments):
+    """
+    :return: an ExportPipeline object if requested with --pipeline_depth and
+        possible, None otherwise
+
+    Results are saved in the main thread if the subproblems are linked (the
+    next subproblem needs the previous one's results) or if logging (the
+    output of both threads would go to the current subproblem's log).
+    """
+    if parsed_arguments.pipeline_depth < 1:
+        return None
+    if os.path.exists(os.path.join(scenario_directory, "linked_subproblems_map.csv")):
+        warnings.warn(
+            "GridPath WARNING: subproblems are linked and their results "
+            "cannot be saved while the next subproblem is solved. Ignoring "
+            "--pipeline_depth."
+        )
+        return None
+    if parsed_arguments.log:
+        warnings.warn(
+            "GridPath WARNING: --pipeline_depth cannot be used with --log. "
+            "Ignoring --pipeline_depth."
+        )
+        return None
+
+    return ExportPipeline(depth=parsed_arguments.pipeline_depth)
+
 
 def solve_sequentially(
     scenario_directory_structure,
     scenario_directory,
     scenario_structure,
     parsed_arguments,
+    completed_subproblems,
+    subproblem_complete_callback=None,
 ):
+    """
+    Solve the subproblems one after the other. If a
+    subproblem_complete_callback function is passed, it is called with the
+    subproblem's weather_iteration, hydro_iteration, availability_iteration,
+    and subproblem directories once the subproblem's results are saved.
+    """
     # Create dictionary with which we'll keep track of subproblem/stage
     # objective function values
     objective_values = {}
 
+    # If requested, save the results in the background
+    export_pipeline = get_export_pipeline(
+        scenario_directory=scenario_directory, parsed_arguments=parsed_arguments
+    )
+
     # TODO: refactor this
     for weather_iteration_str in scenario_directory_structure.keys():
         for hydro_iteration_str in scenario_directory_structure[
@@ -560,6 +778,15 @@ def solve_sequentially(
                 ][hydro_iteration_str][availability_iteration_str].keys():
                     subproblem = 1 if subproblem_str == "" else int(subproblem_str)
 
+                    # Skip subproblems that are checkpointed as complete
+                    if (
+                        weather_iteration_str,
+                        hydro_iteration_str,
+                        availability_iteration_str,
+                        subproblem_str,
+                    ) in completed_subproblems:
+                        continue
+
                     # Write pass through input file headers
                     # TODO: this is not the best place for this; we should
                     #  probably set up the gridpath modules only once and do
@@ -600,12 +827,32 @@ def solve_sequentially(
                         multi_stage=scenario_structure.STAGE_FLAG,
                         parsed_arguments=parsed_arguments,
                         objective_values=objective_values,
+                        export_pipeline=export_pipeline,
                     )
+                    if subproblem_complete_callback is not None:
+                        subproblem_complete_callback_kwargs = dict(
+                            weather_iteration=weather_iteration_str,
+                            hydro_iteration=hydro_iteration_str,
+                            availability_iteration=availability_iteration_str,
+                            subproblem=subproblem_str,
+                        )
+                        if export_pipeline is None:
+                            subproblem_complete_callback(
+                                **subproblem_complete_callback_kwargs
+                            )
+                        else:
+                            export_pipeline.submit_after_last(
+                                subproblem_complete_callback,
+                                **subproblem_complete_callback_kwargs,
+                            )
                     # Force garbage collection after each subproblem to release file descriptors
                     gc.collect()
                 # Force garbage collection after each availability iteration
                 gc.collect()
 
+    if export_pipeline is not None:
+        export_pipeline.close(quiet=parsed_arguments.quiet)
+
     return objective_values
 
 
@@ -613,6 +860,8 @@ def run_scenario(
     scenario_directory,
     scenario_structure,
     parsed_arguments,
+    subproblem_complete_callback=None,
+    skip_subproblems=None,
 ):
     """
     Check the scenario structure, iterate over all subproblems if they
@@ -624,6 +873,14 @@ def run_scenario(
     :param scenario_directory: scenario directory path
     :param scenario_structure: the subproblem structure object
     :param parsed_arguments:
+    :param subproblem_complete_callback: function to call with the
+        weather_iteration, hydro_iteration, availability_iteration, and
+        subproblem directories of each subproblem once it is solved and its
+        results are saved (e.g. to import them)
+    :param skip_subproblems: set of the (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem) directories of the subproblems
+        not to solve (e.g. because their results will be copied from
+        another scenario with identical inputs)
     :return: the objective function value (NPV); only used in
      'testing' mode.
     """
@@ -632,6 +889,20 @@ def run_scenario(
         scenario_structure
     ).SCENARIO_DIRECTORY_STRUCTURE
 
+    # If resuming, determine which subproblems are complete from their
+    # checkpoints; otherwise, the checkpoints of prior runs are obsolete
+    if parsed_arguments.incomplete_only:
+        completed_subproblems = get_completed_subproblems(
+            scenario_directory=scenario_directory,
+            scenario_directory_structure=scenario_directory_structure,
+            quiet=parsed_arguments.quiet,
+        )
+    else:
+        clear_checkpoints(scenario_directory=scenario_directory)
+        completed_subproblems = set()
+    if skip_subproblems is not None:
+        completed_subproblems = completed_subproblems | set(skip_subproblems)
+
     # TODO: consolidate parallelization checks
     try:
         n_parallel_subproblems = int(parsed_arguments.n_parallel_solve)
@@ -658,6 +929,8 @@ def run_scenario(
             scenario_directory=scenario_directory,
             scenario_structure=scenario_structure,
             parsed_arguments=parsed_arguments,
+            completed_subproblems=completed_subproblems,
+            subproblem_complete_callback=subproblem_complete_callback,
         )
 
         return objective_values
@@ -677,10 +950,11 @@ def run_scenario(
             )
             objective_values = solve_sequentially(
                 scenario_directory_structure=scenario_directory_structure,
-                subproblem_stage_directory_strings=subproblem_stage_directory_strings,
                 scenario_directory=scenario_directory,
                 scenario_structure=scenario_structure,
                 parsed_arguments=parsed_arguments,
+                completed_subproblems=completed_subproblems,
+                subproblem_complete_callback=subproblem_complete_callback,
             )
 
             return objective_values
@@ -713,7 +987,16 @@ def run_scenario(
                         for subproblem_str in scenario_directory_structure[
                             weather_iteration_str
                         ][hydro_iteration_str][availability_iteration_str].keys():
-                            if scenario_structure.STAGE_FLAG:
+                            if (
+                                scenario_structure.STAGE_FLAG
+                                and (
+                                    weather_iteration_str,
+                                    hydro_iteration_str,
+                                    availability_iteration_str,
+                                    subproblem_str,
+                                )
+                                not in completed_subproblems
+                            ):
                                 create_pass_through_inputs(
                                     scenario_directory,
                                     scenario_structure,
@@ -757,57 +1040,34 @@ def run_scenario(
                         for subproblem_str in scenario_directory_structure[
                             weather_iteration_str
                         ][hydro_iteration_str][availability_iteration_str].keys():
+                            # Skip subproblems that are checkpointed as complete
+                            if (
+                                weather_iteration_str,
+                                hydro_iteration_str,
+                                availability_iteration_str,
+                                subproblem_str,
+                            ) in completed_subproblems:
+                                continue
+
                             stage_directories = scenario_directory_structure[
                                 weather_iteration_str
                             ][hydro_iteration_str][availability_iteration_str][
                                 subproblem_str
                             ]
 
-                            # If --incomplete_only flag is set, filter out complete subproblems
-                            if parsed_arguments.incomplete_only:
-                                # Filter stage directories to only include incomplete stages
-                                incomplete_stage_directories = [
-                                    stage_dir
-                                    for stage_dir in stage_directories
-                                    if not is_subproblem_stage_complete(
-                                        scenario_directory,
-                                        weather_iteration_str,
-                                        hydro_iteration_str,
-                                        availability_iteration_str,
-                                        subproblem_str,
-                                        stage_dir,
-                                    )
+                            pool_data.append(
+                                [
+                                    scenario_directory,
+                                    weather_iteration_str,
+                                    hydro_iteration_str,
+                                    availability_iteration_str,
+                                    subproblem_str,
+                                    stage_directories,
+                                    scenario_structure.STAGE_FLAG,
+                                    parsed_arguments,
+                                    objective_values,
                                 ]
-                                # Only add to pool if there are incomplete stages
-                                if incomplete_stage_directories:
-                                    pool_data.append(
-                                        [
-                                            scenario_directory,
-                                            weather_iteration_str,
-                                            hydro_iteration_str,
-                                            availability_iteration_str,
-                                            subproblem_str,
-                                            incomplete_stage_directories,
-                                            scenario_structure.STAGE_FLAG,
-                                            parsed_arguments,
-                                            objective_values,
-                                        ]
-                                    )
-                            else:
-                                # Add all stages if not filtering
-                                pool_data.append(
-                                    [
-                                        scenario_directory,
-                                        weather_iteration_str,
-                                        hydro_iteration_str,
-                                        availability_iteration_str,
-                                        subproblem_str,
-                                        stage_directories,
-                                        scenario_structure.STAGE_FLAG,
-                                        parsed_arguments,
-                                        objective_values,
-                                    ]
-                                )
+                            )
 
             pool_data = tuple(pool_data)
 
@@ -824,9 +1084,39 @@ def run_scenario(
                 n_parallel_subproblems = n_tasks
 
             # Pool must use spawn to work properly on Linux
-            pool = get_context("spawn").Pool(n_parallel_subproblems)
+            # Workers import the modules the parent process determined for
+            # the scenario when they start
+            modules_to_use, loaded_modules = set_up_gridpath_modules(
+                scenario_directory=scenario_directory,
+                multi_stage=scenario_structure.STAGE_FLAG,
+            )
+            pool = get_context("spawn").Pool(
+                n_parallel_subproblems,
+                initializer=initialize_worker,
+                initargs=(
+                    scenario_directory,
+                    scenario_structure.STAGE_FLAG,
+                    modules_to_use,
+                ),
+            )
 
-            pool.map(run_optimization_for_subproblem_pool, pool_data)
+            if subproblem_complete_callback is None:
+                pool.map(run_optimization_for_subproblem_pool, pool_data)
+            else:
+                for (
+                    weather_iteration_str,
+                    hydro_iteration_str,
+                    availability_iteration_str,
+                    subproblem_str,
+                ) in pool.imap_unordered(
+                    run_optimization_for_subproblem_pool, pool_data
+                ):
+                    subproblem_complete_callback(
+                        weather_iteration=weather_iteration_str,
+                        hydro_iteration=hydro_iteration_str,
+                        availability_iteration=availability_iteration_str,
+                        subproblem=subproblem_str,
+                    )
             pool.close()
 
             return objective_values
@@ -874,6 +1164,7 @@ def save_results(
     results,
     dynamic_components,
     parsed_arguments,
+    stage_timings=None,
 ):
     """
     :param scenario_directory:
@@ -882,6 +1173,8 @@ def save_results(
     :param instance: model instance (solution loaded after solving by default)
     :param dynamic_components:
     :param parsed_arguments:
+    :param stage_timings: if a dictionary is passed, the export time (in
+        seconds) is recorded in it
     :return:
 
     Create a results directory for the (sub)problem.
@@ -890,6 +1183,7 @@ def save_results(
     Save objective function value.
     Save constraint duals.
     """
+    export_start_time = datetime.datetime.now()
     if not parsed_arguments.quiet:
         print("Saving results...")
 
@@ -937,6 +1231,22 @@ def save_results(
                 "export"
             ](instance=instance, quiet=parsed_arguments.quiet)
 
+        # Determine which constraints modules save duals for
+        save_duals(
+            scenario_directory=scenario_directory,
+            weather_iteration=weather_iteration,
+            hydro_iteration=hydro_iteration,
+            availability_iteration=availability_iteration,
+            subproblem=subproblem,
+            stage=stage,
+            multi_stage=multi_stage,
+            instance=instance,
+            dynamic_components=dynamic_components,
+            verbose=parsed_arguments.verbose,
+        )
+        if not parsed_arguments.quiet:
+            print("...{:,} duals loaded".format(len(instance.dual)))
+
         if not parsed_arguments.quiet:
             print("...exporting detailed CSV results")
         export_results(
@@ -951,6 +1261,12 @@ def save_results(
             dynamic_components=dynamic_components,
             export_rule=export_rule,
             verbose=parsed_arguments.verbose,
+            results_format=parsed_arguments.results_format,
+        )
+        # Duals are only used by the detailed results export
+        instance.dual.clear()
+        report_peak_memory(
+            phase="exporting detailed results", verbose=parsed_arguments.verbose
         )
 
         if parsed_arguments.results_export_summary_rule is None:
@@ -977,6 +1293,9 @@ def save_results(
                 dynamic_components=dynamic_components,
                 verbose=parsed_arguments.verbose,
             )
+            report_peak_memory(
+                phase="exporting summary results", verbose=parsed_arguments.verbose
+            )
 
         export_pass_through_inputs(
             scenario_directory=scenario_directory,
@@ -1000,19 +1319,6 @@ def save_results(
             instance=instance,
         )
 
-        save_duals(
-            scenario_directory=scenario_directory,
-            weather_iteration=weather_iteration,
-            hydro_iteration=hydro_iteration,
-            availability_iteration=availability_iteration,
-            subproblem=subproblem,
-            stage=stage,
-            multi_stage=multi_stage,
-            instance=instance,
-            dynamic_components=dynamic_components,
-            verbose=parsed_arguments.verbose,
-        )
-
         # Force garbage collection to release file descriptors immediately
         # This prevents "too many open files" errors when processing many iterations
         gc.collect()
@@ -1036,6 +1342,11 @@ def save_results(
                     "Exiting linked subproblem run.".format(subproblem, stage)
                 )
 
+    if stage_timings is not None:
+        stage_timings["export_seconds"] = (
+            datetime.datetime.now() - export_start_time
+        ).total_seconds()
+
 
 def create_abstract_model(
     model,
@@ -1047,6 +1358,7 @@ def create_abstract_model(
     availability_iteration,
     subproblem,
     stage,
+    component_modules=None,
 ):
     """
     :param model: the Pyomo AbstractModel object
@@ -1055,6 +1367,8 @@ def create_abstract_model(
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param component_modules: if a dictionary is passed, the name of the
+        module that added each component is recorded in it by component name
 
     To create the abstract model, we iterate over all required modules and
     call their *add_model_components* method to add components to the Pyomo
@@ -1074,6 +1388,10 @@ def create_abstract_model(
                 subproblem,
                 stage,
             )
+            if component_modules is not None:
+                module_name = m.__name__.replace("gridpath.", "", 1)
+                for component_name in model.component_map().keys():
+                    component_modules.setdefault(component_name, module_name)
 
 
 def load_scenario_data(
@@ -1326,6 +1644,7 @@ def export_results(
     dynamic_components,
     export_rule,
     verbose,
+    results_format="csv",
 ):
     """
     :param scenario_directory:
@@ -1336,11 +1655,20 @@ def export_results(
     :param dynamic_components:
     :param export_rule:
     :param verbose:
+    :param results_format: the format of the consolidated results files
+        ('csv' or 'parquet')
     :return:
 
-    Export results for each loaded module (if applicable)
+    Export results for each loaded module (if applicable). Modules add their
+    results to results dataframes in the dynamic components, which the
+    *consolidate_results* modules write to disk and then release, so we
+    only hold each dataframe until its last consumer has exported it.
     """
+    # Deferred so that importing this script doesn't import model modules
+    from gridpath.transmission import TX_TIMEPOINT_DF
+
     if export_rule:
+        setattr(dynamic_components, RESULTS_FORMAT, results_format)
         # Determine/load modules and dynamic components
         modules_to_use, loaded_modules = set_up_gridpath_modules(
             scenario_directory=scenario_directory, multi_stage=multi_stage
@@ -1364,6 +1692,11 @@ def export_results(
 
             n += 1
 
+        # Transmission modules loaded after the transmission
+        # consolidate_results module (e.g. hurdle costs) still add to the
+        # transmission timepoint dataframe, so it's released here
+        release_results_dfs(dynamic_components, TX_TIMEPOINT_DF)
+
 
 def export_summary_results(
     scenario_directory,
@@ -1457,6 +1790,36 @@ def export_pass_through_inputs(
         n += 1
 
 
+def get_peak_memory_mb():
+    """
+    :return: the peak resident set size of the process so far in MB (None on
+        platforms without the resource module, i.e. Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak_rss / 1024**2
+    else:
+        return peak_rss / 1024
+
+
+def report_peak_memory(phase, verbose):
+    """
+    :param phase: description of the phase just completed
+    :param verbose: only report if True
+
+    Print the peak memory use of the process after a phase of the run.
+    """
+    if verbose:
+        peak_memory = get_peak_memory_mb()
+        if peak_memory is not None:
+            print("...peak memory after {}: {:,.0f} MB".format(phase, peak_memory))
+
+
 def save_objective_function_value(
     scenario_directory,
     weather_iteration,
@@ -1545,19 +1908,109 @@ def save_duals(
         n += 1
 
 
-def set_up_gridpath_modules(scenario_directory, multi_stage):
+def get_dual_constraints(
+    parsed_arguments,
+    scenario_directory,
+    weather_iteration,
+    hydro_iteration,
+    availability_iteration,
+    subproblem,
+    stage,
+    multi_stage,
+):
+    """
+    :return: the set of the names of the constraints whose duals to load
+        from a solution file, or None to load all duals
+
+    With --duals declared, these are the constraints whose duals modules
+    save, i.e. that they add to *constraint_indices* in their
+    *save_duals()* method. The modules only declare the constraint names
+    (and results columns) there, so we don't need the problem instance.
+    """
+    if parsed_arguments.duals == "all":
+        return None
+    if parsed_arguments.duals == "none":
+        return set()
+
+    declarations = SimpleNamespace()
+    save_duals(
+        scenario_directory=scenario_directory,
+        weather_iteration=weather_iteration,
+        hydro_iteration=hydro_iteration,
+        availability_iteration=availability_iteration,
+        subproblem=subproblem,
+        stage=stage,
+        multi_stage=multi_stage,
+        instance=declarations,
+        dynamic_components=None,
+        verbose=False,
+    )
+
+    return set(declarations.constraint_indices.keys())
+
+
+def is_dual_to_load(constraint_data, dual_constraints):
+    """
+    :param constraint_data: the constraint (data object)
+    :param dual_constraints: set of the names of the constraints whose duals
+        to load (all if None)
+    :return: whether to load the dual of the constraint
+    """
+    return (
+        dual_constraints is None
+        or constraint_data.parent_component().name in dual_constraints
+    )
+
+
+# The modules set up in this process by scenario; see
+# set_up_gridpath_modules()
+GRIDPATH_MODULES = {}
+
+
+def set_up_gridpath_modules(
+    scenario_directory, multi_stage, modules_to_use=None, profile_startup=False
+):
     """
+    :param scenario_directory:
+    :param multi_stage:
+    :param modules_to_use: the list of module names if already determined
+        (e.g. by the parent process of a worker); determined from the
+        scenario's features.csv file if not specified
+    :param profile_startup: boolean; whether to print the time it took to
+        import each module
     :return: list of the names of the modules the scenario uses, list of the
         loaded modules, and the populated dynamic components for the scenario
 
     Set up the modules and dynamic components for a scenario run problem
     instance.
+
+    The modules are determined and imported once per process for each
+    scenario (and features.csv file version), as they are needed for every
+    step of every subproblem stage.
     """
+    try:
+        features_file_stat = os.stat(os.path.join(scenario_directory, "features.csv"))
+        key = (
+            os.path.abspath(scenario_directory),
+            multi_stage,
+            features_file_stat.st_mtime_ns,
+            features_file_stat.st_size,
+        )
+    except OSError:
+        # determine_modules() will report the missing features file
+        key = None
+
+    if key is not None and key in GRIDPATH_MODULES:
+        return GRIDPATH_MODULES[key]
+
     # Determine and load modules
-    modules_to_use = determine_modules(
-        scenario_directory=scenario_directory, multi_stage=multi_stage
-    )
-    loaded_modules = load_modules(modules_to_use)
+    if modules_to_use is None:
+        modules_to_use = determine_modules(
+            scenario_directory=scenario_directory, multi_stage=multi_stage
+        )
+    loaded_modules = load_modules(modules_to_use, profile_startup=profile_startup)
+    if key is not None:
+        GRIDPATH_MODULES[key] = (modules_to_use, loaded_modules)
     # Determine the dynamic components based on the needed modules and input
     # data
     # populate_dynamic_inputs(dynamic_components, loaded_modules,
@@ -1599,12 +2052,15 @@ def parse_arguments(args):
     return parsed_arguments
 
 
-def main(args=None):
+def main(args=None, subproblem_complete_callback=None, skip_subproblems=None):
     """
     This is the 'main' method that runs a scenario. It takes in and parses the
     script arguments, determines the scenario structure (i.e. whether it is a
     single optimization or has subproblems), and runs the scenario.
     This method also returns the objective function value(s).
+
+    See run_scenario for the subproblem_complete_callback and
+    skip_subproblems.
     """
 
     if args is None:
@@ -1630,11 +2086,20 @@ def main(args=None):
         scenario_directory=scenario_directory
     )
 
+    if parsed_args.profile_startup:
+        set_up_gridpath_modules(
+            scenario_directory=scenario_directory,
+            multi_stage=scenario_structure.STAGE_FLAG,
+            profile_startup=True,
+        )
+
     # Run the scenario (can be multiple optimization subproblems)
     expected_objective_values = run_scenario(
         scenario_directory=scenario_directory,
         scenario_structure=scenario_structure,
         parsed_arguments=parsed_args,
+        subproblem_complete_callback=subproblem_complete_callback,
+        skip_subproblems=skip_subproblems,
     )
 
     # Return the objective function values (used in testing)
@@ -1723,12 +2188,20 @@ def write_problem_file(instance, prob_sol_files_directory, problem_format="lp"):
 
 
 def load_cplex_xml_solution(
-    prob_sol_files_directory, solution_filename="cplex_solution.sol"
+    prob_sol_files_directory,
+    solution_filename="cplex_solution.sol",
+    dual_constraints=None,
 ):
     """
     :param prob_sol_files_directory:
     :param solution_filename:
+    :param dual_constraints: set of the names of the constraints whose duals
+        to load (all if None; see *get_dual_constraints()*)
     :return:
+
+    The XML solution file is parsed incrementally and the elements are
+    cleared once their values have been loaded, so memory use doesn't grow
+    with the size of the solution file.
     """
     print(
         "Loading results from solution file {}...".format(
@@ -1739,34 +2212,46 @@ def load_cplex_xml_solution(
         prob_sol_files_directory=prob_sol_files_directory
     )
 
+    start_time = datetime.datetime.now()
+    n_vars, n_duals = 0, 0
+    header = None
+    parent = None
     # Read XML (.sol) solution file
-    root = ET.parse(os.path.join(prob_sol_files_directory, solution_filename)).getroot()
-
-    # Variables
-    for type_tag in root.findall("variables/variable"):
-        var_id, var_index, value = (
-            type_tag.get("name"),
-            type_tag.get("index"),
-            type_tag.get("value"),
-        )
-        # "x2" with value None added for CPLEXSolution version 1.2
-        if not var_id in ["ONE_VAR_CONSTANT", "x2"]:
-            symbol_map.bySymbol[var_id].value = float(value)
-
-    # Constraints
-    for type_tag in root.findall("linearConstraints/constraint"):
-        constraint_id_w_extra_symbols, const_index, dual = (
-            type_tag.get("name"),
-            type_tag.get("index"),
-            type_tag.get("dual"),
-        )
-        if not constraint_id_w_extra_symbols == "c_e_ONE_VAR_CONSTANT":
-            # constraint_id = constraint_id_w_extra_symbols[4:-1]
-            constraint_id = constraint_id_w_extra_symbols
-            instance.dual[symbol_map.bySymbol[constraint_id]] = float(dual)
+    for event, elem in ET.iterparse(
+        os.path.join(prob_sol_files_directory, solution_filename),
+        events=("start", "end"),
+    ):
+        if event == "start":
+            # Keep track of the variables and constraints elements, so that
+            # we can remove their children once loaded
+            if elem.tag in ["variables", "linearConstraints"]:
+                parent = elem
+            continue
 
-    # Solver status
-    header = root.findall("header")[0]  # Need a check that there is only one element
+        # Variables
+        if elem.tag == "variable":
+            var_id, value = elem.get("name"), elem.get("value")
+            # "x2" with value None added for CPLEXSolution version 1.2
+            if not var_id in ["ONE_VAR_CONSTANT", "x2"]:
+                symbol_map.bySymbol[var_id].value = float(value)
+                n_vars += 1
+            parent.clear()
+        # Constraints
+        elif elem.tag == "constraint":
+            constraint_id, dual = elem.get("name"), elem.get("dual")
+            if not constraint_id == "c_e_ONE_VAR_CONSTANT":
+                constraint_data = symbol_map.bySymbol[constraint_id]
+                if is_dual_to_load(constraint_data, dual_constraints):
+                    instance.dual[constraint_data] = float(dual)
+                    n_duals += 1
+            parent.clear()
+        # Solver status
+        elif elem.tag == "header":
+            header = dict(elem.attrib)
+
+    print_solution_loading_summary(
+        n_vars=n_vars, n_duals=n_duals, start_time=start_time
+    )
 
     termination_condition = header.get("solutionStatusString")
     # TODO: what are the types
@@ -1779,12 +2264,20 @@ def load_cplex_xml_solution(
 
 
 def load_gurobi_json_solution(
-    prob_sol_files_directory, solution_filename="gurobi_solution.json"
+    prob_sol_files_directory,
+    solution_filename="gurobi_solution.json",
+    dual_constraints=None,
 ):
     """
     :param prob_sol_files_directory:
     :param solution_filename:
+    :param dual_constraints: set of the names of the constraints whose duals
+        to load (all if None; see *get_dual_constraints()*)
     :return:
+
+    The JSON solution file is read incrementally (see
+    *iterate_json_solution()*), so memory use doesn't grow with the size of
+    the solution file.
     """
     print(
         "Loading results from solution file {}...".format(
@@ -1796,31 +2289,37 @@ def load_gurobi_json_solution(
         prob_sol_files_directory=prob_sol_files_directory
     )
 
-    # #### WORKING VERSION #####
-    # This needs to be under an if statement and execute when we are loading
-    # solution from disk
+    start_time = datetime.datetime.now()
+    n_vars, n_duals = 0, 0
+    solution_info = None
     # Read JSON solution file
     with open(os.path.join(prob_sol_files_directory, solution_filename), "r") as f:
-        solution = json.load(f)
-
-    # Variables
-    for v in solution["Vars"]:
-        var_id, value = v["VTag"][0], v["X"]
-        if not var_id == "ONE_VAR_CONSTANT":
-            symbol_map.bySymbol[var_id]().value = float(value)
-
-    # Constraints
-    for c in solution["Constrs"]:
-        constraint_id, dual = c["CTag"][0][4:], c["Pi"]
-        if not constraint_id == "ONE_VAR_CONSTAN":
-            instance.dual[symbol_map.bySymbol[constraint_id]()] = float(dual)
+        for key, item in iterate_json_solution(f):
+            # Variables
+            if key == "Vars":
+                var_id, value = item["VTag"][0], item["X"]
+                if not var_id == "ONE_VAR_CONSTANT":
+                    symbol_map.bySymbol[var_id].value = float(value)
+                    n_vars += 1
+            # Constraints
+            elif key == "Constrs":
+                constraint_id, dual = item["CTag"][0][4:], item["Pi"]
+                if not constraint_id == "ONE_VAR_CONSTAN":
+                    constraint_data = symbol_map.bySymbol[constraint_id]
+                    if is_dual_to_load(constraint_data, dual_constraints):
+                        instance.dual[constraint_data] = float(dual)
+                        n_duals += 1
+            elif key == "SolutionInfo":
+                solution_info = item
+
+    print_solution_loading_summary(
+        n_vars=n_vars, n_duals=n_duals, start_time=start_time
+    )
 
     # Solver status
     # TODO: what are the types
-    termination_condition = (
-        "optimal" if solution["SolutionInfo"]["Status"] == 2 else "unknown"
-    )
-    solver_status = "ok" if solution["SolutionInfo"]["Status"] == 2 else "unknown"
+    termination_condition = "optimal" if solution_info["Status"] == 2 else "unknown"
+    solver_status = "ok" if solution_info["Status"] == 2 else "unknown"
     results = Results(
         solver_status=solver_status, termination_condition=termination_condition
     )
@@ -1828,13 +2327,109 @@ def load_gurobi_json_solution(
     return instance, results, dynamic_components
 
 
+def iterate_json_solution(f, chunk_size=1048576):
+    """
+    :param f: the open JSON file
+    :param chunk_size: the number of characters to read at a time
+    :return: generator of (key, value) tuples for the keys of the top-level
+        JSON object; for list values, a (key, list item) tuple is yielded for
+        each item in the list instead
+
+    Read a JSON object incrementally, so that large lists (e.g. the variables
+    and constraints in a solution file) don't need to be loaded in memory at
+    once.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    end_of_file = False
+
+    def next_character():
+        # Skip whitespace and return the next character, reading more of
+        # the file if needed
+        nonlocal buffer, position, end_of_file
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or end_of_file:
+                return buffer[position] if position < len(buffer) else ""
+            read_more()
+
+    def read_more():
+        nonlocal buffer, position, end_of_file
+        chunk = f.read(chunk_size)
+        if not chunk:
+            end_of_file = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def decode_value():
+        # Decode the next value, reading more of the file until the buffer
+        # contains the whole value
+        nonlocal position
+        next_character()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # Numbers could be cut off at the end of the buffer, in which
+                # case they are followed by the end of the buffer or by the
+                # rest of the number (e.g. "12." of "12.5")
+                if end_of_file or (
+                    end < len(buffer) and buffer[end] not in "0123456789.eE+-"
+                ):
+                    position = end
+                    return value
+            except json.JSONDecodeError:
+                if end_of_file:
+                    raise
+            read_more()
+
+    def expect(characters):
+        nonlocal position
+        character = next_character()
+        if character not in characters:
+            raise ValueError(
+                "Unexpected character '{}' in JSON file, expected one of "
+                "'{}'.".format(character, characters)
+            )
+        position += 1
+        return character
+
+    expect("{")
+    if next_character() == "}":
+        return
+    while True:
+        key = decode_value()
+        expect(":")
+        if next_character() == "[":
+            position += 1
+            if next_character() == "]":
+                position += 1
+            else:
+                while True:
+                    yield key, decode_value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            yield key, decode_value()
+        if expect(",}") == "}":
+            break
+
+
 def load_highs_xml_solution(
-    prob_sol_files_directory, solution_filename="highs_solution.sol"
+    prob_sol_files_directory,
+    solution_filename="highs_solution.sol",
+    dual_constraints=None,
 ):
     """
     :param prob_sol_files_directory:
     :param solution_filename:
+    :param dual_constraints: set of the names of the constraints whose duals
+        to load (all if None; see *get_dual_constraints()*)
     :return:
+
+    The solution file is read line by line, so memory use doesn't grow with
+    the size of the solution file.
     """
     print(
         "Loading results from solution file {}...".format(
@@ -1845,71 +2440,81 @@ def load_highs_xml_solution(
         prob_sol_files_directory=prob_sol_files_directory
     )
 
-    # Read HiGHS solution file
-    with open(os.path.join(prob_sol_files_directory, solution_filename), "r") as f:
-        lines = f.readlines()
-
-    # Model status is  th second line
-    model_status = lines[1].strip() if len(lines) > 1 else "Unknown"
-    termination_condition = model_status.lower()
-    solver_status = "ok" if termination_condition == "optimal" else "unknown"
+    start_time = datetime.datetime.now()
+    n_vars, n_duals = 0, 0
+    model_status = "Unknown"
 
     # Parse the HiGHS solution file
     section = None
 
-    for line in lines:
-        line = line.strip()
-
-        # Skip empty lines and comments
-        if not line or line.startswith("#"):
-            # Check for section headers in comments
-            if line == "# Primal solution values":
-                section = "primal_start"
-            elif "# Columns" in line and section == "primal_start":
-                section = "primal_columns"
-            elif "# Rows" in line and section == "primal_columns":
-                section = "primal_rows"
-            elif line == "# Dual solution values":
-                section = "dual_start"
-            elif "# Columns" in line and section == "dual_start":
-                section = "dual_columns"
-            elif "# Rows" in line and section in ["dual_start", "dual_columns"]:
-                section = "dual_rows"
-            elif line == "# Basis":
-                # Stop parsing once we reach basis section
-                break
-            continue
-
-        # Skip non-data lines
-        if line in ["Model status", "Feasible", "Valid"]:
-            continue
-        if line.startswith("Objective "):
-            continue
-
-        # Parse primal variable values (x variables only)
-        if section == "primal_columns":
-            parts = line.split()
-            if len(parts) == 2:
-                var_id, value = parts[0], parts[1]
-                if (
-                    var_id.startswith("x")
-                    and var_id in symbol_map.bySymbol
-                    and var_id not in ["ONE_VAR_CONSTANT", "x2"]
-                ):
-                    symbol_map.bySymbol[var_id].value = float(value)
-
-        # Parse constraint dual values (c_ constraints only) from dual rows
-        elif section == "dual_rows":
-            parts = line.split()
-            if len(parts) == 2:
-                constraint_id, dual = parts[0], parts[1]
-                if (
-                    constraint_id.startswith("c_")
-                    and constraint_id in symbol_map.bySymbol
-                    and constraint_id != "c_e_ONE_VAR_CONSTANT"
-                ):
-                    instance.dual[symbol_map.bySymbol[constraint_id]] = float(dual)
+    with open(os.path.join(prob_sol_files_directory, solution_filename), "r") as f:
+        for line_number, line in enumerate(f):
+            line = line.strip()
+
+            # Model status is  th second line
+            if line_number == 1:
+                model_status = line
+
+            # Skip empty lines and comments
+            if not line or line.startswith("#"):
+                # Check for section headers in comments
+                if line == "# Primal solution values":
+                    section = "primal_start"
+                elif "# Columns" in line and section == "primal_start":
+                    section = "primal_columns"
+                elif "# Rows" in line and section == "primal_columns":
+                    section = "primal_rows"
+                elif line == "# Dual solution values":
+                    section = "dual_start"
+                elif "# Columns" in line and section == "dual_start":
+                    section = "dual_columns"
+                elif "# Rows" in line and section in ["dual_start", "dual_columns"]:
+                    section = "dual_rows"
+                elif line == "# Basis":
+                    # Stop parsing once we reach basis section
+                    break
+                continue
+
+            # Skip non-data lines
+            if line in ["Model status", "Feasible", "Valid"]:
+                continue
+            if line.startswith("Objective "):
+                continue
+
+            # Parse primal variable values (x variables only)
+            if section == "primal_columns":
+                parts = line.split()
+                if len(parts) == 2:
+                    var_id, value = parts[0], parts[1]
+                    if (
+                        var_id.startswith("x")
+                        and var_id in symbol_map.bySymbol
+                        and var_id not in ["ONE_VAR_CONSTANT", "x2"]
+                    ):
+                        symbol_map.bySymbol[var_id].value = float(value)
+                        n_vars += 1
+
+            # Parse constraint dual values (c_ constraints only) from dual rows
+            elif section == "dual_rows":
+                parts = line.split()
+                if len(parts) == 2:
+                    constraint_id, dual = parts[0], parts[1]
+                    if (
+                        constraint_id.startswith("c_")
+                        and constraint_id in symbol_map.bySymbol
+                        and constraint_id != "c_e_ONE_VAR_CONSTANT"
+                    ):
+                        constraint_data = symbol_map.bySymbol[constraint_id]
+                        if is_dual_to_load(constraint_data, dual_constraints):
+                            instance.dual[constraint_data] = float(dual)
+                            n_duals += 1
+
+    print_solution_loading_summary(
+        n_vars=n_vars, n_duals=n_duals, start_time=start_time
+    )
 
+    termination_condition = model_status.lower()
+    solver_status = "ok" if termination_condition == "optimal" else "unknown"
     results = Results(
         solver_status=solver_status, termination_condition=termination_condition
     )
@@ -1917,7 +2522,24 @@ def load_highs_xml_solution(
     return instance, results, dynamic_components
 
 
+def print_solution_loading_summary(n_vars, n_duals, start_time):
+    """
+    Print the number of variable values and duals loaded from a solution
+    file and the loading throughput.
+    """
+    seconds = max((datetime.datetime.now() - start_time).total_seconds(), 1e-6)
+    print(
+        "...loaded {:,} variable values and {:,} duals in {:.1f} seconds "
+        "({:,.0f} values per second)".format(
+            n_vars, n_duals, seconds, (n_vars + n_duals) / seconds
+        )
+    )
+
+
 def load_problem_info(prob_sol_files_directory):
+    # dill is slow to import and only needed to load a saved problem
+    import dill
+
     with open(
         os.path.join(prob_sol_files_directory, "instance.pickle"), "rb"
     ) as instance_in:
@@ -11,19 +11,65 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-
 """
 Parallel gridpath_run. Note that parallel gridpath_run_e2e is not yet
 supported. You can get the scenario inputs, solve the scenarios in parallel
 with gridpath_run_parallel, the import the results to the database in sequence.
+
+Sensitivity sweeps often differ in only a few inputs, so many of the
+subproblems of the scenarios can have identical inputs and, therefore,
+identical results. With *--deduplicate_subproblems*, we fingerprint the
+inputs of each subproblem (the scenario-level files and the inputs of all
+of its stages) along with the run options that can affect the solution,
+solve each distinct fingerprint only once, and then copy the results of
+the solved subproblem into every other scenario with the same fingerprint.
+The copied subproblems are checkpointed like solved subproblems, so the
+scenarios can be resumed with *--incomplete_only*, and we report the
+solve time saved. Scenarios with linked subproblems are always solved in
+full, as the inputs of their subproblems depend on the solution of the
+previous subproblem.
 """
 
 from argparse import ArgumentParser
 import csv
+import hashlib
+import json
 from multiprocessing import get_context
+import os.path
+import shutil
 import sys
 
-from gridpath.run_scenario import main as run_scenario_main
+from gridpath.auxiliary.checkpoints import (
+    get_subproblem_inputs_fingerprint,
+    get_subproblem_stages,
+    read_checkpoints,
+    write_checkpoint,
+)
+from gridpath.auxiliary.scenario_chars import (
+    get_scenario_structure_from_disk,
+    ScenarioDirectoryStructure,
+)
+from gridpath.common_functions import determine_scenario_directory, ensure_empty_string
+from gridpath.run_scenario import (
+    main as run_scenario_main,
+    parse_arguments as parse_run_scenario_arguments,
+)
+
+# run_scenario options that don't affect the solution, so scenarios
+# that only differ in these can share subproblem results
+DEDUPLICATION_IGNORED_ARGUMENTS = [
+    "scenario",
+    "scenario_location",
+    "log",
+    "quiet",
+    "verbose",
+    "mute_solver_output",
+    "incomplete_only",
+    "hash_checkpoint_inputs",
+    "n_parallel_solve",
+    "pipeline_depth",
+    "profile_startup",
+]
 
 
 def parse_arguments(arguments):
@@ -40,6 +86,13 @@ def parse_arguments(arguments):
         help="The file containing the scenarios to run along with their run_scenario options.",
     )
     parser.add_argument("--n_parallel_scenarios", help="Solve n scenarios in parallel.")
+    parser.add_argument(
+        "--deduplicate_subproblems",
+        default=False,
+        action="store_true",
+        help="Solve subproblems with identical inputs in multiple scenarios "
+        "only once and copy their results into the other scenarios.",
+    )
     # Parse arguments
     parsed_arguments = parser.parse_known_args(args=arguments)[0]
 
@@ -82,22 +135,223 @@ def main(args=None):
 
                 id += 1
 
+    # Determine which subproblems to solve and which to copy from
+    # another scenario
+    if parsed_args.deduplicate_subproblems:
+        scenario_directories, multi_stage_flags, duplicates = get_duplicate_subproblems(
+            args_for_run_scenario=args_for_run_scenario
+        )
+    else:
+        duplicates = {}
+
     # Create pool
     pool = get_context("spawn").Pool(n_parallel_scenarios)
 
-    pool_data = tuple(args_for_run_scenario)
+    pool_data = tuple(
+        [
+            scenario_args,
+            set(duplicates.get(scenario_n, {}).keys()),
+        ]
+        for scenario_n, scenario_args in enumerate(args_for_run_scenario)
+    )
     pool.map(run_scenario_pool, pool_data)
     pool.close()
 
+    if parsed_args.deduplicate_subproblems:
+        copy_duplicate_subproblem_results(
+            scenarios=scenarios,
+            scenario_directories=scenario_directories,
+            multi_stage_flags=multi_stage_flags,
+            duplicates=duplicates,
+        )
+
 
 def run_scenario_pool(pool_datum):
     """
     Helper function to pass to pool.map if solving scenarios in parallel.
     """
+    scenario_args, skip_subproblems = pool_datum
     run_scenario_main(
-        args=pool_datum,
+        args=scenario_args,
+        skip_subproblems=skip_subproblems,
+    )
+
+
+def get_run_options_fingerprint(scenario_args):
+    """
+    :param scenario_args: the run_scenario arguments of the scenario
+    :return: the run_scenario options (and their values) that can affect the
+        solution, sorted by name
+    """
+    return sorted(
+        [argument, value]
+        for argument, value in zip(scenario_args[::2], scenario_args[1::2])
+        if argument.lstrip("-") not in DEDUPLICATION_IGNORED_ARGUMENTS
+    )
+
+
+def get_duplicate_subproblems(args_for_run_scenario):
+    """
+    :param args_for_run_scenario: list of the run_scenario arguments of each
+        scenario
+    :return: the list of scenario directories, the list of the scenarios'
+        multi-stage flags, and a dictionary by scenario (index) of the
+        subproblems whose results can be copied from another scenario, with
+        the (weather_iteration, hydro_iteration, availability_iteration,
+        subproblem) directories as keys and the index of the scenario that
+        will solve the subproblem as values
+
+    Each subproblem is solved by the first scenario with its fingerprint.
+    """
+    scenario_directories = []
+    multi_stage_flags = []
+    duplicates = {}
+    solving_scenario_by_fingerprint = {}
+    for scenario_n, scenario_args in enumerate(args_for_run_scenario):
+        parsed_args = parse_run_scenario_arguments(scenario_args)
+        scenario_directory = determine_scenario_directory(
+            scenario_location=parsed_args.scenario_location,
+            scenario_name=parsed_args.scenario,
+        )
+        scenario_structure = get_scenario_structure_from_disk(
+            scenario_directory=scenario_directory
+        )
+        scenario_directories.append(scenario_directory)
+        multi_stage_flags.append(scenario_structure.STAGE_FLAG)
+
+        if os.path.exists(
+            os.path.join(scenario_directory, "linked_subproblems_map.csv")
+        ):
+            continue
+
+        run_options = get_run_options_fingerprint(scenario_args)
+        scenario_directory_structure = ScenarioDirectoryStructure(
+            scenario_structure
+        ).SCENARIO_DIRECTORY_STRUCTURE
+        for weather_iteration in scenario_directory_structure.keys():
+            for hydro_iteration in scenario_directory_structure[
+                weather_iteration
+            ].keys():
+                for availability_iteration in scenario_directory_structure[
+                    weather_iteration
+                ][hydro_iteration].keys():
+                    for subproblem in scenario_directory_structure[weather_iteration][
+                        hydro_iteration
+                    ][availability_iteration].keys():
+                        key = (
+                            ensure_empty_string(weather_iteration),
+                            ensure_empty_string(hydro_iteration),
+                            ensure_empty_string(availability_iteration),
+                            subproblem,
+                        )
+                        fingerprint = hashlib.sha256(
+                            json.dumps(
+                                [
+                                    run_options,
+                                    key,
+                                    get_subproblem_inputs_fingerprint(
+                                        scenario_directory,
+                                        *key,
+                                        multi_stage=scenario_structure.STAGE_FLAG,
+                                    ),
+                                ]
+                            ).encode()
+                        ).hexdigest()
+                        if fingerprint in solving_scenario_by_fingerprint:
+                            duplicates.setdefault(scenario_n, {})[key] = (
+                                solving_scenario_by_fingerprint[fingerprint]
+                            )
+                        else:
+                            solving_scenario_by_fingerprint[fingerprint] = scenario_n
+
+    return scenario_directories, multi_stage_flags, duplicates
+
+
+def copy_duplicate_subproblem_results(
+    scenarios, scenario_directories, multi_stage_flags, duplicates
+):
+    """
+    :param scenarios: list of the scenario names
+    :param scenario_directories: list of the scenario directories
+    :param multi_stage_flags: list of the scenarios' multi-stage flags
+    :param duplicates: dictionary of the duplicate subproblems by scenario
+        (see get_duplicate_subproblems)
+    :return: the solve time saved in seconds
+
+    Copy the results (and pass-through inputs) of each duplicate subproblem
+    from the scenario that solved it, checkpoint the subproblem, and report
+    the number of subproblems deduplicated and the solve time saved.
+    Subproblems are only copied if the solving scenario checkpointed them
+    as complete.
+    """
+    checkpoints_by_scenario = {}
+    n_subproblems_copied = 0
+    solve_seconds_saved = 0
+    for scenario_n, scenario_duplicates in duplicates.items():
+        for key, solving_scenario_n in scenario_duplicates.items():
+            if solving_scenario_n not in checkpoints_by_scenario:
+                checkpoints_by_scenario[solving_scenario_n] = read_checkpoints(
+                    scenario_directories[solving_scenario_n]
+                )
+            manifest = checkpoints_by_scenario[solving_scenario_n].get(key)
+            if manifest is None:
+                print(
+                    "WARNING: subproblem {} of scenario {} was not solved, so "
+                    "its results were not copied to scenario {}.".format(
+                        "/".join([d for d in key if d != ""]) or "1",
+                        scenarios[solving_scenario_n],
+                        scenarios[scenario_n],
+                    )
+                )
+                continue
+
+            from_subproblem_directory = os.path.join(
+                scenario_directories[solving_scenario_n], *key
+            )
+            to_subproblem_directory = os.path.join(
+                scenario_directories[scenario_n], *key
+            )
+            stages = get_subproblem_stages(
+                to_subproblem_directory, multi_stage_flags[scenario_n]
+            )
+            directories_to_copy = [os.path.join(stage, "results") for stage in stages]
+            if multi_stage_flags[scenario_n]:
+                directories_to_copy.append("pass_through_inputs")
+            for directory in directories_to_copy:
+                shutil.rmtree(
+                    os.path.join(to_subproblem_directory, directory),
+                    ignore_errors=True,
+                )
+                shutil.copytree(
+                    os.path.join(from_subproblem_directory, directory),
+                    os.path.join(to_subproblem_directory, directory),
+                )
+
+            write_checkpoint(
+                scenario_directory=scenario_directories[scenario_n],
+                weather_iteration=key[0],
+                hydro_iteration=key[1],
+                availability_iteration=key[2],
+                subproblem=key[3],
+                multi_stage=multi_stage_flags[scenario_n],
+                stage_timings={
+                    stage: {"results_copied_from": scenarios[solving_scenario_n]}
+                    for stage in stages
+                },
+            )
+            n_subproblems_copied += 1
+            solve_seconds_saved += sum(
+                stage_results.get("solve_seconds", 0)
+                for stage_results in manifest["stages"].values()
+            )
+
+    print(
+        "Deduplicated {} subproblem(s); saved {:.1f} seconds of solve "
+        "time.".format(n_subproblems_copied, solve_seconds_saved)
     )
 
+    return solve_seconds_saved
+
 
 if __name__ == "__main__":
     main()
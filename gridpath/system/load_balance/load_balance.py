@@ -41,6 +41,7 @@ import pandas as pd
 from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_results_subset_filter
 from gridpath.auxiliary.dynamic_components import (
     load_balance_consumption_components,
     load_balance_production_components,
@@ -359,7 +360,24 @@ def export_summary_results(
     )
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def save_duals(
+    scenario_directory,
+    weather_iteration,
+    hydro_iteration,
+    availability_iteration,
+    subproblem,
+    stage,
+    instance,
+    dynamic_components,
+):
+    instance.constraint_indices["Meet_Load_Constraint"] = [
+        "load_zone",
+        "timepoint",
+        "dual",
+    ]
+
+
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate capacity costs by load zone, and break out into
     spinup_or_lookahead.
@@ -367,21 +385,29 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
+
+    The timepoint and day summaries are only recomputed for the results
+    subset; the loss of load metrics are then recomputed from the
+    scenario's summaries.
     """
     if not quiet:
         print("calculating loss of load timepoint summary")
 
+    subset_filter, subset_data = get_results_subset_filter(results_subset)
+
     # results_system_timepoint_loss_of_load_summary
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_system_timepoint_loss_of_load_summary
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_system_timepoint_loss_of_load_summary
         (scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, timepoint, period, 
@@ -397,27 +423,29 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(unserved_energy_mw) AS unserved_energy_mw
         FROM results_system_load_zone_timepoint_loss_of_load_summary
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, timepoint
         ORDER BY scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, timepoint;"""
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     if not quiet:
         print("calculating loss of load days summary")
 
     # results_system_days_loss_of_load_summary
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_system_days_loss_of_load_summary
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_system_days_loss_of_load_summary
         (scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, period, month, 
@@ -432,6 +460,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(number_of_hours_in_timepoint)
         FROM results_system_timepoint_loss_of_load_summary
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, weather_iteration, hydro_iteration, 
         availability_iteration, subproblem_id, stage_id, period, month, 
         day_of_month
@@ -439,7 +468,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         availability_iteration, subproblem_id, stage_id, period, month, 
         day_of_month;"""
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     if not quiet:
@@ -15,6 +15,7 @@
 
 import os.path
 
+from gridpath.common_functions import release_results_dfs
 from gridpath.system.policy.carbon_cap import CARBON_CAP_ZONE_PRD_DF
 
 
@@ -47,3 +48,5 @@ def export_results(
         sep=",",
         index=True,
     )
+
+    release_results_dfs(d, CARBON_CAP_ZONE_PRD_DF)
@@ -15,6 +15,7 @@
 
 import os.path
 
+from gridpath.common_functions import release_results_dfs
 from gridpath.system.policy.energy_targets import (
     ENERGY_TARGET_ZONE_PRD_DF,
     ENERGY_TARGET_ZONE_HRZ_DF,
@@ -64,3 +65,5 @@ def export_results(
             sep=",",
             index=True,
         )
+
+    release_results_dfs(d, ENERGY_TARGET_ZONE_PRD_DF, ENERGY_TARGET_ZONE_HRZ_DF)
@@ -15,6 +15,7 @@
 
 import os.path
 
+from gridpath.common_functions import release_results_dfs
 from gridpath.system.policy.generic_policy import POLICY_ZONE_PRD_DF, POLICY_MH_DF
 
 
@@ -56,3 +57,5 @@ def export_results(
             sep=",",
             index=True,
         )
+
+    release_results_dfs(d, POLICY_ZONE_PRD_DF, POLICY_MH_DF)
@@ -15,6 +15,8 @@
 
 from pyomo.environ import Set, Expression
 
+from gridpath.auxiliary.auxiliary import linear_combination
+
 
 def generic_add_model_components(
     m,
@@ -55,10 +57,12 @@ def generic_add_model_components(
 
     # Reserve provision
     def total_reserve_rule(mod, ba, tmp):
-        return sum(
-            getattr(mod, generator_reserve_provision_variable)[g, tmp]
+        reserve_provision = getattr(mod, generator_reserve_provision_variable)
+        reserve_zone = getattr(mod, reserve_zone_param)
+        return linear_combination(
+            (1, reserve_provision[g, tmp])
             for g in getattr(mod, op_set)[tmp]
-            if getattr(mod, reserve_zone_param)[g] == ba
+            if reserve_zone[g] == ba
         )
 
     setattr(
@@ -16,6 +16,8 @@
 Flows across water links.
 """
 
+from bisect import bisect_left
+from itertools import accumulate
 import os.path
 
 from pyomo.environ import (
@@ -34,8 +36,6 @@ from pyomo.environ import (
 from gridpath.auxiliary.db_interface import directories_to_db_values, import_csv
 from gridpath.common_functions import create_results_df
 from gridpath.project.common_functions import (
-    check_if_boundary_type_and_last_timepoint,
-    check_boundary_type,
     check_if_boundary_type_and_first_timepoint,
 )
 from gridpath.project.operations.operational_types.common_functions import (
@@ -482,99 +482,96 @@ def determine_future_timepoint(mod, dep_tmp, time_from_dep_tmp, keep_tmps=False)
     issues. You could also see issues if timepoints don't receive any flows
     because of short durations. This functionality is new and not yet
     extensively tested, so proceed with caution.
+
+    The arrival timepoint is the first timepoint after the departure
+    timepoint whose start is at least time_from_dep_tmp hours after the
+    start of the departure timepoint; it is looked up with a binary search
+    on the cumulative hours of the departure timepoint's horizon (see
+    get_water_travel_time_map). If the travel time is less than the hours in
+    the departure timepoint, balancing happens within the departure
+    timepoint. If there is no such timepoint in a 'linear' horizon or we
+    loop back past the departure timepoint in a 'circular' horizon,
+    the arrival timepoint is 'tmp_outside_horizon'. In a 'linked' horizon,
+    the arrival timepoint is None.
+
+    If keep_tmps is True, the list of timepoints from the timepoint after the
+    departure timepoint through the arrival timepoint is returned instead.
     """
-    dep_to_arr_tmps_list = []
+    (tmps, cumulative_hours, boundary), dep_index = get_water_travel_time_map(mod)[
+        dep_tmp
+    ]
+
     # If travel time is less than the hours in the departure timepoint,
     # balancing happens within the departure timepoint
     if time_from_dep_tmp < mod.hrs_in_tmp[dep_tmp]:
         arr_tmp = dep_tmp
-        if keep_tmps:
-            dep_to_arr_tmps_list.append(arr_tmp)
-    # If this is the last timepoint of a linear horizon, there are no
-    # timepoints to check and we'll return 'tmp_outside_horizon'
-    elif check_if_boundary_type_and_last_timepoint(
-        mod=mod,
-        tmp=dep_tmp,
-        balancing_type=mod.water_system_balancing_type,
-        boundary_type="linear",
-    ):
-        arr_tmp = "tmp_outside_horizon"
-        if keep_tmps:
-            dep_to_arr_tmps_list.append(arr_tmp)
-    elif check_if_boundary_type_and_last_timepoint(
-        mod=mod,
-        tmp=dep_tmp,
-        balancing_type=mod.water_system_balancing_type,
-        boundary_type="linked",
-    ):
-        # TODO: add linked
-        arr_tmp = None
+        dep_to_arr_tmps_list = [arr_tmp]
     else:
-        # Otherwise, we check the following timepoints
-        # First we'll check the next timepoint of the starting timepoint and
-        # start with the duration of the starting timepoint
-        arr_tmp = mod.next_tmp[dep_tmp, mod.water_system_balancing_type]
-        dep_to_arr_tmps_list.append(arr_tmp)
-        hours_from_departure_tmp = mod.hrs_in_tmp[dep_tmp]
-        while hours_from_departure_tmp < time_from_dep_tmp:
-            # If we haven't exceeded the travel time yet, we move on to the next tmp
-            # In a 'linear' horizon setting, once we reach the last
-            # timepoint of the horizon, we set the arrival timepoint to
-            # "tmp_outside_horizon" and break out of the loop
-            if check_if_boundary_type_and_last_timepoint(
-                mod=mod,
-                tmp=arr_tmp,
-                balancing_type=mod.water_system_balancing_type,
-                boundary_type="linear",
-            ):
-                arr_tmp = "tmp_outside_horizon"
-                if keep_tmps:
-                    dep_to_arr_tmps_list.append(arr_tmp)
-                break
-            # In a 'circular' horizon setting, once we loop back to the
-            # departure timepoint again, we break out of the loop since there
-            # are no more timepoints to consider (we have already checked all
-            # horizon timepoints)
-            elif (
-                check_boundary_type(
-                    mod=mod,
-                    tmp=dep_tmp,
-                    balancing_type=mod.water_system_balancing_type,
-                    boundary_type="circular",
-                )
-                and arr_tmp == dep_tmp
-            ):
-                arr_tmp = "tmp_outside_horizon"
-                if keep_tmps:
-                    dep_to_arr_tmps_list.append(arr_tmp)
-                break
+        # In a 'circular' horizon, we can check all other horizon timepoints
+        # and the departure timepoint again (the horizon timepoints are
+        # repeated twice); otherwise, we can check the timepoints through
+        # the last timepoint of the horizon
+        if boundary == "circular":
+            last_index = dep_index + len(tmps) // 2
+        else:
+            last_index = len(tmps) - 1
+        arr_index = bisect_left(
+            cumulative_hours,
+            cumulative_hours[dep_index] + time_from_dep_tmp,
+            lo=dep_index + 1,
+            hi=last_index + 1,
+        )
+        if arr_index <= last_index:
+            arr_tmp = tmps[arr_index]
+            dep_to_arr_tmps_list = tmps[dep_index + 1 : arr_index + 1]
+        else:
+            dep_to_arr_tmps_list = tmps[dep_index + 1 : last_index + 1]
             # TODO: only allow the first horizon of a subproblem to have
             #  linked timepoints
-            # In a 'linked' horizon setting, once we reach the first
-            # timepoint of the horizon, we'll start adding the linked
-            # timepoints until we reach the target min time
-            elif check_if_boundary_type_and_last_timepoint(
-                mod=mod,
-                tmp=arr_tmp,
-                balancing_type=mod.water_system_balancing_type,
-                boundary_type="linked",
-            ):
+            if boundary == "linked":
                 # TODO: add linked
                 arr_tmp = None
-                break
-            # Otherwise, we move on to the next timepoint and will add that
-            # timepoint's duration to hours_from_departure_tmp
             else:
-                hours_from_departure_tmp += mod.hrs_in_tmp[arr_tmp]
-                arr_tmp = mod.next_tmp[arr_tmp, mod.water_system_balancing_type]
-                if keep_tmps:
-                    dep_to_arr_tmps_list.append(arr_tmp)
+                arr_tmp = "tmp_outside_horizon"
+                dep_to_arr_tmps_list.append(arr_tmp)
+
     if keep_tmps:
         return dep_to_arr_tmps_list
     else:
         return arr_tmp
 
 
+def get_water_travel_time_map(mod):
+    """
+    Get the map from each timepoint to the travel-time lookup data of its
+    horizon for the water system balancing type, i.e. the ordered horizon
+    timepoints, their cumulative hours from the start of the horizon,
+    and the horizon boundary, along with the timepoint's index in the
+    horizon timepoints. In 'circular' horizons, the horizon timepoints are
+    repeated twice, so that we can look up arrivals after looping back to
+    the first timepoint of the horizon.
+
+    The map is built once per model instance and shared by all water flow
+    set initializers.
+    """
+    if not hasattr(mod, "water_travel_time_map"):
+        travel_time_map = dict()
+        for bt, hrz in mod.BLN_TYPE_HRZS:
+            if bt != value(mod.water_system_balancing_type):
+                continue
+            hrz_tmps = list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz])
+            boundary = mod.boundary[bt, hrz]
+            tmps = hrz_tmps * 2 if boundary == "circular" else hrz_tmps
+            cumulative_hours = [0] + list(
+                accumulate(mod.hrs_in_tmp[tmp] for tmp in tmps)
+            )
+            for index, tmp in enumerate(hrz_tmps):
+                travel_time_map[tmp] = ((tmps, cumulative_hours, boundary), index)
+        mod.water_travel_time_map = travel_time_map
+
+    return mod.water_travel_time_map
+
+
 def load_model_data(
     m,
     d,
@@ -75,6 +75,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import (
     determine_table_subset_by_start_and_column,
     directories_to_db_values,
+    get_results_subset_filter,
 )
 from gridpath.auxiliary.validations import write_validation_to_database
 
@@ -401,13 +402,14 @@ def write_model_inputs(
             writer.writerow(replace_nulls)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     # Check if there are any spinup or lookahead timepoints
@@ -430,6 +432,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         tables_to_update = determine_table_subset_by_start_and_column(
             conn=db, tbl_start="results_", cols=["timepoint", "spinup_or_lookahead"]
         )
+        subset_filter, subset_data = get_results_subset_filter(results_subset)
 
         for tbl in tables_to_update:
             if not quiet:
@@ -449,10 +452,13 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 AND {tbl}.stage_id = inputs_temporal.stage_id
                 AND {tbl}.timepoint = inputs_temporal.timepoint
                 )
-                WHERE scenario_id = {scenario_id};
+                WHERE scenario_id = {scenario_id}
+                {subset_filter};
                 """.format(tbl, tbl, tbl, tbl)
 
-            spin_on_database_lock(conn=db, cursor=c, sql=sql, data=(), many=False)
+            spin_on_database_lock(
+                conn=db, cursor=c, sql=sql, data=subset_data, many=False
+            )
 
 
 # Validation
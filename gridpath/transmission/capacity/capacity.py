@@ -31,6 +31,7 @@ from gridpath.auxiliary.auxiliary import (
     get_required_subtype_modules,
     join_sets,
 )
+from gridpath.auxiliary.db_interface import get_results_subset_filter
 from gridpath.common_functions import create_results_df
 from gridpath.transmission import TX_PERIOD_DF
 from gridpath.transmission.capacity.common_functions import (
@@ -334,7 +335,7 @@ def save_duals(
 ###############################################################################
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate capacity costs by "to_zone" load zone, and break out into
     spinup_or_lookahead.
@@ -342,22 +343,30 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate tx capacity costs by load zone")
 
+    # Capacity costs are summed across iterations, so we recompute them for
+    # all iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old resulst
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_costs_capacity_agg 
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Insert new results
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_costs_capacity_agg
         (scenario_id, load_zone, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost)
@@ -386,11 +395,17 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         load_zone_to AS load_zone,
         SUM(capacity_cost) AS capacity_cost
         FROM results_transmission_period
+        WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period, load_zone)
         ;"""
 
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id,), many=False
+        conn=db,
+        cursor=c,
+        sql=agg_sql,
+        data=(scenario_id, scenario_id) + subset_data,
+        many=False,
     )
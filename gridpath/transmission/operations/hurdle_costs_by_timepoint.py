@@ -27,6 +27,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.db_interface import (
     directories_to_db_values,
+    get_results_subset_filter,
 )
 from gridpath.auxiliary.validations import (
     write_validation_to_database,
@@ -410,7 +411,7 @@ def write_model_inputs(
             writer.writerow(replace_nulls)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate costs by zone and period. Costs are allocated to the destination
     zone. I.e. positive direction hurdle costs are allocated to the to-zone
@@ -419,22 +420,30 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate hurdle costs")
 
+    # Hurdle costs are summed across iterations, so we recompute them for
+    # all iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_hurdle_costs_by_timepoint_agg
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate hurdle costs by period, load zone, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_hurdle_costs_by_timepoint_agg
         (scenario_id, subproblem_id, stage_id, timepoint, load_zone, 
         spinup_or_lookahead, tx_hurdle_cost_by_timepoint)
@@ -451,6 +460,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         number_of_hours_in_timepoint) AS pos_dir_hurdle_cost_by_tmp
         FROM results_transmission_timepoint
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ) AS pos_dir_hurdle_costs_by_tmp
@@ -463,6 +473,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         number_of_hours_in_timepoint) AS neg_dir_hurdle_cost_by_tmp
         FROM results_transmission_timepoint
         WHERE scenario_id = ?
+        {subset_filter}
         GROUP BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, timepoint, load_zone, spinup_or_lookahead
         ) AS neg_dir_hurdle_costs_by_tmp
@@ -472,7 +483,11 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         ;"""
 
     spin_on_database_lock(
-        conn=db, cursor=c, sql=agg_sql, data=(scenario_id, scenario_id), many=False
+        conn=db,
+        cursor=c,
+        sql=agg_sql,
+        data=((scenario_id,) + subset_data) * 2,
+        many=False,
     )
 
 
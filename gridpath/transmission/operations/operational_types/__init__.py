@@ -290,7 +290,7 @@ def import_results_into_database(
             )
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Go through each relevant operational type and process the results
     for that operational type.
@@ -299,6 +299,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
 
@@ -313,7 +314,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     for op_m in required_tx_opchar_modules:
         if hasattr(imported_tx_operational_modules[op_m], "process_model_results"):
             imported_tx_operational_modules[op_m].process_model_results(
-                db, c, scenario_id, subscenarios, quiet
+                db, c, scenario_id, subscenarios, quiet, results_subset=results_subset
             )
 
 
@@ -48,6 +48,7 @@ Linear Optimal Power Flow Using Cycle Flows".
 
 """
 
+from functools import lru_cache
 import networkx as nx
 import os
 import pandas as pd
@@ -287,31 +288,87 @@ def periods_cycles_zones_init(mod):
     (nodes) that belong to it. We do this for each period since the network
     can change between periods as we add/remove transmission lines (edges).
 
+    The cycles of each period are looked up with get_cycle_incidence, so
+    the networkx calculations are only performed once for each distinct set
+    of operational DC OPF lines (and reused across periods and subproblems
+    with the same network). The per-period cycles are kept in the
+    tx_dcopf_cycles_by_period dictionary on the model, from which all other
+    derived sets and params are initialized.
+
     The result is returned as a 3-dimensional set of period-cycle-zone
     combinations, e.g. (2030, 1, zone1) means that zone1 belongs to cycle 1
-    in period 2030. This is the key set on which all other derived sets are
-    based such that we onlyl have to perform the networkx calculations once.
+    in period 2030.
     """
+    mod.tx_dcopf_cycles_by_period = dict()
     result = list()
     for period in mod.PERIODS:
         # Get the relevant tx_lines (= currently operational & DC OPF)
-        tx_lines = list(mod.TX_DCOPF & mod.TX_LINES_OPR_IN_PRD[period])
-
-        # Get the edges from the relevant tx_lines
-        edges = [(mod.load_zone_to[tx], mod.load_zone_from[tx]) for tx in tx_lines]
-        # TODO: make sure there are no parallel edges (or pre-process those)
-
-        # Create a network graph from the list of lines (edges) and find
-        # the elementary cycles (if any)
-        graph = nx.Graph()
-        graph.add_edges_from(edges)
-        cycles = nx.cycle_basis(graph)  # list w list of zones for each cycle
-        for cycle_id, cycle in enumerate(cycles):
-            for zone in cycle:
+        # and their zones; this is the signature of the period's network
+        tx_lines = tuple(
+            (tx, mod.load_zone_from[tx], mod.load_zone_to[tx])
+            for tx in mod.TX_DCOPF & mod.TX_LINES_OPR_IN_PRD[period]
+        )
+        cycles = get_cycle_incidence(tx_lines)
+        mod.tx_dcopf_cycles_by_period[period] = cycles
+        for cycle_id, (zones, _) in enumerate(cycles):
+            for zone in zones:
                 result.append((period, cycle_id, zone))
     return result
 
 
+@lru_cache(maxsize=None)
+def get_cycle_incidence(tx_lines):
+    """
+    :param tx_lines: tuple of (tx_line, load_zone_from, load_zone_to) tuples
+    :return: tuple with a (zones, lines) tuple for each cycle of the network,
+        where zones is the ordered tuple of zones in the cycle and lines is a
+        tuple of (tx_line, direction) tuples for the lines connecting each
+        zone to the previous zone in the cycle
+
+    Determine the basic cycles of the network formed by the transmission
+    lines and the cycle incidence of the lines in each cycle. The direction
+    is 1 if the line goes in the direction of the cycle and -1 if it goes in
+    the reverse direction.
+
+    Results are cached by the tx_lines tuple, so the cycle basis is
+    computed only once for each distinct network.
+    """
+    # Get the edges from the relevant tx_lines
+    edges = [(zone_to, zone_from) for (tx, zone_from, zone_to) in tx_lines]
+    # TODO: make sure there are no parallel edges (or pre-process those)
+
+    # Look up lines by their edge (the first line wins for parallel edges)
+    line_by_edge = dict()
+    for (tx, zone_from, zone_to), edge in zip(tx_lines, edges):
+        line_by_edge.setdefault(edge, (tx, zone_from, zone_to))
+
+    # Create a network graph from the list of lines (edges) and find
+    # the elementary cycles (if any)
+    graph = nx.Graph()
+    graph.add_edges_from(edges)
+
+    cycles = list()
+    for zones in nx.cycle_basis(graph):  # list w list of zones for each cycle
+        lines = list()
+        # Get the tx lines in this cycle
+        for tx_from, tx_to in zip(zones[-1:] + zones[:-1], zones):
+            if (tx_from, tx_to) in line_by_edge:
+                tx, zone_from, zone_to = line_by_edge[(tx_from, tx_to)]
+            elif (tx_to, tx_from) in line_by_edge:
+                # Revert direction
+                tx, zone_from, zone_to = line_by_edge[(tx_to, tx_from)]
+            else:
+                raise ValueError(
+                    "The branch connecting {} and {} is not in the "
+                    "transmission line inputs".format(tx_from, tx_to)
+                )
+            direction = 1 if (zone_from, zone_to) == (tx_from, tx_to) else -1
+            lines.append((tx, direction))
+        cycles.append((tuple(zones), tuple(lines)))
+
+    return tuple(cycles)
+
+
 def period_cycles_init(mod):
     """
     Determine the period-cycle combinations from the larger PRDS_CYCLES_ZONES
@@ -325,8 +382,8 @@ def zones_by_period_cycle_init(mod, period, cycle):
     Re-arrange the 3-dimensional PRDS_CYCLES_ZONES set into a 1-dimensional
     set of ZONES, indexed by PRD_CYCLES
     """
-    zones = [z for (p, c, z) in mod.PRDS_CYCLES_ZONES if p == period and c == cycle]
-    return zones
+    zones, _ = mod.tx_dcopf_cycles_by_period[period][cycle]
+    return list(zones)
 
 
 def periods_cycles_transmission_lines_init(mod):
@@ -337,37 +394,14 @@ def periods_cycles_transmission_lines_init(mod):
 
     Note: Alternatively, we could simply define this set by the bigger set
     m.PRDS_CYCLES * m.TX_DCOPF and set the tx_dcopf_cycle_direction to zero
-    whenever the line is not part of the cycle. This would get rid of the
-    repetitive code in the init function below at the cost of iterating over
-    more tx_lines than necessary in the summation of the KVL constraint.
+    whenever the line is not part of the cycle. This would mean iterating
+    over more tx_lines than necessary in the summation of the KVL constraint.
     """
-    result = list()
-    for p, c in mod.PRDS_CYCLES:
-        # Ordered list of zones in the current cycle
-        zones = list(mod.ZONES_IN_PRD_CYCLE[(p, c)])
-
-        # Relevant tx_lines
-        tx_lines = list(mod.TX_DCOPF & mod.TX_LINES_OPR_IN_PRD[p])
-
-        # Get the edges from the relevant tx_lines
-        edges = [(mod.load_zone_to[tx], mod.load_zone_from[tx]) for tx in tx_lines]
-
-        # Get the tx lines in this cycle
-        for tx_from, tx_to in zip(zones[-1:] + zones[:-1], zones):
-            try:
-                index = edges.index((tx_from, tx_to))
-            except:
-                try:
-                    # Revert direction
-                    index = edges.index((tx_to, tx_from))
-                except:
-                    raise ValueError(
-                        "The branch connecting {} and {} is not in the "
-                        "transmission line inputs".format(tx_from, tx_to)
-                    )
-            tx_line = tx_lines[index]
-            result.append((p, c, tx_line))
-    return result
+    return [
+        (p, c, tx)
+        for (p, c) in mod.PRDS_CYCLES
+        for (tx, _) in mod.tx_dcopf_cycles_by_period[p][c][1]
+    ]
 
 
 def tx_lines_by_period_cycle_init(mod, period, cycle):
@@ -375,10 +409,8 @@ def tx_lines_by_period_cycle_init(mod, period, cycle):
     Re-arrange the 3-dimensional PRDS_CYCLES_TX_DCOPF set into a 1-dimensional
     set of TX_DCOPF, indexed by PRD_CYCLES.
     """
-    txs = list(
-        tx for (p, c, tx) in mod.PRDS_CYCLES_TX_DCOPF if c == cycle and p == period
-    )
-    return txs
+    _, lines = mod.tx_dcopf_cycles_by_period[period][cycle]
+    return [tx for (tx, _) in lines]
 
 
 # Param Rules
@@ -404,20 +436,8 @@ def tx_dcopf_cycle_direction_init(mod, period, cycle, tx_line):
     See "Horsch et al. (2018). Linear Optimal Power Flow Using Cycle Flows"
     for more background.
     """
-    zones = list(mod.ZONES_IN_PRD_CYCLE[(period, cycle)])
-    from_to = (mod.load_zone_from[tx_line], mod.load_zone_to[tx_line])
-    if from_to in zip(zones[-1:] + zones[:-1], zones):
-        direction = 1
-    elif from_to in zip(zones, zones[-1:] + zones[:-1]):
-        direction = -1
-    else:
-        raise ValueError(
-            "The branch connecting {} and {} is not in the "
-            "transmission line inputs".format(
-                mod.load_zone_from[tx_line], mod.load_zone_to[tx_line]
-            )
-        )
-    return direction
+    _, lines = mod.tx_dcopf_cycles_by_period[period][cycle]
+    return dict(lines)[tx_line]
 
 
 # Constraint Formulations
@@ -24,6 +24,7 @@ from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules
+from gridpath.auxiliary.db_interface import get_results_subset_filter
 from gridpath.common_functions import create_results_df
 from gridpath.transmission.operations.common_functions import (
     load_tx_operational_type_modules,
@@ -210,7 +211,7 @@ def export_results(
 ###############################################################################
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(db, c, scenario_id, subscenarios, quiet, results_subset=None):
     """
     Aggregate imports/exports by zone, period and spinup_or_lookahead
     (numbers are based on flows without accounting for losses!)
@@ -219,22 +220,30 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param results_subset:
     :return:
     """
     if not quiet:
         print("aggregate transmission imports exports")
 
+    # Imports and exports are summed across iterations, so we recompute them
+    # for all iterations of the subproblems and stages in the results subset
+    subset_filter, subset_data = get_results_subset_filter(
+        results_subset, columns=["subproblem_id", "stage_id"]
+    )
+
     # Delete old results
-    del_sql = """
+    del_sql = f"""
         DELETE FROM results_transmission_imports_exports_agg
         WHERE scenario_id = ?
+        {subset_filter}
         """
     spin_on_database_lock(
-        conn=db, cursor=c, sql=del_sql, data=(scenario_id,), many=False
+        conn=db, cursor=c, sql=del_sql, data=(scenario_id,) + subset_data, many=False
     )
 
     # Aggregate imports/exports by period, load zone, and spinup_or_lookahead
-    agg_sql = """
+    agg_sql = f"""
         INSERT INTO results_transmission_imports_exports_agg
         (scenario_id, subproblem_id, stage_id, period, 
         load_zone, spinup_or_lookahead, imports, exports)
@@ -258,14 +267,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_to AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy
+                WHERE scenario_id = ?
+                {subset_filter}) AS dummy
                 
                 LEFT JOIN 
                 
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_from AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy2
+                WHERE scenario_id = ?
+                {subset_filter}) AS dummy2
                 USING (scenario_id, subproblem_id, stage_id, period, load_zone,
                 spinup_or_lookahead)
             ) AS left_join1
@@ -278,14 +289,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_from AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy3
+                WHERE scenario_id = ?
+                {subset_filter}) AS dummy3
                 
                 LEFT JOIN 
                 
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_to AS load_zone, spinup_or_lookahead
                 FROM results_transmission_timepoint
-                WHERE scenario_id = ?) AS dummy4
+                WHERE scenario_id = ?
+                {subset_filter}) AS dummy4
                 USING (scenario_id, subproblem_id, stage_id, period, load_zone,
                 spinup_or_lookahead)
             
@@ -304,6 +317,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw > 0
         AND scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead) 
         AS imports_pos_dir
@@ -319,6 +333,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw > 0
         AND scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead) 
         AS exports_pos_dir
@@ -334,6 +349,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw < 0
         AND scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead) 
         AS imports_neg_dir
@@ -349,6 +365,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_timepoint
         WHERE transmission_flow_mw < 0
         AND scenario_id = ?
+        {subset_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead) 
         AS exports_neg_dir
@@ -358,5 +375,5 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ;"""
 
-    scenario_ids = tuple([scenario_id] * 8)
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql, data=scenario_ids, many=False)
+    agg_data = ((scenario_id,) + subset_data) * 8
+    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql, data=agg_data, many=False)
@@ -18,6 +18,7 @@ calls their *validate_inputs()* method, which performs various validations
 of the input data and scenario setup.
 """
 
+from multiprocessing import get_context
 import sqlite3
 import sys
 from argparse import ArgumentParser
@@ -28,6 +29,18 @@ from gridpath.auxiliary.db_interface import (
     get_scenario_id_and_name,
 )
 from gridpath.auxiliary.validations import write_validation_to_database
+from gridpath.auxiliary.validation_cache import (
+    FingerprintCalculator,
+    TableReadRecorder,
+    coordinate_dimensions_from_projection,
+    generalize_validation_rows,
+    get_cached_validations,
+    project_coordinate,
+    specialize_validation_rows,
+    validation_cache_exists,
+    write_validation_rows_to_database,
+    write_validations_to_cache,
+)
 from gridpath.common_functions import get_db_parser
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import (
@@ -37,62 +50,343 @@ from gridpath.auxiliary.scenario_chars import (
 )
 
 
+def get_validation_coordinates(scenario_structure):
+    """
+    :param scenario_structure: ScenarioStructure object with info on the
+        iteration and subproblem/stage structure
+    :return: list of (weather_iteration, hydro_iteration,
+        availability_iteration, subproblem, stage) tuples to validate
+    """
+    structure_dict = scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT
+    return [
+        (w, h, a, subproblem, stage)
+        for w in structure_dict.keys()
+        for h in structure_dict[w].keys()
+        for a in structure_dict[w][h].keys()
+        for subproblem in structure_dict[w][h][a].keys()
+        for stage in structure_dict[w][h][a][subproblem]
+    ]
+
+
 def validate_inputs(
     scenario_structure,
-    loaded_modules,
+    modules_to_use,
     scenario_id,
-    weather_iteration,
-    hydro_iteration,
-    availability_iteration,
     subscenarios,
+    db_path,
     conn,
+    n_parallel_validation=1,
+    use_cache=True,
+    quiet=False,
 ):
-    """ "
+    """
     For each module, load the inputs from the database and validate them
 
+    Each module's validation is run at most once for each distinct
+    combination of the iteration/subproblem/stage values its inputs
+    actually vary by (as determined by the database columns the module
+    reads). Validation results are also cached in the database by a
+    fingerprint of the inputs the module read, so validations of unchanged
+    inputs (e.g. from a prior validation of this or another scenario)
+    are skipped and their results are reused.
+
     :param scenario_structure: ScenarioStructure object with info on the
         iteration and subproblem/stage structure
-    :param loaded_modules: list of imported modules (Python <class 'module'>
-        objects)
+    :param modules_to_use: list of the names of the modules to use
+    :param scenario_id: int, the scenario ID
     :param subscenarios: SubScenarios object with all subscenario info
+    :param db_path: str, path to the database (for the worker connections)
     :param conn: database connection
+    :param n_parallel_validation: int, number of processes to validate in
+    :param use_cache: boolean, whether to reuse cached validation results
+    :param quiet: boolean, whether to suppress the summary
     :return:
     """
 
-    # TODO: check if we even need database cursor (and subscenarios?)
-    #   since presumably we already have our data in the inputs.
-    #   need to go through each module's input validation to check this
-
     # TODO: see if we can do some sort of automatic dtype validation for
     #  each table in the database? Problem is that you don't necessarily want
     #  to check the full table but only the appropriate subscenario
 
-    for w in scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT.keys():
-        for h in scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT[w].keys():
-            for a in scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT[w][h]:
-                for subproblem in (
-                    scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT
-                )[w][h][a].keys():
-                    for stage in (
-                        scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT
-                    )[w][h][a][subproblem]:
-                        for m in loaded_modules:
-                            if hasattr(m, "validate_inputs"):
-                                m.validate_inputs(
-                                    scenario_id=scenario_id,
-                                    subscenarios=subscenarios,
-                                    weather_iteration=w,
-                                    hydro_iteration=h,
-                                    availability_iteration=a,
-                                    subproblem=subproblem,
-                                    stage=stage,
-                                    conn=conn,
-                                )
-
-            # 2. input validation across modules
-            #    make sure geography and projects are in line
-            #    ... (see Evernote validation list)
-            #    create separate function for each validation that you call here
+    loaded_modules = load_modules(modules_to_use=modules_to_use)
+    validating_modules = [
+        i for i, m in enumerate(loaded_modules) if hasattr(m, "validate_inputs")
+    ]
+    coordinates = get_validation_coordinates(scenario_structure=scenario_structure)
+    cache_exists = validation_cache_exists(conn=conn)
+    fingerprints = FingerprintCalculator(
+        conn=conn, scenario_id=scenario_id, subscenarios=subscenarios
+    )
+
+    # Known validation results by module as a dictionary of
+    # (generalized rows, source) tuples by (dimensions, projection), where
+    # the source is "cache" or the coordinate the validation was run for;
+    # we also keep the distinct dimensions of each module's known results
+    known_results = {i: {} for i in validating_modules}
+    known_dimensions = {i: [] for i in validating_modules}
+    dimensions_by_module = {}
+
+    if use_cache and cache_exists:
+        for i in validating_modules:
+            for projection, tables, fingerprint, rows in get_cached_validations(
+                conn=conn, gridpath_module=modules_to_use[i]
+            ):
+                if (
+                    fingerprints.fingerprint(
+                        loaded_module=loaded_modules[i], tables=tables
+                    )[1]
+                    == fingerprint
+                ):
+                    dimensions = coordinate_dimensions_from_projection(projection)
+                    add_known_result(
+                        known_results=known_results[i],
+                        known_dimensions=known_dimensions[i],
+                        dimensions=dimensions,
+                        projection=projection,
+                        rows=rows,
+                        source="cache",
+                    )
+                    dimensions_by_module[i] = dimensions
+
+    pending = {i: list(coordinates) for i in validating_modules}
+    validation_rows = []
+    cache_rows = []
+    n_run, n_cached, n_invariant = 0, 0, 0
+    while pending:
+        # Resolve what we can from the known results
+        for i in list(pending.keys()):
+            unresolved = []
+            for coordinate in pending[i]:
+                for dimensions in known_dimensions[i]:
+                    known_result = known_results[i].get(
+                        (dimensions, project_coordinate(coordinate, dimensions))
+                    )
+                    if known_result is not None:
+                        rows, source = known_result
+                        if source == "cache":
+                            n_cached += 1
+                        elif source != coordinate:
+                            n_invariant += 1
+                        validation_rows += specialize_validation_rows(
+                            generalized_rows=rows,
+                            scenario_id=scenario_id,
+                            coordinate=coordinate,
+                        )
+                        break
+                else:
+                    unresolved.append(coordinate)
+            if unresolved:
+                pending[i] = unresolved
+            else:
+                del pending[i]
+
+        # Run a validation for each distinct combination of the values
+        # the module's inputs vary by or, if we don't know that yet, for the
+        # first coordinate only
+        tasks = []
+        for i, unresolved in pending.items():
+            if i in dimensions_by_module.keys():
+                projections = {}
+                for coordinate in unresolved:
+                    projections.setdefault(
+                        project_coordinate(coordinate, dimensions_by_module[i]),
+                        coordinate,
+                    )
+                tasks += [(i, coordinate) for coordinate in projections.values()]
+            else:
+                tasks.append((i, unresolved[0]))
+
+        for i, coordinate, dimensions, tables, rows in run_validation_tasks(
+            tasks=tasks,
+            db_path=db_path,
+            scenario_id=scenario_id,
+            modules_to_use=modules_to_use,
+            n_parallel_validation=n_parallel_validation,
+        ):
+            n_run += 1
+            projection = project_coordinate(coordinate, dimensions)
+            generalized_rows = generalize_validation_rows(
+                rows=rows, coordinate=coordinate
+            )
+            add_known_result(
+                known_results=known_results[i],
+                known_dimensions=known_dimensions[i],
+                dimensions=dimensions,
+                projection=projection,
+                rows=generalized_rows,
+                source=coordinate,
+            )
+            dimensions_by_module[i] = dimensions
+            subscenario_ids, fingerprint = fingerprints.fingerprint(
+                loaded_module=loaded_modules[i], tables=tables
+            )
+            if fingerprint is not None:
+                cache_rows.append(
+                    (
+                        modules_to_use[i],
+                        projection,
+                        tables,
+                        subscenario_ids,
+                        fingerprint,
+                        generalized_rows,
+                    )
+                )
+
+    write_validation_rows_to_database(conn=conn, rows=validation_rows)
+    if cache_exists:
+        write_validations_to_cache(conn=conn, cache_rows=cache_rows)
+
+    if not quiet:
+        print(
+            "Validated {} modules for {} iteration/subproblem/stage "
+            "combination(s): {} validation(s) run, {} skipped because their "
+            "inputs were unchanged since a prior validation, {} skipped "
+            "because the module's inputs don't vary by the "
+            "iteration/subproblem/stage.".format(
+                len(validating_modules),
+                len(coordinates),
+                n_run,
+                n_cached,
+                n_invariant,
+            )
+        )
+        if use_cache and not cache_exists:
+            print(
+                "No status_validation_cache table found in the database; "
+                "validation results were not cached."
+            )
+
+
+def add_known_result(
+    known_results, known_dimensions, dimensions, projection, rows, source
+):
+    """
+    :param known_results: dictionary of a module's known (generalized rows,
+        source) tuples by (dimensions, projection)
+    :param known_dimensions: list of the distinct dimensions of the module's
+        known results
+    :param dimensions: list of indices of the coordinate elements the
+        validation depends on
+    :param projection: the projected coordinate (see project_coordinate)
+    :param rows: the generalized validation rows
+    :param source: "cache" or the coordinate the validation was run for
+
+    Add a validation result to a module's known results; the first known
+    result for a projection is kept.
+    """
+    dimensions = tuple(dimensions)
+    known_results.setdefault((dimensions, projection), (rows, source))
+    if dimensions not in known_dimensions:
+        known_dimensions.append(dimensions)
+
+
+def run_validation_tasks(
+    tasks, db_path, scenario_id, modules_to_use, n_parallel_validation
+):
+    """
+    :param tasks: list of (module index, coordinate) tuples
+    :param db_path: str, path to the database
+    :param scenario_id: int, the scenario ID
+    :param modules_to_use: list of the names of the modules to use
+    :param n_parallel_validation: int, number of processes to validate in
+    :return: list of the results of all tasks (see validate_module_inputs)
+
+    Split the tasks into chunks and validate each chunk in a separate
+    process if parallelization is requested.
+    """
+    n_processes = min(max(n_parallel_validation, 1), len(tasks))
+    if n_processes <= 1:
+        return validate_module_inputs(
+            db_path=db_path,
+            scenario_id=scenario_id,
+            modules_to_use=modules_to_use,
+            tasks=tasks,
+        )
+    else:
+        pool_data = tuple(
+            [db_path, scenario_id, modules_to_use, tasks[n::n_processes]]
+            for n in range(n_processes)
+        )
+        # Pool must use spawn to work properly on Linux
+        pool = get_context("spawn").Pool(n_processes)
+        results = pool.map(validate_module_inputs_pool, pool_data)
+        pool.close()
+
+        return [result for chunk_results in results for result in chunk_results]
+
+
+def validate_module_inputs(db_path, scenario_id, modules_to_use, tasks):
+    """
+    :param db_path: str, path to the database
+    :param scenario_id: int, the scenario ID
+    :param modules_to_use: list of the names of the modules to use
+    :param tasks: list of (module index, coordinate) tuples
+    :return: list of (module index, coordinate, coordinate dimensions,
+        tables read, validation rows) tuples
+
+    Run each module's validation for the requested coordinate and record
+    the tables and columns it read. Validations are written to a temporary
+    status_validation table that shadows the main one, so that we can
+    collect the validation rows of each module; the calling process writes
+    them to the database.
+    """
+    loaded_modules = load_modules(modules_to_use=modules_to_use)
+
+    # Turn off statement caching, as the authorizer is only called when
+    # statements are prepared
+    conn = connect_to_database(
+        db_path=db_path, detect_types=sqlite3.PARSE_DECLTYPES, cached_statements=0
+    )
+    subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
+    conn.execute("""CREATE TEMP TABLE status_validation AS
+        SELECT * FROM main.status_validation WHERE 0;""")
+    recorder = TableReadRecorder()
+    conn.set_authorizer(recorder)
+
+    results = []
+    for i, coordinate in tasks:
+        w, h, a, subproblem, stage = coordinate
+        recorder.start()
+        loaded_modules[i].validate_inputs(
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            weather_iteration=w,
+            hydro_iteration=h,
+            availability_iteration=a,
+            subproblem=subproblem,
+            stage=stage,
+            conn=conn,
+        )
+        recorder.stop()
+
+        rows = conn.execute("""SELECT subproblem_id, stage_id, gridpath_module,
+            db_table, severity, description
+            FROM temp.status_validation;""").fetchall()
+        conn.execute("""DELETE FROM temp.status_validation;""")
+        conn.commit()
+
+        results.append(
+            (i, coordinate, recorder.coordinate_dimensions(), recorder.tables(), rows)
+        )
+
+    conn.close()
+
+    return results
+
+
+def validate_module_inputs_pool(pool_datum):
+    """
+    Helper function to easily pass to pool.map if validating in parallel
+    :param pool_datum:
+    :return:
+    """
+    [db_path, scenario_id, modules_to_use, tasks] = pool_datum
+
+    return validate_module_inputs(
+        db_path=db_path,
+        scenario_id=scenario_id,
+        modules_to_use=modules_to_use,
+        tasks=tasks,
+    )
 
 
 def validate_subscenario_ids(scenario_id, subscenarios, optional_features, conn):
@@ -353,6 +647,19 @@ def parse_arguments(args):
     parser.add_argument(
         "--quiet", default=False, action="store_true", help="Don't print run output."
     )
+    parser.add_argument(
+        "--n_parallel_validation",
+        default=1,
+        type=int,
+        help="Validate inputs in n processes in parallel.",
+    )
+    parser.add_argument(
+        "--ignore_validation_cache",
+        default=False,
+        action="store_true",
+        help="Re-run all validations instead of reusing the cached results "
+        "of validations of unchanged inputs.",
+    )
 
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
@@ -436,34 +743,19 @@ def main(args=None):
         modules_to_use = determine_modules(
             features=feature_list, multi_stage=stages_flag
         )
-        loaded_modules = load_modules(modules_to_use=modules_to_use)
 
         # Read in inputs from db and validate inputs for loaded modules
-        for (
-            weather_iteration
-        ) in scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT.keys():
-            for (
-                hydro_iteration
-            ) in scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT[
-                weather_iteration
-            ].keys():
-                for (
-                    availability_iteration
-                ) in scenario_structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT[
-                    weather_iteration
-                ][
-                    hydro_iteration
-                ]:
-                    validate_inputs(
-                        scenario_structure,
-                        loaded_modules,
-                        scenario_id,
-                        weather_iteration,
-                        hydro_iteration,
-                        availability_iteration,
-                        subscenarios,
-                        conn,
-                    )
+        validate_inputs(
+            scenario_structure=scenario_structure,
+            modules_to_use=modules_to_use,
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            db_path=db_path,
+            conn=conn,
+            n_parallel_validation=int(parsed_arguments.n_parallel_validation),
+            use_cache=not parsed_arguments.ignore_validation_cache,
+            quiet=parsed_arguments.quiet,
+        )
 
     else:
         if not parsed_arguments.quiet:
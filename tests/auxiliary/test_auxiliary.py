@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pyomo.environ import AbstractModel
+from pyomo.core.expr import LinearExpression
+from pyomo.environ import AbstractModel, ConcreteModel, Expression, Param, Var, value
 import unittest
 
 import gridpath.auxiliary.auxiliary as auxiliary_module_to_test
@@ -91,6 +92,39 @@ class TestAuxiliary(unittest.TestCase):
         self.assertEqual(True, auxiliary_module_to_test.is_number(100.5))
         self.assertEqual(False, auxiliary_module_to_test.is_number("string"))
 
+    def test_linear_combination(self):
+        """
+        Variable terms give a flat LinearExpression with the evaluated
+        coefficients; other terms give the same value as the plain sum
+        :return:
+        """
+        mod = ConcreteModel()
+        mod.x = Var([1, 2, 3], initialize={1: 1, 2: 2, 3: 3})
+        mod.p = Param([1, 2, 3], initialize={1: 0.5, 2: 2, 3: 0}, mutable=True)
+        mod.e = Expression([1, 2], rule=lambda m, i: 2 * m.x[i])
+
+        expr = auxiliary_module_to_test.linear_combination(
+            [(mod.p[i], mod.x[i]) for i in [1, 2, 3]] + [(1, 10), (3, mod.x[3])],
+            constant=1,
+        )
+        self.assertIsInstance(expr, LinearExpression)
+        # The zero-coefficient term is dropped
+        self.assertEqual(4, expr.nargs())
+        self.assertEqual(0.5 * 1 + 2 * 2 + 10 + 3 * 3 + 1, value(expr))
+
+        expr = auxiliary_module_to_test.linear_combination(
+            [(0.5, mod.e[1]), (1, mod.e[2]), (2, mod.x[3])]
+        )
+        self.assertNotIsInstance(expr, LinearExpression)
+        self.assertEqual(0.5 * 2 + 4 + 2 * 3, value(expr))
+
+        self.assertEqual(
+            5, auxiliary_module_to_test.linear_combination([(0, mod.x[1])], 5)
+        )
+
+        with self.assertRaises(ValueError):
+            auxiliary_module_to_test.linear_combination([(mod.x[1], mod.x[2])])
+
 
 if __name__ == "__main__":
     unittest.main()
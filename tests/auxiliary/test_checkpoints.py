@@ -0,0 +1,319 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import gridpath.auxiliary.checkpoints as module_to_test
+
+SCENARIO_DIRECTORY_STRUCTURE = {
+    "empty_string": {
+        "empty_string": {"empty_string": {"1": [""], "2": [""], "3": [""]}}
+    }
+}
+
+
+class TestCheckpoints(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.scenario_directory = tempfile.mkdtemp()
+        for subproblem in ["1", "2", "3"]:
+            for directory in ["inputs", "results"]:
+                os.makedirs(
+                    os.path.join(self.scenario_directory, subproblem, directory)
+                )
+            self.write_file(os.path.join(subproblem, "inputs", "projects.tab"), "a")
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario_directory)
+
+    def write_file(self, filename, content):
+        with open(os.path.join(self.scenario_directory, filename), "w") as f:
+            f.write(content)
+
+    def solve(self, subproblem, hash_inputs=True):
+        self.write_file(
+            os.path.join(subproblem, "results", "termination_condition.txt"),
+            "optimal",
+        )
+        return module_to_test.write_checkpoint(
+            scenario_directory=self.scenario_directory,
+            weather_iteration="",
+            hydro_iteration="",
+            availability_iteration="",
+            subproblem=subproblem,
+            multi_stage=False,
+            stage_timings={"": {"solve_seconds": 1.0, "export_seconds": 0.5}},
+            hash_inputs=hash_inputs,
+        )
+
+    def get_completed_subproblems(self):
+        return module_to_test.get_completed_subproblems(
+            scenario_directory=self.scenario_directory,
+            scenario_directory_structure=SCENARIO_DIRECTORY_STRUCTURE,
+            quiet=True,
+        )
+
+    def test_write_checkpoint(self):
+        """
+        A checkpoint is only written if the subproblem is complete
+        :return:
+        """
+        self.assertIsNone(
+            module_to_test.write_checkpoint(
+                scenario_directory=self.scenario_directory,
+                weather_iteration="",
+                hydro_iteration="",
+                availability_iteration="",
+                subproblem="1",
+                multi_stage=False,
+                stage_timings={},
+            )
+        )
+
+        manifest = self.solve("1")
+        self.assertDictEqual(
+            {
+                "": {
+                    "termination_condition": "optimal",
+                    "solve_seconds": 1.0,
+                    "export_seconds": 0.5,
+                }
+            },
+            manifest["stages"],
+        )
+        self.assertListEqual(["projects.tab"], list(manifest["inputs"]["inputs"]))
+        self.assertDictEqual(
+            {("", "", "", "1"): manifest},
+            module_to_test.read_checkpoints(self.scenario_directory),
+        )
+
+    def test_get_completed_subproblems(self):
+        """
+        Checkpointed subproblems are complete unless their inputs changed
+        :return:
+        """
+        self.solve("1")
+        self.solve("3")
+        self.assertSetEqual(
+            {("", "", "", "1"), ("", "", "", "3")}, self.get_completed_subproblems()
+        )
+
+        # Same content
+        self.write_file(os.path.join("3", "inputs", "projects.tab"), "a")
+        self.assertSetEqual(
+            {("", "", "", "1"), ("", "", "", "3")}, self.get_completed_subproblems()
+        )
+
+        # Changed content
+        self.write_file(os.path.join("3", "inputs", "projects.tab"), "b")
+        with self.assertRaises(Exception):
+            self.get_completed_subproblems()
+        self.write_file(os.path.join("3", "inputs", "projects.tab"), "a")
+        self.assertSetEqual(
+            {("", "", "", "1"), ("", "", "", "3")}, self.get_completed_subproblems()
+        )
+
+        # Added file
+        self.write_file(os.path.join("1", "inputs", "new.tab"), "a")
+        with self.assertRaises(Exception):
+            self.get_completed_subproblems()
+        os.remove(os.path.join(self.scenario_directory, "1", "inputs", "new.tab"))
+
+        # Removed file
+        os.remove(os.path.join(self.scenario_directory, "1", "inputs", "projects.tab"))
+        with self.assertRaises(Exception):
+            self.get_completed_subproblems()
+
+        module_to_test.clear_checkpoints(self.scenario_directory)
+        self.assertSetEqual(set(), self.get_completed_subproblems())
+
+    def test_get_completed_subproblems_without_hashes(self):
+        """
+        By default, files aren't hashed when writing or checking checkpoints
+        and a file whose size or modification time changed is considered
+        changed
+        :return:
+        """
+        with patch.object(
+            module_to_test, "hash_file", wraps=module_to_test.hash_file
+        ) as hash_file:
+            manifest = self.solve("1", hash_inputs=False)
+            self.assertIsNone(manifest["inputs_hash"])
+            self.assertIsNone(manifest["inputs"]["inputs"]["projects.tab"][2])
+            self.assertSetEqual({("", "", "", "1")}, self.get_completed_subproblems())
+
+            # Same content, but new modification time
+            os.utime(
+                os.path.join(self.scenario_directory, "1", "inputs", "projects.tab"),
+                ns=(0, 0),
+            )
+            with self.assertRaises(Exception):
+                self.get_completed_subproblems()
+            hash_file.assert_not_called()
+
+    def test_get_completed_multi_stage_subproblems(self):
+        """
+        A checkpointed subproblem whose pass-through inputs changed is solved
+        again; if subproblems are linked, the following subproblems are
+        solved again too
+        :return:
+        """
+        self.write_file("linked_subproblems_map.csv", "")
+        for subproblem in ["1", "2", "3"]:
+            os.makedirs(
+                os.path.join(self.scenario_directory, subproblem, "pass_through_inputs")
+            )
+            self.write_file(
+                os.path.join(subproblem, "pass_through_inputs", "fixed.tab"), "a"
+            )
+            self.solve(subproblem)
+        self.assertSetEqual(
+            {("", "", "", "1"), ("", "", "", "2"), ("", "", "", "3")},
+            self.get_completed_subproblems(),
+        )
+
+        self.write_file(os.path.join("2", "pass_through_inputs", "fixed.tab"), "b")
+        self.assertSetEqual({("", "", "", "1")}, self.get_completed_subproblems())
+
+        os.remove(os.path.join(self.scenario_directory, "linked_subproblems_map.csv"))
+        self.assertSetEqual(
+            {("", "", "", "1"), ("", "", "", "3")}, self.get_completed_subproblems()
+        )
+
+    def test_get_completed_linked_subproblems(self):
+        """
+        Linked subproblems are complete only before the first incomplete
+        subproblem and we can't resume if its linked inputs changed
+        :return:
+        """
+        self.write_file("linked_subproblems_map.csv", "")
+        self.write_file(os.path.join("2", "inputs", "x_linked_params.tab"), "1")
+        self.solve("1")
+        self.solve("3")
+        self.assertSetEqual({("", "", "", "1")}, self.get_completed_subproblems())
+
+        self.write_file(os.path.join("2", "inputs", "x_linked_params.tab"), "2")
+        with self.assertRaises(Exception):
+            self.get_completed_subproblems()
+
+    def test_unchanged_files_not_hashed(self):
+        """
+        Files whose size and modification time are unchanged are not hashed
+        again when resuming
+        :return:
+        """
+        self.solve("1")
+        self.solve("2")
+        with patch.object(
+            module_to_test, "hash_file", wraps=module_to_test.hash_file
+        ) as hash_file:
+            self.assertSetEqual(
+                {("", "", "", "1"), ("", "", "", "2")},
+                self.get_completed_subproblems(),
+            )
+            hash_file.assert_not_called()
+
+    def test_get_completed_linked_subproblems_by_iteration(self):
+        """
+        Linked subproblems are linked within each iteration: the linked
+        state is written to the next subproblem of the same iteration, and
+        the first incomplete subproblem of an iteration doesn't make the
+        subproblems of the other iterations incomplete
+        :return:
+        """
+        self.write_file("linked_subproblems_map.csv", "")
+        for iteration in ["weather_iteration_1", "weather_iteration_2"]:
+            for subproblem in ["1", "2"]:
+                os.makedirs(
+                    os.path.join(
+                        self.scenario_directory, iteration, subproblem, "inputs"
+                    )
+                )
+                os.makedirs(
+                    os.path.join(
+                        self.scenario_directory, iteration, subproblem, "results"
+                    )
+                )
+            self.write_file(
+                os.path.join(iteration, "2", "inputs", "x_linked_params.tab"), "1"
+            )
+
+        manifests = {}
+        for iteration, subproblem in [
+            ("weather_iteration_1", "1"),
+            ("weather_iteration_2", "1"),
+            ("weather_iteration_2", "2"),
+        ]:
+            self.write_file(
+                os.path.join(
+                    iteration, subproblem, "results", "termination_condition.txt"
+                ),
+                "optimal",
+            )
+            manifests[iteration, subproblem] = module_to_test.write_checkpoint(
+                scenario_directory=self.scenario_directory,
+                weather_iteration=iteration,
+                hydro_iteration="",
+                availability_iteration="",
+                subproblem=subproblem,
+                multi_stage=False,
+                stage_timings={},
+            )
+
+        linked_directory = os.path.join("weather_iteration_1", "2", "inputs")
+        self.assertListEqual(
+            [linked_directory],
+            list(manifests["weather_iteration_1", "1"]["linked_state"]),
+        )
+        self.assertListEqual(
+            ["x_linked_params.tab"],
+            list(
+                manifests["weather_iteration_1", "1"]["linked_state"][linked_directory]
+            ),
+        )
+
+        def get_completed_subproblems():
+            return module_to_test.get_completed_subproblems(
+                scenario_directory=self.scenario_directory,
+                scenario_directory_structure={
+                    iteration: {
+                        "empty_string": {"empty_string": {"1": [""], "2": [""]}}
+                    }
+                    for iteration in ["weather_iteration_1", "weather_iteration_2"]
+                },
+                quiet=True,
+            )
+
+        self.assertSetEqual(
+            {
+                ("weather_iteration_1", "", "", "1"),
+                ("weather_iteration_2", "", "", "1"),
+                ("weather_iteration_2", "", "", "2"),
+            },
+            get_completed_subproblems(),
+        )
+
+        # The linked state of the first incomplete subproblem changed
+        self.write_file(os.path.join(linked_directory, "x_linked_params.tab"), "2")
+        with self.assertRaises(Exception):
+            get_completed_subproblems()
+
+
+if __name__ == "__main__":
+    unittest.main()
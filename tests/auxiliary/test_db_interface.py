@@ -0,0 +1,177 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import os.path
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import gridpath.auxiliary.db_interface as module_to_test
+from gridpath.common_functions import read_results_df, write_results_df
+
+
+def get_results_df():
+    return pd.DataFrame(
+        {
+            "project": ["Wind", "Wind", "Gas"],
+            "timepoint": [1, 2, 1],
+            "power_mw": [1.5, 2.25, None],
+            "technology": ["wind", "wind", "gas"],
+        }
+    ).set_index(["project", "timepoint"])
+
+
+class TestDbInterface(unittest.TestCase):
+    """ """
+
+    def import_results(self, results_format):
+        """
+        Write the results in the requested format and import them into a
+        new database
+        :return: the imported rows
+        """
+        with tempfile.TemporaryDirectory() as results_directory:
+            write_results_df(
+                df=get_results_df(),
+                results_directory=results_directory,
+                which_results="project_timepoint",
+                results_format=results_format,
+            )
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(
+                        results_directory, "project_timepoint.{}".format(results_format)
+                    )
+                )
+            )
+            pd.testing.assert_frame_equal(
+                get_results_df().reset_index(),
+                read_results_df(
+                    results_directory=results_directory,
+                    which_results="project_timepoint",
+                ),
+            )
+
+            conn = sqlite3.connect(":memory:")
+            module_to_test.import_csv(
+                conn=conn,
+                cursor=conn.cursor(),
+                scenario_id=1,
+                weather_iteration="",
+                hydro_iteration="",
+                availability_iteration="",
+                subproblem="2",
+                stage="",
+                quiet=True,
+                results_directory=results_directory,
+                which_results="project_timepoint",
+            )
+            rows = conn.execute("""SELECT scenario_id, subproblem_id, stage_id,
+                project, timepoint, power_mw, technology
+                FROM results_project_timepoint
+                ORDER BY project, timepoint;""").fetchall()
+            conn.close()
+
+        return rows
+
+    def test_import_csv(self):
+        """
+        CSV results are imported with the scenario, subproblem, and stage
+        :return:
+        """
+        self.assertListEqual(
+            [
+                (1, 2, 1, "Gas", 1, None, "gas"),
+                (1, 2, 1, "Wind", 1, 1.5, "wind"),
+                (1, 2, 1, "Wind", 2, 2.25, "wind"),
+            ],
+            self.import_results(results_format="csv"),
+        )
+
+    def test_switch_results_format(self):
+        """
+        Writing results in one format removes the results file in the other
+        format, so that results written by a prior run are never read;
+        pyarrow is mocked by pickling the dataframes
+        :return:
+        """
+
+        def to_parquet(df, path, index, compression):
+            df.to_pickle(path)
+
+        with tempfile.TemporaryDirectory() as results_directory, patch.object(
+            pd.DataFrame, "to_parquet", to_parquet
+        ), patch.object(pd, "read_parquet", pd.read_pickle):
+            for results_format, power_mw in [
+                ("parquet", 1.0),
+                ("csv", 2.0),
+                ("parquet", 3.0),
+            ]:
+                df = get_results_df().assign(power_mw=power_mw)
+                write_results_df(
+                    df=df,
+                    results_directory=results_directory,
+                    which_results="project_timepoint",
+                    results_format=results_format,
+                )
+                self.assertListEqual(
+                    ["project_timepoint.{}".format(results_format)],
+                    os.listdir(results_directory),
+                )
+                pd.testing.assert_frame_equal(
+                    df.reset_index(),
+                    read_results_df(
+                        results_directory=results_directory,
+                        which_results="project_timepoint",
+                    ),
+                )
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow"), "Parquet results require pyarrow"
+    )
+    def test_import_parquet(self):
+        """
+        Parquet results are read in batches and give the same rows as CSV
+        results
+        :return:
+        """
+        self.assertListEqual(
+            self.import_results(results_format="csv"),
+            self.import_results(results_format="parquet"),
+        )
+
+        with tempfile.TemporaryDirectory() as results_directory:
+            write_results_df(
+                df=get_results_df(),
+                results_directory=results_directory,
+                which_results="project_timepoint",
+                results_format="parquet",
+            )
+            batches = list(
+                module_to_test.iterate_results_dfs(
+                    results_filepath=os.path.join(
+                        results_directory, "project_timepoint.parquet"
+                    ),
+                    batch_size=2,
+                )
+            )
+        self.assertListEqual([2, 1], [len(df) for df in batches])
+        pd.testing.assert_frame_equal(
+            get_results_df().reset_index(),
+            pd.concat(batches, ignore_index=True),
+        )
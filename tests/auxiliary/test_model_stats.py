@@ -0,0 +1,107 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from pyomo.environ import AbstractModel, Set, Var, Expression, Constraint
+
+import gridpath.auxiliary.model_stats as module_to_test
+
+
+class TestModelStats(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        model = AbstractModel()
+        model.PRJS = Set(initialize=["a", "b"])
+        model.TMPS = Set(initialize=[1, 2, 3])
+        model.Provide_Power = Var(model.PRJS, model.TMPS)
+        model.Total_Power = Expression(
+            model.TMPS,
+            rule=lambda mod, tmp: sum(mod.Provide_Power[p, tmp] for p in mod.PRJS),
+        )
+        model.Max_Power_Constraint = Constraint(
+            model.TMPS, rule=lambda mod, tmp: mod.Total_Power[tmp] <= 1
+        )
+
+        self.recorder = module_to_test.ConstructionTimeRecorder()
+        self.recorder.start()
+        try:
+            self.instance = model.create_instance()
+        finally:
+            self.recorder.stop()
+        self.instance.Provide_Power["b", 3].fix(0)
+
+        self.component_modules = {
+            "PRJS": "project",
+            "TMPS": "temporal",
+            "Provide_Power": "project.operations",
+            "Total_Power": "project.operations",
+            "Max_Power_Constraint": "system",
+        }
+
+    def test_construction_time_recorder(self):
+        """
+        Construction times are recorded for all components
+        :return:
+        """
+        for component in self.component_modules.keys():
+            self.assertIn(component, self.recorder.seconds)
+
+        self.instance.Another_Set = Set(initialize=[1])
+        self.assertNotIn("Another_Set", self.recorder.seconds)
+
+    def test_get_component_stats(self):
+        """
+        Fixed variables don't count towards nonzeros
+        :return:
+        """
+        stats = module_to_test.get_component_stats(
+            self.instance, self.component_modules, {}
+        )
+        self.assertListEqual(
+            [
+                ["project", "PRJS", "Set", None, 2, None, None],
+                ["temporal", "TMPS", "Set", None, 3, None, None],
+                [
+                    "project.operations",
+                    "Provide_Power",
+                    "Var",
+                    "PRJS*TMPS",
+                    6,
+                    None,
+                    None,
+                ],
+                ["project.operations", "Total_Power", "Expression", "TMPS", 3, 5, None],
+                ["system", "Max_Power_Constraint", "Constraint", "TMPS", 3, 5, None],
+            ],
+            stats,
+        )
+
+    def test_get_index_set_stats(self):
+        """
+        Index sets are ordered by size
+        :return:
+        """
+        self.assertListEqual(
+            [
+                ["project.operations", "PRJS*TMPS", 2, 6, 1, 6],
+                ["temporal", "TMPS", 1, 3, 2, 6],
+            ],
+            module_to_test.get_index_set_stats(self.instance, self.component_modules),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
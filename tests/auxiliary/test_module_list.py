@@ -0,0 +1,103 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import redirect_stdout
+import io
+import os
+import tempfile
+import unittest
+
+import gridpath.auxiliary.module_list as module_to_test
+
+
+class TestModuleList(unittest.TestCase):
+    """ """
+
+    def test_load_modules_profile_startup(self):
+        """
+        Only the requested modules are loaded and, when profiling, the import
+        time of each is printed
+        :return:
+        """
+        modules_to_use = ["temporal.operations.timepoints", "geography.load_zones"]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            loaded_modules = module_to_test.load_modules(
+                modules_to_use, profile_startup=True
+            )
+
+        self.assertListEqual(
+            ["gridpath." + m for m in modules_to_use],
+            [m.__name__ for m in loaded_modules],
+        )
+        lines = output.getvalue().splitlines()
+        self.assertEqual("Module import times (seconds):", lines[0])
+        self.assertSetEqual(
+            set(modules_to_use), set(line.split()[-1] for line in lines[1:3])
+        )
+        self.assertRegex(lines[3], r"^ +\d+\.\d{3}  total \(2 modules\)$")
+
+        # Nothing is printed if not profiling
+        output = io.StringIO()
+        with redirect_stdout(output):
+            module_to_test.load_modules(modules_to_use)
+        self.assertEqual("", output.getvalue())
+
+    def test_determine_modules_multi_stage(self):
+        """
+        The "fix variables" modules are only included for multi-stage
+        scenarios as determined by the multi_stage_flag.txt file or, if the
+        file is missing, by the stage subdirectories of the subproblems
+        :return:
+        """
+        # The market participation module also requires the markets feature
+        fix_variables_modules = ["project.operations.fix_commitment"]
+        for flag, stage_directories, expected_multi_stage in [
+            ("True", [], True),
+            ("False", ["1/1", "1/2"], False),
+            (None, ["1/1", "1/2", "2"], True),
+            (None, ["1", "2"], False),
+            (None, [], False),
+        ]:
+            with self.subTest(flag=flag, stage_directories=stage_directories):
+                with tempfile.TemporaryDirectory() as scenario_directory:
+                    with open(
+                        os.path.join(scenario_directory, "features.csv"), "w"
+                    ) as f:
+                        f.write("features\n")
+                    if flag is not None:
+                        with open(
+                            os.path.join(scenario_directory, "multi_stage_flag.txt"),
+                            "w",
+                        ) as f:
+                            f.write(flag)
+                    for directory in stage_directories:
+                        os.makedirs(os.path.join(scenario_directory, directory))
+
+                    modules_to_use = module_to_test.determine_modules(
+                        scenario_directory=scenario_directory
+                    )
+                    for module in fix_variables_modules:
+                        self.assertEqual(expected_multi_stage, module in modules_to_use)
+                    self.assertListEqual(
+                        modules_to_use,
+                        module_to_test.determine_modules(
+                            scenario_directory=scenario_directory,
+                            multi_stage=expected_multi_stage,
+                        ),
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
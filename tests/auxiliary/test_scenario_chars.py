@@ -0,0 +1,203 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import gridpath.auxiliary.scenario_chars as module_to_test
+
+
+def make_scenario_directory(scenario_directory, levels, multi_stage_flag=None):
+    """
+    Create the directories for each combination of the directory names in
+    levels (a list of lists, outermost level first) along with an inputs
+    directory and a file in the innermost directories, and write the
+    multi-stage flag file if multi_stage_flag is not None
+    """
+    paths = [scenario_directory]
+    for level in levels:
+        paths = [os.path.join(path, name) for path in paths for name in level]
+    for path in paths:
+        os.makedirs(os.path.join(path, "inputs"))
+        with open(os.path.join(path, "inputs", "periods.tab"), "w") as f:
+            f.write("period\n2020\n")
+    # Files at the scenario level are not part of the structure
+    with open(os.path.join(scenario_directory, "features.csv"), "w") as f:
+        f.write("features\n")
+    if multi_stage_flag is not None:
+        with open(os.path.join(scenario_directory, "multi_stage_flag.txt"), "w") as f:
+            f.write(str(multi_stage_flag))
+
+
+WEATHER = ["weather_iteration_1", "weather_iteration_2"]
+HYDRO = ["hydro_iteration_0", "hydro_iteration_3"]
+AVAILABILITY = ["availability_iteration_4"]
+SUBPROBLEMS = ["1", "2"]
+STAGES = ["1", "2", "3"]
+
+
+class TestScenarioChars(unittest.TestCase):
+    """ """
+
+    def get_structure(self, levels, multi_stage_flag=None):
+        with tempfile.TemporaryDirectory() as scenario_directory:
+            make_scenario_directory(scenario_directory, levels, multi_stage_flag)
+            return module_to_test.get_scenario_structure_from_disk(scenario_directory)
+
+    def assert_structure(self, structure, expected_dict, expected_flags):
+        self.assertDictEqual(
+            expected_dict, structure.WEATHER_HYDRO_AVAIL_SUBPROBLEM_STAGE_DICT
+        )
+        self.assertListEqual(
+            expected_flags,
+            [
+                structure.WEATHER_ITERATION_FLAG,
+                structure.HYDRO_ITERATION_FLAG,
+                structure.AVAILABILITY_ITERATION_FLAG,
+                structure.SUBPROBLEM_FLAG,
+                structure.STAGE_FLAG,
+            ],
+        )
+
+    def test_get_scenario_structure_from_disk_no_iterations(self):
+        """
+        Structure of scenarios without iterations with and without
+        subproblems and stages
+        :return:
+        """
+        self.assert_structure(
+            self.get_structure([]),
+            {0: {0: {0: {1: [1]}}}},
+            [False, False, False, False, False],
+        )
+        self.assert_structure(
+            self.get_structure([SUBPROBLEMS]),
+            {0: {0: {0: {"1": [1], "2": [1]}}}},
+            [False, False, False, True, False],
+        )
+        self.assert_structure(
+            self.get_structure([STAGES], multi_stage_flag=True),
+            {0: {0: {0: {1: ["1", "2", "3"]}}}},
+            [False, False, False, False, True],
+        )
+        self.assert_structure(
+            self.get_structure([SUBPROBLEMS, STAGES], multi_stage_flag=True),
+            {0: {0: {0: {"1": ["1", "2", "3"], "2": ["1", "2", "3"]}}}},
+            [False, False, False, True, True],
+        )
+
+    def test_get_scenario_structure_from_disk_iterations(self):
+        """
+        Structure of scenarios with each combination of iteration levels
+        with and without subproblems and stages
+        :return:
+        """
+        for weather in [False, True]:
+            for hydro in [False, True]:
+                for availability in [False, True]:
+                    iteration_levels = [
+                        level
+                        for level, flag in [
+                            (WEATHER, weather),
+                            (HYDRO, hydro),
+                            (AVAILABILITY, availability),
+                        ]
+                        if flag
+                    ]
+                    weather_keys = [1, 2] if weather else [0]
+                    hydro_keys = [0, 3] if hydro else [0]
+                    availability_keys = [4] if availability else [0]
+                    for non_iteration_levels, subproblems, flags in [
+                        ([], {1: [1]}, [False, False]),
+                        ([SUBPROBLEMS], {"1": [1], "2": [1]}, [True, False]),
+                        ([STAGES], {1: STAGES}, [False, True]),
+                        (
+                            [SUBPROBLEMS, STAGES],
+                            {"1": STAGES, "2": STAGES},
+                            [True, True],
+                        ),
+                    ]:
+                        with self.subTest(
+                            weather=weather,
+                            hydro=hydro,
+                            availability=availability,
+                            non_iteration_levels=non_iteration_levels,
+                        ):
+                            self.assert_structure(
+                                self.get_structure(
+                                    iteration_levels + non_iteration_levels,
+                                    multi_stage_flag=(True if flags[1] else None),
+                                ),
+                                {
+                                    w: {
+                                        h: {a: subproblems for a in availability_keys}
+                                        for h in hydro_keys
+                                    }
+                                    for w in weather_keys
+                                },
+                                [weather, hydro, availability] + flags,
+                            )
+
+    def test_get_scenario_structure_from_disk_multi_stage_flag(self):
+        """
+        Subproblems with stages require the multi-stage flag file to be set
+        to True
+        :return:
+        """
+        with self.assertRaises(ValueError):
+            self.get_structure([SUBPROBLEMS, STAGES])
+        with self.assertRaises(ValueError):
+            self.get_structure([SUBPROBLEMS, STAGES], multi_stage_flag=False)
+        with self.assertRaises(ValueError):
+            self.get_structure([STAGES], multi_stage_flag=False)
+
+    def test_dir_to_nested_dict(self):
+        """
+        Only iteration and integer directories are included, up to the
+        maximum level
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as scenario_directory:
+            make_scenario_directory(scenario_directory, [WEATHER, SUBPROBLEMS, STAGES])
+            os.makedirs(os.path.join(scenario_directory, "logs", "1"))
+            os.makedirs(
+                os.path.join(scenario_directory, "weather_iteration_1", "1", "1", "9")
+            )
+
+            self.assertDictEqual(
+                {
+                    w: {
+                        s: {
+                            st: (
+                                {"9": {}}
+                                if (w, s, st) == (WEATHER[0], "1", "1")
+                                else {}
+                            )
+                            for st in STAGES
+                        }
+                        for s in SUBPROBLEMS
+                    }
+                    for w in WEATHER
+                },
+                module_to_test.dir_to_nested_dict(scenario_directory, 1, 5),
+            )
+            self.assertDictEqual(
+                {w: {s: {} for s in SUBPROBLEMS} for w in WEATHER},
+                module_to_test.dir_to_nested_dict(scenario_directory, 1, 2),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+# Copyright 2016-2023 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import unittest
+
+import gridpath.auxiliary.validation_cache as module_to_test
+
+
+class MockSubScenarios(object):
+    PROJECT_OPERATIONAL_CHARS_SCENARIO_ID = 1
+    TEMPORAL_SCENARIO_ID = "NULL"
+
+
+class TestValidationCache(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:", cached_statements=0)
+        self.conn.execute("""CREATE TABLE inputs_project_operational_chars (
+            project_operational_chars_scenario_id INTEGER, project TEXT,
+            variable_generator_profile_scenario_id INTEGER
+            );""")
+        self.conn.execute("""CREATE TABLE inputs_project_variable_generator_profiles (
+            project TEXT, variable_generator_profile_scenario_id INTEGER,
+            weather_iteration INTEGER, stage_id INTEGER, timepoint INTEGER,
+            cap_factor FLOAT
+            );""")
+        self.conn.executemany(
+            "INSERT INTO inputs_project_operational_chars VALUES (?, ?, ?);",
+            [(1, "Wind", 1), (2, "Wind", 2)],
+        )
+        self.conn.executemany(
+            """INSERT INTO inputs_project_variable_generator_profiles
+            VALUES (?, ?, ?, ?, ?, ?);""",
+            [
+                ("Wind", 1, 0, 1, 1, 0.5),
+                ("Wind", 1, 0, 1, 2, 0.6),
+                ("Wind", 2, 0, 1, 1, 0.9),
+            ],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_table_read_recorder(self):
+        """
+        Only reads between start() and stop() are recorded, and the
+        coordinate dimensions are determined by the coordinate columns read
+        :return:
+        """
+        recorder = module_to_test.TableReadRecorder()
+        self.conn.set_authorizer(recorder)
+
+        self.conn.execute(
+            "SELECT cap_factor FROM inputs_project_variable_generator_profiles;"
+        ).fetchall()
+        self.assertDictEqual({}, recorder.tables())
+
+        recorder.start()
+        self.conn.execute("""SELECT project, cap_factor
+            FROM inputs_project_variable_generator_profiles
+            WHERE weather_iteration = 0 AND stage_id = 1;""").fetchall()
+        recorder.stop()
+
+        self.assertDictEqual(
+            {
+                "inputs_project_variable_generator_profiles": [
+                    "cap_factor",
+                    "project",
+                    "stage_id",
+                    "weather_iteration",
+                ]
+            },
+            recorder.tables(),
+        )
+        self.assertListEqual([0, 4], recorder.coordinate_dimensions())
+
+    def test_fingerprint(self):
+        """
+        The profiles table is filtered by the profile scenario IDs found in
+        the operational characteristics table, so changing data of another
+        profile scenario ID doesn't change the fingerprint but changing the
+        scenario's data does
+        :return:
+        """
+        tables = {
+            "inputs_project_operational_chars": [
+                "project",
+                "project_operational_chars_scenario_id",
+                "variable_generator_profile_scenario_id",
+            ],
+            "inputs_project_variable_generator_profiles": [
+                "cap_factor",
+                "project",
+                "timepoint",
+                "variable_generator_profile_scenario_id",
+            ],
+        }
+
+        def get_fingerprint():
+            return module_to_test.FingerprintCalculator(
+                conn=self.conn, scenario_id=1, subscenarios=MockSubScenarios()
+            ).fingerprint(loaded_module=module_to_test, tables=tables)
+
+        subscenario_ids, fingerprint = get_fingerprint()
+        self.assertDictEqual(
+            {
+                "inputs_project_operational_chars": {
+                    "project_operational_chars_scenario_id": 1
+                },
+                "inputs_project_variable_generator_profiles": {
+                    "variable_generator_profile_scenario_id": [1]
+                },
+            },
+            subscenario_ids,
+        )
+
+        self.conn.execute("""UPDATE inputs_project_variable_generator_profiles
+            SET cap_factor = 0.1
+            WHERE variable_generator_profile_scenario_id = 2;""")
+        self.assertEqual(fingerprint, get_fingerprint()[1])
+
+        self.conn.execute("""UPDATE inputs_project_variable_generator_profiles
+            SET cap_factor = 0.1
+            WHERE variable_generator_profile_scenario_id = 1;""")
+        self.assertNotEqual(fingerprint, get_fingerprint()[1])
+
+    def test_source_fingerprint(self):
+        """
+        The source fingerprint changes if the module, a GridPath module it
+        imports from, or a shared validation helper changes
+        :return:
+        """
+        import db.common_functions
+        import gridpath.auxiliary.validations
+
+        def get_source_fingerprint(changed_module=None):
+            calculator = module_to_test.FingerprintCalculator(
+                conn=self.conn, scenario_id=1, subscenarios=MockSubScenarios()
+            )
+            if changed_module is not None:
+                calculator._file_hashes[changed_module.__file__] = "changed"
+            return calculator.source_fingerprint(loaded_module=module_to_test)
+
+        source_fingerprint = get_source_fingerprint()
+        self.assertEqual(source_fingerprint, get_source_fingerprint())
+        for changed_module in [
+            module_to_test,
+            db.common_functions,
+            gridpath.auxiliary.validations,
+        ]:
+            self.assertNotEqual(
+                source_fingerprint,
+                get_source_fingerprint(changed_module=changed_module),
+            )
+
+    def test_generalize_and_specialize_validation_rows(self):
+        """
+        Validation rows for the coordinate's subproblem and stage can be
+        replayed for another coordinate
+        :return:
+        """
+        rows = [
+            (1, 1, "module", "table", "High", "error 1"),
+            ("N/A", "N/A", "module", "table", "Low", "error 2"),
+        ]
+        generalized_rows = module_to_test.generalize_validation_rows(
+            rows=rows, coordinate=(0, 0, 0, 1, 1)
+        )
+        self.assertListEqual(
+            [
+                [None, None, "module", "table", "High", "error 1"],
+                ["N/A", "N/A", "module", "table", "Low", "error 2"],
+            ],
+            generalized_rows,
+        )
+        self.assertListEqual(
+            [
+                (5, 2, 1, "module", "table", "High", "error 1"),
+                (5, "N/A", "N/A", "module", "table", "Low", "error 2"),
+            ],
+            module_to_test.specialize_validation_rows(
+                generalized_rows=generalized_rows,
+                scenario_id=5,
+                coordinate=(1, 0, 0, 2, 1),
+            ),
+        )
+
+    def test_project_coordinate(self):
+        """
+        :return:
+        """
+        projection = module_to_test.project_coordinate((3, 0, 0, 2, 1), [0, 3])
+        self.assertEqual('{"subproblem_id": "2", "weather_iteration": "3"}', projection)
+        self.assertListEqual(
+            [0, 3], module_to_test.coordinate_dimensions_from_projection(projection)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
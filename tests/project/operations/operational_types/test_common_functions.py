@@ -17,18 +17,29 @@ from importlib import import_module
 import numpy as np
 import os.path
 import pandas as pd
+import sqlite3
 import sys
+import tempfile
+from types import SimpleNamespace
 import unittest
 
 from tests.common_functions import add_components_and_load_data
 
+from gridpath.auxiliary.db_interface import directories_to_db_values
 from gridpath.project.operations.operational_types.common_functions import (
     determine_relevant_timepoints,
+    get_prj_temporal_index_opr_inputs_from_db,
+    PartitionedTabFileWriter,
+    write_prj_temporal_index_opr_inputs_bulk,
+    write_tab_file_model_inputs,
 )
 
 TEST_DATA_DIRECTORY = os.path.join(
     os.path.dirname(__file__), "..", "..", "..", "test_data"
 )
+SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "db", "db_schema.sql"
+)
 
 # Import prerequisite modules
 PREREQUISITE_MODULE_NAMES = [
@@ -293,6 +304,169 @@ class TestOperationalTypeCommonFunctions(unittest.TestCase):
                 actual_rel_linked_tmp_list, expected_rel_linked_tmp_list
             )
 
+    def test_partitioned_tab_file_writer(self):
+        """
+        Rows are written to the right files with a header, Nulls are
+        replaced, and rows are appended to files that already exist even
+        when the number of open files is limited
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_a = os.path.join(tmp_dir, "a.tab")
+            file_b = os.path.join(tmp_dir, "b.tab")
+            with open(file_b, "w") as f:
+                f.write("project\ttimepoint\tvalue\n")
+                f.write("Wind\t1\t0.1\n")
+
+            with PartitionedTabFileWriter(
+                columns=["project", "timepoint", "value"],
+                replace_nulls=True,
+                max_open_files=1,
+                buffer_rows=2,
+            ) as writer:
+                writer.write_row(file_a, ("Wind", 1, 0.5))
+                writer.write_row(file_b, ("Wind", 2, 0.2))
+                writer.write_row(file_a, ("Wind", 2, None))
+                writer.write_row(file_b, ("Wind", 3, 0.3))
+                writer.write_row(file_a, ("Wind", 3, 0.7))
+
+            self.assertEqual(5, writer.n_rows)
+            self.assertSetEqual({file_a, file_b}, writer.files_written)
+            with open(file_a) as f:
+                self.assertEqual(
+                    "project\ttimepoint\tvalue\n"
+                    "Wind\t1\t0.5\nWind\t2\t.\nWind\t3\t0.7\n",
+                    f.read(),
+                )
+            with open(file_b) as f:
+                self.assertEqual(
+                    "project\ttimepoint\tvalue\n"
+                    "Wind\t1\t0.1\nWind\t2\t0.2\nWind\t3\t0.3\n",
+                    f.read(),
+                )
+
+    def test_bulk_inputs_match_per_subproblem_inputs(self):
+        """
+        The inputs written for all iteration/subproblem/stage directories
+        with a single query match the inputs written with one query per
+        directory, for projects that vary by weather iteration and projects
+        that don't
+        :return:
+        """
+        conn = sqlite3.connect(":memory:")
+        with open(SCHEMA, "r") as f:
+            conn.executescript(f.read())
+        conn.executemany(
+            """INSERT INTO inputs_project_portfolios
+            (project_portfolio_scenario_id, project) VALUES (1, ?);""",
+            [("Wind",), ("Solar",), ("Gas",)],
+        )
+        conn.executemany(
+            """INSERT INTO inputs_project_operational_chars
+            (project_operational_chars_scenario_id, project, operational_type,
+            variable_generator_profile_scenario_id)
+            VALUES (1, ?, ?, 1);""",
+            [("Wind", "gen_var"), ("Solar", "gen_var"), ("Gas", "gen_simple")],
+        )
+        conn.executemany(
+            """INSERT INTO inputs_project_variable_generator_profiles_iterations
+            VALUES (?, 1, ?, 0);""",
+            [("Wind", 1), ("Solar", 0), ("Gas", 0)],
+        )
+        conn.executemany(
+            """INSERT INTO inputs_project_variable_generator_profiles
+            VALUES (?, 1, ?, 0, 1, ?, ?);""",
+            [
+                ("Wind", weather_iteration, tmp, 0.1 * weather_iteration + tmp)
+                for weather_iteration in [1, 2, 3]
+                for tmp in range(1, 7)
+            ]
+            + [("Solar", 0, tmp, None if tmp == 3 else tmp) for tmp in range(1, 7)]
+            + [("Gas", 0, tmp, 1) for tmp in range(1, 7)],
+        )
+        # Two subproblems with three timepoints each
+        conn.executemany(
+            """INSERT INTO inputs_temporal
+            (temporal_scenario_id, subproblem_id, stage_id, timepoint, period,
+            number_of_hours_in_timepoint, timepoint_weight, spinup_or_lookahead)
+            VALUES (1, ?, 1, ?, 2030, 1, 1, 0);""",
+            [(1 if tmp <= 3 else 2, tmp) for tmp in range(1, 7)],
+        )
+        subscenarios = SimpleNamespace(
+            PROJECT_PORTFOLIO_SCENARIO_ID=1,
+            PROJECT_OPERATIONAL_CHARS_SCENARIO_ID=1,
+            TEMPORAL_SCENARIO_ID=1,
+        )
+        fname = "variable_generator_profiles.tab"
+        query_kwargs = dict(
+            conn=conn,
+            op_type="gen_var",
+            table="inputs_project_variable_generator_profiles",
+            subscenario_id_column="variable_generator_profile_scenario_id",
+            data_column="cap_factor",
+        )
+        # Weather iterations 1 and 2 only
+        iterations_subproblems_stages = [
+            ("weather_iteration_{}".format(weather_iteration), "", "", subproblem, "")
+            for weather_iteration in [1, 2]
+            for subproblem in ["1", "2"]
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            per_directory_dir = os.path.join(tmp_dir, "per_directory")
+            bulk_dir = os.path.join(tmp_dir, "bulk")
+            for directories in iterations_subproblems_stages:
+                for scenario_dir in [per_directory_dir, bulk_dir]:
+                    os.makedirs(os.path.join(scenario_dir, *directories, "inputs"))
+
+                (
+                    db_weather_iteration,
+                    db_hydro_iteration,
+                    db_availability_iteration,
+                    db_subproblem,
+                    db_stage,
+                ) = directories_to_db_values(*directories)
+                data = get_prj_temporal_index_opr_inputs_from_db(
+                    subscenarios=subscenarios,
+                    weather_iteration=db_weather_iteration,
+                    hydro_iteration=db_hydro_iteration,
+                    availability_iteration=db_availability_iteration,
+                    subproblem=db_subproblem,
+                    stage=db_stage,
+                    **query_kwargs,
+                )
+                write_tab_file_model_inputs(
+                    per_directory_dir, *directories, fname, data
+                )
+
+            n_rows = write_prj_temporal_index_opr_inputs_bulk(
+                scenario_directory=bulk_dir,
+                subscenarios=subscenarios,
+                iterations_subproblems_stages=iterations_subproblems_stages,
+                fname=fname,
+                **query_kwargs,
+            )
+
+            # Two projects with three timepoints in each of the four
+            # directories
+            self.assertEqual(24, n_rows)
+            for directories in iterations_subproblems_stages:
+                with open(
+                    os.path.join(per_directory_dir, *directories, "inputs", fname)
+                ) as f:
+                    expected_lines = f.read().splitlines()
+                with open(os.path.join(bulk_dir, *directories, "inputs", fname)) as f:
+                    actual_lines = f.read().splitlines()
+                # Same header and rows; the row order may differ, as the
+                # inputs are loaded by index
+                self.assertEqual(7, len(expected_lines))
+                self.assertEqual(expected_lines[0], actual_lines[0])
+                self.assertListEqual(
+                    sorted(expected_lines[1:]), sorted(actual_lines[1:])
+                )
+
+        conn.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -17,6 +17,8 @@ from collections import OrderedDict
 from importlib import import_module
 import os.path
 import sys
+import tempfile
+from types import SimpleNamespace
 import unittest
 
 from tests.common_functions import create_abstract_model, add_components_and_load_data
@@ -515,6 +517,114 @@ class TestFixCommitment(unittest.TestCase):
         )
         self.assertDictEqual(expected_fixed_commitment, actual_fixed_commitment)
 
+    def test_data_handed_off_in_memory(self):
+        """
+        Fixed commitments handed off in memory by the previous stage are
+        used instead of the pass-through inputs file
+        :return:
+        """
+        key = os.path.abspath(
+            os.path.join(
+                TEST_DATA_DIRECTORY, "subproblems", "202001", "pass_through_inputs"
+            )
+        )
+        MODULE_BEING_TESTED.PASS_THROUGH_COMMITMENTS[key] = {
+            "stage": "1",
+            "fxd_commit_prjs": {"Coal"},
+            "project": ["Coal", "Coal"],
+            "timepoint": [20200101, 20200102],
+            "commitment": [5, 7],
+        }
+        try:
+            m, data = add_components_and_load_data(
+                prereq_modules=IMPORTED_PREREQ_MODULES,
+                module_to_test=MODULE_BEING_TESTED,
+                test_data_dir=os.path.join(TEST_DATA_DIRECTORY, "subproblems"),
+                weather_iteration="",
+                hydro_iteration="",
+                availability_iteration="",
+                subproblem="202001",
+                stage="2",
+            )
+            instance = m.create_instance(data)
+        finally:
+            MODULE_BEING_TESTED.PASS_THROUGH_COMMITMENTS.pop(key)
+
+        self.assertListEqual(["Coal"], [prj for prj in instance.FXD_COMMIT_PRJS])
+        self.assertDictEqual(
+            {("Coal", 20200101): 5, ("Coal", 20200102): 7},
+            {
+                (prj, tmp): instance.fixed_commitment[prj, tmp]
+                for (prj, tmp) in instance.FXD_COMMIT_PRJ_OPR_TMPS
+            },
+        )
+
+    def test_hand_off_released_after_last_stage(self):
+        """
+        Fixed commitments are handed off in memory to the next stage and
+        released after the last stage, while all stages' commitments are
+        written to the pass-through inputs file
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as scenario_directory:
+            for stage in ["1", "2"]:
+                os.makedirs(os.path.join(scenario_directory, stage, "inputs"))
+                with open(
+                    os.path.join(scenario_directory, stage, "inputs", "projects.tab"),
+                    "w",
+                ) as f:
+                    f.write("project\tlast_commitment_stage\nCoal\t1\nGas\t2\n")
+            pass_through_directory = os.path.join(
+                scenario_directory, "pass_through_inputs"
+            )
+            os.makedirs(pass_through_directory)
+            MODULE_BEING_TESTED.write_pass_through_file_headers(pass_through_directory)
+            key = os.path.abspath(pass_through_directory)
+
+            for stage, projects, commitment in [("1", ["Coal"], 5), ("2", ["Gas"], 3)]:
+                m = SimpleNamespace(
+                    FNL_COMMIT_PRJ_OPR_TMPS=[(prj, 20200101) for prj in projects],
+                    Commitment={
+                        (prj, 20200101): SimpleNamespace(
+                            expr=SimpleNamespace(value=commitment)
+                        )
+                        for prj in projects
+                    },
+                )
+                MODULE_BEING_TESTED.export_pass_through_inputs(
+                    scenario_directory=scenario_directory,
+                    weather_iteration="",
+                    hydro_iteration="",
+                    availability_iteration="",
+                    subproblem="",
+                    stage=stage,
+                    m=m,
+                )
+                if stage == "1":
+                    self.assertDictEqual(
+                        {
+                            "stage": "1",
+                            "fxd_commit_prjs": {"Coal"},
+                            "project": ["Coal"],
+                            "timepoint": [20200101],
+                            "commitment": [5],
+                        },
+                        MODULE_BEING_TESTED.PASS_THROUGH_COMMITMENTS[key],
+                    )
+
+            self.assertNotIn(key, MODULE_BEING_TESTED.PASS_THROUGH_COMMITMENTS)
+            with open(
+                os.path.join(pass_through_directory, "fixed_commitment.tab")
+            ) as f:
+                self.assertListEqual(
+                    [
+                        "project\ttimepoint\tstage\tfinal_commitment_stage\tcommitment",
+                        "Coal\t20200101\t1\t1\t5",
+                        "Gas\t20200101\t2\t2\t3",
+                    ],
+                    f.read().splitlines(),
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -993,3 +993,39 @@ class TestWaterFlows(unittest.TestCase):
         }
 
         self.assertDictEqual(expected_tmp_delta, actual_tmp_delta)
+
+    def test_determine_future_timepoint(self):
+        """
+        Check arrival and in-transit timepoints within a horizon, after
+        looping around a circular horizon, and past the end of a linear
+        horizon
+        :return:
+        """
+        m, data = add_components_and_load_data(
+            prereq_modules=IMPORTED_PREREQ_MODULES,
+            module_to_test=MODULE_BEING_TESTED,
+            test_data_dir=TEST_DATA_DIRECTORY,
+            weather_iteration="",
+            hydro_iteration="",
+            availability_iteration="",
+            subproblem="",
+            stage="",
+        )
+        instance = m.create_instance(data)
+
+        expected = {
+            (20200101, 0.5): (20200101, [20200101]),
+            (20200101, 4.5): (20200104, [20200102, 20200103, 20200104]),
+            (20200123, 3): (20200103, [20200124, 20200101, 20200102, 20200103]),
+            (20200224, 2): ("tmp_outside_horizon", ["tmp_outside_horizon"]),
+        }
+        actual = {
+            (tmp, hrs): (
+                MODULE_BEING_TESTED.determine_future_timepoint(instance, tmp, hrs),
+                MODULE_BEING_TESTED.determine_future_timepoint(
+                    instance, tmp, hrs, keep_tmps=True
+                ),
+            )
+            for (tmp, hrs) in expected.keys()
+        }
+        self.assertDictEqual(expected, actual)
@@ -0,0 +1,121 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+import gridpath.common_functions as module_to_test
+
+
+class TestLogging(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.logs_dir = tempfile.TemporaryDirectory()
+        self.stdout_original = sys.stdout
+        self.terminal = io.StringIO()
+        sys.stdout = self.terminal
+
+    def tearDown(self):
+        sys.stdout = self.stdout_original
+        self.logs_dir.cleanup()
+
+    def get_logger(self, **kwargs):
+        return module_to_test.Logging(
+            logs_dir=self.logs_dir.name,
+            start_time=datetime.datetime(2025, 1, 2, 3, 4, 5),
+            e2e=False,
+            process_id=None,
+            **kwargs,
+        )
+
+    def read_log_file(self, logger):
+        with open(logger.log_file_path, "r") as f:
+            return f.read()
+
+    def test_log_file_order(self):
+        """
+        Messages written from multiple threads reach the log file in the
+        order they were written and are echoed to the terminal
+        :return:
+        """
+        logger = self.get_logger()
+        self.assertEqual(
+            os.path.join(self.logs_dir.name, "opt_2025-01-02_03-04-05.log"),
+            logger.log_file_path,
+        )
+        lock = threading.Lock()
+        written = []
+
+        def write_lines(thread_n):
+            for line_n in range(500):
+                with lock:
+                    message = "thread {} line {}\n".format(thread_n, line_n)
+                    logger.write(message)
+                    written.append(message)
+
+        threads = [threading.Thread(target=write_lines, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+
+        self.assertEqual("".join(written), self.read_log_file(logger))
+        self.assertEqual("".join(written), self.terminal.getvalue())
+
+    def test_echo(self):
+        """
+        Without echo, messages only go to the log file; echo_off restores
+        the echo setting even if an exception is raised
+        :return:
+        """
+        logger = self.get_logger(echo=False)
+        logger.write("file only\n")
+        self.assertEqual("", self.terminal.getvalue())
+
+        logger.echo = True
+        with self.assertRaises(RuntimeError):
+            with logger.echo_off():
+                logger.write("solver output\n")
+                raise RuntimeError("solver failed")
+        self.assertTrue(logger.echo)
+        logger.write("both\n")
+        logger.close()
+
+        self.assertEqual("both\n", self.terminal.getvalue())
+        self.assertEqual("file only\nsolver output\nboth\n", self.read_log_file(logger))
+
+    def test_close(self):
+        """
+        Closing the logger more than once (explicitly, on exiting the
+        context, and when garbage collected) is safe
+        :return:
+        """
+        with self.get_logger() as logger:
+            logger.write("message\n")
+        self.assertTrue(logger.log_file_closed)
+        self.assertTrue(logger.log_file_handler.stream is None)
+        logger.close()
+        logger.__del__()
+        self.assertEqual("message\n", self.read_log_file(logger))
+
+
+if __name__ == "__main__":
+    unittest.main()
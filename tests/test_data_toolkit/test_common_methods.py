@@ -0,0 +1,149 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import os.path
+import sqlite3
+import tempfile
+import unittest
+
+import data_toolkit.common_methods as module_to_test
+
+
+class TestCommonMethods(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("""CREATE TABLE raw_data_var_profiles (
+            year INTEGER, month INTEGER, day_of_month INTEGER,
+            day_type INTEGER, hour_of_day INTEGER, unit VARCHAR(64),
+            value FLOAT,
+            PRIMARY KEY (year, month, day_of_month, hour_of_day, unit)
+            );""")
+        self.conn.executemany(
+            "INSERT INTO raw_data_var_profiles VALUES (?, ?, ?, ?, ?, ?, ?);",
+            [
+                (2010, 1, 2, 1, 1, "A", 0.5),
+                (2010, 1, 2, 1, 2, "A", None),
+                (2010, 1, 2, 1, 1, "B", 0.25),
+                (2010, 1, 1, 1, 1, "A", 0.1),
+                (2010, 1, 1, 1, 2, "B", 0.2),
+                (2010, 1, 1, 1, 1, "C", 1.0),
+            ],
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_weighted_draw_profile(self):
+        """
+        Units' weighted values are summed by day and hour, hours with only
+        NULL values are NaN, and hours without data are skipped
+        :return:
+        """
+        days, hours, values, present = module_to_test.get_raw_unit_day_hour_data(
+            conn=self.conn, raw_data_table="raw_data_var_profiles", units=["A", "B"]
+        )
+        self.assertListEqual([(2010, 1, 1), (2010, 1, 2)], list(days))
+        self.assertListEqual([1, 2], list(hours))
+        self.assertTupleEqual((2, 2, 2), values.shape)
+
+        profile, has_data = module_to_test.get_weighted_day_hour_profile(
+            values=values, present=present, unit_weights=[(0, 2), (1, 0.5)]
+        )
+        np.testing.assert_array_equal(np.array([[0.2, 0.1], [1.125, np.nan]]), profile)
+        np.testing.assert_array_equal(np.array([[True, True], [True, True]]), has_data)
+
+        profile, has_data = module_to_test.get_weighted_day_hour_profile(
+            values=values, present=present, unit_weights=[(1, 1)]
+        )
+        np.testing.assert_array_equal(
+            np.array([[False, True], [True, False]]), has_data
+        )
+
+        # Draws of day 2, a day not in the raw data, and day 1
+        draw_rows, hour_rows = module_to_test.get_draw_rows(
+            has_data=has_data, draw_days=np.array([1, -1, 0])
+        )
+        self.assertListEqual([0, 2], list(draw_rows))
+        self.assertListEqual([0, 1], list(hour_rows))
+
+    def test_raw_data_store(self):
+        """
+        Slicing units' data from the raw data array store gives the same data
+        as reading them from the database, and the database is read when the
+        store is absent
+        :return:
+        """
+        # The store is not available for in-memory databases
+        self.assertIsNone(
+            module_to_test.get_raw_data_store_table_directory(
+                conn=self.conn, raw_data_table="raw_data_var_profiles"
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+            conn = sqlite3.connect(os.path.join(temp_directory, "raw.db"))
+            self.conn.commit()
+            self.conn.backup(conn)
+            table_directory = module_to_test.get_raw_data_store_table_directory(
+                conn=conn, raw_data_table="raw_data_var_profiles"
+            )
+
+            unit_lists = [["A", "B"], ["B"], ["C", "A"], ["D", "B"], ["D"], []]
+            expected = [
+                module_to_test.get_raw_unit_day_hour_data(
+                    conn=conn, raw_data_table="raw_data_var_profiles", units=units
+                )
+                for units in unit_lists
+            ]
+
+            module_to_test.materialize_raw_data_store(
+                conn=conn, raw_data_table="raw_data_var_profiles"
+            )
+            self.assertTrue(os.path.exists(table_directory))
+            # The table is no longer read
+            conn.execute("DELETE FROM raw_data_var_profiles;")
+
+            for units, (
+                expected_days,
+                expected_hours,
+                expected_values,
+                expected_present,
+            ) in zip(unit_lists, expected):
+                days, hours, values, present = (
+                    module_to_test.get_raw_unit_day_hour_data(
+                        conn=conn, raw_data_table="raw_data_var_profiles", units=units
+                    )
+                )
+                self.assertTrue(expected_days.equals(days))
+                self.assertListEqual(expected_days.names, days.names)
+                np.testing.assert_array_equal(expected_hours, hours)
+                np.testing.assert_array_equal(expected_values, values)
+                np.testing.assert_array_equal(expected_present, present)
+
+            module_to_test.remove_raw_data_store(
+                conn=conn, raw_data_table="raw_data_var_profiles"
+            )
+            self.assertFalse(os.path.exists(table_directory))
+            days, hours, values, present = module_to_test.get_raw_unit_day_hour_data(
+                conn=conn, raw_data_table="raw_data_var_profiles", units=["A"]
+            )
+            self.assertEqual(0, values.size)
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import os
+import shutil
 import unittest
 
 from db.create_database import main as create_database_main
+from data_toolkit.common_methods import RAW_DATA_STORE_SUFFIX
 from data_toolkit.load_raw_data import main as load_raw_data_main
 
 
@@ -55,6 +57,42 @@ class TestLoadRawData(unittest.TestCase):
         ]
         load_raw_data_main(args)
 
+    def test_load_raw_data_store(self):
+        """
+        Test load_raw_data materializing the hourly raw data tables into the
+        raw data array store
+        """
+        db_path = "ra_toolkit_test_store_temp.db"
+        store_directory = db_path + RAW_DATA_STORE_SUFFIX
+        create_database_main(
+            [
+                "--database",
+                db_path,
+                "--db_schema",
+                "../data_toolkit/raw_data_db_schema.sql",
+                "--quiet",
+            ]
+        )
+        load_raw_data_main(
+            [
+                "--database",
+                db_path,
+                "--csv_location",
+                "./csvs_test_examples/raw_data_ra_toolkit/",
+                "--raw_data_store",
+                "--quiet",
+            ]
+        )
+        try:
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(store_directory, "raw_data_var_profiles", "units.json")
+                )
+            )
+        finally:
+            shutil.rmtree(store_directory, ignore_errors=True)
+            os.remove(db_path)
+
     @classmethod
     def tearDownClass(cls):
         """Clean up test database"""
@@ -0,0 +1,128 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import sqlite3
+import tempfile
+import unittest
+
+import db.common_functions as module_to_test
+
+
+class TestAttachScenarioResults(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_directory.name, "io.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""CREATE TABLE results_project_period (
+            scenario_id INTEGER, project VARCHAR(64), capacity_mw FLOAT
+            );""")
+        conn.execute("""CREATE VIEW results_capacity_by_scenario AS
+            SELECT scenario_id, SUM(capacity_mw) AS capacity_mw
+            FROM results_project_period
+            GROUP BY scenario_id;""")
+        conn.execute("INSERT INTO results_project_period VALUES (0, 'Gas', 5);")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.temp_directory.cleanup()
+
+    def create_scenario_results_databases(self, n_scenarios):
+        conn = sqlite3.connect(self.db_path)
+        for scenario_id in range(1, n_scenarios + 1):
+            scenario_results_db_path = module_to_test.get_scenario_results_db_path(
+                db_path=self.db_path, scenario_id=scenario_id
+            )
+            module_to_test.create_scenario_results_database(
+                conn=conn, scenario_results_db_path=scenario_results_db_path
+            )
+            results_conn = sqlite3.connect(scenario_results_db_path)
+            results_conn.executemany(
+                "INSERT INTO results_project_period VALUES (?, ?, ?);",
+                [(scenario_id, "Wind", scenario_id), (scenario_id, "Solar", 1)],
+            )
+            results_conn.commit()
+            results_conn.close()
+        conn.close()
+
+    def get_results(self, scenario_ids=None):
+        conn = sqlite3.connect(self.db_path)
+        module_to_test.attach_scenario_results(conn=conn, scenario_ids=scenario_ids)
+        results = (
+            conn.execute("""SELECT scenario_id, project, capacity_mw
+                FROM results_project_period
+                ORDER BY scenario_id, project;""").fetchall(),
+            conn.execute("""SELECT scenario_id, capacity_mw
+                FROM results_capacity_by_scenario
+                ORDER BY scenario_id;""").fetchall(),
+        )
+        conn.close()
+        return results
+
+    def test_attach_scenario_results(self):
+        """
+        The results of the attached scenario results databases are combined
+        with those in the database
+        :return:
+        """
+        self.create_scenario_results_databases(n_scenarios=3)
+        self.assertTupleEqual(
+            (
+                [
+                    (0, "Gas", 5),
+                    (1, "Solar", 1),
+                    (1, "Wind", 1),
+                    (2, "Solar", 1),
+                    (2, "Wind", 2),
+                    (3, "Solar", 1),
+                    (3, "Wind", 3),
+                ],
+                [(0, 5), (1, 2), (2, 3), (3, 4)],
+            ),
+            self.get_results(),
+        )
+        self.assertTupleEqual(
+            ([(0, "Gas", 5), (2, "Solar", 1), (2, "Wind", 2)], [(0, 5), (2, 3)]),
+            self.get_results(scenario_ids=[2]),
+        )
+
+    def test_attach_scenario_results_over_limit(self):
+        """
+        More scenario results databases than SQLite can attach at once are
+        attached in batches
+        :return:
+        """
+        conn = sqlite3.connect(":memory:")
+        max_attached = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        conn.close()
+        n_scenarios = 2 * max_attached + 1
+        self.create_scenario_results_databases(n_scenarios=n_scenarios)
+
+        results, results_by_scenario = self.get_results()
+        self.assertEqual(1 + 2 * n_scenarios, len(results))
+        self.assertListEqual(
+            [(0, 5)]
+            + [
+                (scenario_id, scenario_id + 1)
+                for scenario_id in range(1, n_scenarios + 1)
+            ],
+            results_by_scenario,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
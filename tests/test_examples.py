@@ -13,19 +13,32 @@
 # limitations under the License.
 
 import ast
+from contextlib import redirect_stdout
 import csv
+import io
 import logging
 import multiprocessing
 import os
 import pandas as pd
 import platform
+import shutil
 import sqlite3
+import tempfile
 import unittest
+from unittest.mock import patch
 
-from gridpath import run_end_to_end, run_scenario, validate_inputs
+from pyomo.environ import Constraint, Suffix
+
+from gridpath import process_results, run_end_to_end, run_scenario, validate_inputs
 from db import create_database
-from db.common_functions import connect_to_database
+from db.common_functions import (
+    SCENARIO_RESULTS_DIRECTORY_SUFFIX,
+    attach_scenario_results,
+    connect_to_database,
+    get_scenario_results_db_path,
+)
 from db.utilities import port_csvs_to_db, scenario
+from gridpath.auxiliary.checkpoints import read_checkpoints
 
 # Change directory to 'gridpath' directory, as that's what run_scenario.py
 # expects; the rest of the global variables are relative paths from there
@@ -523,6 +536,192 @@ class TestExamples(unittest.TestCase):
         scenario_name = "multi_stage_prod_cost"
         self.validate_and_test_example_generic(scenario_name=scenario_name)
 
+    def test_example_multi_stage_prod_cost_pipeline(self):
+        """
+        Check objective function values of "multi_stage_prod_cost" example
+        when saving results in the background
+        :return:
+        """
+        scenario_name = "multi_stage_prod_cost"
+        self.validate_and_test_example_generic(
+            scenario_name=scenario_name,
+            skip_validation=True,
+            additional_args=["--pipeline_depth", "2"],
+        )
+
+    def test_example_multi_stage_prod_cost_results_subset(self):
+        """
+        Check that the end-to-end run of the "multi_stage_prod_cost" example
+        only processes the results it imported and that this gives the same
+        aggregated results as processing all of the scenario's results
+        :return:
+        """
+        scenario_name = "multi_stage_prod_cost"
+        with patch.object(
+            process_results, "process_results", wraps=process_results.process_results
+        ) as process_results_mock:
+            self.validate_and_test_example_generic(
+                scenario_name=scenario_name, skip_validation=True
+            )
+        self.assertListEqual(
+            [
+                (0, 0, 0, subproblem, stage)
+                for subproblem in [1, 2, 3]
+                for stage in [1, 2, 3]
+            ],
+            process_results_mock.call_args.kwargs["results_subset"],
+        )
+
+        def get_aggregated_results():
+            conn = connect_to_database(db_path=DB_PATH)
+            aggregated_results = {}
+            for table in [
+                "results_project_dispatch_by_technology",
+                "results_project_dispatch_by_technology_period",
+                "results_project_costs_operations_agg",
+                "results_project_carbon_emissions_by_technology_period",
+                "results_system_timepoint_loss_of_load_summary",
+            ]:
+                n_columns = len(conn.execute(f"PRAGMA table_info({table});").fetchall())
+                aggregated_results[table] = conn.execute(
+                    f"""SELECT * FROM {table}
+                    WHERE scenario_id = (
+                        SELECT scenario_id FROM scenarios WHERE scenario_name = ?
+                    )
+                    ORDER BY {", ".join(str(i) for i in range(1, n_columns + 1))};
+                    """,
+                    (scenario_name,),
+                ).fetchall()
+            conn.close()
+            return aggregated_results
+
+        subset_results = get_aggregated_results()
+        self.assertGreater(
+            len(subset_results["results_project_dispatch_by_technology"]), 0
+        )
+
+        # Process all of the scenario's results
+        process_results.main(
+            [
+                "--database",
+                DB_PATH,
+                "--scenario",
+                scenario_name,
+                "--scenario_location",
+                EXAMPLES_DIRECTORY,
+                "--quiet",
+            ]
+        )
+        self.assertDictEqual(subset_results, get_aggregated_results())
+
+    def test_example_multi_stage_prod_cost_incremental_import(self):
+        """
+        Check objective function values of "multi_stage_prod_cost" example
+        when importing and processing the results of each subproblem as it is
+        solved, and that this gives the same results as importing and
+        processing them after the scenario is solved
+        :return:
+        """
+        scenario_name = "multi_stage_prod_cost"
+
+        def get_results():
+            conn = connect_to_database(db_path=DB_PATH)
+            results = {}
+            for (table,) in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name LIKE 'results%';"
+            ).fetchall():
+                results[table] = sorted(
+                    conn.execute(
+                        f"""SELECT * FROM {table}
+                        WHERE scenario_id = (
+                            SELECT scenario_id FROM scenarios
+                            WHERE scenario_name = ?
+                        );""",
+                        (scenario_name,),
+                    ).fetchall(),
+                    key=repr,
+                )
+            conn.close()
+            return results
+
+        self.validate_and_test_example_generic(
+            scenario_name=scenario_name,
+            skip_validation=True,
+            additional_args=["--incremental_import"],
+        )
+        incremental_results = get_results()
+        self.assertGreater(
+            len(incremental_results["results_project_dispatch_by_technology"]), 0
+        )
+
+        self.validate_and_test_example_generic(
+            scenario_name=scenario_name, skip_validation=True
+        )
+        self.assertDictEqual(get_results(), incremental_results)
+
+    def test_example_multi_stage_prod_cost_scenario_results_database(self):
+        """
+        Check objective function values of "multi_stage_prod_cost" example
+        when importing results into a scenario results database, and that the
+        attached scenario results are the same as when importing them into
+        the database
+        :return:
+        """
+        scenario_name = "multi_stage_prod_cost"
+        self.validate_and_test_example_generic(
+            scenario_name=scenario_name,
+            skip_validation=True,
+            additional_args=["--scenario_results_database"],
+        )
+
+        def get_results():
+            conn = connect_to_database(db_path=DB_PATH)
+            (scenario_id,) = conn.execute(
+                "SELECT scenario_id FROM scenarios WHERE scenario_name = ?;",
+                (scenario_name,),
+            ).fetchone()
+            attach_scenario_results(conn=conn, scenario_ids=[scenario_id])
+            results = {}
+            for table in [
+                "results_scenario",
+                "results_project_timepoint",
+                "results_project_dispatch_by_technology",
+                "results_system_load_zone_timepoint",
+                "results_costs_by_period",
+            ]:
+                results[table] = sorted(
+                    conn.execute(
+                        f"SELECT * FROM {table} WHERE scenario_id = ?;",
+                        (scenario_id,),
+                    ).fetchall()
+                )
+            conn.close()
+            return scenario_id, results
+
+        scenario_id, scenario_results_db_results = get_results()
+        scenario_results_db_path = get_scenario_results_db_path(
+            db_path=DB_PATH, scenario_id=scenario_id
+        )
+        self.assertTrue(os.path.exists(scenario_results_db_path))
+        for table, rows in scenario_results_db_results.items():
+            self.assertGreater(len(rows), 0, msg=table)
+        conn = connect_to_database(db_path=DB_PATH)
+        self.assertIsNone(
+            conn.execute(
+                "SELECT 1 FROM results_project_timepoint WHERE scenario_id = ?;",
+                (scenario_id,),
+            ).fetchone()
+        )
+        conn.close()
+
+        # Importing into the database replaces the scenario results database
+        self.validate_and_test_example_generic(
+            scenario_name=scenario_name, skip_validation=True
+        )
+        self.assertFalse(os.path.exists(scenario_results_db_path))
+        self.assertDictEqual(scenario_results_db_results, get_results()[1])
+
     def test_example_single_stage_prod_cost_cycle_select(self):
         """
         Check validation and objective function values of
@@ -1265,6 +1464,222 @@ class TestExamples(unittest.TestCase):
             ]
         )
 
+    def test_incomplete_only_parallel(self):
+        """
+        Check that resuming a run solving subproblems in parallel only
+        re-solves (all stages of) the subproblems without a checkpoint
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as scenario_location:
+            shutil.copytree(
+                os.path.join(EXAMPLES_DIRECTORY, "multi_stage_prod_cost"),
+                os.path.join(scenario_location, "multi_stage_prod_cost"),
+            )
+            scenario_directory = os.path.join(
+                scenario_location, "multi_stage_prod_cost"
+            )
+            args = [
+                "--scenario",
+                "multi_stage_prod_cost",
+                "--scenario_location",
+                scenario_location,
+                "--quiet",
+                "--mute_solver_output",
+                "--n_parallel_solve",
+                "2",
+            ]
+            run_scenario.main(args)
+            checkpoints = read_checkpoints(scenario_directory)
+
+            # Simulate a run that died while solving stage 2 of subproblem 2
+            os.remove(os.path.join(scenario_directory, "checkpoints", "2.json"))
+            shutil.rmtree(os.path.join(scenario_directory, "2", "2", "results"))
+            shutil.rmtree(os.path.join(scenario_directory, "2", "3", "results"))
+
+            run_scenario.main(args + ["--incomplete_only"])
+            resumed_checkpoints = read_checkpoints(scenario_directory)
+
+            for subproblem in ["1", "3"]:
+                key = ("", "", "", subproblem)
+                self.assertDictEqual(checkpoints[key], resumed_checkpoints[key])
+            resumed = resumed_checkpoints[("", "", "", "2")]
+            self.assertNotEqual(
+                checkpoints[("", "", "", "2")]["timestamp"], resumed["timestamp"]
+            )
+            self.assertListEqual(["1", "2", "3"], sorted(resumed["stages"]))
+            for stage_results in resumed["stages"].values():
+                self.assertIn("solve_seconds", stage_results)
+
+    def test_log_solver_output_to_file_only(self):
+        """
+        Check that with --log_solver_output_to_file_only the solver output
+        is written to the log file but not to the terminal, while the
+        other messages go to both
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as scenario_location:
+            shutil.copytree(
+                os.path.join(EXAMPLES_DIRECTORY, "test"),
+                os.path.join(scenario_location, "test"),
+            )
+            terminal = io.StringIO()
+            with redirect_stdout(terminal):
+                run_scenario.main(
+                    [
+                        "--scenario",
+                        "test",
+                        "--scenario_location",
+                        scenario_location,
+                        "--log",
+                        "--log_solver_output_to_file_only",
+                    ]
+                )
+            logs_directory = os.path.join(scenario_location, "test", "logs")
+            [log_file] = os.listdir(logs_directory)
+            with open(os.path.join(logs_directory, log_file), "r") as f:
+                log = f.read()
+
+            self.assertIn("Welcome to the CBC MILP Solver", log)
+            self.assertNotIn("Welcome to the CBC MILP Solver", terminal.getvalue())
+            self.assertIn("Loading data...", terminal.getvalue())
+            self.assertIn("Loading data...", log)
+
+    def test_duals(self):
+        """
+        Check the dual suffix and the duals to load from solution files for
+        each --duals option, and that the exported duals are the same with
+        'declared' and 'all' and empty with 'none'
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as scenario_location:
+            shutil.copytree(
+                os.path.join(EXAMPLES_DIRECTORY, "test"),
+                os.path.join(scenario_location, "test"),
+            )
+            scenario_directory = os.path.join(scenario_location, "test")
+            dual_columns = {
+                "system_load_zone_timepoint.csv": "load_balance_dual",
+                "system_lf_reserves_up.csv": "dual",
+                "system_regulation_down.csv": "dual",
+            }
+            exported_duals = {}
+            for duals, direction in [
+                ("all", Suffix.IMPORT),
+                ("declared", Suffix.IMPORT),
+                ("none", Suffix.LOCAL),
+            ]:
+                args = [
+                    "--scenario",
+                    "test",
+                    "--scenario_location",
+                    scenario_location,
+                    "--quiet",
+                    "--mute_solver_output",
+                    "--duals",
+                    duals,
+                ]
+                parsed_arguments = run_scenario.parse_arguments(args)
+                dynamic_components, instance = run_scenario.create_problem(
+                    scenario_directory=scenario_directory,
+                    weather_iteration="",
+                    hydro_iteration="",
+                    availability_iteration="",
+                    subproblem="",
+                    stage="",
+                    multi_stage=False,
+                    parsed_arguments=parsed_arguments,
+                )
+                self.assertEqual(direction, instance.dual.direction)
+
+                dual_constraints = run_scenario.get_dual_constraints(
+                    parsed_arguments=parsed_arguments,
+                    scenario_directory=scenario_directory,
+                    weather_iteration="",
+                    hydro_iteration="",
+                    availability_iteration="",
+                    subproblem="",
+                    stage="",
+                    multi_stage=False,
+                )
+                if duals == "all":
+                    self.assertIsNone(dual_constraints)
+                elif duals == "declared":
+                    # Modules may declare constraints that are not in the
+                    # problem (e.g. for capacity types not used)
+                    self.assertLessEqual(
+                        {
+                            "Meet_Load_Constraint",
+                            "Meet_LF_Reserves_Up_Constraint",
+                            "Meet_LF_Reserves_Down_Constraint",
+                            "Meet_Regulation_Up_Constraint",
+                            "Meet_Regulation_Down_Constraint",
+                        },
+                        dual_constraints,
+                    )
+                    n_declared = sum(
+                        len(getattr(instance, c))
+                        for c in dual_constraints
+                        if hasattr(instance, c)
+                    )
+                    n_constraints = sum(
+                        len(c) for c in instance.component_objects(Constraint)
+                    )
+                    self.assertLess(n_declared, n_constraints)
+                else:
+                    self.assertSetEqual(set(), dual_constraints)
+
+                run_scenario.main(args)
+                exported_duals[duals] = {
+                    results_file: pd.read_csv(
+                        os.path.join(scenario_directory, "results", results_file)
+                    )
+                    for results_file in dual_columns.keys()
+                }
+
+            for results_file, df in exported_duals["all"].items():
+                dual_column = dual_columns[results_file]
+                self.assertTrue(df[dual_column].notna().all())
+                pd.testing.assert_frame_equal(
+                    df, exported_duals["declared"][results_file]
+                )
+                self.assertTrue(
+                    exported_duals["none"][results_file][dual_column].isna().all()
+                )
+
+    def test_export_releases_results_dfs(self):
+        """
+        Check that no results dataframes are left on the dynamic components
+        once the detailed results are exported
+        :return:
+        """
+        for scenario_name in [
+            "2periods_new_build_2zones_transmission_w_hurdle_rates",
+            "2periods_new_build_generic_policy",
+            "test_new_solar_carbon_cap_2zones_tx",
+        ]:
+            with patch.object(
+                run_scenario, "export_results", wraps=run_scenario.export_results
+            ) as export_results:
+                run_scenario.main(
+                    [
+                        "--scenario",
+                        scenario_name,
+                        "--scenario_location",
+                        EXAMPLES_DIRECTORY,
+                        "--quiet",
+                        "--mute_solver_output",
+                    ]
+                )
+            dynamic_components = export_results.call_args.kwargs["dynamic_components"]
+            self.assertListEqual(
+                [],
+                [
+                    attribute
+                    for attribute, value in vars(dynamic_components).items()
+                    if isinstance(value, pd.DataFrame)
+                ],
+            )
+
     def test_example_test_w_storage_starting_soc(self):
         """
         Check validation and objective function value of
@@ -1824,6 +2239,7 @@ class TestExamples(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         os.remove(DB_PATH)
+        shutil.rmtree(DB_PATH + SCENARIO_RESULTS_DIRECTORY_SUFFIX, ignore_errors=True)
         for temp_file_ext in ["-shm", "-wal"]:
             temp_file = "{}{}".format(DB_PATH, temp_file_ext)
             if os.path.exists(temp_file):
@@ -0,0 +1,170 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from db import create_database
+from db.utilities import port_csvs_to_db
+
+DB_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "db")
+CSV_PATH = os.path.join(DB_DIRECTORY, "csvs_test_examples")
+
+# A subset of the test examples' CSV structure covering the different
+# subscenario types and a custom method
+CSV_STRUCTURE_PATHS = [
+    "solver",
+    "temporal",
+    os.path.join("project", "portfolios"),
+    os.path.join("system_load", "load_zones"),
+    os.path.join("system_load", "load_balance"),
+    os.path.join("project", "load_zones"),
+]
+
+
+class TestPortCSVsToDB(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_directory, "csvs")
+        for path in CSV_STRUCTURE_PATHS:
+            shutil.copytree(
+                os.path.join(CSV_PATH, path), os.path.join(self.csv_path, path)
+            )
+        csv_structure = pd.read_csv(os.path.join(CSV_PATH, "csv_structure.csv"))
+        csv_structure[
+            csv_structure["path"].isin(
+                [p.replace(os.sep, "/") for p in CSV_STRUCTURE_PATHS]
+            )
+        ].to_csv(os.path.join(self.csv_path, "csv_structure.csv"), index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
+
+    def create_database(self, name):
+        db_path = os.path.join(self.temp_directory, "{}.db".format(name))
+        create_database.main(
+            [
+                "--database",
+                db_path,
+                "--db_schema",
+                os.path.join(DB_DIRECTORY, "db_schema.sql"),
+                "--data_directory",
+                os.path.join(DB_DIRECTORY, "data"),
+            ]
+        )
+        return db_path
+
+    def load(self, db_path, additional_args=[]):
+        port_csvs_to_db.main(
+            ["--database", db_path, "--csv_location", self.csv_path, "--quiet"]
+            + additional_args
+        )
+
+    @staticmethod
+    def get_table_contents(db_path):
+        conn = sqlite3.connect(db_path)
+        tables = [
+            table
+            for (table,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name;"
+            )
+        ]
+        contents = {
+            table: sorted(
+                conn.execute("SELECT * FROM {};".format(table)).fetchall(), key=repr
+            )
+            for table in tables
+        }
+        conn.close()
+        return contents
+
+    def test_parallel_read(self):
+        """
+        Parsing the CSVs in worker processes loads the same data as a serial
+        load
+        :return:
+        """
+        serial_db_path = self.create_database("serial")
+        self.load(serial_db_path)
+        parallel_db_path = self.create_database("parallel")
+        self.load(parallel_db_path, ["--n_parallel_read", "2"])
+
+        serial_contents = self.get_table_contents(serial_db_path)
+        self.assertTrue(serial_contents["inputs_temporal"])
+        self.assertTrue(serial_contents["inputs_project_portfolios"])
+        self.assertDictEqual(serial_contents, self.get_table_contents(parallel_db_path))
+
+    def test_resume(self):
+        """
+        A resumed load skips the tables recorded in the load log and loads
+        the same data as an uninterrupted load
+        :return:
+        """
+        serial_db_path = self.create_database("serial")
+        self.load(serial_db_path)
+        self.assertFalse(
+            os.path.exists(port_csvs_to_db.get_load_log_path(serial_db_path))
+        )
+
+        # Interrupt the load after the third table
+        db_path = self.create_database("resumed")
+        load_table = (
+            port_csvs_to_db.load_all_subscenario_ids_from_dir_to_subscenario_table
+        )
+        n_tables_loaded = 3
+        calls = []
+
+        def interrupted_load_table(*args, **kwargs):
+            calls.append(args)
+            if len(calls) > n_tables_loaded:
+                raise KeyboardInterrupt
+            load_table(*args, **kwargs)
+
+        with patch.object(
+            port_csvs_to_db,
+            "load_all_subscenario_ids_from_dir_to_subscenario_table",
+            side_effect=interrupted_load_table,
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                self.load(db_path)
+        load_log = port_csvs_to_db.get_load_log_path(db_path)
+        self.assertEqual(n_tables_loaded, len(port_csvs_to_db.read_load_log(load_log)))
+
+        with patch.object(
+            port_csvs_to_db,
+            "load_all_subscenario_ids_from_dir_to_subscenario_table",
+            wraps=load_table,
+        ) as resumed_load_table:
+            self.load(db_path, ["--resume"])
+        self.assertEqual(
+            len(pd.read_csv(os.path.join(self.csv_path, "csv_structure.csv")))
+            - n_tables_loaded,
+            resumed_load_table.call_count,
+        )
+        self.assertFalse(os.path.exists(load_log))
+        self.assertDictEqual(
+            self.get_table_contents(serial_db_path), self.get_table_contents(db_path)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
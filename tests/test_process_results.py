@@ -0,0 +1,196 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import re
+import sqlite3
+import unittest
+
+from gridpath.auxiliary.module_list import all_modules_list, load_modules
+from gridpath.auxiliary.scenario_chars import SubScenarios
+import gridpath.process_results as module_to_test
+from gridpath.project.operations import power
+from gridpath.project.operations.operational_types import (
+    gen_hydro,
+    gen_var,
+    gen_var_stor_hyb,
+)
+from gridpath.project.reliability.prm.prm_types import energy_only_allowed
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "db", "db_schema.sql")
+
+ZONE_TABLES = {
+    "inputs_project_carbon_cap_zones": "carbon_cap_zone",
+    "inputs_project_carbon_tax_zones": "carbon_tax_zone",
+    "inputs_project_energy_target_zones": "energy_target_zone",
+    "inputs_project_instantaneous_penetration_zones": (
+        "instantaneous_penetration_zone"
+    ),
+    "inputs_project_performance_standard_zones": "performance_standard_zone",
+}
+
+
+class TestProcessResults(unittest.TestCase):
+    """ """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        with open(SCHEMA, "r") as f:
+            self.conn.executescript(f.read())
+
+        # Two scenarios with all subscenario IDs set
+        subscenario_columns = [
+            row[1]
+            for row in self.conn.execute("PRAGMA table_info(scenarios);")
+            if row[1].endswith("_scenario_id")
+        ]
+        for scenario_id in [1, 2]:
+            self.conn.execute(
+                "INSERT INTO scenarios (scenario_id, scenario_name, {}) "
+                "VALUES (?, ?, {});".format(
+                    ", ".join(subscenario_columns),
+                    ", ".join(["1"] * len(subscenario_columns)),
+                ),
+                (scenario_id, "scenario_{}".format(scenario_id)),
+            )
+
+        self.conn.executemany(
+            """INSERT INTO inputs_temporal
+            (temporal_scenario_id, subproblem_id, stage_id, timepoint, period,
+            number_of_hours_in_timepoint, timepoint_weight, spinup_or_lookahead)
+            VALUES (1, ?, 1, ?, 2030, 1, 1, ?);""",
+            [(1, 1, 0), (1, 2, 1), (2, 3, 0), (2, 4, 1)],
+        )
+        self.conn.execute("""INSERT INTO inputs_temporal_iterations
+            (temporal_scenario_id, weather_iteration, hydro_iteration,
+            availability_iteration)
+            VALUES (1, 0, 0, 0);""")
+        for table, col in ZONE_TABLES.items():
+            self.conn.execute("INSERT INTO {} VALUES (1, 'gen', 'zone');".format(table))
+
+        self.conn.executemany(
+            """INSERT INTO results_project_timepoint
+            (scenario_id, project, weather_iteration, hydro_iteration,
+            availability_iteration, subproblem_id, stage_id, timepoint, period,
+            timepoint_weight, number_of_hours_in_timepoint, load_zone,
+            technology, power_mw)
+            VALUES (?, ?, 0, 0, 0, ?, 1, ?, 2030, 1, 1, 'zone', 'tech', ?);""",
+            [
+                (scenario_id, project, subproblem, tmp, power_mw)
+                for scenario_id in [1, 2]
+                for project, power_mw in [("gen", 10), ("gen2", 5)]
+                for subproblem, tmp in [(1, 1), (1, 2), (2, 3), (2, 4)]
+            ],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def get_dispatch_by_technology(self):
+        return self.conn.execute("""SELECT *
+            FROM results_project_dispatch_by_technology
+            ORDER BY scenario_id, subproblem_id, timepoint;""").fetchall()
+
+    def test_process_queries_scenario_scoped(self):
+        """
+        All results processing queries only search the target scenario's
+        results, both when processing all results and a results subset
+        :return:
+        """
+        loaded_modules = load_modules(all_modules_list()) + [
+            gen_hydro,
+            gen_var,
+            gen_var_stor_hyb,
+        ]
+        subscenarios = SubScenarios(conn=self.conn, scenario_id=1)
+        c = self.conn.cursor()
+
+        for results_subset in [None, [(0, 0, 0, 2, 1)]]:
+            statements = []
+            self.conn.set_trace_callback(statements.append)
+            module_to_test.process_results(
+                loaded_modules=loaded_modules,
+                db=self.conn,
+                cursor=c,
+                scenario_id=1,
+                subscenarios=subscenarios,
+                quiet=True,
+                results_subset=results_subset,
+            )
+            for m in [gen_hydro, gen_var, gen_var_stor_hyb, energy_only_allowed]:
+                m.process_model_results(
+                    self.conn, c, 1, subscenarios, True, results_subset=results_subset
+                )
+            self.conn.set_trace_callback(None)
+
+            results_statements = [
+                s
+                for s in statements
+                if re.search(r"\bresults_", s)
+                and s.strip().split()[0].upper()
+                in ["SELECT", "INSERT", "UPDATE", "DELETE"]
+            ]
+            self.assertGreater(len(results_statements), 0)
+            for statement in results_statements:
+                for plan_row in self.conn.execute(
+                    "EXPLAIN QUERY PLAN {}".format(statement)
+                ).fetchall():
+                    detail = plan_row[-1]
+                    # scenario_id is the rowid of tables with a scenario_id
+                    # INTEGER PRIMARY KEY
+                    if re.match(r"(SCAN|SEARCH) results_", detail):
+                        self.assertRegex(
+                            detail,
+                            r"^SEARCH .*\((scenario_id|rowid)=\?",
+                            msg="Query not scoped to the scenario:\n{}".format(
+                                statement
+                            ),
+                        )
+
+    def test_process_results_subset(self):
+        """
+        Processing a results subset only recomputes the aggregates for that
+        subset and gives the same results as processing all results
+        :return:
+        """
+        c = self.conn.cursor()
+        for scenario_id in [1, 2]:
+            power.process_results(self.conn, c, scenario_id, None, True)
+        expected_dispatch = self.get_dispatch_by_technology()
+        self.assertEqual(8, len(expected_dispatch))
+
+        # Re-import subproblem 2 of scenario 1 with new dispatch
+        self.conn.execute("""UPDATE results_project_timepoint
+            SET power_mw = power_mw * 2
+            WHERE scenario_id = 1 AND subproblem_id = 2;""")
+        power.process_results(
+            self.conn, c, 1, None, True, results_subset=[(0, 0, 0, 2, 1)]
+        )
+        dispatch = self.get_dispatch_by_technology()
+
+        # Recompute everything
+        for scenario_id in [1, 2]:
+            power.process_results(self.conn, c, scenario_id, None, True)
+        self.assertListEqual(self.get_dispatch_by_technology(), dispatch)
+        self.assertListEqual(
+            [row[-1] for row in expected_dispatch[:2]],
+            [row[-1] for row in dispatch[:2]],
+        )
+        self.assertListEqual([30, 30], [row[-1] for row in dispatch[2:4]])
+        self.assertListEqual(expected_dispatch[4:], dispatch[4:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,489 @@
+# Copyright 2016-2025 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import dill
+import io
+import json
+import os.path
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from pyomo.core.base.componentuid import ComponentUID
+from pyomo.environ import (
+    ConcreteModel,
+    Constraint,
+    NonNegativeReals,
+    Objective,
+    Set,
+    Suffix,
+    Var,
+)
+
+from gridpath import run_scenario
+from gridpath.auxiliary.dynamic_components import DynamicComponents
+from gridpath.run_scenario import (
+    ExportPipeline,
+    get_peak_memory_mb,
+    iterate_json_solution,
+    load_cplex_xml_solution,
+    load_gurobi_json_solution,
+    load_highs_xml_solution,
+    report_peak_memory,
+    write_problem_file,
+)
+
+JSON_SOLUTIONS = {
+    "empty": "{}",
+    "empty_lists": '{"Vars": [], "Constrs": [ ]}',
+    "scalars": """{
+        "int": 12345, "float": -1.5e-10, "exp": 2E+3, "true": true,
+        "false": false, "null": null
+    }""",
+    "escaped_strings": r"""{
+        "Vars": [
+            {"VTag": ["x\"1\""], "X": 1},
+            {"VTag": ["brackets ]}{[ and , commas"], "X": 0.25},
+            {"VTag": ["back\\slash\\"], "X": 3},
+            {"VTag": ["unicode é😀 \/ \b\f\n\r\t"], "X": 4}
+        ],
+        "key with \"quotes\" and : colon": "value, with } brace"
+    }""",
+    "nested": """{
+        "SolutionInfo": {
+            "Status": 2, "ObjVal": 100.5,
+            "Nested": {"a": [1, [2, 3], {"b": [{}, []]}], "c": {"d": null}}
+        },
+        "Vars": [
+            {"VTag": ["x1"], "X": 10.123456789},
+            {"VTag": ["x2"], "X": [1, {"y": [2]}]},
+            [[], [[]]],
+            "string item",
+            -0.0
+        ],
+        "Constrs": [{"CTag": ["c_l_x3_"], "Pi": -1e-07}]
+    }""",
+}
+
+
+def expected_items(solution):
+    """
+    The (key, value) tuples iterate_json_solution should return, based on
+    the fully loaded JSON object
+    """
+    items = []
+    for key, value in json.loads(solution).items():
+        if isinstance(value, list):
+            items += [(key, item) for item in value]
+        else:
+            items.append((key, value))
+    return items
+
+
+# The scripts called for each scenario or subproblem; the GridPath modules
+# the scenario uses are only imported after the arguments are parsed
+ENTRY_POINT_MODULES = [
+    "gridpath.get_scenario_inputs",
+    "gridpath.run_scenario",
+    "gridpath.import_scenario_results",
+    "gridpath.process_results",
+    "gridpath.run_end_to_end",
+]
+
+# Dependencies that are slow to import and only needed by some scenarios
+DEFERRED_DEPENDENCIES = ["dill", "networkx"]
+
+
+class TestRunScenario(unittest.TestCase):
+    """ """
+
+    def test_startup_imports(self):
+        """
+        Importing the entry point scripts does not import any GridPath model
+        modules or the deferred dependencies
+        :return:
+        """
+        imported = json.loads(
+            subprocess.check_output(
+                [
+                    sys.executable,
+                    "-c",
+                    "import json, sys\n"
+                    + "".join("import {}\n".format(m) for m in ENTRY_POINT_MODULES)
+                    + "print(json.dumps(sorted(sys.modules)))",
+                ],
+                cwd=os.path.join(os.path.dirname(__file__), ".."),
+            )
+        )
+        for dependency in DEFERRED_DEPENDENCIES:
+            self.assertNotIn(dependency, imported)
+        self.assertListEqual(
+            [],
+            [
+                m
+                for m in imported
+                if m.startswith("gridpath.")
+                and m not in ENTRY_POINT_MODULES
+                and not m.startswith("gridpath.auxiliary")
+                and m != "gridpath.common_functions"
+            ],
+        )
+
+    def test_export_pipeline(self):
+        """
+        Items are run in order in the background, with at most *depth* items
+        queued, and exceptions are raised in the main thread
+        :return:
+        """
+        main_thread = threading.current_thread()
+        calls = []
+
+        def export(n):
+            self.assertIsNot(main_thread, threading.current_thread())
+            time.sleep(0.01)
+            calls.append(n)
+
+        pipeline = ExportPipeline(depth=2)
+        for n in range(5):
+            pipeline.submit(export, n=n)
+            pipeline.submit_after_last(export, n="checkpoint {}".format(n))
+            self.assertLessEqual(len(pipeline.pending), 2)
+        pipeline.close(quiet=True)
+        self.assertListEqual(
+            [item for n in range(5) for item in [n, "checkpoint {}".format(n)]],
+            calls,
+        )
+        self.assertGreater(pipeline.export_seconds, 0.1)
+
+        def fail():
+            raise ValueError("export failed")
+
+        pipeline = ExportPipeline(depth=1)
+        pipeline.submit(fail)
+        with self.assertRaises(ValueError):
+            pipeline.submit(export, n=0)
+        pipeline.close(quiet=True)
+
+    def test_iterate_json_solution(self):
+        """
+        The keys and values read incrementally are the same as those loaded
+        with json.load, including when values, strings, and numbers are split
+        across chunk boundaries
+        :return:
+        """
+        for name, solution in JSON_SOLUTIONS.items():
+            expected = expected_items(solution)
+            for chunk_size in [1, 2, 3, 5, 7, 16, 1048576]:
+                with self.subTest(solution=name, chunk_size=chunk_size):
+                    actual = list(
+                        iterate_json_solution(
+                            io.StringIO(solution), chunk_size=chunk_size
+                        )
+                    )
+                    self.assertListEqual(expected, actual)
+                    # Same types, e.g. integers are not read as floats
+                    self.assertListEqual(
+                        [json.dumps(item) for item in expected],
+                        [json.dumps(item) for item in actual],
+                    )
+
+    def test_iterate_json_solution_from_file(self):
+        """
+        A solution file written with json.dump is read back in full
+        :return:
+        """
+        solution = {
+            "SolutionInfo": {"Status": 2, "ObjVal": 12.5},
+            "Vars": [{"VTag": ["x{}".format(i)], "X": i * 0.1} for i in range(10000)],
+            "Constrs": [
+                {"CTag": ["c_l_x{}_".format(i)], "Pi": -i} for i in range(10000)
+            ],
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            solution_file = os.path.join(tmp_dir, "solution.json")
+            with open(solution_file, "w") as f:
+                json.dump(solution, f, indent=2)
+            with open(solution_file, "r") as f:
+                expected = expected_items(f.read())
+            with open(solution_file, "r") as f:
+                actual = list(iterate_json_solution(f, chunk_size=4096))
+
+        self.assertEqual(20001, len(actual))
+        self.assertListEqual(expected, actual)
+
+    def test_iterate_json_solution_invalid(self):
+        """
+        Invalid or truncated JSON raises an error
+        :return:
+        """
+        for solution in [
+            "",
+            "[1, 2]",
+            '{"Vars": [1, 2}',
+            '{"Vars": [1, 2',
+            '{"a": 1 "b": 2}',
+            '{"a": "unterminated',
+        ]:
+            with self.subTest(solution=solution):
+                with self.assertRaises(ValueError):
+                    list(iterate_json_solution(io.StringIO(solution), chunk_size=3))
+
+    def test_load_solutions(self):
+        """
+        The CPLEX, Gurobi, and HiGHS solution loaders load the same variable
+        values and duals into the saved problem instance
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as prob_sol_files_directory:
+            # Save the problem instance, dynamic components, and symbol map
+            # as with --create_lp_problem_file_only
+            m = ConcreteModel()
+            m.PROJECTS = Set(initialize=["Wind", "Solar", "Gas"])
+            m.Power = Var(m.PROJECTS, within=NonNegativeReals)
+            m.Min_Power = Constraint(m.PROJECTS, rule=lambda mod, p: mod.Power[p] >= 1)
+            # The constant term adds the ONE_VAR_CONSTANT variable
+            m.Cost = Objective(expr=sum(m.Power[p] for p in m.PROJECTS) + 1)
+            m.dual = Suffix(direction=Suffix.IMPORT)
+
+            smap_id = write_problem_file(
+                instance=m, prob_sol_files_directory=prob_sol_files_directory
+            )
+            symbol_map = m.solutions.symbol_map[smap_id]
+            with open(
+                os.path.join(prob_sol_files_directory, "instance.pickle"), "wb"
+            ) as f_out:
+                dill.dump(m, f_out)
+            with open(
+                os.path.join(prob_sol_files_directory, "dynamic_components.pickle"),
+                "wb",
+            ) as f_out:
+                dill.dump(DynamicComponents(), f_out)
+            with open(
+                os.path.join(prob_sol_files_directory, "symbol_map.pickle"), "wb"
+            ) as f_out:
+                dill.dump(
+                    tuple(
+                        (symbol, ComponentUID(var_weakref, cuid_buffer={}))
+                        for symbol, var_weakref in symbol_map.bySymbol.items()
+                    ),
+                    f_out,
+                )
+
+            var_symbols = {
+                p: symbol_map.getSymbol(m.Power[p]) for p in ["Wind", "Solar", "Gas"]
+            }
+            constraint_symbols = {
+                p: symbol_map.getSymbol(m.Min_Power[p])
+                for p in ["Wind", "Solar", "Gas"]
+            }
+            one_var_constant_symbol = [
+                s
+                for s, c in symbol_map.bySymbol.items()
+                if c.name == "ONE_VAR_CONSTANT"
+            ][0]
+            values = {"Wind": 1.5, "Solar": 2.25, "Gas": 1}
+            duals = {"Wind": 1, "Solar": 0.5, "Gas": -1e-07}
+
+            with open(
+                os.path.join(prob_sol_files_directory, "cplex_solution.sol"), "w"
+            ) as f:
+                f.write(
+                    '<?xml version = "1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    '<CPLEXSolution version="1.2">\n'
+                    ' <header solutionStatusValue="1" '
+                    'solutionStatusString="optimal"/>\n'
+                    " <linearConstraints>\n"
+                    + "".join(
+                        '  <constraint name="{}" index="{}" dual="{}"/>\n'.format(
+                            constraint_symbols[p], i, duals[p]
+                        )
+                        for i, p in enumerate(duals.keys())
+                    )
+                    + " </linearConstraints>\n"
+                    " <variables>\n"
+                    '  <variable name="{}" index="0" value="1"/>\n'.format(
+                        one_var_constant_symbol
+                    )
+                    + "".join(
+                        '  <variable name="{}" index="{}" value="{}"/>\n'.format(
+                            var_symbols[p], i + 1, values[p]
+                        )
+                        for i, p in enumerate(values.keys())
+                    )
+                    + " </variables>\n"
+                    "</CPLEXSolution>\n"
+                )
+            with open(
+                os.path.join(prob_sol_files_directory, "gurobi_solution.json"), "w"
+            ) as f:
+                json.dump(
+                    {
+                        "SolutionInfo": {"Status": 2, "ObjVal": 5.75},
+                        "Vars": [{"VTag": ["ONE_VAR_CONSTANT"], "X": 1}]
+                        + [{"VTag": [var_symbols[p]], "X": values[p]} for p in values],
+                        # The loader drops the first four characters of the
+                        # constraint tags
+                        "Constrs": [
+                            {"CTag": ["lin_" + constraint_symbols[p]], "Pi": duals[p]}
+                            for p in duals
+                        ],
+                    },
+                    f,
+                )
+            with open(
+                os.path.join(prob_sol_files_directory, "highs_solution.sol"), "w"
+            ) as f:
+                f.write(
+                    "Model status\nOptimal\n\n# Primal solution values\nFeasible\n"
+                    "Objective 5.75\n# Columns 4\n"
+                    "{} 1\n".format(one_var_constant_symbol)
+                    + "".join(
+                        "{} {}\n".format(var_symbols[p], values[p]) for p in values
+                    )
+                    + "# Rows 3\n"
+                    + "".join("{} 1\n".format(constraint_symbols[p]) for p in duals)
+                    + "\n# Dual solution values\nFeasible\n# Columns 4\n"
+                    "{} 0\n".format(one_var_constant_symbol)
+                    + "".join("{} 0\n".format(var_symbols[p]) for p in values)
+                    + "# Rows 3\n"
+                    + "".join(
+                        "{} {}\n".format(constraint_symbols[p], duals[p]) for p in duals
+                    )
+                    + "\n# Basis\nHiGHS v1\nValid\n"
+                )
+
+            for loader in [
+                load_cplex_xml_solution,
+                load_gurobi_json_solution,
+                load_highs_xml_solution,
+            ]:
+                with self.subTest(loader=loader.__name__):
+                    instance, results, dynamic_components = loader(
+                        prob_sol_files_directory=prob_sol_files_directory
+                    )
+                    self.assertEqual("optimal", results.solver.termination_condition)
+                    self.assertEqual("ok", results.solver.status)
+                    self.assertIsInstance(dynamic_components, DynamicComponents)
+                    self.assertDictEqual(
+                        values, {p: instance.Power[p].value for p in values}
+                    )
+                    self.assertDictEqual(
+                        duals,
+                        {p: instance.dual[instance.Min_Power[p]] for p in duals},
+                    )
+
+                    # Only the duals of the requested constraints are loaded
+                    for dual_constraints, n_duals in [
+                        ({"Min_Power", "Other_Constraint"}, 3),
+                        ({"Other_Constraint"}, 0),
+                        (set(), 0),
+                    ]:
+                        instance, results, dynamic_components = loader(
+                            prob_sol_files_directory=prob_sol_files_directory,
+                            dual_constraints=dual_constraints,
+                        )
+                        self.assertDictEqual(
+                            values, {p: instance.Power[p].value for p in values}
+                        )
+                        self.assertEqual(n_duals, len(instance.dual))
+
+    def test_set_up_gridpath_modules(self):
+        """
+        The modules are determined and loaded once per scenario and
+        features.csv file version; the worker initializer caches the modules
+        determined by the parent process
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as scenario_directory, patch.dict(
+            run_scenario.GRIDPATH_MODULES, clear=True
+        ), patch.object(
+            run_scenario, "determine_modules", wraps=run_scenario.determine_modules
+        ) as determine_modules:
+            features_file = os.path.join(scenario_directory, "features.csv")
+            with open(features_file, "w") as f:
+                f.write("features\nlf_reserves_up\n")
+
+            modules = run_scenario.set_up_gridpath_modules(
+                scenario_directory=scenario_directory, multi_stage=False
+            )
+            self.assertIs(
+                modules[1],
+                run_scenario.set_up_gridpath_modules(
+                    scenario_directory=scenario_directory, multi_stage=False
+                )[1],
+            )
+            self.assertEqual(1, determine_modules.call_count)
+            self.assertIn("system.reserves.requirement.lf_reserves_up", modules[0])
+
+            # Changed features file
+            with open(features_file, "w") as f:
+                f.write("features\nregulation_up\n")
+            modules = run_scenario.set_up_gridpath_modules(
+                scenario_directory=scenario_directory, multi_stage=False
+            )
+            self.assertEqual(2, determine_modules.call_count)
+            self.assertNotIn("system.reserves.requirement.lf_reserves_up", modules[0])
+            self.assertIn("system.reserves.requirement.regulation_up", modules[0])
+            self.assertEqual(2, len(run_scenario.GRIDPATH_MODULES))
+
+            # Modules determined by the parent process
+            run_scenario.initialize_worker(
+                scenario_directory=scenario_directory,
+                multi_stage=True,
+                modules_to_use=modules[0],
+            )
+            self.assertEqual(2, determine_modules.call_count)
+            self.assertListEqual(
+                modules[0],
+                run_scenario.set_up_gridpath_modules(
+                    scenario_directory=scenario_directory, multi_stage=True
+                )[0],
+            )
+            self.assertEqual(2, determine_modules.call_count)
+
+    def test_report_peak_memory(self):
+        """
+        The peak memory is reported when verbose and nothing is reported on
+        platforms without the resource module
+        :return:
+        """
+        for resource_module_missing in [False, True]:
+            with self.subTest(resource_module_missing=resource_module_missing):
+                terminal = io.StringIO()
+                with patch.object(sys, "stdout", terminal), patch.dict(
+                    sys.modules, {"resource": None} if resource_module_missing else {}
+                ):
+                    peak_memory = get_peak_memory_mb()
+                    report_peak_memory(phase="solving", verbose=False)
+                    report_peak_memory(phase="solving", verbose=True)
+
+                if resource_module_missing or sys.platform == "win32":
+                    self.assertIsNone(peak_memory)
+                    self.assertEqual("", terminal.getvalue())
+                else:
+                    self.assertGreater(peak_memory, 0)
+                    self.assertEqual(
+                        "...peak memory after solving: {:,.0f} MB\n".format(
+                            peak_memory
+                        ),
+                        terminal.getvalue(),
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
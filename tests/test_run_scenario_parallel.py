@@ -12,10 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import csv
+import filecmp
 import os
+import shutil
+import tempfile
 import unittest
 
 from gridpath import run_scenario_parallel
+from gridpath.auxiliary.checkpoints import read_checkpoints
 
 # Change directory to the 'gridpath' directory as that's what
 # run_scenario_parallel.py expects; the rest of the variables are relative
@@ -32,6 +37,70 @@ class TestRunScenarioParallel(unittest.TestCase):
             ["--scenarios_csv", scenarios_csv_path, "--n_parallel_scenarios", "2"]
         )
 
+    def test_parallel_scenarios_deduplicate_subproblems(self):
+        """
+        Subproblems with identical inputs are solved once and their results
+        copied; subproblems whose inputs differ are solved in each scenario
+        """
+        with tempfile.TemporaryDirectory() as scenario_location:
+            for scenario in ["a", "b"]:
+                shutil.copytree(
+                    os.path.join(os.getcwd(), "../examples/multi_stage_prod_cost"),
+                    os.path.join(scenario_location, scenario),
+                )
+            # Change the load of subproblem 2 of scenario b
+            load_file = os.path.join(
+                scenario_location, "b", "2", "1", "inputs", "load_mw.tab"
+            )
+            with open(load_file, "r") as f:
+                load = f.read()
+            with open(load_file, "w") as f:
+                f.write(load.replace("\t10.0\n", "\t12.0\n"))
+
+            scenarios_csv_path = os.path.join(scenario_location, "scenarios.csv")
+            with open(scenarios_csv_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["scenario", "a", "b"])
+                writer.writerow(["scenario_location"] + [scenario_location] * 2)
+                writer.writerow(["quiet", "", ""])
+                writer.writerow(["mute_solver_output", "", ""])
+
+            run_scenario_parallel.main(
+                [
+                    "--scenarios_csv",
+                    scenarios_csv_path,
+                    "--n_parallel_scenarios",
+                    "2",
+                    "--deduplicate_subproblems",
+                ]
+            )
+
+            checkpoints_a = read_checkpoints(os.path.join(scenario_location, "a"))
+            checkpoints_b = read_checkpoints(os.path.join(scenario_location, "b"))
+            for subproblem in ["1", "2", "3"]:
+                key = ("", "", "", subproblem)
+                for stage in ["1", "2", "3"]:
+                    self.assertIn("solve_seconds", checkpoints_a[key]["stages"][stage])
+                    if subproblem == "2":
+                        self.assertIn(
+                            "solve_seconds", checkpoints_b[key]["stages"][stage]
+                        )
+                    else:
+                        self.assertEqual(
+                            "a",
+                            checkpoints_b[key]["stages"][stage]["results_copied_from"],
+                        )
+
+                comparison = filecmp.dircmp(
+                    os.path.join(scenario_location, "a", subproblem, "1", "results"),
+                    os.path.join(scenario_location, "b", subproblem, "1", "results"),
+                )
+                self.assertListEqual([], comparison.left_only + comparison.right_only)
+                if subproblem == "2":
+                    self.assertIn("objective_function_value.txt", comparison.diff_files)
+                else:
+                    self.assertListEqual([], comparison.diff_files)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -646,6 +646,37 @@ class TestTxOperations(unittest.TestCase):
         )
         self.assertDictEqual(expected_reactance, actual_reactance)
 
+    def test_get_cycle_incidence(self):
+        """
+        Lines are assigned to the cycle with the direction of the cycle and
+        the cycle basis is only calculated once for each network
+        :return:
+        """
+        tx_lines = (
+            ("Tx1", "Zone1", "Zone2"),
+            ("Tx2", "Zone3", "Zone2"),
+            ("Tx3", "Zone3", "Zone1"),
+            ("Tx4", "Zone3", "Zone4"),
+        )
+        MODULE_BEING_TESTED.get_cycle_incidence.cache_clear()
+        cycles = MODULE_BEING_TESTED.get_cycle_incidence(tx_lines)
+
+        self.assertEqual(1, len(cycles))
+        zones, lines = cycles[0]
+        self.assertListEqual(["Zone1", "Zone2", "Zone3"], sorted(zones))
+        directions = dict(lines)
+        self.assertListEqual(["Tx1", "Tx2", "Tx3"], sorted(directions.keys()))
+        self.assertTrue(
+            directions
+            in [
+                {"Tx1": 1, "Tx2": -1, "Tx3": 1},
+                {"Tx1": -1, "Tx2": 1, "Tx3": -1},
+            ]
+        )
+
+        self.assertIs(cycles, MODULE_BEING_TESTED.get_cycle_incidence(tx_lines))
+        self.assertEqual(1, MODULE_BEING_TESTED.get_cycle_incidence.cache_info().hits)
+
 
 if __name__ == "__main__":
     unittest.main()
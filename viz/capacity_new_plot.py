@@ -26,7 +26,7 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import attach_scenario_results, connect_to_database
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import (
     create_stacked_bar_plot,
@@ -115,6 +115,7 @@ def main(args=None):
         c=c,
         script="capacity_new_plot",
     )
+    attach_scenario_results(conn=conn, scenario_ids=[scenario_id])
 
     tech_colors = get_tech_colors(c)
     tech_plotting_order = get_tech_plotting_order(c)
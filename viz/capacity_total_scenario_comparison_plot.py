@@ -25,7 +25,7 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import attach_scenario_results, connect_to_database
 from viz.common_functions import (
     create_stacked_bar_plot,
     show_plot,
@@ -103,6 +103,7 @@ def main(args=None):
     parsed_args = parse_arguments(arguments=args)
 
     conn = connect_to_database(db_path=parsed_args.database)
+    attach_scenario_results(conn=conn)
 
     tech_colors = get_tech_colors(conn.cursor())
     tech_plotting_order = get_tech_plotting_order(conn.cursor())
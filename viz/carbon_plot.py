@@ -26,7 +26,7 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import attach_scenario_results, connect_to_database
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import (
     show_hide_legend,
@@ -293,6 +293,7 @@ def main(args=None):
         c=c,
         script="carbon_plot",
     )
+    attach_scenario_results(conn=conn, scenario_ids=[scenario_id])
 
     carbon_unit = get_unit(c, "carbon_emissions")
     cost_unit = get_unit(c, "cost")
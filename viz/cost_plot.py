@@ -23,7 +23,7 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import attach_scenario_results, connect_to_database
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import (
     create_stacked_bar_plot,
@@ -158,6 +158,7 @@ def main(args=None):
         c=c,
         script="cost_plot",
     )
+    attach_scenario_results(conn=conn, scenario_ids=[scenario_id])
 
     cost_unit = "million " + get_unit(c, "cost")
 
@@ -51,7 +51,7 @@ from bokeh.io import curdoc
 from bokeh.layouts import column, row
 import sys
 
-from db.common_functions import connect_to_database
+from db.common_functions import attach_scenario_results, connect_to_database
 from viz.common_functions import create_stacked_bar_plot
 from viz.dashboard.data import DataProvider
 
@@ -156,6 +156,7 @@ parser = create_parser()
 args = sys.argv[1:]
 parsed_args = parser.parse_args(args=args)
 conn = connect_to_database(db_path=parsed_args.database)
+attach_scenario_results(conn=conn)
 
 # Set Up Data
 data = DataProvider(conn)
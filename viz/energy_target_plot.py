@@ -32,7 +32,7 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import attach_scenario_results, connect_to_database
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import (
     show_hide_legend,
@@ -288,6 +288,7 @@ def main(args=None):
         c=c,
         script="energy_target_plot",
     )
+    attach_scenario_results(conn=conn, scenario_ids=[scenario_id])
 
     energy_unit = get_unit(c, "energy")
     cost_unit = get_unit(c, "cost")